@@ -5,6 +5,9 @@ Public API for RWA calculations providing:
 - RWAService: Main service facade for calculations
 - Request/Response models: Clean interface contracts
 - Validation utilities: Data path validation
+- LazyResults: Paged/streamed access to results without full materialization
+- ResultsCache: On-disk results with aggregate sidecars for the UI explorer
+- ResultsStore: Partitioned history of every run with run-over-run queries
 
 Usage:
     from rwa_calc.api import RWAService, CalculationRequest
@@ -39,6 +42,9 @@ from rwa_calc.api.models import (
     ValidationRequest,
     ValidationResponse,
 )
+from rwa_calc.api.results import LazyResults
+from rwa_calc.api.results_cache import ResultsCache, ResultsFilter
+from rwa_calc.api.results_store import ResultsStore, RunSelection
 from rwa_calc.api.service import (
     RWAService,
     create_service,
@@ -65,6 +71,11 @@ __all__ = [
     "SummaryByDimension",
     "APIError",
     "PerformanceMetrics",
+    "LazyResults",
+    "ResultsCache",
+    "ResultsFilter",
+    "ResultsStore",
+    "RunSelection",
     # Validation
     "DataPathValidator",
     "validate_data_path",
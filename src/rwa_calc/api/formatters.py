@@ -3,12 +3,15 @@ Result formatting utilities for RWA Calculator API.
 
 ResultFormatter: Formats AggregatedResultBundle for API responses
 compute_summary: Calculates SummaryStatistics from results
+materialize_bundle: Collects bundle outputs in a single pass
 
-Handles LazyFrame materialization and summary computation for UI consumption.
+Handles LazyFrame materialization (or lazy result handles) and summary
+computation for UI consumption.
 """
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
@@ -22,11 +25,64 @@ from rwa_calc.api.models import (
     PerformanceMetrics,
     SummaryStatistics,
 )
+from rwa_calc.api.results import LazyResults
+from rwa_calc.contracts.config import PolarsEngine
 
 if TYPE_CHECKING:
     from rwa_calc.contracts.bundles import AggregatedResultBundle
 
 
+# LazyFrame outputs of AggregatedResultBundle, in materialization order
+BUNDLE_OUTPUTS: tuple[str, ...] = (
+    "results",
+    "sa_results",
+    "irb_results",
+    "slotting_results",
+    "equity_results",
+    "floor_impact",
+    "supporting_factor_impact",
+    "summary_by_class",
+    "summary_by_approach",
+    "pre_crm_summary",
+    "post_crm_detailed",
+    "post_crm_summary",
+    "perimeter_summary_by_class",
+    "perimeter_summary_by_approach",
+    "perimeter_lending_groups",
+    "perimeter_floor_impact",
+)
+
+# Flattened output names for the nested PerimeterResultBundle fields
+_PERIMETER_OUTPUTS: dict[str, str] = {
+    "perimeter_summary_by_class": "summary_by_class",
+    "perimeter_summary_by_approach": "summary_by_approach",
+    "perimeter_lending_groups": "lending_groups",
+    "perimeter_floor_impact": "floor_impact",
+}
+
+# Approach groupings used for per-approach summary totals
+_APPROACH_GROUPS: dict[str, list[str]] = {
+    "sa": ["SA", "standardised"],
+    "irb": ["FIRB", "AIRB", "IRB"],
+    "slotting": ["SLOTTING"],
+}
+
+
+def _bundle_output(bundle: AggregatedResultBundle, name: str) -> pl.LazyFrame | None:
+    """Resolve a BUNDLE_OUTPUTS name, including flattened perimeter outputs."""
+    if name in _PERIMETER_OUTPUTS:
+        perimeters = bundle.perimeter_results
+        if perimeters is None:
+            return None
+        return getattr(perimeters, _PERIMETER_OUTPUTS[name])
+    return getattr(bundle, name)
+
+
+def _to_decimal(value: float | int | None) -> Decimal:
+    """Convert an aggregated numeric value to Decimal (None -> 0)."""
+    return Decimal(str(value or 0))
+
+
 # =============================================================================
 # Result Formatter
 # =============================================================================
@@ -58,46 +114,75 @@ class ResultFormatter:
         framework: str,
         reporting_date: date,
         started_at: datetime,
+        materialize_results: bool = True,
+        engine: PolarsEngine = "streaming",
     ) -> CalculationResponse:
         """
         Format AggregatedResultBundle into CalculationResponse.
 
         Materializes LazyFrames and computes summary statistics.
 
+        When materialize_results is False, the detailed results stay lazy:
+        the response carries a LazyResults handle and an empty results
+        frame with the result schema, and summary statistics are computed
+        with a single streaming aggregation instead of a full collect.
+
         Args:
             bundle: Result bundle from pipeline
             framework: Framework used for calculation
             reporting_date: As-of date
             started_at: Calculation start time
+            materialize_results: Whether to collect the detailed results
+            engine: Polars engine the lazy results handle runs its queries on
+                (the run's CalculationConfig.collect_engine)
 
         Returns:
             CalculationResponse ready for API return
         """
         completed_at = datetime.now()
 
-        results_df = self._materialize_results(bundle.results)
-
-        # Batch-collect summary frames that share the same query root
-        summary_by_class, summary_by_approach = self._batch_materialize_summaries(
-            bundle.summary_by_class,
-            bundle.summary_by_approach,
-        )
-
-        summary = self._compute_summary(
-            results_df=results_df,
-            floor_impact=bundle.floor_impact,
-        )
+        # Gather every output in one collect_all so the shared calculator
+        # plans are executed once (common-subplan elimination)
+        outputs: dict[str, pl.LazyFrame | None] = {
+            "summary_by_class": bundle.summary_by_class,
+            "summary_by_approach": bundle.summary_by_approach,
+            "floor_totals": self._floor_impact_totals(bundle.floor_impact),
+        }
+        for name in _PERIMETER_OUTPUTS:
+            outputs[name] = _bundle_output(bundle, name)
+        if materialize_results:
+            outputs["results"] = bundle.results
+        else:
+            outputs["totals"] = self._summary_totals(bundle.results)
+
+        collected = collect_named(outputs)
+        floor_stats = self._floor_stats(collected["floor_totals"])
+
+        lazy_results: LazyResults | None = None
+        if materialize_results:
+            results_df = collected["results"]
+            if results_df is None:
+                results_df = self._empty_results_frame()
+            summary = self._summary_from_results(results_df, floor_stats)
+        else:
+            lazy_results = LazyResults(bundle.results, engine=engine)
+            results_df = self._empty_results_like(bundle.results)
+            summary = self._summary_from_totals(collected["totals"], floor_stats)
+
+        summary_by_class = collected["summary_by_class"]
+        summary_by_approach = collected["summary_by_approach"]
+        perimeters = {name: collected[name] for name in _PERIMETER_OUTPUTS}
 
         errors = convert_errors(bundle.errors) if bundle.errors else []
 
         has_critical = any(e.severity == "critical" for e in errors)
-        success = not has_critical and results_df.height > 0
+        success = not has_critical and summary.exposure_count > 0
 
         performance = PerformanceMetrics(
             started_at=started_at,
             completed_at=completed_at,
             duration_seconds=(completed_at - started_at).total_seconds(),
-            exposure_count=results_df.height,
+            exposure_count=summary.exposure_count,
         )
 
         return CalculationResponse(
@@ -108,8 +193,13 @@ class ResultFormatter:
             results=results_df,
             summary_by_class=summary_by_class,
             summary_by_approach=summary_by_approach,
+            perimeter_summary_by_class=perimeters["perimeter_summary_by_class"],
+            perimeter_summary_by_approach=perimeters["perimeter_summary_by_approach"],
+            perimeter_lending_groups=perimeters["perimeter_lending_groups"],
+            perimeter_floor_impact=perimeters["perimeter_floor_impact"],
             errors=errors,
             performance=performance,
+            lazy_results=lazy_results,
         )
 
     def format_error_response(
@@ -166,192 +256,246 @@ class ResultFormatter:
             performance=performance,
         )
 
-    def _materialize_results(self, lazy_frame: pl.LazyFrame) -> pl.DataFrame:
+    def _empty_results_frame(self) -> pl.DataFrame:
+        """Create empty results DataFrame with the minimal expected schema."""
+        return pl.DataFrame({
+            "exposure_reference": pl.Series([], dtype=pl.String),
+            "approach_applied": pl.Series([], dtype=pl.String),
+            "exposure_class": pl.Series([], dtype=pl.String),
+            "ead_final": pl.Series([], dtype=pl.Float64),
+            "risk_weight": pl.Series([], dtype=pl.Float64),
+            "rwa_final": pl.Series([], dtype=pl.Float64),
+        })
+
+    def _empty_results_like(self, lazy_frame: pl.LazyFrame) -> pl.DataFrame:
         """
-        Materialize main results LazyFrame to DataFrame.
+        Build an empty DataFrame carrying the results schema.
 
         Args:
             lazy_frame: LazyFrame containing results
 
         Returns:
-            Materialized DataFrame
+            Zero-row DataFrame with the resolved results schema
         """
         try:
-            return lazy_frame.collect()
+            return pl.DataFrame(schema=lazy_frame.collect_schema())
         except Exception:
-            return pl.DataFrame({
-                "exposure_reference": pl.Series([], dtype=pl.String),
-                "approach_applied": pl.Series([], dtype=pl.String),
-                "exposure_class": pl.Series([], dtype=pl.String),
-                "ead_final": pl.Series([], dtype=pl.Float64),
-                "risk_weight": pl.Series([], dtype=pl.Float64),
-                "rwa_final": pl.Series([], dtype=pl.Float64),
-            })
-
-    def _batch_materialize_summaries(
+            return pl.DataFrame()
+
+    def _compute_summary(
         self,
-        summary_by_class: pl.LazyFrame | None,
-        summary_by_approach: pl.LazyFrame | None,
-    ) -> tuple[pl.DataFrame | None, pl.DataFrame | None]:
+        results_df: pl.DataFrame,
+        floor_impact: pl.LazyFrame | None,
+    ) -> SummaryStatistics:
         """
-        Batch-collect summary LazyFrames using pl.collect_all().
+        Compute summary statistics from the already-materialized results DataFrame.
 
-        When both frames share a common query root, collect_all allows
-        Polars to deduplicate shared subplans for a single pass.
+        Evaluates all totals (overall and per approach) in a single select
+        over results_df instead of re-collecting separate LazyFrames.
 
         Args:
-            summary_by_class: Optional summary-by-class LazyFrame
-            summary_by_approach: Optional summary-by-approach LazyFrame
+            results_df: Materialized results DataFrame
+            floor_impact: Optional floor impact LazyFrame
 
         Returns:
-            Tuple of (materialized class summary, materialized approach summary)
+            SummaryStatistics with computed metrics
         """
-        frames_to_collect: list[pl.LazyFrame] = []
-        indices: dict[str, int] = {}
+        floor_totals = self._floor_impact_totals(floor_impact)
+        floor_df = collect_named({"floor": floor_totals})["floor"]
+        return self._summary_from_results(results_df, self._floor_stats(floor_df))
 
-        if summary_by_class is not None:
-            indices["class"] = len(frames_to_collect)
-            frames_to_collect.append(summary_by_class)
+    def _summary_from_results(
+        self,
+        results_df: pl.DataFrame,
+        floor_stats: tuple[bool, Decimal],
+    ) -> SummaryStatistics:
+        """
+        Compute summary statistics from materialized results.
+
+        Args:
+            results_df: Materialized results DataFrame
+            floor_stats: Tuple of (floor applied, floor add-on)
+
+        Returns:
+            SummaryStatistics with computed metrics
+        """
+        if results_df.height == 0:
+            return self._empty_summary()
 
-        if summary_by_approach is not None:
-            indices["approach"] = len(frames_to_collect)
-            frames_to_collect.append(summary_by_approach)
+        totals = results_df.select(self._summary_expressions(results_df.columns))
+        return self._summary_from_totals(totals, floor_stats)
 
-        if not frames_to_collect:
-            return None, None
+    def _summary_totals(self, results: pl.LazyFrame) -> pl.LazyFrame | None:
+        """
+        Build the lazy single-row totals query used for lazy responses.
+
+        Args:
+            results: LazyFrame containing results
 
+        Returns:
+            LazyFrame aggregating the summary totals, or None if the
+            results schema cannot be resolved
+        """
         try:
-            collected = pl.collect_all(frames_to_collect)
+            columns = results.collect_schema().names()
         except Exception:
-            return None, None
+            return None
+        return results.select(self._summary_expressions(columns))
 
-        class_df = collected[indices["class"]] if "class" in indices else None
-        approach_df = collected[indices["approach"]] if "approach" in indices else None
+    def _summary_expressions(self, columns: list[str]) -> list[pl.Expr]:
+        """
+        Build the aggregation expressions behind SummaryStatistics.
 
-        return class_df, approach_df
+        Per-approach totals are filtered sums on approach_applied, so the
+        whole summary is a single pass over the results.
 
-    def _compute_summary(
+        Args:
+            columns: Column names present in the results
+
+        Returns:
+            List of scalar aggregation expressions
+        """
+        ead_col = self._find_column_name(columns, ["ead_final", "ead", "exposure_at_default"])
+        rwa_col = self._find_column_name(columns, ["rwa_final", "rwa", "risk_weighted_assets"])
+
+        exprs = [
+            pl.len().alias("exposure_count"),
+            (pl.col(ead_col).sum() if ead_col else pl.lit(0.0)).alias("total_ead"),
+            (pl.col(rwa_col).sum() if rwa_col else pl.lit(0.0)).alias("total_rwa"),
+        ]
+
+        has_approach = "approach_applied" in columns
+        for key, approaches in _APPROACH_GROUPS.items():
+            for prefix, col in (("ead", ead_col), ("rwa", rwa_col)):
+                if has_approach and col:
+                    expr = pl.col(col).filter(pl.col("approach_applied").is_in(approaches)).sum()
+                else:
+                    expr = pl.lit(0.0)
+                exprs.append(expr.alias(f"{prefix}_{key}"))
+
+        return exprs
+
+    def _summary_from_totals(
         self,
-        results_df: pl.DataFrame,
-        floor_impact: pl.LazyFrame | None,
+        totals: pl.DataFrame | None,
+        floor_stats: tuple[bool, Decimal],
     ) -> SummaryStatistics:
         """
-        Compute summary statistics from the already-materialized results DataFrame.
-
-        Filters results_df by approach_applied instead of re-collecting separate
-        LazyFrames, eliminating 6 redundant pipeline executions.
+        Build SummaryStatistics from a single row of aggregated totals.
 
         Args:
-            results_df: Materialized results DataFrame
-            floor_impact: Optional floor impact LazyFrame
+            totals: Single-row frame produced by _summary_expressions
+            floor_stats: Tuple of (floor applied, floor add-on)
 
         Returns:
             SummaryStatistics with computed metrics
         """
-        if results_df.height == 0:
-            return SummaryStatistics(
-                total_ead=Decimal("0"),
-                total_rwa=Decimal("0"),
-                exposure_count=0,
-                average_risk_weight=Decimal("0"),
-            )
-
-        ead_col = self._find_column(results_df, ["ead_final", "ead", "exposure_at_default"])
-        rwa_col = self._find_column(results_df, ["rwa_final", "rwa", "risk_weighted_assets"])
+        if totals is None or totals.height == 0:
+            return self._empty_summary()
 
-        total_ead = Decimal("0")
-        total_rwa = Decimal("0")
-
-        if ead_col:
-            total_ead = Decimal(str(results_df[ead_col].sum() or 0))
-        if rwa_col:
-            total_rwa = Decimal(str(results_df[rwa_col].sum() or 0))
+        row = totals.row(0, named=True)
+        if not row["exposure_count"]:
+            return self._empty_summary()
 
+        total_ead = _to_decimal(row["total_ead"])
+        total_rwa = _to_decimal(row["total_rwa"])
         avg_rw = total_rwa / total_ead if total_ead > 0 else Decimal("0")
-
-        # Compute per-approach stats from already-materialized results_df
-        approach_stats = self._compute_approach_stats(results_df, ead_col, rwa_col)
-
-        floor_applied = False
-        floor_impact_value = Decimal("0")
-        if floor_impact is not None:
-            try:
-                floor_df = floor_impact.collect()
-                if "floor_binding" in floor_df.columns:
-                    floor_applied = floor_df["floor_binding"].any()
-                if "floor_add_on" in floor_df.columns:
-                    floor_impact_value = Decimal(str(floor_df["floor_add_on"].sum() or 0))
-            except Exception:
-                pass
+        floor_applied, floor_impact_value = floor_stats
 
         return SummaryStatistics(
             total_ead=total_ead,
             total_rwa=total_rwa,
-            exposure_count=results_df.height,
+            exposure_count=int(row["exposure_count"]),
             average_risk_weight=avg_rw,
-            total_ead_sa=approach_stats["ead_sa"],
-            total_ead_irb=approach_stats["ead_irb"],
-            total_ead_slotting=approach_stats["ead_slotting"],
-            total_rwa_sa=approach_stats["rwa_sa"],
-            total_rwa_irb=approach_stats["rwa_irb"],
-            total_rwa_slotting=approach_stats["rwa_slotting"],
+            total_ead_sa=_to_decimal(row["ead_sa"]),
+            total_ead_irb=_to_decimal(row["ead_irb"]),
+            total_ead_slotting=_to_decimal(row["ead_slotting"]),
+            total_rwa_sa=_to_decimal(row["rwa_sa"]),
+            total_rwa_irb=_to_decimal(row["rwa_irb"]),
+            total_rwa_slotting=_to_decimal(row["rwa_slotting"]),
             floor_applied=floor_applied,
             floor_impact=floor_impact_value,
         )
 
-    def _compute_approach_stats(
+    def _floor_impact_totals(
         self,
-        results_df: pl.DataFrame,
-        ead_col: str | None,
-        rwa_col: str | None,
-    ) -> dict[str, Decimal]:
+        floor_impact: pl.LazyFrame | None,
+    ) -> pl.LazyFrame | None:
+        """
+        Build the lazy aggregation of the floor impact frame.
+
+        Args:
+            floor_impact: Optional floor impact LazyFrame
+
+        Returns:
+            Single-row LazyFrame with floor_binding / floor_add_on, or None
+            if there is nothing to aggregate
         """
-        Compute per-approach EAD and RWA totals from the materialized results DataFrame.
+        if floor_impact is None:
+            return None
+
+        try:
+            columns = floor_impact.collect_schema().names()
+        except Exception:
+            return None
 
-        Filters on the approach_applied column instead of re-collecting separate LazyFrames.
+        binding_col = self._find_column_name(columns, ["is_floor_binding", "floor_binding"])
+        add_on_col = self._find_column_name(columns, ["floor_impact_rwa", "floor_add_on"])
+
+        exprs = []
+        if binding_col:
+            exprs.append(pl.col(binding_col).any().alias("floor_binding"))
+        if add_on_col:
+            exprs.append(pl.col(add_on_col).sum().alias("floor_add_on"))
+        if not exprs:
+            return None
+
+        return floor_impact.select(exprs)
+
+    def _floor_stats(self, floor_totals: pl.DataFrame | None) -> tuple[bool, Decimal]:
+        """
+        Extract (floor applied, total add-on) from aggregated floor totals.
 
         Args:
-            results_df: Materialized results DataFrame
-            ead_col: Name of EAD column (or None)
-            rwa_col: Name of RWA column (or None)
+            floor_totals: Collected output of _floor_impact_totals
 
         Returns:
-            Dict with keys ead_sa, ead_irb, ead_slotting, rwa_sa, rwa_irb, rwa_slotting
+            Tuple of (whether the floor bound anywhere, total floor add-on)
         """
-        stats: dict[str, Decimal] = {
-            "ead_sa": Decimal("0"),
-            "ead_irb": Decimal("0"),
-            "ead_slotting": Decimal("0"),
-            "rwa_sa": Decimal("0"),
-            "rwa_irb": Decimal("0"),
-            "rwa_slotting": Decimal("0"),
-        }
+        if floor_totals is None or floor_totals.height == 0:
+            return False, Decimal("0")
 
-        if "approach_applied" not in results_df.columns:
-            return stats
+        row = floor_totals.row(0, named=True)
+        return bool(row.get("floor_binding") or False), _to_decimal(row.get("floor_add_on"))
 
-        # SA approaches
-        sa_approaches = {"SA", "standardised"}
-        # IRB approaches (FIRB, AIRB, IRB, etc.)
-        irb_approaches = {"FIRB", "AIRB", "IRB"}
-        # Slotting approaches
-        slotting_approaches = {"SLOTTING"}
+    def _empty_summary(self) -> SummaryStatistics:
+        """Create zeroed summary statistics."""
+        return SummaryStatistics(
+            total_ead=Decimal("0"),
+            total_rwa=Decimal("0"),
+            exposure_count=0,
+            average_risk_weight=Decimal("0"),
+        )
 
-        approach_mapping = {
-            "sa": sa_approaches,
-            "irb": irb_approaches,
-            "slotting": slotting_approaches,
-        }
+    def _find_column_name(
+        self,
+        columns: list[str],
+        candidates: list[str],
+    ) -> str | None:
+        """
+        Find first matching column name from candidates in a column list.
 
-        for key, approaches in approach_mapping.items():
-            filtered = results_df.filter(pl.col("approach_applied").is_in(approaches))
-            if filtered.height > 0:
-                if ead_col and ead_col in filtered.columns:
-                    stats[f"ead_{key}"] = Decimal(str(filtered[ead_col].sum() or 0))
-                if rwa_col and rwa_col in filtered.columns:
-                    stats[f"rwa_{key}"] = Decimal(str(filtered[rwa_col].sum() or 0))
+        Args:
+            columns: Available column names
+            candidates: List of possible column names
 
-        return stats
+        Returns:
+            First matching column name or None
+        """
+        for col in candidates:
+            if col in columns:
+                return col
+        return None
 
     def _find_column(
         self,
@@ -368,10 +512,7 @@ class ResultFormatter:
         Returns:
             First matching column name or None
         """
-        for col in candidates:
-            if col in df.columns:
-                return col
-        return None
+        return self._find_column_name(df.columns, candidates)
 
 
 # =============================================================================
@@ -398,37 +539,80 @@ def compute_summary(results_df: pl.DataFrame) -> SummaryStatistics:
     )
 
 
-def materialize_bundle(bundle: AggregatedResultBundle) -> dict[str, pl.DataFrame]:
+def collect_named(
+    frames: dict[str, pl.LazyFrame | None],
+) -> dict[str, pl.DataFrame | None]:
     """
-    Materialize all LazyFrames in a bundle to DataFrames.
+    Collect named LazyFrames together in a single pl.collect_all() pass.
 
-    Useful for debugging and inspection.
+    Bundle outputs all descend from the same calculator plans; collecting
+    them together lets Polars eliminate the common sub-plans so each
+    calculator runs once rather than once per output.
+
+    If the combined collect fails, frames are collected one by one so a
+    single broken output does not lose the others.
 
     Args:
-        bundle: AggregatedResultBundle to materialize
+        frames: Mapping of output name to LazyFrame (None entries are skipped)
 
     Returns:
-        Dictionary of materialized DataFrames
+        Mapping of output name to DataFrame (None if absent or failed)
     """
-    result: dict[str, pl.DataFrame] = {}
+    result: dict[str, pl.DataFrame | None] = dict.fromkeys(frames)
+    names = [name for name, lf in frames.items() if lf is not None]
+    if not names:
+        return result
 
     try:
-        result["results"] = bundle.results.collect()
+        collected = pl.collect_all([frames[name] for name in names])
+        result.update(zip(names, collected, strict=True))
     except Exception:
-        result["results"] = pl.DataFrame()
-
-    for name, lazy in [
-        ("sa_results", bundle.sa_results),
-        ("irb_results", bundle.irb_results),
-        ("slotting_results", bundle.slotting_results),
-        ("floor_impact", bundle.floor_impact),
-        ("summary_by_class", bundle.summary_by_class),
-        ("summary_by_approach", bundle.summary_by_approach),
-    ]:
-        if lazy is not None:
+        for name in names:
             try:
-                result[name] = lazy.collect()
+                result[name] = frames[name].collect()
             except Exception:
-                result[name] = pl.DataFrame()
+                result[name] = None
+
+    return result
+
+
+def materialize_bundle(
+    bundle: AggregatedResultBundle,
+    outputs: Sequence[str] | None = None,
+) -> dict[str, pl.DataFrame]:
+    """
+    Materialize LazyFrames in a bundle to DataFrames.
+
+    All requested outputs are gathered in one pl.collect_all() call so the
+    SA/IRB/slotting/equity plans they share are executed once.
+
+    Args:
+        bundle: AggregatedResultBundle to materialize
+        outputs: Names of bundle outputs to materialize (default: all of
+            BUNDLE_OUTPUTS). "results" is always returned when requested.
+
+    Returns:
+        Dictionary of materialized DataFrames. Outputs that are None on the
+        bundle are omitted; outputs that fail to collect are empty frames.
+
+    Raises:
+        ValueError: If an unknown output name is requested
+    """
+    names = list(outputs) if outputs is not None else list(BUNDLE_OUTPUTS)
+    unknown = [name for name in names if name not in BUNDLE_OUTPUTS]
+    if unknown:
+        raise ValueError(f"Unknown bundle outputs: {', '.join(unknown)}")
+
+    frames = {name: _bundle_output(bundle, name) for name in names}
+    collected = collect_named(frames)
+
+    result: dict[str, pl.DataFrame] = {}
+    for name in names:
+        df = collected[name]
+        if df is None:
+            if frames[name] is None and name != "results":
+                continue
+            df = pl.DataFrame()
+        result[name] = df
 
     return result
@@ -21,6 +21,8 @@ from typing import TYPE_CHECKING, Literal
 if TYPE_CHECKING:
     import polars as pl
 
+    from rwa_calc.api.results import LazyResults
+
 
 # =============================================================================
 # Request Models
@@ -48,6 +50,12 @@ class CalculationRequest:
             - "full_irb": Both FIRB and AIRB permitted (AIRB preferred)
         data_format: Format of input files ("parquet" or "csv")
         eur_gbp_rate: EUR/GBP exchange rate for threshold conversion
+        materialize_results: Whether to collect the detailed results into
+            the response. When False, the response keeps a lazy handle
+            (see CalculationResponse.scan_results) and summary statistics
+            are computed with a streaming aggregation.
+        cache_csv: Whether CSV inputs are cached as typed Parquet files next
+            to the CSVs and reused until the CSVs change (csv format only)
     """
 
     data_path: str | Path
@@ -60,6 +68,8 @@ class CalculationRequest:
     ] | None = None
     data_format: Literal["parquet", "csv"] = "parquet"
     eur_gbp_rate: Decimal = field(default_factory=lambda: Decimal("0.8732"))
+    materialize_results: bool = True
+    cache_csv: bool = False
 
     @property
     def path(self) -> Path:
@@ -229,11 +239,21 @@ class CalculationResponse:
         framework: Framework used for calculation
         reporting_date: As-of date for the calculation
         summary: Aggregated summary statistics
-        results: Materialized DataFrame with detailed results
+        results: Materialized DataFrame with detailed results. Empty (schema
+            only) when the response was built with a lazy results handle.
         summary_by_class: Optional breakdown by exposure class
         summary_by_approach: Optional breakdown by approach
+        perimeter_summary_by_class: RWA by perimeter_id and exposure class
+            (when perimeters are supplied)
+        perimeter_summary_by_approach: RWA by perimeter_id and approach
+        perimeter_lending_groups: Retail threshold totals by perimeter_id
+            and lending group
+        perimeter_floor_impact: Output floor impact by perimeter_id
+            (Basel 3.1 only)
         errors: List of errors/warnings encountered
         performance: Performance metrics for the run
+        lazy_results: Optional lazy handle over the detailed results, set
+            when results were not materialized
     """
 
     success: bool
@@ -243,8 +263,36 @@ class CalculationResponse:
     results: pl.DataFrame
     summary_by_class: pl.DataFrame | None = None
     summary_by_approach: pl.DataFrame | None = None
+    perimeter_summary_by_class: pl.DataFrame | None = None
+    perimeter_summary_by_approach: pl.DataFrame | None = None
+    perimeter_lending_groups: pl.DataFrame | None = None
+    perimeter_floor_impact: pl.DataFrame | None = None
     errors: list[APIError] = field(default_factory=list)
     performance: PerformanceMetrics | None = None
+    lazy_results: LazyResults | None = None
+
+    @property
+    def is_lazy(self) -> bool:
+        """Check if detailed results are held lazily rather than materialized."""
+        return self.lazy_results is not None
+
+    def scan_results(self) -> LazyResults:
+        """
+        Get a lazy handle over the detailed results.
+
+        Works for both lazy and materialized responses, so callers can use
+        paging, batching and column projection without caring how the
+        response was built.
+
+        Returns:
+            LazyResults over the detailed results
+        """
+        if self.lazy_results is not None:
+            return self.lazy_results
+
+        from rwa_calc.api.results import LazyResults
+
+        return LazyResults(self.results.lazy(), engine="cpu")
 
     @property
     def has_warnings(self) -> bool:
@@ -0,0 +1,214 @@
+"""
+Lazy result access for RWA Calculator API.
+
+LazyResults: Deferred handle over the pipeline results LazyFrame
+
+Lets callers page through, stream, or write out results without
+materializing the full frame as a Python-visible DataFrame. Callers
+that will access the same results many times can opt in to caching
+the collected frame with LazyResults.cache().
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Literal
+
+import polars as pl
+
+from rwa_calc.contracts.config import PolarsEngine
+
+ResultFormat = Literal["parquet", "csv", "ipc"]
+
+
+# =============================================================================
+# Lazy Results Handle
+# =============================================================================
+
+
+class LazyResults:
+    """
+    Deferred view over calculation results.
+
+    Wraps the results LazyFrame so that consumers only pay for the rows
+    and columns they actually touch. Every access runs the underlying
+    query with projection and slice pushdown; nothing is cached on the
+    handle unless the caller asks for it with cache().
+
+    Usage:
+        handle = response.scan_results()
+
+        # Column projection
+        slim = handle.select(["exposure_reference", "rwa_final"])
+
+        # Paging for UI tables
+        first_page = slim.page(offset=0, limit=100)
+
+        # Streaming to a downstream consumer
+        for batch in slim.iter_batches(batch_size=250_000):
+            consume(batch)
+
+        # Write straight to disk without a Python-visible DataFrame
+        handle.write_to("results.parquet", format="parquet")
+
+        # Many pages over the same results: run the query once
+        cached = handle.cache()
+    """
+
+    def __init__(
+        self,
+        frame: pl.LazyFrame,
+        engine: PolarsEngine = "streaming",
+    ) -> None:
+        """
+        Initialize LazyResults.
+
+        Args:
+            frame: LazyFrame containing results
+            engine: Polars engine used when the query is executed
+        """
+        self._frame = frame
+        self._engine = engine
+        self._cached = False
+        self._lock = threading.Lock()
+
+    @property
+    def schema(self) -> pl.Schema:
+        """Resolved schema of the results (no data is read)."""
+        return self._frame.collect_schema()
+
+    @property
+    def columns(self) -> list[str]:
+        """Column names of the results (no data is read)."""
+        return self.schema.names()
+
+    @property
+    def is_cached(self) -> bool:
+        """Whether the results are held in memory (see cache())."""
+        return self._cached
+
+    def lazy(self) -> pl.LazyFrame:
+        """Return the underlying LazyFrame for further composition."""
+        return self._frame
+
+    def cache(self) -> LazyResults:
+        """
+        Run the query once and serve later accesses from memory.
+
+        Materializes the full results, so only use it when the same
+        results will be paged or counted repeatedly (e.g. a UI table).
+        Handles derived with select() afterwards project the cached frame.
+
+        Returns:
+            This handle, now backed by the collected frame
+        """
+        with self._lock:
+            if not self._cached:
+                self._frame = self._frame.collect(engine=self._engine).lazy()
+                self._cached = True
+        return self
+
+    def select(self, columns: Sequence[str]) -> LazyResults:
+        """
+        Project the results onto a subset of columns.
+
+        Args:
+            columns: Column names to keep
+
+        Returns:
+            New LazyResults restricted to the given columns
+        """
+        return LazyResults(self._frame.select(list(columns)), engine=self._engine)
+
+    def count(self) -> int:
+        """
+        Count result rows using a streaming aggregation.
+
+        Returns:
+            Number of result rows
+        """
+        return self._frame.select(pl.len()).collect(engine=self._engine).item()
+
+    def collect(self) -> pl.DataFrame:
+        """
+        Materialize the (projected) results in full.
+
+        Returns:
+            Materialized DataFrame
+        """
+        return self._frame.collect(engine=self._engine)
+
+    def page(self, offset: int, limit: int) -> pl.DataFrame:
+        """
+        Materialize a single page of results.
+
+        Args:
+            offset: Zero-based index of the first row
+            limit: Maximum number of rows to return
+
+        Returns:
+            DataFrame with at most ``limit`` rows
+        """
+        if offset < 0 or limit < 0:
+            raise ValueError("offset and limit must be non-negative")
+        return self._frame.slice(offset, limit).collect(engine=self._engine)
+
+    def iter_batches(self, batch_size: int = 100_000) -> Iterator[pl.DataFrame]:
+        """
+        Stream the results in batches.
+
+        Uses the Polars streaming engine so that only a bounded number of
+        rows is resident at a time. Every yielded batch has at most
+        ``batch_size`` rows.
+
+        Args:
+            batch_size: Maximum rows per batch
+
+        Yields:
+            DataFrame batches in result order
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        if hasattr(self._frame, "collect_batches"):
+            chunks: Iterator[pl.DataFrame] = self._frame.collect_batches(chunk_size=batch_size)
+        else:
+            # Older Polars: single streaming collect, then slice
+            chunks = iter([self._frame.collect(engine=self._engine)])
+
+        for chunk in chunks:
+            yield from chunk.iter_slices(n_rows=batch_size)
+
+    def write_to(
+        self,
+        path: str | Path,
+        format: ResultFormat = "parquet",
+    ) -> Path:
+        """
+        Stream the results directly to a file.
+
+        Uses Polars sinks, so rows go from the query to disk without
+        being collected into a single DataFrame.
+
+        Args:
+            path: Destination file path
+            format: Output format ("parquet", "csv" or "ipc")
+
+        Returns:
+            Path of the written file
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        if format == "parquet":
+            self._frame.sink_parquet(target)
+        elif format == "csv":
+            self._frame.sink_csv(target)
+        elif format == "ipc":
+            self._frame.sink_ipc(target)
+        else:
+            raise ValueError(f"Unsupported result format: {format}")
+
+        return target
@@ -0,0 +1,470 @@
+"""
+On-disk results cache for the RWA Calculator UI.
+
+ResultsCache: Writes calculation results plus aggregate sidecars, and
+serves filtered, paged and aggregated views by scanning them lazily.
+
+The calculator app writes results once per run as an Arrow IPC file
+(memory-mapped on scan) together with a small aggregate "cube" keyed by
+exposure class, approach and risk weight band. The results explorer
+reads filter options, totals and summaries from the cube, and scans the
+IPC file with predicate/projection pushdown only when it needs row-level
+data (pages, risk weight range filters, exports). CSV is produced on
+demand rather than on every run.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import polars as pl
+
+from rwa_calc.contracts.config import PolarsEngine
+
+if TYPE_CHECKING:
+    from rwa_calc.api.models import CalculationResponse
+
+
+RESULTS_FILE = "last_results.arrow"
+LEGACY_RESULTS_FILE = "last_results.parquet"
+LEGACY_CSV_FILE = "last_results.csv"
+META_FILE = "last_results_meta.json"
+CUBE_FILE = "last_results_cube.parquet"
+SUMMARY_BY_CLASS_FILE = "last_summary_by_class.parquet"
+SUMMARY_BY_APPROACH_FILE = "last_summary_by_approach.parquet"
+
+# Upper bound (inclusive) and label of each risk weight band
+RISK_WEIGHT_BANDS: tuple[tuple[float, str], ...] = (
+    (0.20, "0-20%"),
+    (0.50, "20-50%"),
+    (0.75, "50-75%"),
+    (1.00, "75-100%"),
+    (1.50, "100-150%"),
+)
+RISK_WEIGHT_BAND_OVERFLOW = "150%+"
+
+# Dimensions available for filters and group-bys
+CUBE_DIMENSIONS: tuple[str, ...] = ("exposure_class", "approach_applied", "rw_band")
+
+
+def risk_weight_band(column: str = "risk_weight") -> pl.Expr:
+    """
+    Expression mapping a risk weight column to its band label.
+
+    Args:
+        column: Risk weight column name
+
+    Returns:
+        String expression aliased to "rw_band"
+    """
+    upper, label = RISK_WEIGHT_BANDS[0]
+    expr = pl.when(pl.col(column) <= upper).then(pl.lit(label))
+    for upper, label in RISK_WEIGHT_BANDS[1:]:
+        expr = expr.when(pl.col(column) <= upper).then(pl.lit(label))
+    return expr.otherwise(pl.lit(RISK_WEIGHT_BAND_OVERFLOW)).alias("rw_band")
+
+
+_BAND_LABELS: tuple[str, ...] = (
+    *(label for _, label in RISK_WEIGHT_BANDS),
+    RISK_WEIGHT_BAND_OVERFLOW,
+)
+
+
+def _band_order(label: str) -> int:
+    return _BAND_LABELS.index(label) if label in _BAND_LABELS else len(_BAND_LABELS)
+
+
+# =============================================================================
+# Filter
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class ResultsFilter:
+    """
+    Filter over cached results.
+
+    Attributes:
+        exposure_class: Keep only this exposure class (None for all)
+        approach: Keep only this approach_applied value (None for all)
+        rw_min: Minimum risk weight, inclusive (None for no bound)
+        rw_max: Maximum risk weight, inclusive (None for no bound)
+    """
+
+    exposure_class: str | None = None
+    approach: str | None = None
+    rw_min: float | None = None
+    rw_max: float | None = None
+
+    @property
+    def has_risk_weight_range(self) -> bool:
+        """Whether the filter needs row-level risk weights (not answerable from the cube)."""
+        return self.rw_min is not None or self.rw_max is not None
+
+    def dimension_predicates(self, columns: Sequence[str]) -> list[pl.Expr]:
+        """Equality predicates on cube dimensions present in ``columns``."""
+        predicates = []
+        if self.exposure_class is not None and "exposure_class" in columns:
+            predicates.append(pl.col("exposure_class") == self.exposure_class)
+        if self.approach is not None and "approach_applied" in columns:
+            predicates.append(pl.col("approach_applied") == self.approach)
+        return predicates
+
+    def row_predicates(self, columns: Sequence[str]) -> list[pl.Expr]:
+        """
+        All predicates applicable to row-level results with ``columns``.
+
+        Rows with a null risk weight never match, with or without a range.
+        """
+        predicates = self.dimension_predicates(columns)
+        if "risk_weight" in columns:
+            predicates.append(pl.col("risk_weight").is_not_null())
+            if self.rw_min is not None:
+                predicates.append(pl.col("risk_weight") >= self.rw_min)
+            if self.rw_max is not None:
+                predicates.append(pl.col("risk_weight") <= self.rw_max)
+        return predicates
+
+
+def _apply(frame: pl.LazyFrame | pl.DataFrame, predicates: list[pl.Expr]):
+    return frame.filter(pl.all_horizontal(predicates)) if predicates else frame
+
+
+# =============================================================================
+# Results Cache
+# =============================================================================
+
+
+class ResultsCache:
+    """
+    Results and aggregate sidecars stored in a cache directory.
+
+    Usage:
+        cache = ResultsCache(cache_dir)
+        cache.write(response)                      # calculator, once per run
+
+        options = cache.filter_options("exposure_class")
+        flt = ResultsFilter(exposure_class="corporate")
+        totals = cache.totals(flt)                 # from the cube
+        by_approach = cache.summary("approach_applied", flt)
+        page = cache.page(flt, ["exposure_reference", "rwa_final"], offset=0, limit=100)
+        cache.write_csv("filtered.csv", flt)       # on demand
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        engine: PolarsEngine = "streaming",
+    ) -> None:
+        """
+        Initialize ResultsCache.
+
+        Args:
+            cache_dir: Directory holding the cached files
+            engine: Polars engine used for scans over the results file
+        """
+        self.cache_dir = Path(cache_dir)
+        self._engine = engine
+        self._cube: pl.DataFrame | None = None
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def write(self, response: CalculationResponse) -> Path:
+        """
+        Cache a calculation response.
+
+        Sinks the results to an Arrow IPC file, then builds the aggregate
+        cube from a scan of that file. The cache never collects the results
+        itself: lazy responses stream from the query to disk, and
+        materialized responses are written from the frame they already
+        hold. Stale Parquet/CSV copies from earlier versions are removed.
+
+        Args:
+            response: Successful calculation response
+
+        Returns:
+            Path of the results file
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        results_path = response.scan_results().write_to(self.results_path, format="ipc")
+
+        self._build_cube(pl.scan_ipc(results_path)).collect(engine=self._engine).write_parquet(
+            self.cache_dir / CUBE_FILE
+        )
+        self._cube = None
+
+        metadata = {
+            "framework": response.framework,
+            "reporting_date": str(response.reporting_date),
+            "total_ead": float(response.summary.total_ead),
+            "total_rwa": float(response.summary.total_rwa),
+            "exposure_count": response.summary.exposure_count,
+        }
+        (self.cache_dir / META_FILE).write_text(json.dumps(metadata, indent=2))
+
+        for frame, name in (
+            (response.summary_by_class, SUMMARY_BY_CLASS_FILE),
+            (response.summary_by_approach, SUMMARY_BY_APPROACH_FILE),
+        ):
+            if frame is not None:
+                frame.write_parquet(self.cache_dir / name)
+
+        for stale in (LEGACY_RESULTS_FILE, LEGACY_CSV_FILE):
+            (self.cache_dir / stale).unlink(missing_ok=True)
+
+        return results_path
+
+    @staticmethod
+    def _build_cube(results: pl.LazyFrame) -> pl.LazyFrame:
+        """Aggregate results by every available cube dimension."""
+        if "risk_weight" in results.collect_schema().names():
+            # Rows without a risk weight are left out of every filtered view
+            results = results.filter(pl.col("risk_weight").is_not_null()).with_columns(
+                risk_weight_band()
+            )
+        columns = results.collect_schema().names()
+        dimensions = [d for d in CUBE_DIMENSIONS if d in columns]
+
+        aggregations = [pl.len().cast(pl.Int64).alias("exposure_count")]
+        for source, target in (("ead_final", "total_ead"), ("rwa_final", "total_rwa")):
+            if source in columns:
+                aggregations.append(pl.col(source).sum().alias(target))
+            else:
+                aggregations.append(pl.lit(0.0).alias(target))
+
+        if not dimensions:
+            return results.select(aggregations)
+        return results.group_by(dimensions).agg(aggregations)
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    @property
+    def results_path(self) -> Path:
+        """Path of the cached results file."""
+        return self.cache_dir / RESULTS_FILE
+
+    def exists(self) -> bool:
+        """Whether cached results are available."""
+        return self.results_path.exists() or (self.cache_dir / LEGACY_RESULTS_FILE).exists()
+
+    def metadata(self) -> dict[str, Any]:
+        """Run metadata written alongside the results (empty if missing)."""
+        meta_path = self.cache_dir / META_FILE
+        return json.loads(meta_path.read_text()) if meta_path.exists() else {}
+
+    def scan(self) -> pl.LazyFrame:
+        """
+        Lazily scan the cached results.
+
+        Falls back to a Parquet file written by earlier versions.
+
+        Returns:
+            LazyFrame over the results file
+        """
+        if self.results_path.exists():
+            return pl.scan_ipc(self.results_path)
+        return pl.scan_parquet(self.cache_dir / LEGACY_RESULTS_FILE)
+
+    @property
+    def columns(self) -> list[str]:
+        """Result column names (read from the file schema, not the data)."""
+        return self.scan().collect_schema().names()
+
+    def cube(self) -> pl.DataFrame:
+        """
+        The aggregate cube, building it from the results if the sidecar is missing.
+
+        Returns:
+            DataFrame with one row per dimension combination
+        """
+        if self._cube is None:
+            cube_path = self.cache_dir / CUBE_FILE
+            if cube_path.exists():
+                self._cube = pl.read_parquet(cube_path)
+            else:
+                self._cube = self._build_cube(self.scan()).collect(engine=self._engine)
+        return self._cube
+
+    def summary_table(self, name: str) -> pl.DataFrame | None:
+        """
+        Summary table written by the calculator.
+
+        Args:
+            name: "class" or "approach"
+
+        Returns:
+            DataFrame, or None if not cached
+        """
+        file_name = {"class": SUMMARY_BY_CLASS_FILE, "approach": SUMMARY_BY_APPROACH_FILE}[name]
+        path = self.cache_dir / file_name
+        return pl.read_parquet(path) if path.exists() else None
+
+    def filter_options(self, dimension: str) -> list[str]:
+        """
+        Distinct values of a dimension, for filter dropdowns.
+
+        Args:
+            dimension: One of CUBE_DIMENSIONS
+
+        Returns:
+            Sorted distinct non-null values (empty if the dimension is absent)
+        """
+        cube = self.cube()
+        if dimension not in cube.columns:
+            return []
+        values = cube.get_column(dimension).drop_nulls().unique().to_list()
+        return sorted(values, key=_band_order) if dimension == "rw_band" else sorted(values)
+
+    # -------------------------------------------------------------------------
+    # Filtered views
+    # -------------------------------------------------------------------------
+
+    def _filtered(self, flt: ResultsFilter) -> pl.LazyFrame:
+        """Row-level scan with the filter pushed down into the reader."""
+        frame = self.scan()
+        return _apply(frame, flt.row_predicates(frame.collect_schema().names()))
+
+    def _aggregate_source(self, flt: ResultsFilter) -> pl.LazyFrame:
+        """Cube rows matching the filter, or a pushed-down scan if the cube cannot answer it."""
+        if not flt.has_risk_weight_range:
+            cube = self.cube()
+            return _apply(cube, flt.dimension_predicates(cube.columns)).lazy()
+        return self._build_cube(self._filtered(flt))
+
+    def totals(self, flt: ResultsFilter | None = None) -> dict[str, float]:
+        """
+        Exposure count, EAD, RWA and average risk weight for a filter.
+
+        Args:
+            flt: Filter (None for all results)
+
+        Returns:
+            Dict with exposure_count, total_ead, total_rwa, avg_risk_weight
+        """
+        flt = flt or ResultsFilter()
+        row = (
+            self._aggregate_source(flt)
+            .select(
+                pl.col("exposure_count").sum(),
+                pl.col("total_ead").sum(),
+                pl.col("total_rwa").sum(),
+            )
+            .collect(engine=self._engine)
+            .row(0, named=True)
+        )
+        total_ead = row["total_ead"] or 0.0
+        total_rwa = row["total_rwa"] or 0.0
+        return {
+            "exposure_count": int(row["exposure_count"] or 0),
+            "total_ead": total_ead,
+            "total_rwa": total_rwa,
+            "avg_risk_weight": total_rwa / total_ead if total_ead > 0 else 0.0,
+        }
+
+    def summary(self, dimension: str, flt: ResultsFilter | None = None) -> pl.DataFrame:
+        """
+        EAD, RWA and count grouped by one dimension.
+
+        Args:
+            dimension: One of CUBE_DIMENSIONS
+            flt: Filter (None for all results)
+
+        Returns:
+            DataFrame with dimension, total_ead, total_rwa, count, avg_risk_weight
+        """
+        summary = (
+            self._aggregate_source(flt or ResultsFilter())
+            .group_by(dimension)
+            .agg(
+                pl.col("total_ead").sum(),
+                pl.col("total_rwa").sum(),
+                pl.col("exposure_count").sum().alias("count"),
+            )
+            .with_columns(
+                pl.when(pl.col("total_ead") > 0)
+                .then(pl.col("total_rwa") / pl.col("total_ead"))
+                .otherwise(0.0)
+                .alias("avg_risk_weight")
+            )
+            .collect(engine=self._engine)
+        )
+        if dimension == "rw_band":
+            order = {label: i for i, label in enumerate(_BAND_LABELS)}
+            return summary.sort(
+                pl.col("rw_band").replace_strict(order, default=len(order), return_dtype=pl.Int64)
+            )
+        return summary.sort("total_rwa", descending=True)
+
+    def page(
+        self,
+        flt: ResultsFilter | None = None,
+        columns: Sequence[str] | None = None,
+        offset: int = 0,
+        limit: int = 500,
+    ) -> pl.DataFrame:
+        """
+        One page of filtered results.
+
+        Only the requested columns and rows are read from the file.
+
+        Args:
+            flt: Filter (None for all results)
+            columns: Columns to return (None for all)
+            offset: Zero-based index of the first row
+            limit: Maximum number of rows
+
+        Returns:
+            DataFrame with at most ``limit`` rows
+        """
+        if offset < 0 or limit < 0:
+            raise ValueError("offset and limit must be non-negative")
+        frame = self._filtered(flt or ResultsFilter())
+        if columns is not None:
+            frame = frame.select(list(columns))
+        return frame.slice(offset, limit).collect(engine=self._engine)
+
+    def write_csv(self, path: str | Path, flt: ResultsFilter | None = None) -> Path:
+        """
+        Stream filtered results to a CSV file.
+
+        Args:
+            path: Destination CSV path
+            flt: Filter (None for all results)
+
+        Returns:
+            Path of the written file
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        self._filtered(flt or ResultsFilter()).sink_csv(target)
+        return target
+
+    def to_bytes(self, flt: ResultsFilter | None = None, format: str = "csv") -> bytes:
+        """
+        Filtered results as CSV or Parquet bytes, for download buttons.
+
+        Args:
+            flt: Filter (None for all results)
+            format: "csv" or "parquet"
+
+        Returns:
+            Encoded file contents
+        """
+        import io
+
+        df = self._filtered(flt or ResultsFilter()).collect(engine=self._engine)
+        if format == "csv":
+            return df.write_csv().encode("utf-8")
+        if format == "parquet":
+            buffer = io.BytesIO()
+            df.write_parquet(buffer)
+            return buffer.getvalue()
+        raise ValueError(f"Unsupported export format: {format}")
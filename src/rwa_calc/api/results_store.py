@@ -0,0 +1,442 @@
+"""
+Historical results store for the RWA Calculator.
+
+ResultsStore: Keeps every run's outputs in a hive-partitioned Parquet
+dataset with a run catalogue, and answers run-over-run questions by
+scanning only the partitions a query needs.
+
+Layout under the store root::
+
+    catalogue/<run_id>.parquet
+    results/framework=CRR/reporting_date=2024-12-31/run_id=<id>/data.parquet
+    summary_by_class/framework=CRR/reporting_date=2024-12-31/run_id=<id>/data.parquet
+    summary_by_approach/...
+    floor_impact/...
+    audit/...
+
+Row-level results are written sorted by exposure_reference, so Parquet
+row-group statistics let a single-exposure lookup skip almost every row
+group. Audit strings (classification_reason and *_calculation columns)
+are split into the audit dataset, keeping the results files narrow.
+
+A run's outputs are collected in one pass and then written, each file
+via a temporary file and an atomic rename. The catalogue holds one entry
+file per run, published last, so concurrent writers never rewrite each
+other's entries and readers only see completely written runs.
+
+Queries select runs from the catalogue (framework, date range, latest
+run per reporting date) and scan only those runs' files, so partition
+pruning never lists the dataset directories.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import polars as pl
+
+from rwa_calc.contracts.bundles import AggregatedResultBundle
+from rwa_calc.contracts.config import PolarsEngine
+
+if TYPE_CHECKING:
+    from rwa_calc.api.models import CalculationResponse
+    from rwa_calc.domain.enums import RegulatoryFramework
+
+
+CATALOGUE_DIR = "catalogue"
+DATA_FILE = "data.parquet"
+
+# Datasets written per run
+STORE_TABLES: tuple[str, ...] = (
+    "results",
+    "summary_by_class",
+    "summary_by_approach",
+    "floor_impact",
+    "audit",
+)
+
+# Row-level datasets, sorted by exposure_reference for statistics-based skipping
+ROW_LEVEL_TABLES: tuple[str, ...] = ("results", "audit")
+
+# Rows per Parquet row group in row-level datasets
+ROW_GROUP_SIZE = 100_000
+
+CATALOGUE_SCHEMA: dict[str, pl.DataType] = {
+    "run_id": pl.String,
+    "framework": pl.String,
+    "reporting_date": pl.Date,
+    "written_at": pl.Datetime("us"),
+    "exposure_count": pl.Int64,
+    "total_ead": pl.Float64,
+    "total_rwa": pl.Float64,
+    "tables": pl.List(pl.String),
+    "metadata": pl.String,
+}
+
+
+def is_audit_column(name: str) -> bool:
+    """Whether a results column holds an audit string."""
+    return name == "classification_reason" or name.endswith("_calculation")
+
+
+# =============================================================================
+# Run Selection
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class RunSelection:
+    """
+    Runs a history query reads.
+
+    Attributes:
+        framework: Keep only this framework (None for all)
+        start: Earliest reporting date, inclusive (None for no bound)
+        end: Latest reporting date, inclusive (None for no bound)
+        last: Keep only the most recent N reporting dates (None for all)
+        latest_only: Keep only the latest run per framework and reporting date
+        run_ids: Keep only these runs (None for all)
+    """
+
+    framework: str | None = None
+    start: date | None = None
+    end: date | None = None
+    last: int | None = None
+    latest_only: bool = True
+    run_ids: tuple[str, ...] | None = None
+
+    def apply(self, catalogue: pl.DataFrame) -> pl.DataFrame:
+        """Filter a catalogue to the selected runs, ordered by reporting date."""
+        runs = catalogue
+        if self.framework is not None:
+            runs = runs.filter(pl.col("framework") == self.framework)
+        if self.start is not None:
+            runs = runs.filter(pl.col("reporting_date") >= self.start)
+        if self.end is not None:
+            runs = runs.filter(pl.col("reporting_date") <= self.end)
+        if self.run_ids is not None:
+            runs = runs.filter(pl.col("run_id").is_in(list(self.run_ids)))
+        if self.latest_only:
+            runs = runs.sort("written_at").group_by(
+                ["framework", "reporting_date"], maintain_order=True
+            ).last()
+        if self.last is not None:
+            dates = runs.get_column("reporting_date").unique().sort().tail(self.last)
+            runs = runs.filter(pl.col("reporting_date").is_in(dates.to_list()))
+        return runs.sort(["reporting_date", "framework", "written_at"])
+
+
+# =============================================================================
+# Results Store
+# =============================================================================
+
+
+class ResultsStore:
+    """
+    Partitioned Parquet history of calculation runs.
+
+    Usage:
+        store = ResultsStore("/data/rwa_history")
+        run_id = store.write(bundle, framework="CRR", reporting_date=date(2024, 12, 31))
+        run_id = store.write(response)             # CalculationResponse carries both
+
+        store.runs(RunSelection(framework="CRR", last=12))
+        store.exposure_history("EXP001", RunSelection(last=12))
+        store.class_totals(RunSelection(framework="CRR"))
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        engine: PolarsEngine = "streaming",
+    ) -> None:
+        """
+        Initialize ResultsStore.
+
+        Args:
+            root: Directory holding the datasets and the catalogue
+            engine: Polars engine used for writes and scans
+        """
+        self.root = Path(root)
+        self._engine = engine
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def write(
+        self,
+        source: AggregatedResultBundle | CalculationResponse,
+        framework: str | RegulatoryFramework | None = None,
+        reporting_date: date | None = None,
+        run_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> str:
+        """
+        Store one run's outputs and add it to the catalogue.
+
+        Args:
+            source: Aggregated pipeline output or a calculation response
+            framework: Framework of the run, as a string or RegulatoryFramework
+                (defaults to the response's)
+            reporting_date: Reporting date of the run (defaults to the response's)
+            run_id: Run identifier (generated if omitted)
+            metadata: Extra JSON-serialisable run metadata for the catalogue
+
+        Returns:
+            The run_id
+
+        Raises:
+            ValueError: If framework or reporting_date is unknown, or run_id exists
+        """
+        frames = self._frames(source)
+        if not isinstance(source, AggregatedResultBundle):
+            framework = framework or source.framework
+            reporting_date = reporting_date or source.reporting_date
+        if framework is None or reporting_date is None:
+            raise ValueError("framework and reporting_date are required to store a run")
+        framework = getattr(framework, "value", framework)
+
+        run_id = run_id or f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        entry_path = self._entry_path(run_id)
+        if entry_path.exists():
+            raise ValueError(f"Run {run_id!r} is already stored")
+
+        # Collect every table in one pass so the shared result plan runs once
+        tables = dict(zip(
+            frames, pl.collect_all(list(frames.values()), engine=self._engine), strict=True
+        ))
+        for table, df in tables.items():
+            path = self._partition(table, framework, reporting_date, run_id) / DATA_FILE
+            _write_atomic(df, path, row_group_size=ROW_GROUP_SIZE)
+
+        entry = pl.DataFrame(
+            [{
+                "run_id": run_id,
+                "framework": framework,
+                "reporting_date": reporting_date,
+                "written_at": datetime.now(),
+                **_totals(tables["results"]),
+                "tables": list(tables),
+                "metadata": json.dumps(metadata or {}, default=str),
+            }],
+            schema=CATALOGUE_SCHEMA,
+        )
+        try:
+            _write_atomic(entry, entry_path, exclusive=True)
+        except FileExistsError:
+            raise ValueError(f"Run {run_id!r} is already stored") from None
+        return run_id
+
+    def _frames(
+        self,
+        source: AggregatedResultBundle | CalculationResponse,
+    ) -> dict[str, pl.LazyFrame]:
+        """Outputs to store, with audit strings split from the results."""
+        if isinstance(source, AggregatedResultBundle):
+            candidates = {
+                "results": source.results,
+                "summary_by_class": source.summary_by_class,
+                "summary_by_approach": source.summary_by_approach,
+                "floor_impact": source.floor_impact,
+            }
+        else:
+            candidates = {
+                "results": source.scan_results().lazy(),
+                "summary_by_class": source.summary_by_class,
+                "summary_by_approach": source.summary_by_approach,
+            }
+
+        frames = {
+            name: frame.lazy()
+            for name, frame in candidates.items()
+            if frame is not None
+        }
+
+        columns = frames["results"].collect_schema().names()
+        audit = [c for c in columns if is_audit_column(c)]
+        if audit and "exposure_reference" in columns:
+            frames["audit"] = frames["results"].select(["exposure_reference", *audit])
+            frames["results"] = frames["results"].drop(audit)
+
+        for table in ROW_LEVEL_TABLES:
+            if table in frames and "exposure_reference" in frames[table].collect_schema():
+                frames[table] = frames[table].sort("exposure_reference")
+        return frames
+
+    def _partition(
+        self,
+        table: str,
+        framework: str,
+        reporting_date: date,
+        run_id: str,
+    ) -> Path:
+        """Hive partition directory of one run's dataset."""
+        return (
+            self.root / table / f"framework={framework}"
+            / f"reporting_date={reporting_date.isoformat()}" / f"run_id={run_id}"
+        )
+
+    def _entry_path(self, run_id: str) -> Path:
+        """Catalogue entry file of one run."""
+        return self.root / CATALOGUE_DIR / f"{run_id}.parquet"
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def catalogue(self) -> pl.DataFrame:
+        """
+        Every stored run.
+
+        Returns:
+            DataFrame with one row per run (see CATALOGUE_SCHEMA)
+        """
+        entries = sorted((self.root / CATALOGUE_DIR).glob("*.parquet"))
+        if not entries:
+            return pl.DataFrame(schema=CATALOGUE_SCHEMA)
+        return pl.concat([pl.read_parquet(path) for path in entries]).sort("written_at")
+
+    def runs(self, selection: RunSelection | None = None) -> pl.DataFrame:
+        """
+        Catalogue rows of the selected runs.
+
+        Args:
+            selection: Runs to keep (default: latest run per reporting date)
+
+        Returns:
+            DataFrame ordered by reporting date
+        """
+        return (selection or RunSelection()).apply(self.catalogue())
+
+    def scan(
+        self,
+        table: str = "results",
+        selection: RunSelection | None = None,
+    ) -> pl.LazyFrame:
+        """
+        Lazily scan one dataset across the selected runs.
+
+        Only the selected runs' files are scanned. Each row carries the
+        run_id, framework and reporting_date partition values.
+
+        Args:
+            table: Dataset name (one of STORE_TABLES)
+            selection: Runs to read (default: latest run per reporting date)
+
+        Returns:
+            LazyFrame over the selected runs (empty if none hold the table)
+        """
+        if table not in STORE_TABLES:
+            raise ValueError(f"Unknown table {table!r}; expected one of {STORE_TABLES}")
+
+        scans = []
+        for run in self.runs(selection).iter_rows(named=True):
+            if table not in run["tables"]:
+                continue
+            partition = self._partition(
+                table, run["framework"], run["reporting_date"], run["run_id"]
+            )
+            scans.append(pl.scan_parquet(partition / DATA_FILE).with_columns([
+                pl.lit(run["run_id"]).alias("run_id"),
+                pl.lit(run["framework"]).alias("framework"),
+                pl.lit(run["reporting_date"]).alias("reporting_date"),
+            ]))
+
+        if not scans:
+            return pl.LazyFrame(schema={
+                "run_id": pl.String, "framework": pl.String, "reporting_date": pl.Date,
+            })
+        return pl.concat(scans, how="diagonal_relaxed")
+
+    def exposure_history(
+        self,
+        exposure_reference: str,
+        selection: RunSelection | None = None,
+        columns: list[str] | None = None,
+    ) -> pl.DataFrame:
+        """
+        One exposure's results across runs.
+
+        Args:
+            exposure_reference: Exposure to look up
+            selection: Runs to read (default: latest run per reporting date)
+            columns: Result columns to return (default: all)
+
+        Returns:
+            DataFrame with one row per run holding the exposure, by reporting date
+        """
+        lf = self.scan("results", selection)
+        if "exposure_reference" not in lf.collect_schema().names():
+            return lf.collect()
+        lf = lf.filter(pl.col("exposure_reference") == exposure_reference)
+        if columns is not None:
+            lf = lf.select(["reporting_date", "framework", "run_id", *columns])
+        return lf.sort("reporting_date").collect(engine=self._engine)
+
+    def class_totals(self, selection: RunSelection | None = None) -> pl.DataFrame:
+        """
+        Summary-by-class rows across runs.
+
+        Args:
+            selection: Runs to read (default: latest run per reporting date)
+
+        Returns:
+            DataFrame of the stored class summaries, by reporting date
+        """
+        return self.scan("summary_by_class", selection).sort(
+            "reporting_date"
+        ).collect(engine=self._engine)
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _totals(results: pl.DataFrame) -> dict[str, Any]:
+    """Exposure count and EAD/RWA totals of a run's results."""
+    return {
+        "exposure_count": results.height,
+        **{
+            target: float(results[source].sum()) if source in results.columns else None
+            for source, target in (("ead_final", "total_ead"), ("rwa_final", "total_rwa"))
+        },
+    }
+
+
+def _write_atomic(
+    df: pl.DataFrame,
+    path: Path,
+    row_group_size: int | None = None,
+    exclusive: bool = False,
+) -> None:
+    """
+    Write a Parquet file via a temporary file in the same directory.
+
+    Args:
+        df: Frame to write
+        path: Destination file
+        row_group_size: Rows per row group (Polars default if None)
+        exclusive: Fail instead of replacing an existing file
+
+    Raises:
+        FileExistsError: If exclusive and the file exists
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        df.write_parquet(tmp, statistics=True, row_group_size=row_group_size)
+        if exclusive:
+            # A hard link publishes the file atomically and never overwrites
+            os.link(tmp, path)
+        else:
+            os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
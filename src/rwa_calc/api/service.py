@@ -63,10 +63,23 @@ class RWAService:
             print(response.results)
     """
 
-    def __init__(self) -> None:
-        """Initialize RWAService with default components."""
+    def __init__(self, limits: ResourceLimits | None = None) -> None:
+        """
+        Initialize RWAService with default components.
+
+        Args:
+            limits: Memory and concurrency limits shared by all
+                requests (optional)
+        """
+        from rwa_calc.engine.pipeline import PipelineOrchestrator
+        from rwa_calc.engine.resources import ResourceGovernor
+
         self._validator = DataPathValidator()
         self._formatter = ResultFormatter()
+        # Shared by every request; orchestrator runs are reentrant
+        self._pipeline = PipelineOrchestrator(
+            governor=ResourceGovernor(limits) if limits is not None else None,
+        )
 
     def calculate(self, request: CalculationRequest) -> CalculationResponse:
         """
@@ -109,6 +122,8 @@ class RWAService:
                 framework=request.framework,
                 reporting_date=request.reporting_date,
                 started_at=started_at,
+                materialize_results=request.materialize_results,
+                engine=config.collect_engine,
             )
 
         except Exception as e:
@@ -249,7 +264,7 @@ class RWAService:
         from rwa_calc.engine.loader import CSVLoader, ParquetLoader
 
         if request.data_format == "csv":
-            return CSVLoader(base_path=request.path)
+            return CSVLoader(base_path=request.path, cache=request.cache_csv)
         else:
             return ParquetLoader(base_path=request.path)
 
@@ -257,15 +272,16 @@ class RWAService:
         """
         Create pipeline orchestrator with loader.
 
+        The orchestrator shares the service's components, so concurrent
+        requests reuse them instead of building their own.
+
         Args:
             loader: Data loader instance
 
         Returns:
             Configured PipelineOrchestrator
         """
-        from rwa_calc.engine.pipeline import PipelineOrchestrator
-
-        return PipelineOrchestrator(loader=loader)
+        return self._pipeline.with_loader(loader)
 
 
 # =============================================================================
@@ -277,6 +293,7 @@ if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
     from rwa_calc.contracts.protocols import LoaderProtocol
     from rwa_calc.engine.pipeline import PipelineOrchestrator
+    from rwa_calc.engine.resources import ResourceLimits
 
 
 # =============================================================================
@@ -284,14 +301,17 @@ if TYPE_CHECKING:
 # =============================================================================
 
 
-def create_service() -> RWAService:
+def create_service(limits: ResourceLimits | None = None) -> RWAService:
     """
     Factory function to create RWAService instance.
 
+    Args:
+        limits: Memory and concurrency limits (optional)
+
     Returns:
         Configured RWAService
     """
-    return RWAService()
+    return RWAService(limits=limits)
 
 
 def quick_calculate(
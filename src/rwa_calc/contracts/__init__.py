@@ -10,6 +10,7 @@ for the RWA calculation pipeline. This module enables:
 
 Submodules:
 - bundles: Data transfer dataclasses for pipeline stages
+- columns: Column contracts applied before materialisation points
 - config: CalculationConfig and related configuration classes
 - errors: CalculationError and LazyFrameResult for error handling
 - protocols: Protocol definitions for component interfaces
@@ -23,6 +24,7 @@ from rwa_calc.contracts.config import (
     LGDFloors,
     OutputFloorConfig,
     PDFloors,
+    RatingSelection,
     RetailThresholds,
     SupportingFactors,
 )
@@ -71,8 +73,10 @@ from rwa_calc.contracts.bundles import (
     CounterpartyLookup,
     CRMAdjustedBundle,
     IRBResultBundle,
+    PerimeterResultBundle,
     RawDataBundle,
     ResolvedHierarchyBundle,
+    RWAMovementBundle,
     SAResultBundle,
     SlottingResultBundle,
     create_empty_classified_bundle,
@@ -82,6 +86,13 @@ from rwa_calc.contracts.bundles import (
     create_empty_resolved_hierarchy_bundle,
 )
 
+# Column contracts
+from rwa_calc.contracts.columns import (
+    CLASSIFIED_COLUMNS,
+    CRM_ADJUSTED_COLUMNS,
+    ColumnContract,
+)
+
 # Protocol definitions
 from rwa_calc.contracts.protocols import (
     ClassifierProtocol,
@@ -124,6 +135,7 @@ __all__ = [
     "LGDFloors",
     "OutputFloorConfig",
     "PDFloors",
+    "RatingSelection",
     "RetailThresholds",
     "SupportingFactors",
     # Errors
@@ -163,10 +175,12 @@ __all__ = [
     "ERROR_UNKNOWN_EXPOSURE_CLASS",
     # Bundles
     "AggregatedResultBundle",
+    "RWAMovementBundle",
     "ClassifiedExposuresBundle",
     "CounterpartyLookup",
     "CRMAdjustedBundle",
     "IRBResultBundle",
+    "PerimeterResultBundle",
     "RawDataBundle",
     "ResolvedHierarchyBundle",
     "SAResultBundle",
@@ -176,6 +190,10 @@ __all__ = [
     "create_empty_crm_adjusted_bundle",
     "create_empty_raw_data_bundle",
     "create_empty_resolved_hierarchy_bundle",
+    # Column contracts
+    "CLASSIFIED_COLUMNS",
+    "CRM_ADJUSTED_COLUMNS",
+    "ColumnContract",
     # Protocols
     "ClassifierProtocol",
     "CRMProcessorProtocol",
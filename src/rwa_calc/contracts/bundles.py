@@ -51,6 +51,7 @@ class RawDataBundle:
         specialised_lending: Specialised lending metadata (slotting)
         equity_exposures: Equity exposure details
         fx_rates: FX rates for currency conversion (optional)
+        perimeters: Perimeter membership by booking entity (optional)
     """
 
     facilities: pl.LazyFrame
@@ -67,6 +68,7 @@ class RawDataBundle:
     specialised_lending: pl.LazyFrame | None = None
     equity_exposures: pl.LazyFrame | None = None
     fx_rates: pl.LazyFrame | None = None
+    perimeters: pl.LazyFrame | None = None
 
 
 @dataclass(frozen=True)
@@ -288,6 +290,7 @@ class AggregatedResultBundle:
         pre_crm_summary: Pre-CRM summary (gross view by original class)
         post_crm_detailed: Post-CRM detailed view (split rows for guarantees)
         post_crm_summary: Post-CRM summary (net view by effective class)
+        perimeter_results: Per-perimeter summaries (when perimeters are supplied)
         errors: All errors accumulated throughout pipeline
     """
 
@@ -303,9 +306,48 @@ class AggregatedResultBundle:
     pre_crm_summary: pl.LazyFrame | None = None
     post_crm_detailed: pl.LazyFrame | None = None
     post_crm_summary: pl.LazyFrame | None = None
+    perimeter_results: PerimeterResultBundle | None = None
     errors: list = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class PerimeterResultBundle:
+    """
+    Solo and consolidated views from a single calculation.
+
+    Each exposure is tagged with every perimeter its booking entity
+    belongs to, and every summary is grouped by perimeter_id.
+
+    Attributes:
+        summary_by_class: RWA by perimeter_id and exposure class
+        summary_by_approach: RWA by perimeter_id and approach
+        lending_groups: Retail threshold totals by perimeter_id and lending group
+        floor_impact: Output floor impact by perimeter_id (Basel 3.1 only)
+    """
+
+    summary_by_class: pl.LazyFrame
+    summary_by_approach: pl.LazyFrame
+    lending_groups: pl.LazyFrame
+    floor_impact: pl.LazyFrame | None = None
+
+
+@dataclass(frozen=True)
+class RWAMovementBundle:
+    """
+    RWA movement attribution between two calculation runs.
+
+    Attributes:
+        exposure_movements: One row per exposure_reference in either run,
+            with prior/current RWA and one column per movement driver
+        class_movements: Movement drivers summed by exposure class
+        drivers: Driver column names, in waterfall order
+    """
+
+    exposure_movements: pl.LazyFrame
+    class_movements: pl.LazyFrame
+    drivers: tuple[str, ...] = ()
+
+
 # =============================================================================
 # HELPER FUNCTIONS FOR BUNDLE CREATION
 # =============================================================================
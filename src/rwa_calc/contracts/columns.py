@@ -0,0 +1,236 @@
+"""
+Column contracts for pipeline materialisation points.
+
+Each strategic collect (end of classification, end of CRM) materialises
+every column the stage added along the way. A ColumnContract declares the
+columns that downstream stages and the final outputs need, plus an audit
+allow-list, and projects everything else away before the collect.
+
+Columns kept by a contract:
+- Documented input columns (facility, loan, contingent, specialised lending)
+- Derived columns read by later stages or reported in the results
+- Audit columns, unless CalculationConfig.audit_mode is "none"
+
+CalculationConfig(keep_all_columns=True) disables pruning for debugging.
+
+Usage:
+    from rwa_calc.contracts.columns import CLASSIFIED_COLUMNS
+
+    classified = CLASSIFIED_COLUMNS.prune(classified, config)
+    classified = classified.collect().lazy()
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from rwa_calc.data.schemas import (
+    CONTINGENTS_SCHEMA,
+    FACILITY_SCHEMA,
+    LOAN_SCHEMA,
+    RAW_EXPOSURE_SCHEMA,
+    SPECIALISED_LENDING_SCHEMA,
+)
+
+if TYPE_CHECKING:
+    from rwa_calc.contracts.config import CalculationConfig
+
+
+@dataclass(frozen=True)
+class ColumnContract:
+    """
+    Columns a stage hands to the next materialisation point.
+
+    Attributes:
+        stage: Stage name (for diagnostics)
+        required: Columns needed by downstream stages or the final outputs
+        audit: Columns kept only while an audit trail is being built
+    """
+
+    stage: str
+    required: frozenset[str]
+    audit: frozenset[str] = frozenset()
+
+    def extend(
+        self,
+        stage: str,
+        required: frozenset[str] = frozenset(),
+        audit: frozenset[str] = frozenset(),
+    ) -> ColumnContract:
+        """Create a contract for a later stage that keeps this one's columns."""
+        return ColumnContract(
+            stage=stage,
+            required=self.required | required,
+            audit=self.audit | audit,
+        )
+
+    def keep(self, available: list[str], include_audit: bool = True) -> list[str]:
+        """Columns of `available` to keep, in their original order."""
+        wanted = self.required | self.audit if include_audit else self.required
+        return [c for c in available if c in wanted]
+
+    def dropped(self, available: list[str], include_audit: bool = True) -> list[str]:
+        """Columns of `available` the contract would project away."""
+        kept = set(self.keep(available, include_audit))
+        return [c for c in available if c not in kept]
+
+    def prune(self, lf: pl.LazyFrame, config: CalculationConfig) -> pl.LazyFrame:
+        """
+        Project away columns outside the contract.
+
+        Args:
+            lf: Frame about to be materialised
+            config: Calculation configuration (keep_all_columns, audit_mode)
+
+        Returns:
+            LazyFrame restricted to the contract's columns
+        """
+        if config.keep_all_columns:
+            return lf
+
+        available = lf.collect_schema().names()
+        if not self.dropped(available, config.audit_trail):
+            return lf
+        return lf.select(self.keep(available, config.audit_trail))
+
+
+# =============================================================================
+# STAGE CONTRACTS
+# =============================================================================
+
+# FX conversion audit trail added by the FX converter
+FX_AUDIT_COLUMNS: frozenset[str] = frozenset({
+    "original_currency",
+    "original_amount",
+    "fx_rate_applied",
+})
+
+# Input columns are always passed through
+INPUT_COLUMNS: frozenset[str] = frozenset().union(
+    FACILITY_SCHEMA,
+    LOAN_SCHEMA,
+    CONTINGENTS_SCHEMA,
+    SPECIALISED_LENDING_SCHEMA,
+    RAW_EXPOSURE_SCHEMA,
+) - FX_AUDIT_COLUMNS
+
+CLASSIFIED_COLUMNS = ColumnContract(
+    stage="classifier",
+    required=INPUT_COLUMNS | frozenset({
+        "exposure_reference",
+        "exposure_type",
+        "undrawn_amount",
+        "ltv",
+        # Hierarchy references (reporting)
+        "parent_facility_reference",
+        "root_facility_reference",
+        "parent_counterparty_reference",
+        "ultimate_parent_reference",
+        "lending_group_reference",
+        # Retail threshold contribution (per-perimeter lending group totals)
+        "exposure_for_retail_threshold",
+        # Ratings
+        "cqs",
+        "pd",
+        "rating_value",
+        "rating_agency",
+        # Counterparty attributes used by the calculators
+        "cp_entity_type",
+        "cp_annual_revenue",
+        "cp_is_managed_as_retail",
+        # Classification
+        "exposure_class",
+        "exposure_class_sa",
+        "exposure_class_irb",
+        "approach",
+        "is_sme",
+        "is_mortgage",
+        "is_defaulted",
+        "is_infrastructure",
+        "requires_fi_scalar",
+        # Specialised lending
+        "sl_type",
+        "slotting_category",
+        "is_hvcre",
+        "is_short_maturity",
+        "is_pre_operational",
+    }),
+    audit=FX_AUDIT_COLUMNS | frozenset({
+        # Rating inheritance
+        "rating_inherited",
+        "rating_source_counterparty",
+        "rating_inheritance_reason",
+        # Facility undrawn lineage
+        "source_facility_reference",
+        # Classification decisions
+        "exposure_class_for_sa",
+        "is_financial_sector_entity",
+        "is_large_financial_sector_entity",
+        "qualifies_as_retail",
+        "retail_threshold_exclusion_applied",
+        "reclassified_to_retail",
+        "has_property_collateral",
+        "residential_collateral_value",
+        "lending_group_adjusted_exposure",
+        "classification_reason",
+    }),
+)
+
+CRM_ADJUSTED_COLUMNS = CLASSIFIED_COLUMNS.extend(
+    stage="crm",
+    required=frozenset({
+        # Provisions
+        "provision_allocated",
+        "provision_on_drawn",
+        "provision_on_nominal",
+        "provision_deducted",
+        "nominal_after_provision",
+        # CCF / EAD waterfall
+        "ccf",
+        "ead_from_ccf",
+        "ead_pre_crm",
+        "ead_gross",
+        "ead_after_collateral",
+        "ead_after_guarantee",
+        "ead_final",
+        "collateral_adjusted_value",
+        "guarantee_amount",
+        # LGD
+        "lgd_pre_crm",
+        "lgd_post_crm",
+        # Pre/post CRM reporting and guarantee substitution
+        "pre_crm_counterparty_reference",
+        "pre_crm_exposure_class",
+        "post_crm_counterparty_guaranteed",
+        "post_crm_exposure_class_guaranteed",
+        "is_guaranteed",
+        "guaranteed_portion",
+        "unguaranteed_portion",
+        "guarantor_reference",
+        "guarantee_ratio",
+        "guarantor_approach",
+        "guarantor_entity_type",
+        "guarantor_exposure_class",
+        "guarantor_cqs",
+    }),
+    audit=frozenset({
+        "ccf_calculation",
+        "crm_calculation",
+        "ccf_original",
+        "ccf_guaranteed",
+        "ccf_unguaranteed",
+        # Collateral / guarantee detail behind lgd_post_crm and ead_final
+        "collateral_market_value",
+        "collateral_coverage_pct",
+        "total_collateral_for_lgd",
+        "lgd_secured",
+        "lgd_unsecured",
+        "total_guarantee_amount",
+        "percentage_covered",
+        "primary_guarantor",
+        "guarantee_count",
+    }),
+)
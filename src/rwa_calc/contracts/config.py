@@ -27,11 +27,17 @@ from rwa_calc.domain.enums import (
 )
 
 if TYPE_CHECKING:
-    pass
+    from pathlib import Path
 
 # Type alias for Polars collection engine
 PolarsEngine = Literal["cpu", "gpu", "streaming"]
 
+# Type alias for audit trail detail
+# - "none": no audit frames and no per-row audit strings
+# - "numeric": audit frames with component columns only (no strings)
+# - "full": audit frames and per-row human-readable strings
+AuditMode = Literal["none", "numeric", "full"]
+
 
 @dataclass(frozen=True)
 class PDFloors:
@@ -303,6 +309,30 @@ class RetailThresholds:
         )
 
 
+@dataclass(frozen=True)
+class RatingSelection:
+    """
+    Policy for choosing one rating per counterparty from the ratings history.
+
+    point_in_time is on by default, so ratings dated after the reporting
+    date no longer apply (earlier versions took the latest rating whatever
+    its date). Set it to False to reproduce the old selection.
+
+    Attributes:
+        point_in_time: Ignore ratings dated after the reporting date
+        separate_streams: Take PD from the latest internal rating and CQS
+            from the latest external rating, instead of both from the
+            single latest rating
+        agency_preference: Rating agencies in order of preference; a rating
+            from an earlier agency wins over a more recent one from a later
+            or unlisted agency
+    """
+
+    point_in_time: bool = True
+    separate_streams: bool = False
+    agency_preference: tuple[str, ...] = ()
+
+
 @dataclass(frozen=True)
 class IRBPermissions:
     """
@@ -450,10 +480,25 @@ class CalculationConfig:
         output_floor: Output floor configuration
         retail_thresholds: Retail classification thresholds
         irb_permissions: IRB approach permissions
+        rating_selection: Point-in-time rating selection policy
         scaling_factor: 1.06 scaling factor for IRB (CRR Art. 153), 1.0 for Basel 3.1
         correlation_multiplier: SME correlation adjustment multiplier
         collect_engine: Polars engine for .collect() - 'streaming' (default)
             processes in batches for lower memory usage, 'cpu' for in-memory
+        materialise_engine: Polars engine for the classifier and CRM
+            materialisation points - 'cpu' (default) in memory, 'streaming'
+            for inputs larger than memory (set by ResourceGovernor when a run
+            exceeds its memory budget)
+        spill_dir: Directory the classifier and CRM materialisation points
+            sink their outputs to, as Arrow IPC files scanned back lazily,
+            instead of collecting them in memory (default None; set by
+            ResourceGovernor when a run exceeds its memory budget)
+        audit_mode: Audit trail detail - 'full' (default) builds per-row
+            audit strings, 'numeric' keeps only the component columns,
+            'none' skips audit frames entirely. Strings can be rendered on
+            demand with lf.audit.render() from rwa_calc.engine.audit_namespace
+        keep_all_columns: Debug mode - skip the column contracts and keep every
+            intermediate column at the classifier and CRM materialisation points
     """
 
     framework: RegulatoryFramework
@@ -466,9 +511,24 @@ class CalculationConfig:
     output_floor: OutputFloorConfig = field(default_factory=OutputFloorConfig.crr)
     retail_thresholds: RetailThresholds = field(default_factory=RetailThresholds.crr)
     irb_permissions: IRBPermissions = field(default_factory=IRBPermissions.sa_only)
+    rating_selection: RatingSelection = field(default_factory=RatingSelection)
     scaling_factor: Decimal = Decimal("1.06")  # IRB K scaling (CRR Art. 153)
     eur_gbp_rate: Decimal = Decimal("0.8732")  # FX rate for EUR threshold conversion
     collect_engine: PolarsEngine = "streaming"  # Default to streaming for memory efficiency
+    materialise_engine: PolarsEngine = "cpu"
+    spill_dir: Path | None = None
+    audit_mode: AuditMode = "full"
+    keep_all_columns: bool = False
+
+    @property
+    def audit_strings(self) -> bool:
+        """Whether per-row human-readable audit strings are built."""
+        return self.audit_mode == "full"
+
+    @property
+    def audit_trail(self) -> bool:
+        """Whether audit trail frames are built."""
+        return self.audit_mode != "none"
 
     @property
     def is_crr(self) -> bool:
@@ -491,6 +551,7 @@ class CalculationConfig:
         irb_permissions: IRBPermissions | None = None,
         eur_gbp_rate: Decimal = Decimal("0.8732"),
         collect_engine: PolarsEngine = "streaming",
+        audit_mode: AuditMode = "full",
     ) -> CalculationConfig:
         """
         Create CRR (Basel 3.0) configuration.
@@ -509,6 +570,7 @@ class CalculationConfig:
             eur_gbp_rate: EUR/GBP exchange rate for threshold conversion
             collect_engine: Polars engine for .collect() - 'streaming' (default)
                 for memory efficiency, 'cpu' for in-memory processing
+            audit_mode: Audit trail detail - 'full' (default), 'numeric' or 'none'
 
         Returns:
             Configured CalculationConfig for CRR
@@ -526,6 +588,7 @@ class CalculationConfig:
             scaling_factor=Decimal("1.06"),
             eur_gbp_rate=eur_gbp_rate,
             collect_engine=collect_engine,
+            audit_mode=audit_mode,
         )
 
     @classmethod
@@ -534,6 +597,7 @@ class CalculationConfig:
         reporting_date: date,
         irb_permissions: IRBPermissions | None = None,
         collect_engine: PolarsEngine = "streaming",
+        audit_mode: AuditMode = "full",
     ) -> CalculationConfig:
         """
         Create Basel 3.1 (PRA PS9/24) configuration.
@@ -550,6 +614,7 @@ class CalculationConfig:
             irb_permissions: IRB approach permissions (optional)
             collect_engine: Polars engine for .collect() - 'streaming' (default)
                 for memory efficiency, 'cpu' for in-memory processing
+            audit_mode: Audit trail detail - 'full' (default), 'numeric' or 'none'
 
         Returns:
             Configured CalculationConfig for Basel 3.1
@@ -567,4 +632,5 @@ class CalculationConfig:
             scaling_factor=Decimal("1.0"),  # Removed under Basel 3.1 (PRA CP16/22)
             eur_gbp_rate=Decimal("0.8732"),  # Not used for Basel 3.1 (GBP thresholds)
             collect_engine=collect_engine,
+            audit_mode=audit_mode,
         )
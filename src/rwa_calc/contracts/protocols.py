@@ -389,6 +389,7 @@ class OutputAggregatorProtocol(Protocol):
         slotting_bundle: SlottingResultBundle | None,
         config: CalculationConfig,
         equity_bundle: EquityResultBundle | None = None,
+        perimeters: pl.LazyFrame | None = None,
     ) -> AggregatedResultBundle:
         """
         Aggregate with full audit trail.
@@ -399,6 +400,8 @@ class OutputAggregatorProtocol(Protocol):
             slotting_bundle: Slotting calculation results bundle
             config: Calculation configuration
             equity_bundle: Equity calculation results bundle
+            perimeters: Perimeter membership (perimeter_id, book_code) for
+                per-perimeter summaries
 
         Returns:
             AggregatedResultBundle with audit information
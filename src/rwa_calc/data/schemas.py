@@ -276,6 +276,11 @@ LENDING_MAPPING_SCHEMA = {
     "child_counterparty_reference": pl.String,
 }
 
+PERIMETER_SCHEMA = {
+    "perimeter_id": pl.String,  # Reporting perimeter (e.g., solo entity or consolidated group)
+    "book_code": pl.String,     # Booking entity included in the perimeter
+}
+
 EXPOSURE_CLASS_MAPPING_SCHEMA = {
     "exposure_class_code": pl.String,
     "exposure_class_name": pl.String,
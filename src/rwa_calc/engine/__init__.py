@@ -11,9 +11,15 @@ Each component implements a protocol from rwa_calc.contracts.protocols.
 
 Modules:
     loader: Data loading from files/databases
+    data_quality: Input data profiling and data quality checks
+    ratings: Point-in-time rating selection
     hierarchy: Counterparty and facility hierarchy resolution
     classifier: Exposure classification and approach assignment
     aggregator: Result aggregation and output floor application
+    attribution: RWA movement attribution between two runs
+    explain: Single-exposure drill-down via its dependency closure
+    snapshot_diff: Row-level change sets between two input snapshots
+    resources: Memory and concurrency limits for runs
     pipeline: Pipeline orchestration
 
 Subpackages:
@@ -39,9 +45,15 @@ import rwa_calc.engine.hierarchy_namespace  # noqa: F401
 import rwa_calc.engine.aggregator_namespace  # noqa: F401
 import rwa_calc.engine.audit_namespace  # noqa: F401
 
-from .loader import ParquetLoader, CSVLoader
+from .loader import ParquetLoader, CSVLoader, ExcelLoader
+from .data_quality import DataQualityChecker, create_data_quality_checker
+from .ratings import RatingSelector, create_rating_selector
 from .hierarchy import HierarchyResolver, create_hierarchy_resolver
 from .aggregator import OutputAggregator, create_output_aggregator
+from .attribution import MovementAttributor, create_movement_attributor
+from .explain import ExposureExplainer, ExposureExplanation, create_exposure_explainer
+from .snapshot_diff import SnapshotDiff, SnapshotDiffer, create_snapshot_differ
+from .resources import ResourceGovernor, ResourceLimits
 from .pipeline import PipelineOrchestrator, create_pipeline, create_test_pipeline
 from .hierarchy_namespace import HierarchyLazyFrame
 from .aggregator_namespace import AggregatorLazyFrame
@@ -50,10 +62,25 @@ from .audit_namespace import AuditLazyFrame, AuditExpr
 __all__ = [
     "ParquetLoader",
     "CSVLoader",
+    "ExcelLoader",
+    "DataQualityChecker",
+    "create_data_quality_checker",
+    "RatingSelector",
+    "create_rating_selector",
     "HierarchyResolver",
     "create_hierarchy_resolver",
     "OutputAggregator",
     "create_output_aggregator",
+    "MovementAttributor",
+    "create_movement_attributor",
+    "ExposureExplainer",
+    "ExposureExplanation",
+    "create_exposure_explainer",
+    "SnapshotDiff",
+    "SnapshotDiffer",
+    "create_snapshot_differ",
+    "ResourceGovernor",
+    "ResourceLimits",
     "PipelineOrchestrator",
     "create_pipeline",
     "create_test_pipeline",
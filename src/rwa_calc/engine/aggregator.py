@@ -14,6 +14,7 @@ Key responsibilities:
 - Apply output floor (Basel 3.1: max(IRB RWA, 72.5% × SA RWA))
 - Track supporting factor impact (CRR only)
 - Generate summary statistics by class and approach
+- Generate per-perimeter (solo/consolidated) summaries when perimeters are supplied
 
 References:
 - CRE99.1-8: Output floor (Basel 3.1)
@@ -33,6 +34,7 @@ import polars as pl
 
 from rwa_calc.contracts.bundles import (
     AggregatedResultBundle,
+    PerimeterResultBundle,
     SAResultBundle,
     IRBResultBundle,
     SlottingResultBundle,
@@ -43,6 +45,7 @@ from rwa_calc.contracts.errors import (
     ErrorCategory,
     ErrorSeverity,
 )
+from rwa_calc.engine.key_encoding import key_dtype
 
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
@@ -126,6 +129,7 @@ class OutputAggregator:
         slotting_bundle: SlottingResultBundle | None,
         config: CalculationConfig,
         equity_bundle: EquityResultBundle | None = None,
+        perimeters: pl.LazyFrame | None = None,
     ) -> AggregatedResultBundle:
         """
         Aggregate with full audit trail.
@@ -136,6 +140,8 @@ class OutputAggregator:
             slotting_bundle: Slotting calculation results bundle
             config: Calculation configuration
             equity_bundle: Equity calculation results bundle
+            perimeters: Perimeter membership (perimeter_id, book_code) for
+                per-perimeter summaries
 
         Returns:
             AggregatedResultBundle with full audit trail
@@ -180,6 +186,13 @@ class OutputAggregator:
         summary_by_class = self._generate_summary_by_class(post_crm_detailed)
         summary_by_approach = self._generate_summary_by_approach(post_crm_detailed)
 
+        # Per-perimeter views of the same results (solo and consolidated)
+        perimeter_results = None
+        if perimeters is not None:
+            perimeter_results = self._generate_perimeter_results(
+                combined, post_crm_detailed, perimeters, config
+            )
+
         # Collect all errors
         all_errors = list(errors)
         if sa_bundle:
@@ -204,6 +217,7 @@ class OutputAggregator:
             pre_crm_summary=pre_crm_summary,
             post_crm_detailed=post_crm_detailed,
             post_crm_summary=post_crm_summary,
+            perimeter_results=perimeter_results,
             errors=all_errors,
         )
 
@@ -396,7 +410,7 @@ class OutputAggregator:
     def _create_empty_result_frame(self) -> pl.LazyFrame:
         """Create empty result frame with expected schema."""
         return pl.LazyFrame({
-            "exposure_reference": pl.Series([], dtype=pl.String),
+            "exposure_reference": pl.Series([], dtype=key_dtype()),
             "approach_applied": pl.Series([], dtype=pl.String),
             "exposure_class": pl.Series([], dtype=pl.String),
             "ead_final": pl.Series([], dtype=pl.Float64),
@@ -513,7 +527,7 @@ class OutputAggregator:
     def _create_empty_floor_impact_frame(self) -> pl.LazyFrame:
         """Create empty floor impact frame with expected schema."""
         return pl.LazyFrame({
-            "exposure_reference": pl.Series([], dtype=pl.String),
+            "exposure_reference": pl.Series([], dtype=key_dtype()),
             "approach_applied": pl.Series([], dtype=pl.String),
             "exposure_class": pl.Series([], dtype=pl.String),
             "rwa_pre_floor": pl.Series([], dtype=pl.Float64),
@@ -548,7 +562,7 @@ class OutputAggregator:
         if not (has_sf and has_pre and has_post):
             # Return empty impact frame
             return pl.LazyFrame({
-                "exposure_reference": pl.Series([], dtype=pl.String),
+                "exposure_reference": pl.Series([], dtype=key_dtype()),
                 "supporting_factor": pl.Series([], dtype=pl.Float64),
                 "rwa_pre_factor": pl.Series([], dtype=pl.Float64),
                 "rwa_post_factor": pl.Series([], dtype=pl.Float64),
@@ -581,12 +595,14 @@ class OutputAggregator:
     def _generate_summary_by_class(
         self,
         results: pl.LazyFrame,
+        by: list[str] | None = None,
     ) -> pl.LazyFrame:
         """
         Generate RWA summary by exposure class.
 
         Uses post-CRM reporting columns when available, so guaranteed
         portions are counted under the guarantor's exposure class.
+        Columns in ``by`` (e.g. perimeter_id) are prepended to the grouping.
 
         Aggregates:
         - Total EAD
@@ -633,11 +649,16 @@ class OutputAggregator:
             )
 
         # Group by exposure class
+        keys = list(by or [])
         if group_col:
-            summary = results.group_by(group_col).agg(agg_exprs)
+            summary = results.group_by([*keys, group_col]).agg(agg_exprs)
             # Normalize column name for downstream consumers
             if group_col != "exposure_class":
                 summary = summary.rename({group_col: "exposure_class"})
+        elif keys:
+            summary = results.group_by(keys).agg(agg_exprs).with_columns([
+                pl.lit("ALL").alias("exposure_class"),
+            ])
         else:
             summary = results.select(agg_exprs).with_columns([
                 pl.lit("ALL").alias("exposure_class"),
@@ -657,12 +678,14 @@ class OutputAggregator:
     def _generate_summary_by_approach(
         self,
         results: pl.LazyFrame,
+        by: list[str] | None = None,
     ) -> pl.LazyFrame:
         """
         Generate RWA summary by calculation approach.
 
         Uses post-CRM reporting columns when available, so guaranteed
         portions are counted under the guarantor's approach.
+        Columns in ``by`` (e.g. perimeter_id) are prepended to the grouping.
 
         Aggregates:
         - Total EAD
@@ -708,11 +731,16 @@ class OutputAggregator:
             )
 
         # Group by approach
+        keys = list(by or [])
         if group_col:
-            summary = results.group_by(group_col).agg(agg_exprs)
+            summary = results.group_by([*keys, group_col]).agg(agg_exprs)
             # Normalize column name for downstream consumers
             if group_col != "approach_applied":
                 summary = summary.rename({group_col: "approach_applied"})
+        elif keys:
+            summary = results.group_by(keys).agg(agg_exprs).with_columns([
+                pl.lit("ALL").alias("approach_applied"),
+            ])
         else:
             summary = results.select(agg_exprs).with_columns([
                 pl.lit("ALL").alias("approach_applied"),
@@ -810,7 +838,7 @@ class OutputAggregator:
         if not ead_col or not exposure_class_col:
             # Cannot generate detailed view without basic columns
             return pl.LazyFrame({
-                "reporting_counterparty": pl.Series([], dtype=pl.String),
+                "reporting_counterparty": pl.Series([], dtype=key_dtype()),
                 "reporting_exposure_class": pl.Series([], dtype=pl.String),
                 "reporting_ead": pl.Series([], dtype=pl.Float64),
                 "reporting_rw": pl.Series([], dtype=pl.Float64),
@@ -944,6 +972,116 @@ class OutputAggregator:
             ).len().alias("guaranteed_portions"),
         ])
 
+    # =========================================================================
+    # Private Methods - Perimeter Consolidation
+    # =========================================================================
+
+    def _generate_perimeter_results(
+        self,
+        combined: pl.LazyFrame,
+        post_crm_detailed: pl.LazyFrame,
+        perimeters: pl.LazyFrame,
+        config: CalculationConfig,
+    ) -> PerimeterResultBundle:
+        """
+        Generate solo and consolidated views from one set of results.
+
+        RWA is computed once per exposure; each perimeter view is a
+        grouping over the exposures whose booking entity belongs to it.
+        An entity in several perimeters (solo and group) contributes to
+        each of them.
+
+        Args:
+            combined: Final calculation results (one row per exposure)
+            post_crm_detailed: Post-CRM detailed view (split rows for guarantees)
+            perimeters: Perimeter membership (perimeter_id, book_code)
+            config: Calculation configuration
+
+        Returns:
+            PerimeterResultBundle keyed by perimeter_id
+        """
+        membership = perimeters.select(["perimeter_id", "book_code"]).unique()
+        tagged = self._tag_perimeters(combined, membership)
+        detailed = self._tag_perimeters(post_crm_detailed, membership)
+
+        # Floor columns only exist when the output floor was applied
+        floor_impact = None
+        if "floor_impact_rwa" in tagged.collect_schema().names():
+            floor_impact = self._generate_perimeter_floor_impact(tagged)
+
+        return PerimeterResultBundle(
+            summary_by_class=self._generate_summary_by_class(detailed, by=["perimeter_id"]),
+            summary_by_approach=self._generate_summary_by_approach(detailed, by=["perimeter_id"]),
+            lending_groups=self._generate_perimeter_lending_groups(tagged, config),
+            floor_impact=floor_impact,
+        )
+
+    def _tag_perimeters(
+        self,
+        results: pl.LazyFrame,
+        membership: pl.LazyFrame,
+    ) -> pl.LazyFrame:
+        """
+        One row per (row, perimeter) for every perimeter containing the row's book.
+
+        Rows whose book_code is in no perimeter are dropped. The membership
+        table is small, so the join is a broadcast of a few keys.
+        """
+        if "book_code" not in results.collect_schema().names():
+            return results.with_columns(
+                pl.lit(None).cast(pl.String).alias("perimeter_id"),
+            ).head(0)
+        return results.join(membership, on="book_code", how="inner")
+
+    def _generate_perimeter_floor_impact(self, tagged: pl.LazyFrame) -> pl.LazyFrame:
+        """Output floor impact totals per perimeter (IRB exposures only)."""
+        return tagged.filter(
+            pl.col("approach_applied").is_in(["FIRB", "AIRB", "IRB"])
+        ).group_by("perimeter_id").agg([
+            pl.col("rwa_pre_floor").sum().alias("total_rwa_pre_floor"),
+            pl.col("floor_rwa").sum().alias("total_floor_rwa"),
+            pl.col("floor_impact_rwa").sum().alias("total_floor_impact"),
+            pl.col("rwa_final").sum().alias("total_rwa_post_floor"),
+            pl.col("is_floor_binding").sum().cast(pl.UInt32).alias("floor_binding_count"),
+            pl.len().alias("exposure_count"),
+        ])
+
+    def _generate_perimeter_lending_groups(
+        self,
+        tagged: pl.LazyFrame,
+        config: CalculationConfig,
+    ) -> pl.LazyFrame:
+        """
+        Retail threshold totals per perimeter and lending group.
+
+        Sums each exposure's threshold contribution (residential property
+        already excluded by the hierarchy resolver) over the group members
+        booked inside the perimeter, and flags totals above the retail
+        threshold. Classification itself uses the consolidated total.
+        """
+        cols = tagged.collect_schema().names()
+        if "lending_group_reference" not in cols or "exposure_for_retail_threshold" not in cols:
+            return pl.LazyFrame({
+                "perimeter_id": pl.Series([], dtype=pl.String),
+                "lending_group_reference": pl.Series([], dtype=key_dtype()),
+                "lending_group_adjusted_exposure": pl.Series([], dtype=pl.Float64),
+                "exposure_count": pl.Series([], dtype=pl.UInt32),
+                "exceeds_retail_threshold": pl.Series([], dtype=pl.Boolean),
+            })
+
+        max_retail_exposure = float(config.retail_thresholds.max_exposure_threshold)
+
+        return tagged.filter(
+            pl.col("lending_group_reference").is_not_null()
+        ).group_by(["perimeter_id", "lending_group_reference"]).agg([
+            pl.col("exposure_for_retail_threshold").fill_null(0.0).sum()
+            .alias("lending_group_adjusted_exposure"),
+            pl.len().alias("exposure_count"),
+        ]).with_columns([
+            (pl.col("lending_group_adjusted_exposure") > max_retail_exposure)
+            .alias("exceeds_retail_threshold"),
+        ])
+
 
 # =============================================================================
 # Factory Function
@@ -0,0 +1,376 @@
+"""
+RWA movement attribution between two calculation runs.
+
+Explains the change in RWA between a prior and a current run by
+hash-joining the two results frames on exposure_reference and running a
+sequential-substitution waterfall, one driver at a time:
+
+    prior RWA
+      -> fx               (EAD re-translated at the current FX rate)
+      -> volume           (gross EAD change, ead_pre_crm)
+      -> crm              (ead_pre_crm -> ead_final)
+      -> rating_migration (SA: CQS risk weight; IRB: PD)
+      -> lgd              (IRB only)
+      -> other            (residual: maturity, classification, guarantees,
+                           supporting factors, floors, config)
+    = current RWA
+
+Exposures present in only one run are attributed to new_business or
+runoff; exposures whose approach changed are attributed to methodology.
+Driver columns always sum to rwa_movement.
+
+SA risk weights and IRB K are recomputed with the existing lf.sa and
+lf.irb namespace methods, holding every other attribute at its prior
+value. Everything stays lazy, so results can be streamed to Parquet with
+sink_parquet at any portfolio size.
+
+Classes:
+    MovementAttributor: Attribute RWA movements between two runs
+
+Usage:
+    from rwa_calc.engine.attribution import MovementAttributor
+
+    movements = MovementAttributor().attribute(prior, current, config)
+    movements.class_movements.collect()
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+import rwa_calc.engine.irb.namespace  # noqa: F401
+import rwa_calc.engine.sa.namespace  # noqa: F401
+from rwa_calc.contracts.bundles import AggregatedResultBundle, RWAMovementBundle
+from rwa_calc.domain.enums import ApproachType
+
+if TYPE_CHECKING:
+    from rwa_calc.contracts.config import CalculationConfig
+
+ResultsSource = AggregatedResultBundle | pl.LazyFrame | pl.DataFrame | str | Path
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Movement drivers, in waterfall order
+MOVEMENT_DRIVERS: tuple[str, ...] = (
+    "new_business",
+    "runoff",
+    "methodology",
+    "fx",
+    "volume",
+    "crm",
+    "rating_migration",
+    "lgd",
+    "other",
+)
+
+# Results columns read from each run (missing columns become typed nulls)
+ATTRIBUTION_COLUMNS: dict[str, pl.DataType] = {
+    "approach_applied": pl.String,
+    "exposure_class": pl.String,
+    "original_currency": pl.String,
+    "fx_rate_applied": pl.Float64,
+    "ead_pre_crm": pl.Float64,
+    "ead_final": pl.Float64,
+    "risk_weight": pl.Float64,
+    "rwa_final": pl.Float64,
+    "is_defaulted": pl.Boolean,
+    # SA risk weight drivers
+    "cqs": pl.Int8,
+    "ltv": pl.Float64,
+    "has_income_cover": pl.Boolean,
+    "cp_is_managed_as_retail": pl.Boolean,
+    # IRB risk weight drivers
+    "pd_floored": pl.Float64,
+    "lgd_floored": pl.Float64,
+    "maturity": pl.Float64,
+    "turnover_m": pl.Float64,
+    "requires_fi_scalar": pl.Boolean,
+}
+
+_SA_APPROACHES = ["SA"]
+_IRB_APPROACHES = [ApproachType.FIRB.value, ApproachType.AIRB.value]
+
+
+class MovementAttributor:
+    """
+    Attribute RWA movements between a prior and a current run.
+
+    Inputs may be AggregatedResultBundles, results frames, or paths to
+    results Parquet exports (scanned lazily). Results must have one row
+    per exposure_reference.
+    """
+
+    def attribute(
+        self,
+        prior: ResultsSource,
+        current: ResultsSource,
+        config: CalculationConfig,
+    ) -> RWAMovementBundle:
+        """
+        Attribute the RWA movement between two runs.
+
+        Args:
+            prior: Prior period results
+            current: Current period results
+            config: Current period configuration (used to recompute
+                SA risk weights and IRB K)
+
+        Returns:
+            RWAMovementBundle with per-exposure and per-class movements
+        """
+        joined = self._project(self._results(prior), "_prior").join(
+            self._project(self._results(current), "_current"),
+            on="exposure_reference",
+            how="full",
+            coalesce=True,
+        )
+
+        joined = self._add_sa_risk_weight(joined, "cqs_prior", "_sa_rw_prior", config)
+        joined = self._add_sa_risk_weight(joined, "cqs_current", "_sa_rw_rating", config)
+        joined = self._add_irb_risk_weight(joined, "pd_prior", "lgd_prior", "_irb_rw_prior", config)
+        joined = self._add_irb_risk_weight(joined, "pd_current", "lgd_prior", "_irb_rw_rating", config)
+        joined = self._add_irb_risk_weight(joined, "pd_current", "lgd_current", "_irb_rw_lgd", config)
+
+        exposure_movements = self._waterfall(joined)
+
+        return RWAMovementBundle(
+            exposure_movements=exposure_movements,
+            class_movements=self._summarise_by_class(exposure_movements),
+            drivers=MOVEMENT_DRIVERS,
+        )
+
+    # =========================================================================
+    # Private Methods - Inputs
+    # =========================================================================
+
+    def _results(self, source: ResultsSource) -> pl.LazyFrame:
+        """Resolve a results source to a LazyFrame."""
+        if isinstance(source, AggregatedResultBundle):
+            return source.results
+        if isinstance(source, pl.DataFrame):
+            return source.lazy()
+        if isinstance(source, (str, Path)):
+            return pl.scan_parquet(source)
+        return source
+
+    def _project(self, results: pl.LazyFrame, suffix: str) -> pl.LazyFrame:
+        """Select the attribution columns, suffixed, with typed nulls for gaps."""
+        available = set(results.collect_schema().names())
+        renames = {"pd_floored": "pd", "lgd_floored": "lgd"}
+
+        exprs = [pl.col("exposure_reference"), pl.lit(True).alias(f"_present{suffix}")]
+        for name, dtype in ATTRIBUTION_COLUMNS.items():
+            expr = pl.col(name).cast(dtype) if name in available else pl.lit(None, dtype=dtype)
+            exprs.append(expr.alias(f"{renames.get(name, name)}{suffix}"))
+
+        return results.select(exprs)
+
+    # =========================================================================
+    # Private Methods - Risk Weight Recalculation
+    # =========================================================================
+
+    def _add_sa_risk_weight(
+        self,
+        lf: pl.LazyFrame,
+        cqs_col: str,
+        alias: str,
+        config: CalculationConfig,
+    ) -> pl.LazyFrame:
+        """SA risk weight for prior attributes with the given CQS."""
+        scratch = {
+            "exposure_class": pl.col("exposure_class_prior"),
+            "cqs": pl.col(cqs_col),
+            "ltv": pl.col("ltv_prior"),
+            "has_income_cover": pl.col("has_income_cover_prior"),
+            "cp_is_managed_as_retail": pl.col("cp_is_managed_as_retail_prior"),
+        }
+        return (
+            lf.with_columns(**scratch)
+            .sa.apply_risk_weights(config)
+            .rename({"risk_weight": alias})
+            .drop(list(scratch))
+        )
+
+    def _add_irb_risk_weight(
+        self,
+        lf: pl.LazyFrame,
+        pd_col: str,
+        lgd_col: str,
+        alias: str,
+        config: CalculationConfig,
+    ) -> pl.LazyFrame:
+        """IRB risk weight (K x 12.5 x scaling x MA) for prior attributes with the given PD/LGD."""
+        scratch = {
+            "pd_floored": pl.col(pd_col),
+            "lgd_floored": pl.col(lgd_col),
+            "exposure_class": pl.col("exposure_class_prior"),
+            "maturity": pl.col("maturity_prior").fill_null(2.5),
+            "turnover_m": pl.col("turnover_m_prior"),
+            "requires_fi_scalar": pl.col("requires_fi_scalar_prior"),
+            "ead_final": pl.lit(1.0),
+        }
+        return (
+            lf.with_columns(**scratch)
+            .irb.calculate_correlation(config)
+            .irb.calculate_k(config)
+            .irb.calculate_maturity_adjustment(config)
+            .irb.calculate_rwa(config)
+            .rename({"risk_weight": alias})
+            .drop([*scratch, "correlation", "k", "maturity_adjustment", "scaling_factor", "rwa"])
+        )
+
+    # =========================================================================
+    # Private Methods - Waterfall
+    # =========================================================================
+
+    def _waterfall(self, joined: pl.LazyFrame) -> pl.LazyFrame:
+        """Run the sequential-substitution waterfall per exposure."""
+        in_prior = pl.col("_present_prior").fill_null(False)
+        in_current = pl.col("_present_current").fill_null(False)
+        approach_prior = pl.col("approach_applied_prior")
+        approach_current = pl.col("approach_applied_current")
+
+        ead_prior = pl.col("ead_final_prior").fill_null(0.0)
+        ead_current = pl.col("ead_final_current").fill_null(0.0)
+        rwa_prior = pl.col("rwa_final_prior").fill_null(0.0)
+        rwa_current = pl.col("rwa_final_current").fill_null(0.0)
+        gross_prior = pl.col("ead_pre_crm_prior").fill_null(0.0)
+        gross_current = pl.col("ead_pre_crm_current").fill_null(0.0)
+
+        # Effective (all-in) risk weights
+        rw_prior = (
+            pl.when(ead_prior != 0.0).then(rwa_prior / ead_prior)
+            .otherwise(pl.col("risk_weight_prior").fill_nan(0.0).fill_null(0.0))
+        )
+        rw_current = (
+            pl.when(ead_current != 0.0).then(rwa_current / ead_current)
+            .otherwise(pl.col("risk_weight_current").fill_nan(0.0).fill_null(0.0))
+        )
+
+        # Step 1: FX - re-translate prior EAD at the current rate
+        fx_ratio = (
+            pl.when(
+                (pl.col("original_currency_prior") == pl.col("original_currency_current"))
+                & (pl.col("fx_rate_applied_prior") > 0.0)
+                & pl.col("fx_rate_applied_current").is_not_null()
+            )
+            .then(pl.col("fx_rate_applied_current") / pl.col("fx_rate_applied_prior"))
+            .otherwise(pl.lit(1.0))
+        )
+        ead_fx = ead_prior * fx_ratio
+        gross_fx = gross_prior * fx_ratio
+
+        # Step 2: volume - scale EAD with gross EAD, holding the CRM ratio
+        ead_volume = (
+            pl.when(gross_fx != 0.0).then(ead_fx * gross_current / gross_fx)
+            .otherwise(ead_current)
+        )
+
+        # Steps 4-5: risk weight deltas from recomputed SA/IRB risk weights
+        is_sa = approach_prior.is_in(_SA_APPROACHES)
+        is_irb = approach_prior.is_in(_IRB_APPROACHES)
+        any_default = (
+            pl.col("is_defaulted_prior").fill_null(False)
+            | pl.col("is_defaulted_current").fill_null(False)
+        )
+        rating_delta = (
+            # Default in either period: the whole risk weight change is migration
+            pl.when(any_default).then(rw_current - rw_prior)
+            .when(is_sa).then(pl.col("_sa_rw_rating") - pl.col("_sa_rw_prior"))
+            .when(is_irb).then(pl.col("_irb_rw_rating") - pl.col("_irb_rw_prior"))
+            .otherwise(pl.lit(0.0))
+            .fill_nan(0.0)
+            .fill_null(0.0)
+        )
+        lgd_delta = (
+            pl.when(is_irb & ~any_default)
+            .then(pl.col("_irb_rw_lgd") - pl.col("_irb_rw_rating"))
+            .otherwise(pl.lit(0.0))
+            .fill_nan(0.0)
+            .fill_null(0.0)
+        )
+
+        rwa_fx = ead_fx * rw_prior
+        rwa_volume = ead_volume * rw_prior
+        rwa_crm = ead_current * rw_prior
+        rwa_rating = rwa_crm + ead_current * rating_delta
+        rwa_lgd = rwa_rating + ead_current * lgd_delta
+
+        existing = in_prior & in_current & (approach_prior == approach_current)
+        movement_type = (
+            pl.when(~in_prior).then(pl.lit("new_business"))
+            .when(~in_current).then(pl.lit("runoff"))
+            .when(~existing).then(pl.lit("methodology"))
+            .otherwise(pl.lit("existing"))
+        )
+
+        def on_existing(expr: pl.Expr) -> pl.Expr:
+            return pl.when(existing).then(expr.fill_nan(0.0).fill_null(0.0)).otherwise(pl.lit(0.0))
+
+        result = joined.with_columns([
+            pl.coalesce("exposure_class_current", "exposure_class_prior").alias("exposure_class"),
+            pl.coalesce("approach_applied_current", "approach_applied_prior").alias("approach_applied"),
+            movement_type.alias("movement_type"),
+            rwa_prior.alias("rwa_prior"),
+            rwa_current.alias("rwa_current"),
+            (rwa_current - rwa_prior).alias("rwa_movement"),
+            pl.when(~in_prior).then(rwa_current).otherwise(pl.lit(0.0)).alias("new_business"),
+            pl.when(~in_current).then(-rwa_prior).otherwise(pl.lit(0.0)).alias("runoff"),
+            pl.when(in_prior & in_current & ~existing)
+            .then(rwa_current - rwa_prior)
+            .otherwise(pl.lit(0.0))
+            .alias("methodology"),
+            on_existing(rwa_fx - rwa_prior).alias("fx"),
+            on_existing(rwa_volume - rwa_fx).alias("volume"),
+            on_existing(rwa_crm - rwa_volume).alias("crm"),
+            on_existing(rwa_rating - rwa_crm).alias("rating_migration"),
+            on_existing(rwa_lgd - rwa_rating).alias("lgd"),
+        ])
+
+        # Residual keeps the drivers reconciled to the total movement
+        explained = pl.sum_horizontal([d for d in MOVEMENT_DRIVERS if d != "other"])
+        result = result.with_columns((pl.col("rwa_movement") - explained).alias("other"))
+
+        return result.select([
+            "exposure_reference",
+            "exposure_class",
+            "approach_applied",
+            "movement_type",
+            pl.col("ead_final_prior").alias("ead_prior"),
+            pl.col("ead_final_current").alias("ead_current"),
+            "rwa_prior",
+            "rwa_current",
+            "rwa_movement",
+            *MOVEMENT_DRIVERS,
+        ])
+
+    def _summarise_by_class(self, exposure_movements: pl.LazyFrame) -> pl.LazyFrame:
+        """Sum movement drivers by exposure class."""
+        return (
+            exposure_movements
+            .group_by("exposure_class")
+            .agg([
+                pl.len().alias("exposure_count"),
+                pl.col("rwa_prior").sum(),
+                pl.col("rwa_current").sum(),
+                pl.col("rwa_movement").sum(),
+                *[pl.col(d).sum() for d in MOVEMENT_DRIVERS],
+            ])
+            .sort("exposure_class", nulls_last=True)
+        )
+
+
+def create_movement_attributor() -> MovementAttributor:
+    """
+    Create a MovementAttributor instance.
+
+    Returns:
+        MovementAttributor ready for use
+    """
+    return MovementAttributor()
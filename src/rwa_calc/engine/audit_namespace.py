@@ -6,6 +6,14 @@ Provides shared formatting utilities and audit trail builders:
 - `expr.audit.format_percent(decimals)` - Format as percentage
 - `lf.audit.build_sa_calculation()` - Build SA audit string
 - `lf.audit.build_irb_calculation()` - Build IRB audit string
+- `lf.audit.build_classification_reason()` - Build classification audit string
+- `lf.audit.build_ccf_calculation()` - Build CCF audit string
+- `lf.audit.render(exposure_references)` - Render all audit strings on demand
+
+With CalculationConfig(audit_mode="numeric") the pipeline keeps only the
+numeric components; `render` rebuilds the strings for the rows asked for:
+
+    trail = results.audit.render(["EXP001", "EXP002"]).collect()
 
 Usage:
     import polars as pl
@@ -29,6 +37,8 @@ from __future__ import annotations
 
 import polars as pl
 
+from rwa_calc.domain.enums import ApproachType
+
 
 # =============================================================================
 # EXPRESSION NAMESPACE
@@ -125,6 +135,142 @@ class AuditLazyFrame:
     def __init__(self, lf: pl.LazyFrame) -> None:
         self._lf = lf
 
+    def build_classification_reason(self) -> pl.LazyFrame:
+        """
+        Build classification audit trail.
+
+        Format: entity_type={type}; exp_class_sa={sa}; exp_class_irb={irb}; is_sme={flag}; ...
+
+        Returns:
+            LazyFrame with classification_reason column
+        """
+        return self._lf.with_columns([
+            pl.concat_str([
+                pl.lit("entity_type="),
+                pl.col("cp_entity_type").fill_null("unknown"),
+                pl.lit("; exp_class_sa="),
+                pl.col("exposure_class_sa").fill_null("unknown"),
+                pl.lit("; exp_class_irb="),
+                pl.col("exposure_class_irb").fill_null("unknown"),
+                pl.lit("; is_sme="),
+                pl.col("is_sme").cast(pl.String),
+                pl.lit("; is_mortgage="),
+                pl.col("is_mortgage").cast(pl.String),
+                pl.lit("; is_defaulted="),
+                pl.col("is_defaulted").cast(pl.String),
+                pl.lit("; is_infrastructure="),
+                pl.col("is_infrastructure").cast(pl.String),
+                pl.lit("; requires_fi_scalar="),
+                pl.col("requires_fi_scalar").cast(pl.String),
+                pl.lit("; qualifies_as_retail="),
+                pl.col("qualifies_as_retail").cast(pl.String),
+                pl.lit("; reclassified_to_retail="),
+                pl.col("reclassified_to_retail").cast(pl.String),
+            ]).alias("classification_reason"),
+        ])
+
+    def build_ccf_calculation(self) -> pl.LazyFrame:
+        """
+        Build CCF audit trail.
+
+        Format: CCF={ccf}%; risk_type={rt}; drawn={drawn}; interest={int}; nominal={nom}; ead_ccf={ead}
+
+        The risk_type, drawn and interest parts are included only when the
+        risk_type / interest columns are present.
+
+        Returns:
+            LazyFrame with ccf_calculation column
+        """
+        cols = self._lf.collect_schema().names()
+
+        parts = [
+            pl.lit("CCF="),
+            (pl.col("ccf") * 100).round(0).cast(pl.String),
+            pl.lit("%"),
+        ]
+        if "risk_type" in cols:
+            parts += [pl.lit("; risk_type="), pl.col("risk_type").fill_null("unknown")]
+        if "interest" in cols:
+            parts += [
+                pl.lit("; drawn="),
+                pl.col("drawn_amount").round(0).cast(pl.String),
+                pl.lit("; interest="),
+                pl.col("interest").fill_null(0.0).round(0).cast(pl.String),
+            ]
+        parts += [
+            pl.lit("; nominal="),
+            pl.col("nominal_amount").round(0).cast(pl.String),
+            pl.lit("; ead_ccf="),
+            pl.col("ead_from_ccf").round(0).cast(pl.String),
+        ]
+
+        return self._lf.with_columns([pl.concat_str(parts).alias("ccf_calculation")])
+
+    def render(self, exposure_references: list[str] | None = None) -> pl.LazyFrame:
+        """
+        Render audit strings on demand for selected exposures.
+
+        Filters to the requested exposure references first, then adds every
+        audit string whose inputs are present and which is not already there.
+        Used with audit_mode="numeric" so only the rows being inspected pay
+        the cost of string formatting. On combined results the SA, IRB and
+        slotting strings are set only on rows of the matching approach.
+
+        Args:
+            exposure_references: Exposures to render (None renders all rows)
+
+        Returns:
+            LazyFrame with the applicable *_calculation / classification_reason columns
+        """
+        lf = self._lf
+        if exposure_references is not None:
+            lf = lf.filter(pl.col("exposure_reference").is_in(exposure_references))
+
+        cols = set(lf.collect_schema().names())
+        sa = [ApproachType.SA.value]
+        irb = [ApproachType.FIRB.value, ApproachType.AIRB.value]
+        slotting = [ApproachType.SLOTTING.value]
+        builders = [
+            ("classification_reason", AuditLazyFrame.build_classification_reason, None, {
+                "cp_entity_type", "exposure_class_sa", "exposure_class_irb", "is_sme",
+                "is_mortgage", "is_defaulted", "is_infrastructure", "requires_fi_scalar",
+                "qualifies_as_retail", "reclassified_to_retail",
+            }),
+            ("ccf_calculation", AuditLazyFrame.build_ccf_calculation, None, {
+                "ccf", "nominal_amount", "ead_from_ccf",
+            }),
+            ("crm_calculation", AuditLazyFrame.build_crm_calculation, None, {"ead_final"}),
+            ("haircut_calculation", AuditLazyFrame.build_haircut_calculation, None, {
+                "market_value", "collateral_haircut", "fx_haircut", "value_after_haircut",
+            }),
+            ("sa_calculation", AuditLazyFrame.build_sa_calculation, sa, {
+                "risk_weight", "rwa_pre_factor",
+            }),
+            ("irb_calculation", AuditLazyFrame.build_irb_calculation, irb, {
+                "pd_floored", "lgd_floored", "rwa",
+            }),
+            ("slotting_calculation", AuditLazyFrame.build_slotting_calculation, slotting, {
+                "slotting_category", "is_hvcre", "risk_weight", "rwa",
+            }),
+            ("floor_calculation", AuditLazyFrame.build_floor_calculation, None, {
+                "floor_rwa", "rwa_pre_floor", "output_floor_pct", "rwa_final",
+                "is_floor_binding",
+            }),
+        ]
+        for output, build, approaches, required in builders:
+            if output in cols or not required <= cols:
+                continue
+            lf = build(AuditLazyFrame(lf))
+            if approaches is not None and "approach" in cols:
+                lf = lf.with_columns(
+                    pl.when(pl.col("approach").is_in(approaches))
+                    .then(pl.col(output))
+                    .alias(output)
+                )
+            cols.add(output)
+
+        return lf
+
     def build_sa_calculation(self) -> pl.LazyFrame:
         """
         Build SA calculation audit trail.
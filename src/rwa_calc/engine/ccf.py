@@ -25,6 +25,8 @@ from typing import TYPE_CHECKING
 
 import polars as pl
 
+# Import namespace to ensure it's registered
+import rwa_calc.engine.audit_namespace  # noqa: F401
 from rwa_calc.domain.enums import ApproachType
 
 if TYPE_CHECKING:
@@ -263,62 +265,8 @@ class CCFCalculator:
             ])
 
         # Add CCF audit trail
-        if has_risk_type and has_interest:
-            exposures = exposures.with_columns([
-                pl.concat_str([
-                    pl.lit("CCF="),
-                    (pl.col("ccf") * 100).round(0).cast(pl.String),
-                    pl.lit("%; risk_type="),
-                    pl.col("risk_type").fill_null("unknown"),
-                    pl.lit("; drawn="),
-                    pl.col("drawn_amount").round(0).cast(pl.String),
-                    pl.lit("; interest="),
-                    pl.col("interest").fill_null(0.0).round(0).cast(pl.String),
-                    pl.lit("; nominal="),
-                    pl.col("nominal_amount").round(0).cast(pl.String),
-                    pl.lit("; ead_ccf="),
-                    pl.col("ead_from_ccf").round(0).cast(pl.String),
-                ]).alias("ccf_calculation"),
-            ])
-        elif has_risk_type:
-            exposures = exposures.with_columns([
-                pl.concat_str([
-                    pl.lit("CCF="),
-                    (pl.col("ccf") * 100).round(0).cast(pl.String),
-                    pl.lit("%; risk_type="),
-                    pl.col("risk_type").fill_null("unknown"),
-                    pl.lit("; nominal="),
-                    pl.col("nominal_amount").round(0).cast(pl.String),
-                    pl.lit("; ead_ccf="),
-                    pl.col("ead_from_ccf").round(0).cast(pl.String),
-                ]).alias("ccf_calculation"),
-            ])
-        elif has_interest:
-            exposures = exposures.with_columns([
-                pl.concat_str([
-                    pl.lit("CCF="),
-                    (pl.col("ccf") * 100).round(0).cast(pl.String),
-                    pl.lit("%; drawn="),
-                    pl.col("drawn_amount").round(0).cast(pl.String),
-                    pl.lit("; interest="),
-                    pl.col("interest").fill_null(0.0).round(0).cast(pl.String),
-                    pl.lit("; nominal="),
-                    pl.col("nominal_amount").round(0).cast(pl.String),
-                    pl.lit("; ead_ccf="),
-                    pl.col("ead_from_ccf").round(0).cast(pl.String),
-                ]).alias("ccf_calculation"),
-            ])
-        else:
-            exposures = exposures.with_columns([
-                pl.concat_str([
-                    pl.lit("CCF="),
-                    (pl.col("ccf") * 100).round(0).cast(pl.String),
-                    pl.lit("%; nominal="),
-                    pl.col("nominal_amount").round(0).cast(pl.String),
-                    pl.lit("; ead_ccf="),
-                    pl.col("ead_from_ccf").round(0).cast(pl.String),
-                ]).alias("ccf_calculation"),
-            ])
+        if config.audit_strings:
+            exposures = exposures.audit.build_ccf_calculation()
 
         # Clean up temporary columns
         temp_columns = [
@@ -8,9 +8,17 @@ Classifies exposures by exposure class and calculation approach:
 - Identifies defaulted exposures
 - Splits exposures by approach for downstream calculators
 
+Classification is driven by decision tables (small frames derived from
+the entity type mappings and the IRB permissions) joined onto exposures,
+rather than by per-row when/then chains.
+
 Classes:
     ExposureClassifier: Main classifier implementing ClassifierProtocol
 
+Functions:
+    entity_type_table: entity_type -> exposure classes and FSE flag
+    approach_table: (exposure_class, retail-without-LGD flag) -> approach
+
 Usage:
     from rwa_calc.engine.classifier import ExposureClassifier
 
@@ -22,6 +30,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from decimal import Decimal
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 import polars as pl
@@ -30,6 +39,7 @@ from rwa_calc.contracts.bundles import (
     ClassifiedExposuresBundle,
     ResolvedHierarchyBundle,
 )
+from rwa_calc.contracts.columns import CLASSIFIED_COLUMNS
 from rwa_calc.config.fx_rates import CRR_REGULATORY_THRESHOLDS_EUR
 from rwa_calc.domain.enums import (
     ApproachType,
@@ -37,6 +47,11 @@ from rwa_calc.domain.enums import (
     SlottingCategory,
     SpecialisedLendingType,
 )
+from rwa_calc.engine.key_encoding import with_key_text
+from rwa_calc.engine.resources import materialise
+
+# Import namespace to ensure it's registered
+import rwa_calc.engine.audit_namespace  # noqa: F401
 
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
@@ -104,6 +119,116 @@ FINANCIAL_SECTOR_ENTITY_TYPES: set[str] = {
     "rgla_institution",  # RGLA treated as institution = financial sector
 }
 
+# Product types treated as mortgages / infrastructure lending (case-insensitive)
+MORTGAGE_PRODUCT_PATTERN = "(?i)MORTGAGE|HOME_LOAN"
+INFRASTRUCTURE_PRODUCT_PATTERN = "(?i)INFRASTRUCTURE"
+
+# Exposure classes eligible for each approach (subject to permissions)
+RETAIL_CLASSES: tuple[ExposureClass, ...] = (
+    ExposureClass.RETAIL_MORTGAGE,
+    ExposureClass.RETAIL_OTHER,
+    ExposureClass.RETAIL_QRRE,
+)
+CORPORATE_CLASSES: tuple[ExposureClass, ...] = (
+    ExposureClass.CORPORATE,
+    ExposureClass.CORPORATE_SME,
+)
+FIRB_CLASSES: tuple[ExposureClass, ...] = CORPORATE_CLASSES + (
+    ExposureClass.INSTITUTION,
+    ExposureClass.CENTRAL_GOVT_CENTRAL_BANK,
+)
+AIRB_CLASSES: tuple[ExposureClass, ...] = FIRB_CLASSES + RETAIL_CLASSES
+
+
+# =============================================================================
+# DECISION TABLES
+# =============================================================================
+
+
+@lru_cache(maxsize=1)
+def entity_type_table() -> pl.DataFrame:
+    """
+    Decision table from entity_type to exposure classes.
+
+    Built once from ENTITY_TYPE_TO_SA_CLASS, ENTITY_TYPE_TO_IRB_CLASS and
+    FINANCIAL_SECTOR_ENTITY_TYPES. Entity types not in the table are
+    classified as OTHER.
+
+    Returns:
+        DataFrame keyed by cp_entity_type with exposure_class_sa,
+        exposure_class_irb and is_financial_sector_entity
+    """
+    entity_types = sorted(ENTITY_TYPE_TO_SA_CLASS.keys() | ENTITY_TYPE_TO_IRB_CLASS.keys())
+    other = ExposureClass.OTHER.value
+    return pl.DataFrame({
+        "cp_entity_type": entity_types,
+        "exposure_class_sa": [ENTITY_TYPE_TO_SA_CLASS.get(e, other) for e in entity_types],
+        "exposure_class_irb": [ENTITY_TYPE_TO_IRB_CLASS.get(e, other) for e in entity_types],
+        "is_financial_sector_entity": [e in FINANCIAL_SECTOR_ENTITY_TYPES for e in entity_types],
+    })
+
+
+def approach_table(config: CalculationConfig) -> pl.DataFrame:
+    """
+    Decision table from exposure class and retail flag to approach.
+
+    One row per exposure class and value of retail_without_lgd (managed
+    as retail and below the retail threshold, but without an internal
+    LGD). Precedence, highest first:
+    1. Retail-managed without internal LGD -> SA
+    2. Specialised lending -> A-IRB if permitted for SL, else slotting if permitted
+    3. Retail and corporate classes -> A-IRB if permitted for the class
+    4. Corporate, institution and sovereign -> F-IRB if permitted for the class
+    5. Otherwise SA
+
+    Args:
+        config: Calculation configuration (IRB permissions)
+
+    Returns:
+        DataFrame keyed by (exposure_class, retail_without_lgd) with
+        firb_permitted, airb_permitted and approach
+    """
+    permissions = config.irb_permissions
+    sl_airb = permissions.is_permitted(ExposureClass.SPECIALISED_LENDING, ApproachType.AIRB)
+    sl_slotting = permissions.is_permitted(
+        ExposureClass.SPECIALISED_LENDING, ApproachType.SLOTTING
+    )
+
+    rows: list[tuple[str, bool, bool, bool, str]] = []
+    for exposure_class in ExposureClass:
+        firb = exposure_class in FIRB_CLASSES and permissions.is_permitted(
+            exposure_class, ApproachType.FIRB
+        )
+        airb = exposure_class in AIRB_CLASSES and permissions.is_permitted(
+            exposure_class, ApproachType.AIRB
+        )
+
+        if exposure_class == ExposureClass.SPECIALISED_LENDING and sl_airb:
+            approach = ApproachType.AIRB
+        elif exposure_class == ExposureClass.SPECIALISED_LENDING and sl_slotting:
+            approach = ApproachType.SLOTTING
+        elif exposure_class in RETAIL_CLASSES + CORPORATE_CLASSES and airb:
+            approach = ApproachType.AIRB
+        elif firb:
+            approach = ApproachType.FIRB
+        else:
+            approach = ApproachType.SA
+
+        rows.append((exposure_class.value, False, firb, airb, approach.value))
+        rows.append((exposure_class.value, True, firb, airb, ApproachType.SA.value))
+
+    return pl.DataFrame(
+        rows,
+        schema={
+            "exposure_class": pl.String,
+            "retail_without_lgd": pl.Boolean,
+            "firb_permitted": pl.Boolean,
+            "airb_permitted": pl.Boolean,
+            "approach": pl.String,
+        },
+        orient="row",
+    )
+
 
 @dataclass
 class ClassificationError:
@@ -199,7 +324,8 @@ class ExposureClassifier:
         classified = self._clear_lgd_for_firb(classified)
 
         # Step 7: Add classification audit trail
-        classified = self._add_classification_audit(classified)
+        if config.audit_strings:
+            classified = classified.audit.build_classification_reason()
 
         # Step 7a: Enrich slotting exposures with slotting metadata
         # This must happen before splitting so metadata flows through CRM processor
@@ -207,7 +333,10 @@ class ExposureClassifier:
 
         # Strategic collect to materialize all classification processing
         # This breaks up the complex query plan for better downstream performance
-        classified = classified.collect().lazy()
+        # Intermediate columns outside the stage contract are dropped first
+        # Runs over the memory budget spill to an IPC file instead (see materialise)
+        classified = CLASSIFIED_COLUMNS.prune(classified, config)
+        classified = materialise(classified, config, "classified")
 
         # Step 8: Split by approach
         sa_exposures = self._filter_by_approach(classified, ApproachType.SA)
@@ -215,7 +344,9 @@ class ExposureClassifier:
         slotting_exposures = self._filter_by_approach(classified, ApproachType.SLOTTING)
 
         # Build classification audit
-        classification_audit = self._build_audit_trail(classified)
+        classification_audit = (
+            self._build_audit_trail(classified) if config.audit_trail else None
+        )
 
         return ClassifiedExposuresBundle(
             all_exposures=classified,
@@ -275,31 +406,28 @@ class ExposureClassifier:
         """
         Determine exposure class based on entity_type.
 
-        Uses direct mapping from entity_type to exposure class via
-        ENTITY_TYPE_TO_SA_CLASS and ENTITY_TYPE_TO_IRB_CLASS constants.
+        Joins entity_type_table() on cp_entity_type, so all class lookups
+        are a single hash join against a table of a few dozen rows.
 
         Sets:
         - exposure_class: SA exposure class (for SA RW lookup, backwards compat)
         - exposure_class_sa: SA exposure class (explicit)
         - exposure_class_irb: IRB exposure class (for IRB formula selection)
+        - is_financial_sector_entity: Entity type is in FINANCIAL_SECTOR_ENTITY_TYPES
         """
-        return exposures.with_columns([
-            # SA exposure class (used for SA risk weight lookup)
-            pl.col("cp_entity_type")
-            .replace_strict(ENTITY_TYPE_TO_SA_CLASS, default=ExposureClass.OTHER.value)
-            .alias("exposure_class_sa"),
-
-            # IRB exposure class (used for IRB formula selection)
+        return exposures.join(
+            entity_type_table().lazy(),
+            on="cp_entity_type",
+            how="left",
+        ).with_columns([
             # Note: PSE/RGLA map to sovereign or institution based on entity_type suffix
             # MDB/international_org map to sovereign for IRB
-            pl.col("cp_entity_type")
-            .replace_strict(ENTITY_TYPE_TO_IRB_CLASS, default=ExposureClass.OTHER.value)
-            .alias("exposure_class_irb"),
-
+            pl.col("exposure_class_sa").fill_null(ExposureClass.OTHER.value),
+            pl.col("exposure_class_irb").fill_null(ExposureClass.OTHER.value),
+            pl.col("is_financial_sector_entity").fill_null(False),
+        ]).with_columns([
             # Unified exposure_class (SA class for backwards compatibility)
-            pl.col("cp_entity_type")
-            .replace_strict(ENTITY_TYPE_TO_SA_CLASS, default=ExposureClass.OTHER.value)
-            .alias("exposure_class"),
+            pl.col("exposure_class_sa").alias("exposure_class"),
         ])
 
     def _apply_sme_classification(
@@ -323,20 +451,15 @@ class ExposureClassifier:
 
         return exposures.with_columns([
             # SME flag
-            pl.when(
+            (
                 (pl.col("exposure_class") == ExposureClass.CORPORATE.value) &
                 (pl.col("cp_annual_revenue") < sme_threshold_gbp) &
                 (pl.col("cp_annual_revenue") > 0)  # Exclude missing/zero revenue
-            ).then(pl.lit(True))
-            .otherwise(pl.lit(False))
-            .alias("is_sme"),
-
+            ).fill_null(False).alias("is_sme"),
+        ]).with_columns([
             # Update exposure class for SME corporates
-            pl.when(
-                (pl.col("exposure_class") == ExposureClass.CORPORATE.value) &
-                (pl.col("cp_annual_revenue") < sme_threshold_gbp) &
-                (pl.col("cp_annual_revenue") > 0)
-            ).then(pl.lit(ExposureClass.CORPORATE_SME.value))
+            pl.when(pl.col("is_sme"))
+            .then(pl.lit(ExposureClass.CORPORATE_SME.value))
             .otherwise(pl.col("exposure_class"))
             .alias("exposure_class"),
         ])
@@ -378,37 +501,21 @@ class ExposureClassifier:
         # 1. Product type indicates mortgage/home loan, OR
         # 2. Secured by immovable property (property_collateral_value > 0), OR
         # 3. Parent facility has property collateral (for undrawn exposures which have 0 drawn_amount)
-        if has_property_col and has_facility_property_flag:
-            # Best case: use both property_collateral_value and the facility flag
-            exposures = exposures.with_columns([
-                pl.when(
-                    (pl.col("product_type").str.to_uppercase().str.contains("MORTGAGE")) |
-                    (pl.col("product_type").str.to_uppercase().str.contains("HOME_LOAN")) |
-                    (pl.col("property_collateral_value") > 0) |
-                    (pl.col("has_facility_property_collateral") == True)  # noqa: E712
-                ).then(pl.lit(True))
-                .otherwise(pl.lit(False))
-                .alias("is_mortgage"),
-            ])
-        elif has_property_col:
-            exposures = exposures.with_columns([
-                pl.when(
-                    (pl.col("product_type").str.to_uppercase().str.contains("MORTGAGE")) |
-                    (pl.col("product_type").str.to_uppercase().str.contains("HOME_LOAN")) |
-                    (pl.col("property_collateral_value") > 0)
-                ).then(pl.lit(True))
-                .otherwise(pl.lit(False))
-                .alias("is_mortgage"),
-            ])
-        else:
-            exposures = exposures.with_columns([
-                pl.when(
-                    (pl.col("product_type").str.to_uppercase().str.contains("MORTGAGE")) |
-                    (pl.col("product_type").str.to_uppercase().str.contains("HOME_LOAN"))
-                ).then(pl.lit(True))
-                .otherwise(pl.lit(False))
-                .alias("is_mortgage"),
-            ])
+        # One case-insensitive regex per row instead of uppercasing per predicate
+        is_mortgage_expr = pl.col("product_type").str.contains(MORTGAGE_PRODUCT_PATTERN)
+        if has_property_col:
+            is_mortgage_expr = is_mortgage_expr | (pl.col("property_collateral_value") > 0)
+        if has_facility_property_flag and has_property_col:
+            is_mortgage_expr = is_mortgage_expr | (
+                pl.col("has_facility_property_collateral") == True  # noqa: E712
+            )
+
+        exposures = exposures.with_columns([
+            pl.when(is_mortgage_expr)
+            .then(pl.lit(True))
+            .otherwise(pl.lit(False))
+            .alias("is_mortgage"),
+        ])
 
         # Check if exposure exceeds retail threshold using ADJUSTED amounts
         # (excluding residential property collateral per CRR Art. 123(c))
@@ -638,7 +745,7 @@ class ExposureClassifier:
         """
         return exposures.with_columns([
             pl.when(
-                pl.col("product_type").str.to_uppercase().str.contains("INFRASTRUCTURE")
+                pl.col("product_type").str.contains(INFRASTRUCTURE_PRODUCT_PATTERN)
             ).then(pl.lit(True))
             .otherwise(pl.lit(False))
             .alias("is_infrastructure"),
@@ -656,8 +763,10 @@ class ExposureClassifier:
         - Large financial sector entities (total assets >= EUR 70bn)
         - Unregulated financial sector entities
 
+        is_financial_sector_entity is set from entity_type_table() during
+        exposure class determination.
+
         Sets:
-        - is_financial_sector_entity: Entity type is in FINANCIAL_SECTOR_ENTITY_TYPES
         - is_large_financial_sector_entity: FSE with total assets >= EUR 70bn threshold
         - requires_fi_scalar: Either LFSE or unregulated FSE
         """
@@ -667,11 +776,6 @@ class ExposureClassifier:
         )
 
         return exposures.with_columns([
-            # Is this a financial sector entity type?
-            pl.col("cp_entity_type")
-            .is_in(FINANCIAL_SECTOR_ENTITY_TYPES)
-            .alias("is_financial_sector_entity"),
-        ]).with_columns([
             # Is this a large financial sector entity? (total assets >= EUR 70bn)
             pl.when(
                 (pl.col("is_financial_sector_entity") == True) &  # noqa: E712
@@ -704,158 +808,28 @@ class ExposureClassifier:
         """
         Determine calculation approach based on permissions.
 
-        Logic:
-        1. Check if IRB is permitted FOR EACH EXPOSURE CLASS
-        2. If F-IRB or A-IRB permitted for that class, assign appropriate approach
-        3. Default to SA if no IRB permission for the class
-        4. Specialised lending uses slotting if permitted
+        Resolved with one join against approach_table(config), keyed by
+        exposure class and whether the exposure is managed as retail
+        without an internal LGD (these must use SA: they cannot use FIRB
+        without own LGD models and don't qualify for retail AIRB).
         """
-        # Build per-exposure-class permission checks
-        # Check AIRB permissions per exposure class
-        airb_corporate = config.irb_permissions.is_permitted(
-            ExposureClass.CORPORATE, ApproachType.AIRB
-        )
-        airb_corporate_sme = config.irb_permissions.is_permitted(
-            ExposureClass.CORPORATE_SME, ApproachType.AIRB
-        )
-        airb_retail_mortgage = config.irb_permissions.is_permitted(
-            ExposureClass.RETAIL_MORTGAGE, ApproachType.AIRB
-        )
-        airb_retail_other = config.irb_permissions.is_permitted(
-            ExposureClass.RETAIL_OTHER, ApproachType.AIRB
-        )
-        airb_retail_qrre = config.irb_permissions.is_permitted(
-            ExposureClass.RETAIL_QRRE, ApproachType.AIRB
-        )
-        airb_institution = config.irb_permissions.is_permitted(
-            ExposureClass.INSTITUTION, ApproachType.AIRB
-        )
-        airb_cgcb = config.irb_permissions.is_permitted(
-            ExposureClass.CENTRAL_GOVT_CENTRAL_BANK, ApproachType.AIRB
-        )
-
-        # Check FIRB permissions per exposure class
-        firb_corporate = config.irb_permissions.is_permitted(
-            ExposureClass.CORPORATE, ApproachType.FIRB
-        )
-        firb_corporate_sme = config.irb_permissions.is_permitted(
-            ExposureClass.CORPORATE_SME, ApproachType.FIRB
-        )
-        firb_institution = config.irb_permissions.is_permitted(
-            ExposureClass.INSTITUTION, ApproachType.FIRB
-        )
-        firb_cgcb = config.irb_permissions.is_permitted(
-            ExposureClass.CENTRAL_GOVT_CENTRAL_BANK, ApproachType.FIRB
-        )
-
-        # Identify exposures managed as retail but without internal LGD
-        # These must use SA (cannot use FIRB without own LGD models)
-        managed_as_retail_without_lgd = (
+        retail_without_lgd = (
             (pl.col("cp_is_managed_as_retail") == True) &  # noqa: E712
             (pl.col("qualifies_as_retail") == True) &  # noqa: E712
             (pl.col("lgd").is_null())
-        )
+        ).fill_null(False)
 
         return exposures.with_columns([
-            # Determine if F-IRB permitted for this exposure class
-            pl.when(
-                (pl.col("exposure_class") == ExposureClass.CORPORATE.value) &
-                pl.lit(firb_corporate)
-            ).then(pl.lit(True))
-            .when(
-                (pl.col("exposure_class") == ExposureClass.CORPORATE_SME.value) &
-                pl.lit(firb_corporate_sme)
-            ).then(pl.lit(True))
-            .when(
-                (pl.col("exposure_class") == ExposureClass.INSTITUTION.value) &
-                pl.lit(firb_institution)
-            ).then(pl.lit(True))
-            .when(
-                (pl.col("exposure_class") == ExposureClass.CENTRAL_GOVT_CENTRAL_BANK.value) &
-                pl.lit(firb_cgcb)
-            ).then(pl.lit(True))
-            .otherwise(pl.lit(False))
-            .alias("firb_permitted"),
-
-            # Determine if A-IRB permitted for this exposure class
-            pl.when(
-                (pl.col("exposure_class") == ExposureClass.CORPORATE.value) &
-                pl.lit(airb_corporate)
-            ).then(pl.lit(True))
-            .when(
-                (pl.col("exposure_class") == ExposureClass.CORPORATE_SME.value) &
-                pl.lit(airb_corporate_sme)
-            ).then(pl.lit(True))
-            .when(
-                (pl.col("exposure_class") == ExposureClass.RETAIL_MORTGAGE.value) &
-                pl.lit(airb_retail_mortgage)
-            ).then(pl.lit(True))
-            .when(
-                (pl.col("exposure_class") == ExposureClass.RETAIL_OTHER.value) &
-                pl.lit(airb_retail_other)
-            ).then(pl.lit(True))
-            .when(
-                (pl.col("exposure_class") == ExposureClass.RETAIL_QRRE.value) &
-                pl.lit(airb_retail_qrre)
-            ).then(pl.lit(True))
-            .when(
-                (pl.col("exposure_class") == ExposureClass.INSTITUTION.value) &
-                pl.lit(airb_institution)
-            ).then(pl.lit(True))
-            .when(
-                (pl.col("exposure_class") == ExposureClass.CENTRAL_GOVT_CENTRAL_BANK.value) &
-                pl.lit(airb_cgcb)
-            ).then(pl.lit(True))
-            .otherwise(pl.lit(False))
-            .alias("airb_permitted"),
-        ]).with_columns([
-            # Assign approach
-            pl.when(
-                # Exposures managed as retail but without internal LGD must use SA
-                # They cannot use FIRB (no own LGD models) and don't qualify for retail AIRB
-                managed_as_retail_without_lgd
-            ).then(pl.lit(ApproachType.SA.value))
-            .when(
-                # Specialised lending with A-IRB permission (models for PD/LGD available)
-                # A-IRB takes precedence over slotting when SPECIFICALLY permitted for SL
-                (pl.col("exposure_class") == ExposureClass.SPECIALISED_LENDING.value) &
-                self._check_sl_airb_permitted(config)
-            ).then(pl.lit(ApproachType.AIRB.value))
-            .when(
-                # Specialised lending with slotting permission (fallback)
-                (pl.col("exposure_class") == ExposureClass.SPECIALISED_LENDING.value) &
-                self._check_slotting_permitted(config)
-            ).then(pl.lit(ApproachType.SLOTTING.value))
-            .when(
-                # A-IRB for retail (retail requires A-IRB, not F-IRB)
-                (pl.col("exposure_class").is_in([
-                    ExposureClass.RETAIL_MORTGAGE.value,
-                    ExposureClass.RETAIL_OTHER.value,
-                    ExposureClass.RETAIL_QRRE.value,
-                ])) &
-                (pl.col("airb_permitted") == True)  # noqa: E712
-            ).then(pl.lit(ApproachType.AIRB.value))
-            .when(
-                # A-IRB for corporates if permitted FOR THAT CLASS
-                (pl.col("exposure_class").is_in([
-                    ExposureClass.CORPORATE.value,
-                    ExposureClass.CORPORATE_SME.value,
-                ])) &
-                (pl.col("airb_permitted") == True)  # noqa: E712
-            ).then(pl.lit(ApproachType.AIRB.value))
-            .when(
-                # F-IRB for corporates/institutions/sovereigns if permitted
-                (pl.col("exposure_class").is_in([
-                    ExposureClass.CORPORATE.value,
-                    ExposureClass.CORPORATE_SME.value,
-                    ExposureClass.INSTITUTION.value,
-                    ExposureClass.CENTRAL_GOVT_CENTRAL_BANK.value,
-                ])) &
-                (pl.col("firb_permitted") == True)  # noqa: E712
-            ).then(pl.lit(ApproachType.FIRB.value))
-            .otherwise(pl.lit(ApproachType.SA.value))
-            .alias("approach"),
-        ])
+            retail_without_lgd.alias("retail_without_lgd"),
+        ]).join(
+            approach_table(config).lazy(),
+            on=["exposure_class", "retail_without_lgd"],
+            how="left",
+        ).with_columns([
+            pl.col("firb_permitted").fill_null(False),
+            pl.col("airb_permitted").fill_null(False),
+            pl.col("approach").fill_null(ApproachType.SA.value),
+        ]).drop("retail_without_lgd")
 
     def _check_firb_permitted(self, config: CalculationConfig) -> pl.Expr:
         """Check if F-IRB is permitted for any class."""
@@ -872,22 +846,6 @@ class ExposureClassifier:
                 return pl.lit(True)
         return pl.lit(False)
 
-    def _check_slotting_permitted(self, config: CalculationConfig) -> pl.Expr:
-        """Check if slotting is permitted."""
-        if config.irb_permissions.is_permitted(
-            ExposureClass.SPECIALISED_LENDING, ApproachType.SLOTTING
-        ):
-            return pl.lit(True)
-        return pl.lit(False)
-
-    def _check_sl_airb_permitted(self, config: CalculationConfig) -> pl.Expr:
-        """Check if A-IRB is permitted specifically for SPECIALISED_LENDING."""
-        if config.irb_permissions.is_permitted(
-            ExposureClass.SPECIALISED_LENDING, ApproachType.AIRB
-        ):
-            return pl.lit(True)
-        return pl.lit(False)
-
     def _clear_lgd_for_firb(
         self,
         exposures: pl.LazyFrame,
@@ -913,37 +871,6 @@ class ExposureClassifier:
             .alias("lgd"),
         ])
 
-    def _add_classification_audit(
-        self,
-        exposures: pl.LazyFrame,
-    ) -> pl.LazyFrame:
-        """Add classification reasoning for audit trail."""
-        return exposures.with_columns([
-            # Build classification reason string
-            pl.concat_str([
-                pl.lit("entity_type="),
-                pl.col("cp_entity_type").fill_null("unknown"),
-                pl.lit("; exp_class_sa="),
-                pl.col("exposure_class_sa").fill_null("unknown"),
-                pl.lit("; exp_class_irb="),
-                pl.col("exposure_class_irb").fill_null("unknown"),
-                pl.lit("; is_sme="),
-                pl.col("is_sme").cast(pl.String),
-                pl.lit("; is_mortgage="),
-                pl.col("is_mortgage").cast(pl.String),
-                pl.lit("; is_defaulted="),
-                pl.col("is_defaulted").cast(pl.String),
-                pl.lit("; is_infrastructure="),
-                pl.col("is_infrastructure").cast(pl.String),
-                pl.lit("; requires_fi_scalar="),
-                pl.col("requires_fi_scalar").cast(pl.String),
-                pl.lit("; qualifies_as_retail="),
-                pl.col("qualifies_as_retail").cast(pl.String),
-                pl.lit("; reclassified_to_retail="),
-                pl.col("reclassified_to_retail").cast(pl.String),
-            ]).alias("classification_reason"),
-        ])
-
     def _filter_by_approach(
         self,
         exposures: pl.LazyFrame,
@@ -978,16 +905,18 @@ class ExposureClassifier:
 
         # Derive slotting_category from counterparty_reference pattern
         # Pattern: SL_*_STRONG -> strong, SL_*_GOOD -> good, SL_*_WEAK -> weak, etc.
+        # (matched on the string form, as references may be dictionary-encoded)
+        exposures = with_key_text(exposures, "counterparty_reference", "_counterparty_text")
         exposures = exposures.with_columns([
-            pl.when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_STRONG"))
+            pl.when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_STRONG"))
             .then(pl.lit("strong"))
-            .when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_GOOD"))
+            .when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_GOOD"))
             .then(pl.lit("good"))
-            .when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_WEAK"))
+            .when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_WEAK"))
             .then(pl.lit("weak"))
-            .when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_DEFAULT"))
+            .when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_DEFAULT"))
             .then(pl.lit("default"))
-            .when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_SATISFACTORY"))
+            .when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_SATISFACTORY"))
             .then(pl.lit("satisfactory"))
             .otherwise(pl.lit("satisfactory"))  # Default to satisfactory
             .alias("slotting_category"),
@@ -1006,22 +935,22 @@ class ExposureClassifier:
                 .then(pl.lit("ipre"))
                 .when(pl.col("product_type").str.to_uppercase() == "HVCRE")
                 .then(pl.lit("hvcre"))
-                .when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_PF_"))
+                .when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_PF_"))
                 .then(pl.lit("project_finance"))
-                .when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_IPRE_"))
+                .when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_IPRE_"))
                 .then(pl.lit("ipre"))
-                .when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_HVCRE_"))
+                .when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_HVCRE_"))
                 .then(pl.lit("hvcre"))
                 .otherwise(pl.lit("project_finance"))
                 .alias("sl_type"),
             ])
         else:
             exposures = exposures.with_columns([
-                pl.when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_PF_"))
+                pl.when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_PF_"))
                 .then(pl.lit("project_finance"))
-                .when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_IPRE_"))
+                .when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_IPRE_"))
                 .then(pl.lit("ipre"))
-                .when(pl.col("counterparty_reference").str.to_uppercase().str.contains("_HVCRE_"))
+                .when(pl.col("_counterparty_text").str.to_uppercase().str.contains("_HVCRE_"))
                 .then(pl.lit("hvcre"))
                 .otherwise(pl.lit("project_finance"))
                 .alias("sl_type"),
@@ -1030,7 +959,7 @@ class ExposureClassifier:
         # Set is_hvcre flag
         exposures = exposures.with_columns([
             (pl.col("sl_type") == "hvcre").alias("is_hvcre"),
-        ])
+        ]).drop("_counterparty_text")
 
         return exposures
 
@@ -1039,6 +968,7 @@ class ExposureClassifier:
         exposures: pl.LazyFrame,
     ) -> pl.LazyFrame:
         """Build classification audit trail."""
+        cols = exposures.collect_schema().names()
         return exposures.select([
             pl.col("exposure_reference"),
             pl.col("counterparty_reference"),
@@ -1058,7 +988,7 @@ class ExposureClassifier:
             pl.col("residential_collateral_value"),
             pl.col("lending_group_adjusted_exposure"),
             pl.col("reclassified_to_retail"),
-            pl.col("classification_reason"),
+            *([pl.col("classification_reason")] if "classification_reason" in cols else []),
         ])
 
 
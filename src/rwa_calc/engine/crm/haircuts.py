@@ -21,6 +21,8 @@ from typing import TYPE_CHECKING
 
 import polars as pl
 
+# Import namespace to ensure it's registered
+import rwa_calc.engine.audit_namespace  # noqa: F401
 from rwa_calc.data.tables.crr_haircuts import (
     FX_HAIRCUT,
     calculate_adjusted_collateral_value,
@@ -30,6 +32,7 @@ from rwa_calc.data.tables.crr_haircuts import (
     lookup_collateral_haircut,
     lookup_fx_haircut,
 )
+from rwa_calc.engine.key_aggregates import COUNTERPARTY_KEY, FACILITY_KEY, KeyAggregates
 
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
@@ -119,18 +122,8 @@ class HaircutCalculator:
         ])
 
         # Add haircut audit trail
-        collateral = collateral.with_columns([
-            pl.concat_str([
-                pl.lit("MV="),
-                pl.col("market_value").round(0).cast(pl.String),
-                pl.lit("; Hc="),
-                (pl.col("collateral_haircut") * 100).round(1).cast(pl.String),
-                pl.lit("%; Hfx="),
-                (pl.col("fx_haircut") * 100).round(1).cast(pl.String),
-                pl.lit("%; Adj="),
-                pl.col("value_after_haircut").round(0).cast(pl.String),
-            ]).alias("haircut_calculation"),
-        ])
+        if config.audit_strings:
+            collateral = collateral.audit.build_haircut_calculation()
 
         return collateral
 
@@ -150,7 +143,6 @@ class HaircutCalculator:
         Falls back to direct-only join when beneficiary_type column is absent.
         """
         coll_schema = collateral.collect_schema()
-        exp_schema = exposures.collect_schema()
 
         # Exposure lookup columns for direct join
         direct_lookup = exposures.select([
@@ -184,35 +176,31 @@ class HaircutCalculator:
             how="left",
         )
 
-        # Facility: lookup currency via parent_facility_reference
-        if "parent_facility_reference" in exp_schema.names():
-            facility_lookup = exposures.filter(
-                pl.col("parent_facility_reference").is_not_null()
-            ).group_by("parent_facility_reference").agg([
-                pl.col("currency").first().alias("exposure_currency"),
-                pl.col("maturity_date").first().alias("exposure_maturity"),
-            ])
-            coll_facility = coll_facility.join(
-                facility_lookup,
-                left_on="beneficiary_reference",
-                right_on="parent_facility_reference",
-                how="left",
-            )
-        else:
-            coll_facility = coll_facility.with_columns([
-                pl.lit(None).cast(pl.String).alias("exposure_currency"),
-                pl.lit(None).cast(pl.Date).alias("exposure_maturity"),
-            ])
-
-        # Counterparty: lookup currency via counterparty_reference
-        counterparty_lookup = exposures.group_by("counterparty_reference").agg([
-            pl.col("currency").first().alias("exposure_currency"),
-            pl.col("maturity_date").first().alias("exposure_maturity"),
-        ])
+        # Facility and counterparty: currency and maturity of the first
+        # exposure under the beneficiary key
+        exposure_terms = KeyAggregates(
+            exposures,
+            {
+                "exposure_currency": pl.col("currency"),
+                "exposure_maturity": pl.col("maturity_date"),
+            },
+            keys=(FACILITY_KEY, COUNTERPARTY_KEY),
+            aggregation="first",
+        )
+        term_columns = {
+            "exposure_currency": "exposure_currency",
+            "exposure_maturity": "exposure_maturity",
+        }
+        coll_facility = coll_facility.join(
+            exposure_terms.totals(FACILITY_KEY, term_columns),
+            left_on="beneficiary_reference",
+            right_on=FACILITY_KEY,
+            how="left",
+        )
         coll_counterparty = coll_counterparty.join(
-            counterparty_lookup,
+            exposure_terms.totals(COUNTERPARTY_KEY, term_columns),
             left_on="beneficiary_reference",
-            right_on="counterparty_reference",
+            right_on=COUNTERPARTY_KEY,
             how="left",
         )
 
@@ -39,6 +39,7 @@ import polars as pl
 from rwa_calc.domain.enums import ApproachType
 from rwa_calc.engine.ccf import drawn_for_ead, on_balance_ead, sa_ccf_expression
 from rwa_calc.engine.classifier import ENTITY_TYPE_TO_SA_CLASS
+from rwa_calc.engine.key_encoding import key_dtype
 
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
@@ -160,7 +161,7 @@ class CRMLazyFrame:
 
             # Initialize guarantee-related columns
             pl.lit(0.0).alias("guarantee_amount"),
-            pl.lit(None).cast(pl.String).alias("guarantor_reference"),
+            pl.lit(None).cast(key_dtype()).alias("guarantor_reference"),
             pl.lit(None).cast(pl.Float64).alias("substitute_rw"),
 
             # Provision-related columns
@@ -324,7 +325,7 @@ class CRMLazyFrame:
             )
         else:
             fac_ead = pl.LazyFrame(
-                schema={"parent_facility_reference": pl.String, "_fac_ead_total": pl.Float64}
+                schema={"parent_facility_reference": key_dtype(), "_fac_ead_total": pl.Float64}
             )
 
         cp_ead = lf.group_by("counterparty_reference").agg(
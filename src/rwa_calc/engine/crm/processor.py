@@ -29,13 +29,21 @@ from rwa_calc.contracts.bundles import (
     ClassifiedExposuresBundle,
     CRMAdjustedBundle,
 )
+from rwa_calc.contracts.columns import CRM_ADJUSTED_COLUMNS
 from rwa_calc.contracts.errors import LazyFrameResult
+from rwa_calc.data.schemas import GUARANTEE_SCHEMA
 from rwa_calc.domain.enums import ApproachType, ExposureClass
 from rwa_calc.engine.ccf import CCFCalculator, drawn_for_ead, on_balance_ead, sa_ccf_expression
 from rwa_calc.engine.classifier import ENTITY_TYPE_TO_SA_CLASS
 from rwa_calc.engine.crm.haircuts import HaircutCalculator
+from rwa_calc.engine.key_aggregates import COUNTERPARTY_KEY, FACILITY_KEY, KeyAggregates
+from rwa_calc.engine.key_encoding import is_key_column, key_dtype
+from rwa_calc.engine.resources import materialise
 from rwa_calc.data.tables.crr_firb_lgd import get_firb_lgd_table
 
+# Import namespace to ensure it's registered
+import rwa_calc.engine.audit_namespace  # noqa: F401
+
 # Transient columns used during guarantee processing but dropped from output
 # These values can be obtained via joins on guarantor_reference
 TRANSIENT_GUARANTEE_COLUMNS = [
@@ -47,6 +55,9 @@ TRANSIENT_GUARANTEE_COLUMNS = [
     "guarantor_exposure_class",
 ]
 
+# Measures shared by the collateral steps for pro-rata allocation
+EAD_GROSS_MEASURES: dict[str, pl.Expr] = {"ead_gross": pl.col("ead_gross")}
+
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
 
@@ -121,6 +132,36 @@ class CRMProcessor:
         except Exception:
             return False
 
+    def _optional_input(
+        self,
+        data: pl.LazyFrame | None,
+        required_columns: set[str],
+        schema: dict[str, pl.DataType],
+    ) -> pl.LazyFrame:
+        """
+        Optional CRM data, or an empty frame when it is missing or unusable.
+
+        Stages that run against the empty frame add the same columns, with
+        the same values, as for an exposure the data does not cover. The CRM
+        output schema, and the results for an exposure, therefore do not
+        depend on whether other exposures have CRM data.
+
+        Args:
+            data: Optional LazyFrame
+            required_columns: Columns the CRM operation needs
+            schema: Input schema for the empty frame
+
+        Returns:
+            data if it is valid for processing, else an empty frame with
+            reference columns in the active key encoding
+        """
+        if self._is_valid_for_processing(data, required_columns):
+            return data
+        return pl.LazyFrame(schema={
+            name: key_dtype() if is_key_column(name) else dtype
+            for name, dtype in schema.items()
+        })
+
     def apply_crm(
         self,
         data: ClassifiedExposuresBundle,
@@ -169,6 +210,8 @@ class CRMProcessor:
         # so CCF can use the provision-adjusted nominal amount
         if self._is_valid_for_processing(data.provisions, self.PROVISION_REQUIRED_COLUMNS):
             exposures = self.resolve_provisions(exposures, data.provisions, config)
+        else:
+            exposures = self._apply_no_provisions(exposures)
 
         # Step 2: Apply CCF to calculate EAD for contingents
         # Uses nominal_after_provision when available
@@ -178,20 +221,23 @@ class CRMProcessor:
         exposures = self._initialize_ead(exposures)
 
         # Step 4: Apply collateral (if available and valid)
+        # Facility and counterparty EAD totals are shared by every collateral step
         if self._is_valid_for_processing(data.collateral, self.COLLATERAL_REQUIRED_COLUMNS):
-            exposures = self.apply_collateral(exposures, data.collateral, config)
+            ead_totals = KeyAggregates(exposures, EAD_GROSS_MEASURES)
+            exposures = self.apply_collateral(
+                exposures, data.collateral, config, ead_totals=ead_totals
+            )
         else:
             # No collateral: still need to set F-IRB supervisory LGD based on seniority
             exposures = self._apply_firb_supervisory_lgd_no_collateral(exposures)
 
-        # Step 5: Apply guarantees (if available and valid)
-        if (
-            self._is_valid_for_processing(data.guarantees, self.GUARANTEE_REQUIRED_COLUMNS)
-            and data.counterparty_lookup is not None
-        ):
+        # Step 5: Apply guarantees (run without guarantees too, for a stable schema)
+        if data.counterparty_lookup is not None:
             exposures = self.apply_guarantees(
                 exposures,
-                data.guarantees,
+                self._optional_input(
+                    data.guarantees, self.GUARANTEE_REQUIRED_COLUMNS, GUARANTEE_SCHEMA
+                ),
                 data.counterparty_lookup.counterparties,
                 config,
                 data.counterparty_lookup.rating_inheritance,
@@ -202,11 +248,15 @@ class CRMProcessor:
         exposures = self._finalize_ead(exposures)
 
         # Step 7: Add CRM audit trail
-        exposures = self._add_crm_audit(exposures)
+        if config.audit_strings:
+            exposures = exposures.audit.build_crm_calculation()
 
         # Strategic collect to materialize all CRM processing
         # This breaks up the complex query plan for better downstream performance
-        exposures = exposures.collect().lazy()
+        # Intermediate columns outside the stage contract are dropped first
+        # Runs over the memory budget spill to an IPC file instead (see materialise)
+        exposures = CRM_ADJUSTED_COLUMNS.prune(exposures, config)
+        exposures = materialise(exposures, config, "crm_adjusted")
 
         # Split by approach for output
         sa_exposures = exposures.filter(pl.col("approach") == ApproachType.SA.value)
@@ -224,7 +274,7 @@ class CRMProcessor:
             irb_exposures=irb_exposures,
             slotting_exposures=slotting_exposures,
             equity_exposures=data.equity_exposures,  # Pass through equity (no CRM)
-            crm_audit=self._build_crm_audit(exposures),
+            crm_audit=self._build_crm_audit(exposures) if config.audit_trail else None,
             collateral_allocation=None,  # Would be populated from collateral processing
             crm_errors=errors,
         )
@@ -299,7 +349,7 @@ class CRMProcessor:
 
             # Initialize guarantee-related columns
             pl.lit(0.0).alias("guarantee_amount"),
-            pl.lit(None).cast(pl.String).alias("guarantor_reference"),
+            pl.lit(None).cast(key_dtype()).alias("guarantor_reference"),
             pl.lit(None).cast(pl.Float64).alias("substitute_rw"),
 
             # Provision-related columns
@@ -349,6 +399,7 @@ class CRMProcessor:
         self,
         collateral: pl.LazyFrame,
         exposures: pl.LazyFrame,
+        ead_totals: KeyAggregates | None = None,
     ) -> pl.LazyFrame:
         """
         Resolve percentage-based collateral pledges to absolute market values.
@@ -365,6 +416,8 @@ class CRMProcessor:
         Args:
             collateral: Collateral data, may or may not have pledge_percentage column
             exposures: Exposures with ead_gross, parent_facility_reference, counterparty_reference
+            ead_totals: Facility and counterparty ead_gross totals
+                (default: computed from exposures)
 
         Returns:
             Collateral with market_value resolved from pledge_percentage where applicable
@@ -373,6 +426,9 @@ class CRMProcessor:
         if "pledge_percentage" not in coll_schema.names():
             return collateral
 
+        if ead_totals is None:
+            ead_totals = KeyAggregates(exposures, EAD_GROSS_MEASURES)
+
         # Determine which rows need resolution:
         # market_value is null or 0, AND pledge_percentage is set and > 0
         needs_resolve = (
@@ -391,25 +447,17 @@ class CRMProcessor:
         ])
 
         # Facility: parent_facility_reference → sum(ead_gross)
-        exp_schema = exposures.collect_schema()
-        if "parent_facility_reference" in exp_schema.names():
-            facility_ead = exposures.filter(
-                pl.col("parent_facility_reference").is_not_null()
-            ).group_by("parent_facility_reference").agg(
-                pl.col("ead_gross").sum().alias("_beneficiary_ead"),
-            ).select(
-                pl.col("parent_facility_reference").cast(pl.String).alias("_ben_ref"),
-                pl.col("_beneficiary_ead"),
-            )
-        else:
-            facility_ead = pl.LazyFrame(
-                schema={"_ben_ref": pl.String, "_beneficiary_ead": pl.Float64}
-            )
+        facility_ead = ead_totals.totals(
+            FACILITY_KEY, {"ead_gross": "_beneficiary_ead"}
+        ).select(
+            pl.col(FACILITY_KEY).cast(coll_schema["beneficiary_reference"]).alias("_ben_ref"),
+            pl.col("_beneficiary_ead"),
+        )
 
         # Counterparty: counterparty_reference → sum(ead_gross)
-        counterparty_ead = exposures.group_by("counterparty_reference").agg(
-            pl.col("ead_gross").sum().alias("_beneficiary_ead"),
-        ).rename({"counterparty_reference": "_ben_ref"})
+        counterparty_ead = ead_totals.totals(
+            COUNTERPARTY_KEY, {"ead_gross": "_beneficiary_ead"}
+        ).rename({COUNTERPARTY_KEY: "_ben_ref"})
 
         if has_beneficiary_type:
             # Split by beneficiary_type, join to correct lookup, concat back
@@ -461,6 +509,7 @@ class CRMProcessor:
         exposures: pl.LazyFrame,
         collateral: pl.LazyFrame,
         config: CalculationConfig,
+        ead_totals: KeyAggregates | None = None,
     ) -> pl.LazyFrame:
         """
         Apply collateral to reduce EAD (SA) or LGD (IRB).
@@ -469,12 +518,17 @@ class CRMProcessor:
             exposures: Exposures with ead_gross
             collateral: Collateral data
             config: Calculation configuration
+            ead_totals: Facility and counterparty ead_gross totals
+                (default: computed from exposures)
 
         Returns:
             Exposures with collateral effects applied
         """
+        if ead_totals is None:
+            ead_totals = KeyAggregates(exposures, EAD_GROSS_MEASURES)
+
         # Resolve percentage-based collateral to absolute market values
-        collateral = self._resolve_pledge_percentages(collateral, exposures)
+        collateral = self._resolve_pledge_percentages(collateral, exposures, ead_totals)
 
         # Apply haircuts to collateral
         adjusted_collateral = self._haircut_calculator.apply_haircuts(
@@ -510,7 +564,7 @@ class CRMProcessor:
 
         if has_beneficiary_type:
             exposures = self._allocate_collateral_multi_level_for_ead(
-                exposures, eligible_collateral
+                exposures, eligible_collateral, ead_totals
             )
         else:
             # Legacy: direct-only join
@@ -551,8 +605,10 @@ class CRMProcessor:
 
         # For F-IRB: Calculate effective LGD with collateral
         # A-IRB uses modelled LGD, so no adjustment needed
+        # (ead_gross is unchanged, so the shared totals stay valid)
+        ead_totals = ead_totals.with_exposures(exposures, changed=["ead_after_collateral"])
         exposures = self._calculate_irb_lgd_with_collateral(
-            exposures, adjusted_collateral, config
+            exposures, adjusted_collateral, config, ead_totals
         )
 
         return exposures
@@ -562,6 +618,7 @@ class CRMProcessor:
         exposures: pl.LazyFrame,
         collateral: pl.LazyFrame,
         config: CalculationConfig,
+        ead_totals: KeyAggregates | None = None,
     ) -> pl.LazyFrame:
         """
         Calculate effective LGD for F-IRB exposures with collateral.
@@ -583,6 +640,8 @@ class CRMProcessor:
             exposures: Exposures with ead_gross and lgd_pre_crm
             collateral: All collateral (not just financial) with haircut-adjusted values
             config: Calculation configuration
+            ead_totals: Facility and counterparty ead_gross totals
+                (default: computed from exposures)
 
         Returns:
             Exposures with lgd_post_crm updated for F-IRB
@@ -674,7 +733,7 @@ class CRMProcessor:
         if has_beneficiary_type:
             # Multi-level collateral allocation
             exposures = self._allocate_collateral_multi_level_for_lgd(
-                exposures, collateral_with_lgd
+                exposures, collateral_with_lgd, ead_totals
             )
         else:
             # Legacy: direct linking only
@@ -820,15 +879,27 @@ class CRMProcessor:
         Returns:
             Exposures with lgd_post_crm set for F-IRB
         """
-        # Add collateral-related columns with zero values for consistency
+        # Add the collateral columns apply_collateral sets for an uncovered
+        # exposure, so the output schema does not depend on collateral data
         exposures = exposures.with_columns([
             pl.lit(0.0).alias("total_collateral_for_lgd"),
             pl.lit(0.0).alias("collateral_coverage_pct"),
+            pl.lit(0.0).alias("collateral_market_value"),
+            pl.lit(0.45).alias("lgd_secured"),
         ])
 
         # Check if seniority column exists
         schema_names = set(exposures.collect_schema().names())
         if "seniority" in schema_names:
+            # Unsecured LGD by seniority, as in apply_collateral
+            exposures = exposures.with_columns([
+                pl.when(
+                    pl.col("seniority").str.to_lowercase().is_in(["subordinated", "junior"])
+                ).then(pl.lit(0.75))
+                .otherwise(pl.lit(0.45))
+                .alias("lgd_unsecured"),
+            ])
+
             # Determine LGD based on seniority for F-IRB
             exposures = exposures.with_columns([
                 pl.when(
@@ -843,6 +914,7 @@ class CRMProcessor:
         else:
             # No seniority column: use 45% for all F-IRB (senior unsecured default)
             exposures = exposures.with_columns([
+                pl.lit(0.45).alias("lgd_unsecured"),
                 pl.when(pl.col("approach") == ApproachType.FIRB.value)
                 .then(pl.lit(0.45))  # Senior unsecured
                 .otherwise(pl.col("lgd_pre_crm"))  # A-IRB or SA: keep existing
@@ -855,6 +927,7 @@ class CRMProcessor:
         self,
         exposures: pl.LazyFrame,
         collateral: pl.LazyFrame,
+        ead_totals: KeyAggregates | None = None,
     ) -> pl.LazyFrame:
         """
         Allocate collateral from multiple linking levels for LGD calculation.
@@ -872,6 +945,8 @@ class CRMProcessor:
             exposures: Exposures with ead_gross, parent_facility_reference, counterparty_reference
             collateral: Collateral with beneficiary_type, adjusted_value, effectively_secured,
                         collateral_lgd, is_financial_collateral_type
+            ead_totals: Facility and counterparty ead_gross totals
+                (default: computed from exposures)
 
         Returns:
             Exposures with total_collateral_for_lgd and lgd_secured columns
@@ -899,16 +974,11 @@ class CRMProcessor:
         coll_facility = aggregate_by_level(collateral, "facility")
         coll_counterparty = aggregate_by_level(collateral, "counterparty")
 
-        # Calculate EAD totals for pro-rata allocation
-        facility_ead_totals = exposures.filter(
-            pl.col("parent_facility_reference").is_not_null()
-        ).group_by("parent_facility_reference").agg([
-            pl.col("ead_gross").sum().alias("facility_ead_total"),
-        ])
-
-        counterparty_ead_totals = exposures.group_by("counterparty_reference").agg([
-            pl.col("ead_gross").sum().alias("cp_ead_total"),
-        ])
+        # EAD totals for pro-rata allocation
+        if ead_totals is None:
+            ead_totals = KeyAggregates(exposures, EAD_GROSS_MEASURES)
+        facility_ead_totals = ead_totals.totals(FACILITY_KEY, {"ead_gross": "facility_ead_total"})
+        counterparty_ead_totals = ead_totals.totals(COUNTERPARTY_KEY, {"ead_gross": "cp_ead_total"})
 
         # Join direct-level collateral
         exposures = exposures.join(
@@ -1048,6 +1118,7 @@ class CRMProcessor:
         self,
         exposures: pl.LazyFrame,
         eligible_collateral: pl.LazyFrame,
+        ead_totals: KeyAggregates | None = None,
     ) -> pl.LazyFrame:
         """
         Allocate eligible financial collateral from multiple linking levels for SA EAD reduction.
@@ -1061,6 +1132,8 @@ class CRMProcessor:
             exposures: Exposures with ead_gross, parent_facility_reference, counterparty_reference
             eligible_collateral: Eligible financial collateral with beneficiary_type,
                                  value_after_maturity_adj/value_after_haircut, market_value
+            ead_totals: Facility and counterparty ead_gross totals
+                (default: computed from exposures)
 
         Returns:
             Exposures with collateral_adjusted_value and collateral_market_value columns
@@ -1098,20 +1171,10 @@ class CRMProcessor:
 
         # --- EAD totals for pro-rata allocation ---
         exp_schema = exposures.collect_schema()
-        if "parent_facility_reference" in exp_schema.names():
-            facility_ead_totals = exposures.filter(
-                pl.col("parent_facility_reference").is_not_null()
-            ).group_by("parent_facility_reference").agg(
-                pl.col("ead_gross").sum().alias("_fac_ead_total"),
-            )
-        else:
-            facility_ead_totals = pl.LazyFrame(
-                schema={"parent_facility_reference": pl.String, "_fac_ead_total": pl.Float64}
-            )
-
-        cp_ead_totals = exposures.group_by("counterparty_reference").agg(
-            pl.col("ead_gross").sum().alias("_cp_ead_total"),
-        )
+        if ead_totals is None:
+            ead_totals = KeyAggregates(exposures, EAD_GROSS_MEASURES)
+        facility_ead_totals = ead_totals.totals(FACILITY_KEY, {"ead_gross": "_fac_ead_total"})
+        cp_ead_totals = ead_totals.totals(COUNTERPARTY_KEY, {"ead_gross": "_cp_ead_total"})
 
         # --- Join direct-level ---
         exposures = exposures.join(
@@ -1502,6 +1565,27 @@ class CRMProcessor:
 
         return exposures
 
+    def _apply_no_provisions(self, exposures: pl.LazyFrame) -> pl.LazyFrame:
+        """
+        Add the provision columns resolve_provisions sets for an exposure
+        without provisions, so the output schema does not depend on
+        provision data.
+
+        Args:
+            exposures: Exposures before CCF
+
+        Returns:
+            Exposures with zero provision_on_drawn and provision_on_nominal,
+            and nominal_after_provision equal to nominal_amount
+        """
+        columns = [
+            pl.lit(0.0).alias("provision_on_drawn"),
+            pl.lit(0.0).alias("provision_on_nominal"),
+        ]
+        if "nominal_amount" in exposures.collect_schema().names():
+            columns.append(pl.col("nominal_amount").alias("nominal_after_provision"))
+        return exposures.with_columns(columns)
+
     def resolve_provisions(
         self,
         exposures: pl.LazyFrame,
@@ -1648,6 +1732,7 @@ class CRMProcessor:
             + pl.col("nominal_amount")
         )
         exposures = exposures.with_columns(weight_expr.alias("_exp_weight"))
+        weight_totals = KeyAggregates(exposures, {"_exp_weight": pl.col("_exp_weight")})
 
         # --- 2. Facility-level provisions ---
         if has_parent_facility:
@@ -1658,11 +1743,8 @@ class CRMProcessor:
                 .agg(pl.col("amount").sum().alias("_prov_facility"))
             )
 
-            fac_totals = (
-                exposures
-                .filter(pl.col("parent_facility_reference").is_not_null())
-                .group_by("parent_facility_reference")
-                .agg(pl.col("_exp_weight").sum().alias("_fac_total_weight"))
+            fac_totals = weight_totals.totals(
+                FACILITY_KEY, {"_exp_weight": "_fac_total_weight"}
             )
 
             exposures = (
@@ -1700,10 +1782,8 @@ class CRMProcessor:
             .agg(pl.col("amount").sum().alias("_prov_cp"))
         )
 
-        cp_totals = (
-            exposures
-            .group_by("counterparty_reference")
-            .agg(pl.col("_exp_weight").sum().alias("_cp_total_weight"))
+        cp_totals = weight_totals.totals(
+            COUNTERPARTY_KEY, {"_exp_weight": "_cp_total_weight"}
         )
 
         exposures = (
@@ -1774,31 +1854,12 @@ class CRMProcessor:
         """
         return self.resolve_provisions(exposures, provisions, config)
 
-    def _add_crm_audit(
-        self,
-        exposures: pl.LazyFrame,
-    ) -> pl.LazyFrame:
-        """Add CRM processing audit trail."""
-        return exposures.with_columns([
-            pl.concat_str([
-                pl.lit("EAD: gross="),
-                pl.col("ead_gross").round(0).cast(pl.String),
-                pl.lit("; coll="),
-                pl.col("collateral_adjusted_value").round(0).cast(pl.String),
-                pl.lit("; guar="),
-                pl.col("guarantee_amount").round(0).cast(pl.String),
-                pl.lit("; prov="),
-                pl.col("provision_allocated").round(0).cast(pl.String),
-                pl.lit("; final="),
-                pl.col("ead_final").round(0).cast(pl.String),
-            ]).alias("crm_calculation"),
-        ])
-
     def _build_crm_audit(
         self,
         exposures: pl.LazyFrame,
     ) -> pl.LazyFrame:
         """Build CRM audit trail for reporting."""
+        cols = exposures.collect_schema().names()
         return exposures.select([
             pl.col("exposure_reference"),
             pl.col("counterparty_reference"),
@@ -1812,7 +1873,7 @@ class CRMProcessor:
             pl.col("ead_final"),
             pl.col("lgd_pre_crm"),
             pl.col("lgd_post_crm"),
-            pl.col("crm_calculation"),
+            *([pl.col("crm_calculation")] if "crm_calculation" in cols else []),
             # Pre/Post CRM tracking columns
             pl.col("pre_crm_counterparty_reference"),
             pl.col("pre_crm_exposure_class"),
@@ -0,0 +1,705 @@
+"""
+Data Quality Checker for RWA Calculations.
+
+Profiles and checks every table in a RawDataBundle before calculation:
+- Value-domain violations for categorical columns
+- Null counts and null rates per column
+- Negative amounts and out-of-range PD / LGD / percentages
+- Duplicate primary keys and null keys
+- Orphan references (exposures without counterparties, CRM items
+  without beneficiaries)
+- Per-column statistics (min, max, mean)
+
+Pipeline position:
+    Standalone. PipelineOrchestrator does not call the checker; run it on
+    a loaded RawDataBundle before calculating. The pipeline itself only
+    validates column value domains (validate_bundle_values).
+
+Every per-table check is expressed as a single aggregation over that
+table, so each table is scanned once. Reference checks are anti-joins.
+All queries are executed together in one pl.collect_all call, which
+runs them concurrently and shares common sub-plans (e.g. the counterparty
+key scan used by several reference checks).
+
+Usage:
+    from rwa_calc.engine.data_quality import create_data_quality_checker
+
+    checker = create_data_quality_checker()
+    report = checker.profile(raw_data, config)
+    report.profile.filter(pl.col("null_rate") > 0.1)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from rwa_calc.contracts.errors import (
+    ERROR_DUPLICATE_KEY,
+    ERROR_INVALID_COLUMN_VALUE,
+    ERROR_INVALID_VALUE,
+    ERROR_LGD_OUT_OF_RANGE,
+    ERROR_MISSING_FIELD,
+    ERROR_ORPHAN_REFERENCE,
+    ERROR_PD_OUT_OF_RANGE,
+    CalculationError,
+    ErrorCategory,
+    ErrorSeverity,
+)
+from rwa_calc.data.schemas import VALID_BENEFICIARY_TYPES
+
+if TYPE_CHECKING:
+    from rwa_calc.contracts.bundles import RawDataBundle
+    from rwa_calc.contracts.config import CalculationConfig
+
+
+# =============================================================================
+# Check Specifications
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class TableRules:
+    """
+    Data quality rules for a single input table.
+
+    Attributes:
+        key: Primary key column (checked for nulls and duplicates)
+        non_negative: Amount columns that must not be negative
+        ranges: Column -> (min, max) inclusive range for ratio columns
+    """
+
+    key: str | None = None
+    non_negative: tuple[str, ...] = ()
+    ranges: dict[str, tuple[float, float]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ReferenceRule:
+    """
+    Foreign key rule between two input tables.
+
+    Attributes:
+        table: Table holding the reference
+        column: Referencing column
+        parent: Table that must contain the referenced key
+        parent_column: Key column on the parent table
+        severity: Severity of orphan references
+    """
+
+    table: str
+    column: str
+    parent: str
+    parent_column: str
+    severity: ErrorSeverity = ErrorSeverity.ERROR
+
+
+TABLE_RULES: dict[str, TableRules] = {
+    "facilities": TableRules(
+        key="facility_reference",
+        non_negative=("limit",),
+        ranges={"lgd": (0.0, 1.25), "ccf_modelled": (0.0, 1.5)},
+    ),
+    "loans": TableRules(
+        key="loan_reference",
+        non_negative=("drawn_amount",),
+        ranges={"lgd": (0.0, 1.25)},
+    ),
+    "contingents": TableRules(
+        key="contingent_reference",
+        non_negative=("nominal_amount",),
+        ranges={"lgd": (0.0, 1.25), "ccf_modelled": (0.0, 1.5)},
+    ),
+    "counterparties": TableRules(
+        key="counterparty_reference",
+        non_negative=("annual_revenue", "total_assets"),
+    ),
+    "collateral": TableRules(
+        key="collateral_reference",
+        non_negative=("market_value", "nominal_value"),
+        ranges={"pledge_percentage": (0.0, 1.0)},
+    ),
+    "guarantees": TableRules(
+        key="guarantee_reference",
+        non_negative=("amount_covered",),
+        ranges={"percentage_covered": (0.0, 1.0)},
+    ),
+    "provisions": TableRules(
+        key="provision_reference",
+        non_negative=("amount",),
+    ),
+    "ratings": TableRules(
+        key="rating_reference",
+        ranges={"pd": (0.0, 1.0)},
+    ),
+    "specialised_lending": TableRules(key="exposure_reference"),
+    "equity_exposures": TableRules(
+        key="exposure_reference",
+        non_negative=("carrying_value", "fair_value"),
+    ),
+}
+
+REFERENCE_RULES: tuple[ReferenceRule, ...] = (
+    ReferenceRule("facilities", "counterparty_reference", "counterparties", "counterparty_reference"),
+    ReferenceRule("loans", "counterparty_reference", "counterparties", "counterparty_reference"),
+    ReferenceRule("contingents", "counterparty_reference", "counterparties", "counterparty_reference"),
+    ReferenceRule(
+        "ratings", "counterparty_reference", "counterparties", "counterparty_reference",
+        severity=ErrorSeverity.WARNING,
+    ),
+    ReferenceRule(
+        "guarantees", "guarantor", "counterparties", "counterparty_reference",
+        severity=ErrorSeverity.WARNING,
+    ),
+)
+
+# Tables whose rows point at a beneficiary via (beneficiary_type, beneficiary_reference)
+BENEFICIARY_TABLES = ("collateral", "guarantees", "provisions")
+
+# beneficiary_type -> (table, key column)
+_BENEFICIARY_SOURCES: dict[str, tuple[str, str]] = {
+    "counterparty": ("counterparties", "counterparty_reference"),
+    "loan": ("loans", "loan_reference"),
+    "facility": ("facilities", "facility_reference"),
+    "contingent": ("contingents", "contingent_reference"),
+}
+
+_RANGE_ERROR_CODES = {
+    "pd": ERROR_PD_OUT_OF_RANGE,
+    "lgd": ERROR_LGD_OUT_OF_RANGE,
+}
+
+# Maximum number of offending values quoted in a single error message
+_SAMPLE_SIZE = 5
+
+PROFILE_SCHEMA: dict[str, pl.DataType] = {
+    "table": pl.String,
+    "column": pl.String,
+    "dtype": pl.String,
+    "row_count": pl.Int64,
+    "null_count": pl.Int64,
+    "null_rate": pl.Float64,
+    "min": pl.String,
+    "max": pl.String,
+    "mean": pl.Float64,
+    "domain_violations": pl.Int64,
+    "negative_count": pl.Int64,
+    "out_of_range_count": pl.Int64,
+    "duplicate_count": pl.Int64,
+}
+
+
+# =============================================================================
+# Report
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class DataQualityReport:
+    """
+    Result of profiling a RawDataBundle.
+
+    Attributes:
+        errors: Data quality issues found
+        profile: One row per (table, column) with statistics and violation
+            counts (see PROFILE_SCHEMA)
+    """
+
+    errors: list[CalculationError]
+    profile: pl.DataFrame
+
+    @property
+    def has_errors(self) -> bool:
+        """Check if any errors (not warnings) were found."""
+        return any(
+            e.severity in (ErrorSeverity.ERROR, ErrorSeverity.CRITICAL)
+            for e in self.errors
+        )
+
+
+# =============================================================================
+# Data Quality Checker
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class _StatRef:
+    """Location of one aggregate in a table's profile query."""
+
+    column: str
+    stat: str
+
+
+class DataQualityChecker:
+    """
+    Profile raw input data and report data quality issues.
+
+    Implements DataQualityCheckerProtocol. All checks are lazy until the
+    single pl.collect_all at the end of profile().
+    """
+
+    def __init__(
+        self,
+        constraints: dict[str, dict[str, set[str]]] | None = None,
+        table_rules: dict[str, TableRules] | None = None,
+        reference_rules: tuple[ReferenceRule, ...] | None = None,
+    ) -> None:
+        """
+        Initialize DataQualityChecker.
+
+        Args:
+            constraints: Categorical value domains; defaults to COLUMN_VALUE_CONSTRAINTS
+            table_rules: Per-table rules; defaults to TABLE_RULES
+            reference_rules: Foreign key rules; defaults to REFERENCE_RULES
+        """
+        if constraints is None:
+            from rwa_calc.data.schemas import COLUMN_VALUE_CONSTRAINTS
+            constraints = COLUMN_VALUE_CONSTRAINTS
+
+        self._constraints = constraints
+        self._table_rules = TABLE_RULES if table_rules is None else table_rules
+        self._reference_rules = REFERENCE_RULES if reference_rules is None else reference_rules
+
+    def check(
+        self,
+        data: RawDataBundle,
+        config: CalculationConfig,
+    ) -> list[CalculationError]:
+        """
+        Run data quality checks on raw data.
+
+        Args:
+            data: Raw data bundle to check
+            config: Calculation configuration
+
+        Returns:
+            List of CalculationError for any issues found
+        """
+        return self.profile(data, config).errors
+
+    def profile(
+        self,
+        data: RawDataBundle,
+        config: CalculationConfig,
+    ) -> DataQualityReport:
+        """
+        Profile raw data and run all data quality checks.
+
+        Args:
+            data: Raw data bundle to profile
+            config: Calculation configuration (collect_engine is used)
+
+        Returns:
+            DataQualityReport with errors and the per-column profile table
+        """
+        tables = _bundle_tables(data)
+
+        queries: list[pl.LazyFrame] = []
+        table_plans: list[tuple[str, pl.Schema, dict[str, _StatRef]]] = []
+        for name, lf in tables.items():
+            schema = lf.collect_schema()
+            exprs, refs = self._table_expressions(name, schema)
+            queries.append(lf.select(exprs))
+            table_plans.append((name, schema, refs))
+
+        reference_checks = self._reference_queries(tables)
+        queries.extend(query for _, _, query in reference_checks)
+
+        frames, errors = _collect_concurrently(
+            queries,
+            labels=[name for name, _, _ in table_plans]
+            + [f"{table}.{column}" for table, column, _ in reference_checks],
+            engine=config.collect_engine,
+        )
+
+        profile_rows: list[dict] = []
+        table_frames, reference_frames = frames[:len(table_plans)], frames[len(table_plans):]
+        for (name, schema, refs), frame in zip(table_plans, table_frames, strict=True):
+            if frame is None:
+                continue
+            values = _stats_by_column(frame, refs)
+            profile_rows.extend(_profile_rows(name, schema, values))
+            errors.extend(self._table_errors(name, values))
+
+        for (table, column, _), frame in zip(reference_checks, reference_frames, strict=True):
+            if frame is None:
+                continue
+            errors.extend(self._reference_errors(table, column, frame))
+
+        profile = pl.DataFrame(profile_rows, schema=PROFILE_SCHEMA, orient="row")
+        return DataQualityReport(errors=errors, profile=profile)
+
+    # -------------------------------------------------------------------------
+    # Query construction
+    # -------------------------------------------------------------------------
+
+    def _table_expressions(
+        self,
+        name: str,
+        schema: pl.Schema,
+    ) -> tuple[list[pl.Expr], dict[str, _StatRef]]:
+        """Build the single aggregation select for one table."""
+        rules = self._table_rules.get(name, TableRules())
+        domains = self._constraints.get(name, {})
+
+        exprs: list[pl.Expr] = []
+        refs: dict[str, _StatRef] = {}
+
+        def add(expr: pl.Expr, column: str, stat: str) -> None:
+            alias = f"_dq_{len(exprs)}"
+            exprs.append(expr.alias(alias))
+            refs[alias] = _StatRef(column, stat)
+
+        add(pl.len(), "", "row_count")
+
+        for column, dtype in schema.items():
+            col = pl.col(column)
+            add(col.null_count(), column, "null_count")
+            if dtype.is_nested():
+                continue
+            add(col.min().cast(pl.String), column, "min")
+            add(col.max().cast(pl.String), column, "max")
+            if dtype.is_numeric():
+                add(col.mean().cast(pl.Float64), column, "mean")
+
+        for column, valid_values in domains.items():
+            if column not in schema or schema[column] != pl.String:
+                continue
+            valid_lower = {v.lower() for v in valid_values}
+            invalid = pl.col(column).is_not_null() & ~pl.col(column).str.to_lowercase().is_in(valid_lower)
+            add(invalid.sum(), column, "domain_violations")
+            add(_sample(pl.col(column).filter(invalid)), column, "domain_sample")
+
+        for column in rules.non_negative:
+            if column in schema and schema[column].is_numeric():
+                add((pl.col(column) < 0).sum(), column, "negative_count")
+
+        for column, (low, high) in rules.ranges.items():
+            if column in schema and schema[column].is_numeric():
+                out_of_range = (pl.col(column) < low) | (pl.col(column) > high)
+                add(out_of_range.sum(), column, "out_of_range_count")
+
+        if rules.key is not None and rules.key in schema:
+            key = pl.col(rules.key)
+            add(key.drop_nulls().len() - key.drop_nulls().n_unique(), rules.key, "duplicate_count")
+            add(_sample(key.filter(key.is_duplicated() & key.is_not_null())), rules.key, "duplicate_sample")
+
+        return exprs, refs
+
+    def _reference_queries(
+        self,
+        tables: dict[str, pl.LazyFrame],
+    ) -> list[tuple[str, str, pl.LazyFrame]]:
+        """Build anti-join queries that count orphan references."""
+        queries: list[tuple[str, str, pl.LazyFrame]] = []
+
+        for rule in self._reference_rules:
+            child = tables.get(rule.table)
+            parent = tables.get(rule.parent)
+            if child is None or parent is None:
+                continue
+            if rule.column not in child.collect_schema() or rule.parent_column not in parent.collect_schema():
+                continue
+            orphans = (
+                child.select(pl.col(rule.column).alias("reference"))
+                .drop_nulls()
+                .join(
+                    parent.select(pl.col(rule.parent_column).alias("reference")).unique(),
+                    on="reference",
+                    how="anti",
+                )
+            )
+            queries.append((rule.table, rule.column, _orphan_summary(orphans)))
+
+        beneficiaries = _beneficiary_keys(tables)
+        if beneficiaries is None:
+            return queries
+
+        for table in BENEFICIARY_TABLES:
+            lf = tables.get(table)
+            if lf is None:
+                continue
+            schema = lf.collect_schema()
+            if "beneficiary_type" not in schema or "beneficiary_reference" not in schema:
+                continue
+            orphans = (
+                lf.select(
+                    pl.col("beneficiary_type").str.to_lowercase(),
+                    pl.col("beneficiary_reference"),
+                )
+                .drop_nulls()
+                .filter(pl.col("beneficiary_type").is_in(VALID_BENEFICIARY_TYPES))
+                .join(beneficiaries, on=["beneficiary_type", "beneficiary_reference"], how="anti")
+                .select(
+                    pl.concat_str(
+                        [pl.col("beneficiary_type"), pl.col("beneficiary_reference")],
+                        separator=":",
+                    ).alias("reference")
+                )
+            )
+            queries.append((table, "beneficiary_reference", _orphan_summary(orphans)))
+
+        return queries
+
+    # -------------------------------------------------------------------------
+    # Error construction
+    # -------------------------------------------------------------------------
+
+    def _table_errors(
+        self,
+        name: str,
+        values: dict[str, dict[str, object]],
+    ) -> list[CalculationError]:
+        """Convert one table's aggregates into CalculationErrors."""
+        rules = self._table_rules.get(name, TableRules())
+        domains = self._constraints.get(name, {})
+        errors: list[CalculationError] = []
+
+        for column, stats in values.items():
+            violations = stats.get("domain_violations") or 0
+            if violations:
+                sorted_valid = sorted(domains[column])
+                bad_values = stats.get("domain_sample") or []
+                errors.append(CalculationError(
+                    code=ERROR_INVALID_COLUMN_VALUE,
+                    message=(
+                        f"[{name}] Invalid values {bad_values} for column '{column}' "
+                        f"({violations} row(s)). Valid values: {sorted_valid}"
+                    ),
+                    severity=ErrorSeverity.WARNING,
+                    category=ErrorCategory.DATA_QUALITY,
+                    field_name=column,
+                    expected_value=", ".join(sorted_valid),
+                    actual_value=", ".join(str(v) for v in bad_values),
+                ))
+
+            negatives = stats.get("negative_count") or 0
+            if negatives:
+                errors.append(CalculationError(
+                    code=ERROR_INVALID_VALUE,
+                    message=f"[{name}] Negative values in '{column}' ({negatives} row(s))",
+                    severity=ErrorSeverity.WARNING,
+                    category=ErrorCategory.DATA_QUALITY,
+                    field_name=column,
+                    expected_value=">= 0",
+                    actual_value=f"min {stats.get('min')}",
+                ))
+
+            out_of_range = stats.get("out_of_range_count") or 0
+            if out_of_range:
+                low, high = rules.ranges[column]
+                errors.append(CalculationError(
+                    code=_RANGE_ERROR_CODES.get(column, ERROR_INVALID_VALUE),
+                    message=(
+                        f"[{name}] Values of '{column}' outside [{low}, {high}] "
+                        f"({out_of_range} row(s))"
+                    ),
+                    severity=ErrorSeverity.ERROR,
+                    category=ErrorCategory.DATA_QUALITY,
+                    field_name=column,
+                    expected_value=f"[{low}, {high}]",
+                    actual_value=f"min {stats.get('min')}, max {stats.get('max')}",
+                ))
+
+        if rules.key is not None and rules.key in values:
+            key_stats = values[rules.key]
+            null_keys = key_stats.get("null_count") or 0
+            if null_keys:
+                errors.append(CalculationError(
+                    code=ERROR_MISSING_FIELD,
+                    message=f"[{name}] Null primary key '{rules.key}' ({null_keys} row(s))",
+                    severity=ErrorSeverity.ERROR,
+                    category=ErrorCategory.DATA_QUALITY,
+                    field_name=rules.key,
+                ))
+            duplicates = key_stats.get("duplicate_count") or 0
+            if duplicates:
+                sample = key_stats.get("duplicate_sample") or []
+                errors.append(CalculationError(
+                    code=ERROR_DUPLICATE_KEY,
+                    message=(
+                        f"[{name}] Duplicate values of key '{rules.key}' "
+                        f"({duplicates} extra row(s)), e.g. {sample}"
+                    ),
+                    severity=ErrorSeverity.ERROR,
+                    category=ErrorCategory.DATA_QUALITY,
+                    field_name=rules.key,
+                    actual_value=", ".join(str(v) for v in sample),
+                ))
+
+        return errors
+
+    def _reference_errors(
+        self,
+        table: str,
+        column: str,
+        frame: pl.DataFrame,
+    ) -> list[CalculationError]:
+        """Convert an orphan summary into CalculationErrors."""
+        count = frame["orphan_count"].item()
+        if not count:
+            return []
+
+        sample = frame["sample"].item().to_list()
+        severity = next(
+            (r.severity for r in self._reference_rules if r.table == table and r.column == column),
+            ErrorSeverity.WARNING,
+        )
+        return [CalculationError(
+            code=ERROR_ORPHAN_REFERENCE,
+            message=(
+                f"[{table}] {count} row(s) reference unknown '{column}' values, "
+                f"e.g. {sample}"
+            ),
+            severity=severity,
+            category=ErrorCategory.DATA_QUALITY,
+            field_name=column,
+            actual_value=", ".join(str(v) for v in sample),
+        )]
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _bundle_tables(data: RawDataBundle) -> dict[str, pl.LazyFrame]:
+    """Map table names to the non-empty LazyFrames of a RawDataBundle."""
+    frame_mapping: dict[str, pl.LazyFrame | None] = {
+        "facilities": data.facilities,
+        "loans": data.loans,
+        "contingents": data.contingents,
+        "counterparties": data.counterparties,
+        "collateral": data.collateral,
+        "guarantees": data.guarantees,
+        "provisions": data.provisions,
+        "ratings": data.ratings,
+        "specialised_lending": data.specialised_lending,
+        "equity_exposures": data.equity_exposures,
+        "facility_mappings": data.facility_mappings,
+        "org_mappings": data.org_mappings,
+        "lending_mappings": data.lending_mappings,
+        "fx_rates": data.fx_rates,
+    }
+    return {name: lf for name, lf in frame_mapping.items() if lf is not None}
+
+
+def _sample(expr: pl.Expr) -> pl.Expr:
+    """Aggregate up to _SAMPLE_SIZE distinct values of expr into a list."""
+    return expr.unique().sort().head(_SAMPLE_SIZE).cast(pl.String).implode()
+
+
+def _orphan_summary(orphans: pl.LazyFrame) -> pl.LazyFrame:
+    """Reduce an orphan frame (single 'reference' column) to count + sample."""
+    return orphans.select(
+        pl.len().alias("orphan_count"),
+        _sample(pl.col("reference")).alias("sample"),
+    )
+
+
+def _beneficiary_keys(tables: dict[str, pl.LazyFrame]) -> pl.LazyFrame | None:
+    """Union of (beneficiary_type, beneficiary_reference) keys across exposure tables."""
+    keys = [
+        tables[table].select(
+            pl.lit(beneficiary_type).alias("beneficiary_type"),
+            pl.col(column).cast(pl.String).alias("beneficiary_reference"),
+        )
+        for beneficiary_type, (table, column) in _BENEFICIARY_SOURCES.items()
+        if table in tables and column in tables[table].collect_schema()
+    ]
+    if not keys:
+        return None
+    return pl.concat(keys).unique()
+
+
+def _collect_concurrently(
+    queries: list[pl.LazyFrame],
+    labels: list[str],
+    engine: str,
+) -> tuple[list[pl.DataFrame | None], list[CalculationError]]:
+    """
+    Collect all queries in one pass, isolating failures per query.
+
+    Falls back to collecting each query separately if the combined
+    collect fails, so one malformed table does not hide the others.
+    """
+    try:
+        return list(pl.collect_all(queries, engine=engine)), []
+    except Exception:
+        pass
+
+    frames: list[pl.DataFrame | None] = []
+    errors: list[CalculationError] = []
+    for label, query in zip(labels, queries, strict=True):
+        try:
+            frames.append(query.collect(engine=engine))
+        except Exception as exc:
+            frames.append(None)
+            errors.append(CalculationError(
+                code=ERROR_INVALID_VALUE,
+                message=f"[{label}] Data quality checks could not be evaluated: {exc}",
+                severity=ErrorSeverity.WARNING,
+                category=ErrorCategory.DATA_QUALITY,
+            ))
+    return frames, errors
+
+
+def _stats_by_column(
+    frame: pl.DataFrame,
+    refs: dict[str, _StatRef],
+) -> dict[str, dict[str, object]]:
+    """Regroup a one-row aggregate frame into {column: {stat: value}}."""
+    row = frame.row(0, named=True)
+    values: dict[str, dict[str, object]] = {}
+    for alias, ref in refs.items():
+        value = row[alias]
+        if isinstance(value, pl.Series):
+            value = value.to_list()
+        values.setdefault(ref.column, {})[ref.stat] = value
+    return values
+
+
+def _profile_rows(
+    table: str,
+    schema: pl.Schema,
+    values: dict[str, dict[str, object]],
+) -> list[tuple]:
+    """Build profile rows (PROFILE_SCHEMA order) for one table."""
+    row_count = values[""]["row_count"]
+    rows = []
+    for column, dtype in schema.items():
+        stats = values.get(column, {})
+        null_count = stats.get("null_count", 0)
+        rows.append((
+            table,
+            column,
+            str(dtype),
+            row_count,
+            null_count,
+            null_count / row_count if row_count else 0.0,
+            stats.get("min"),
+            stats.get("max"),
+            stats.get("mean"),
+            stats.get("domain_violations"),
+            stats.get("negative_count"),
+            stats.get("out_of_range_count"),
+            stats.get("duplicate_count"),
+        ))
+    return rows
+
+
+# =============================================================================
+# Factory Function
+# =============================================================================
+
+
+def create_data_quality_checker() -> DataQualityChecker:
+    """
+    Create a DataQualityChecker instance.
+
+    Returns:
+        DataQualityChecker ready for use
+    """
+    return DataQualityChecker()
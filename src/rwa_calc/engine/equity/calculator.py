@@ -54,6 +54,7 @@ from rwa_calc.data.tables.crr_equity_rw import (
     lookup_equity_rw,
 )
 from rwa_calc.domain.enums import ApproachType, EquityType, ExposureClass
+from rwa_calc.engine.key_encoding import key_dtype
 
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
@@ -142,7 +143,7 @@ class EquityCalculator:
 
         if exposures is None:
             empty_frame = pl.LazyFrame({
-                "exposure_reference": pl.Series([], dtype=pl.String),
+                "exposure_reference": pl.Series([], dtype=key_dtype()),
                 "equity_type": pl.Series([], dtype=pl.String),
                 "ead_final": pl.Series([], dtype=pl.Float64),
                 "risk_weight": pl.Series([], dtype=pl.Float64),
@@ -166,7 +167,10 @@ class EquityCalculator:
 
         exposures = self._calculate_rwa(exposures)
 
-        audit = self._build_audit(exposures, approach)
+        audit = (
+            self._build_audit(exposures, approach, include_strings=config.audit_strings)
+            if config.audit_trail else None
+        )
 
         return EquityResultBundle(
             results=exposures,
@@ -352,6 +356,7 @@ class EquityCalculator:
         self,
         exposures: pl.LazyFrame,
         approach: str,
+        include_strings: bool = True,
     ) -> pl.LazyFrame:
         """Build equity calculation audit trail."""
         schema = exposures.collect_schema()
@@ -375,6 +380,8 @@ class EquityCalculator:
                 select_cols.append(col)
 
         audit = exposures.select(select_cols)
+        if not include_strings:
+            return audit
 
         article = "Art. 133 SA" if approach == "sa" else "Art. 155 IRB Simple"
 
@@ -30,6 +30,7 @@ from typing import TYPE_CHECKING
 
 import polars as pl
 
+
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
 
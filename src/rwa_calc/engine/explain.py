@@ -0,0 +1,386 @@
+"""
+Single-exposure drill-down for RWA calculator.
+
+Explains one exposure by running the full pipeline on its dependency
+closure instead of the whole book. The closure holds what the exposure's
+own calculation reads, and no more:
+
+- Facility tree: root facility and every descendant (undrawn headroom,
+  facility-level CRM allocation)
+- Owner: every exposure of the owning counterparty (counterparty-level CRM
+  allocation, SME supporting factor totals)
+- Lending group: every member and their exposures (retail threshold)
+- Descendants of any facility in the closure, so its undrawn amount is
+  complete; their owners contribute counterparty rows only
+- Collateral, guarantees and provisions attached to any of the above
+- Guarantors, org hierarchy ancestors and their ratings (rating inheritance,
+  guarantee substitution); a guarantor's own exposures are not included
+
+Each step is a fixed number of semi-joins, and hierarchy walks stop after
+MAX_HIERARCHY_DEPTH levels, so the closure does not grow to the exposure's
+whole connected component.
+
+Float results match the full run to a relative tolerance of about 1e-12,
+not bit for bit: group totals in the closure sum fewer rows, in a
+different order, than the same totals in the full run.
+
+Classes:
+    ExposureExplanation: Drill-down result for one exposure
+    ExposureExplainer: Build the dependency closure and run it
+
+Usage:
+    from rwa_calc.engine.explain import ExposureExplainer
+
+    explanation = ExposureExplainer().explain(raw_data, "LOAN_001", config)
+    explanation.results
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from rwa_calc.contracts.bundles import AggregatedResultBundle, RawDataBundle
+
+if TYPE_CHECKING:
+    from rwa_calc.contracts.config import CalculationConfig
+    from rwa_calc.engine.pipeline import PipelineOrchestrator
+
+
+# Suffix the hierarchy resolver appends to facility undrawn exposures
+UNDRAWN_SUFFIX = "_UNDRAWN"
+
+# Upper bound on facility and org hierarchy levels walked (as HierarchyResolver)
+MAX_HIERARCHY_DEPTH = 10
+
+# Key column of the reference frames closure steps semi-join against
+_KEY = "_key"
+
+
+@dataclass(frozen=True)
+class ExposureExplanation:
+    """
+    Drill-down result for one exposure.
+
+    Attributes:
+        exposure_reference: The explained exposure
+        results: The exposure's rows from the results frame, with audit strings
+        data: Raw data restricted to the exposure's dependency closure
+        result_bundle: Full pipeline output for the closure
+    """
+
+    exposure_reference: str
+    results: pl.DataFrame
+    data: RawDataBundle
+    result_bundle: AggregatedResultBundle
+
+
+class ExposureExplainer:
+    """
+    Explain a single exposure via its dependency closure.
+
+    Membership tests are semi-joins against small key frames; the restricted
+    tables are collected together in one pl.collect_all.
+    """
+
+    def explain(
+        self,
+        data: RawDataBundle,
+        exposure_reference: str,
+        config: CalculationConfig,
+        pipeline: PipelineOrchestrator | None = None,
+    ) -> ExposureExplanation:
+        """
+        Run the pipeline on one exposure's dependency closure.
+
+        Args:
+            data: Full raw data bundle
+            exposure_reference: Exposure to explain (loan, contingent,
+                facility undrawn or equity reference)
+            config: Calculation configuration (audit_mode is forced to "full")
+            pipeline: Pipeline to run the closure with (default: a new one)
+
+        Returns:
+            ExposureExplanation for the exposure
+
+        Raises:
+            ValueError: If the exposure is not in the data
+        """
+        if pipeline is None:
+            from rwa_calc.engine.pipeline import PipelineOrchestrator
+
+            pipeline = PipelineOrchestrator()
+
+        subset = self.closure(data, exposure_reference)
+        result_bundle = pipeline.run_with_data(subset, replace(config, audit_mode="full"))
+        results = (
+            result_bundle.results
+            .filter(pl.col("exposure_reference") == exposure_reference)
+            .collect()
+        )
+
+        return ExposureExplanation(
+            exposure_reference=exposure_reference,
+            results=results,
+            data=subset,
+            result_bundle=result_bundle,
+        )
+
+    def closure(self, data: RawDataBundle, exposure_reference: str) -> RawDataBundle:
+        """
+        Restrict raw data to one exposure's dependency closure.
+
+        Args:
+            data: Full raw data bundle
+            exposure_reference: Exposure to explain
+
+        Returns:
+            RawDataBundle holding only the rows the exposure depends on
+
+        Raises:
+            ValueError: If the exposure is not in the data
+        """
+        equity = self._equity_closure(data, exposure_reference)
+        if equity is not None:
+            return equity
+
+        seeds = {exposure_reference}
+        if exposure_reference.endswith(UNDRAWN_SUFFIX):
+            seeds.add(exposure_reference.removesuffix(UNDRAWN_SUFFIX))
+
+        exposure_tables = self._exposure_tables(data)
+        owners = self._counterparties_of(exposure_tables, seeds)
+        if not owners:
+            raise ValueError(f"Exposure {exposure_reference!r} not found in input data")
+
+        # Facility tree: walk up to the root, then down to every descendant
+        refs = self._walk(
+            data.facility_mappings, "child_reference", "parent_facility_reference", seeds
+        )
+        refs = self._walk(
+            data.facility_mappings, "parent_facility_reference", "child_reference", refs
+        )
+
+        # Owners and their lending groups, with every exposure they hold
+        cps = self._lending_groups(data.lending_mappings, owners)
+        refs |= self._exposures_of(exposure_tables, cps)
+
+        # Descendants of facilities held by those counterparties (undrawn headroom)
+        refs = self._walk(
+            data.facility_mappings, "parent_facility_reference", "child_reference", refs
+        )
+
+        # CRM attached to any exposure or counterparty in the closure
+        beneficiaries = refs | cps
+        guarantees = self._semi(data.guarantees, "beneficiary_reference", beneficiaries)
+
+        # Counterparty and rating rows for owners of the closure's exposures,
+        # guarantors and their org hierarchy ancestors
+        related = (
+            cps
+            | self._counterparties_of(exposure_tables, refs)
+            | self._values(guarantees, "guarantor")
+        )
+        related = self._walk(
+            data.org_mappings,
+            "child_counterparty_reference",
+            "parent_counterparty_reference",
+            related,
+        )
+
+        return self._restrict(
+            data,
+            facilities=self._semi(data.facilities, "facility_reference", refs),
+            loans=self._semi(data.loans, "loan_reference", refs),
+            contingents=self._semi(data.contingents, "contingent_reference", refs),
+            counterparties=self._semi(data.counterparties, "counterparty_reference", related),
+            collateral=self._semi(data.collateral, "beneficiary_reference", beneficiaries),
+            guarantees=guarantees,
+            provisions=self._semi(data.provisions, "beneficiary_reference", beneficiaries),
+            ratings=self._semi(data.ratings, "counterparty_reference", related),
+            facility_mappings=self._semi(data.facility_mappings, "child_reference", refs),
+            org_mappings=self._semi(
+                data.org_mappings, "child_counterparty_reference", related
+            ),
+            lending_mappings=self._semi_either(
+                data.lending_mappings,
+                "parent_counterparty_reference",
+                "child_counterparty_reference",
+                cps,
+            ),
+            specialised_lending=self._semi(data.specialised_lending, "exposure_reference", refs),
+            equity_exposures=self._semi(data.equity_exposures, "exposure_reference", set()),
+        )
+
+    # =========================================================================
+    # Private Methods - Closure Steps
+    # =========================================================================
+
+    def _walk(
+        self,
+        mappings: pl.LazyFrame | None,
+        from_col: str,
+        to_col: str,
+        keys: set[str],
+    ) -> set[str]:
+        """Keys plus every key reachable from them along from_col -> to_col edges."""
+        if mappings is None or not {from_col, to_col} <= set(mappings.collect_schema().names()):
+            return set(keys)
+
+        reached = set(keys)
+        frontier = set(keys)
+        for _ in range(MAX_HIERARCHY_DEPTH):
+            if not frontier:
+                break
+            found = self._values(self._semi(mappings, from_col, frontier), to_col)
+            frontier = found - reached
+            reached |= frontier
+        return reached
+
+    def _lending_groups(
+        self,
+        lending_mappings: pl.LazyFrame | None,
+        counterparties: set[str],
+    ) -> set[str]:
+        """Counterparties plus every member of the lending groups they belong to."""
+        parent_col = "parent_counterparty_reference"
+        child_col = "child_counterparty_reference"
+        anchors = counterparties | self._values(
+            self._semi(lending_mappings, child_col, counterparties), parent_col
+        )
+        return anchors | self._values(self._semi(lending_mappings, parent_col, anchors), child_col)
+
+    def _equity_closure(
+        self,
+        data: RawDataBundle,
+        exposure_reference: str,
+    ) -> RawDataBundle | None:
+        """Closure for an equity exposure (the row and its counterparty), or None."""
+        if data.equity_exposures is None:
+            return None
+
+        equity = self._semi(data.equity_exposures, "exposure_reference", {exposure_reference})
+        cps = self._values(equity, "counterparty_reference")
+        if not cps:
+            return None
+
+        return self._restrict(
+            data,
+            facilities=self._semi(data.facilities, "facility_reference", set()),
+            loans=self._semi(data.loans, "loan_reference", set()),
+            contingents=self._semi(data.contingents, "contingent_reference", set()),
+            counterparties=self._semi(data.counterparties, "counterparty_reference", cps),
+            collateral=None,
+            guarantees=None,
+            provisions=None,
+            ratings=self._semi(data.ratings, "counterparty_reference", cps),
+            facility_mappings=self._semi(data.facility_mappings, "child_reference", set()),
+            org_mappings=None,
+            lending_mappings=self._semi(
+                data.lending_mappings, "child_counterparty_reference", set()
+            ),
+            specialised_lending=None,
+            equity_exposures=equity,
+        )
+
+    # =========================================================================
+    # Private Methods - Helpers
+    # =========================================================================
+
+    def _exposure_tables(self, data: RawDataBundle) -> list[tuple[pl.LazyFrame, str]]:
+        """Exposure tables with their reference columns."""
+        tables = [(data.facilities, "facility_reference"), (data.loans, "loan_reference")]
+        if data.contingents is not None:
+            tables.append((data.contingents, "contingent_reference"))
+        return [(frame, col) for frame, col in tables if col in frame.collect_schema().names()]
+
+    def _counterparties_of(
+        self,
+        exposure_tables: list[tuple[pl.LazyFrame, str]],
+        refs: set[str],
+    ) -> set[str]:
+        """Counterparties owning any of the given exposure references."""
+        frames = [self._semi(frame, ref_col, refs) for frame, ref_col in exposure_tables]
+        return self._values_all(frames, "counterparty_reference")
+
+    def _exposures_of(
+        self,
+        exposure_tables: list[tuple[pl.LazyFrame, str]],
+        counterparties: set[str],
+    ) -> set[str]:
+        """Exposure references held by any of the given counterparties."""
+        frames = [
+            self._semi(frame, "counterparty_reference", counterparties).select(
+                pl.col(ref_col).alias(_KEY)
+            )
+            for frame, ref_col in exposure_tables
+        ]
+        return self._values_all(frames, _KEY)
+
+    def _semi(
+        self,
+        frame: pl.LazyFrame | None,
+        column: str,
+        keys: set[str],
+    ) -> pl.LazyFrame | None:
+        """Rows of an optional frame whose column is in keys (lazy semi-join)."""
+        if frame is None or column not in frame.collect_schema().names():
+            return frame
+        return frame.join(self._key_frame(keys), left_on=column, right_on=_KEY, how="semi")
+
+    def _semi_either(
+        self,
+        frame: pl.LazyFrame | None,
+        left: str,
+        right: str,
+        keys: set[str],
+    ) -> pl.LazyFrame | None:
+        """Rows of an optional frame where either column is in keys."""
+        if frame is None:
+            return None
+        names = frame.collect_schema().names()
+        if left not in names or right not in names:
+            return frame
+        return pl.concat(
+            [self._semi(frame, left, keys), self._semi(frame, right, keys)],
+            how="vertical",
+        ).unique(maintain_order=True)
+
+    def _key_frame(self, keys: set[str]) -> pl.LazyFrame:
+        """Single-column frame of keys to semi-join against."""
+        return pl.LazyFrame({_KEY: sorted(keys)}, schema={_KEY: pl.String})
+
+    def _values(self, frame: pl.LazyFrame | None, column: str) -> set[str]:
+        """Distinct non-null values of a column of a (small) frame."""
+        return self._values_all([frame], column)
+
+    def _values_all(self, frames: list[pl.LazyFrame | None], column: str) -> set[str]:
+        """Distinct non-null values of a column across frames, collected together."""
+        queries = [
+            frame.select(pl.col(column).drop_nulls().unique())
+            for frame in frames
+            if frame is not None and column in frame.collect_schema().names()
+        ]
+        values: set[str] = set()
+        for df in pl.collect_all(queries) if queries else []:
+            values |= set(df.to_series())
+        return values
+
+    def _restrict(self, data: RawDataBundle, **tables: pl.LazyFrame | None) -> RawDataBundle:
+        """Replace tables in the bundle, collecting them together in one pass."""
+        names = [name for name, frame in tables.items() if frame is not None]
+        frames = pl.collect_all([tables[name] for name in names])
+        collected = {name: df.lazy() for name, df in zip(names, frames, strict=True)}
+        return replace(data, **{**tables, **collected})
+
+
+def create_exposure_explainer() -> ExposureExplainer:
+    """
+    Create an ExposureExplainer instance.
+
+    Returns:
+        ExposureExplainer ready for use
+    """
+    return ExposureExplainer()
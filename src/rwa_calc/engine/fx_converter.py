@@ -4,7 +4,14 @@ FX conversion module for RWA calculator.
 Provides currency conversion functionality to convert exposure amounts
 from their original currencies to a configurable reporting currency.
 
+Rates are resolved once per run into an FXRateVector: one rate per
+currency into the base currency, taken from a direct quote, the inverse
+of a base-currency quote, or a cross rate through a pivot currency.
+Each table is then converted with an in-expression lookup into that
+small vector instead of a join against the rates table.
+
 Classes:
+    FXRateVector: Resolved currency -> base currency rates for one run
     FXConverter: Main converter for applying FX rates to exposures and CRM data
 
 Usage:
@@ -17,6 +24,8 @@ Usage:
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass, field
+from datetime import date
 from typing import TYPE_CHECKING
 
 import polars as pl
@@ -27,6 +36,60 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+# Currency cross rates are triangulated through
+DEFAULT_PIVOT_CURRENCY = "USD"
+
+# Rates older than this (days before the reporting date) are flagged stale
+DEFAULT_MAX_RATE_AGE_DAYS = 5
+
+# Temporary column holding each row's resolved rate
+_RATE_COLUMN = "_fx_rate"
+
+
+@dataclass(frozen=True)
+class FXRateVector:
+    """
+    Resolved currency -> base currency rates for one run.
+
+    The base currency itself has no entry, so its rows keep a null rate
+    and are never converted.
+
+    Attributes:
+        base_currency: Currency every rate converts into
+        rates: Currency -> multiplier into base_currency
+        sources: Currency -> how the rate was obtained
+            ("direct", "inverse" or "triangulated")
+        stale: Currencies whose rate is older than the staleness limit
+        unresolved: Quoted currencies with no direct, inverse or
+            triangulated rate into base_currency (left unconverted)
+    """
+
+    base_currency: str
+    rates: dict[str, float] = field(default_factory=dict)
+    sources: dict[str, str] = field(default_factory=dict)
+    stale: tuple[str, ...] = ()
+    unresolved: tuple[str, ...] = ()
+
+    def rate_expr(self, column: str = "currency") -> pl.Expr:
+        """
+        Rate for each row's currency, null where none is known.
+
+        Args:
+            column: Currency column
+
+        Returns:
+            Float64 expression looking the currency up in the vector
+        """
+        if not self.rates:
+            return pl.lit(None, dtype=pl.Float64)
+        return pl.col(column).replace_strict(
+            list(self.rates),
+            list(self.rates.values()),
+            default=None,
+            return_dtype=pl.Float64,
+        )
+
+
 class FXConverter:
     """
     Convert exposure and CRM amounts to reporting currency.
@@ -41,9 +104,70 @@ class FXConverter:
     - Converts guarantee amount_covered
     - Converts provision amount
     - Preserves original values for audit trail
+    - Resolves rates once per fx_rates table and base currency, with
+      inverse quotes and cross rates through a pivot currency
     - Handles missing FX rates gracefully (keeps original currency)
     """
 
+    def __init__(
+        self,
+        pivot_currency: str = DEFAULT_PIVOT_CURRENCY,
+        max_rate_age_days: int = DEFAULT_MAX_RATE_AGE_DAYS,
+    ) -> None:
+        """
+        Initialize FXConverter.
+
+        Args:
+            pivot_currency: Currency cross rates are triangulated through
+            max_rate_age_days: Age (days before the reporting date) beyond
+                which dated rates are flagged stale
+        """
+        self.pivot_currency = pivot_currency
+        self.max_rate_age_days = max_rate_age_days
+        self._resolved: tuple[pl.LazyFrame, tuple, FXRateVector] | None = None
+
+    def resolve_rates(
+        self,
+        fx_rates: pl.LazyFrame,
+        config: CalculationConfig,
+    ) -> FXRateVector:
+        """
+        Resolve one rate per currency into the base currency.
+
+        For each currency the first available of these is used:
+        a direct quote into the base currency, the inverse of a quote
+        from the base currency, or the cross rate through the pivot
+        currency (either leg direct or inverse).
+
+        When fx_rates has a rate_date column, the latest rate per pair on
+        or before the reporting date is used, and currencies whose rate
+        is older than max_rate_age_days are listed as stale. Quoted
+        currencies with no rate path into the base currency are listed as
+        unresolved.
+
+        The vector is memoised for the last fx_rates table and base
+        currency, so converting several tables resolves rates once.
+
+        Args:
+            fx_rates: FX rates with currency_from, currency_to, rate columns
+                (and optionally rate_date)
+            config: Calculation configuration with base_currency
+
+        Returns:
+            FXRateVector for the run
+        """
+        key = (config.base_currency, config.reporting_date)
+        # One read of the memo: concurrent runs may replace it at any time
+        resolved = self._resolved
+        if resolved is not None:
+            frame, cached_key, vector = resolved
+            if frame is fx_rates and cached_key == key:
+                return vector
+
+        vector = self._build_vector(fx_rates, config.base_currency, config.reporting_date)
+        self._resolved = (fx_rates, key, vector)
+        return vector
+
     def convert_exposures(
         self,
         exposures: pl.LazyFrame,
@@ -64,92 +188,35 @@ class FXConverter:
             - original_amount: Total amount before conversion
             - fx_rate_applied: Rate used for conversion (null if none)
         """
+        original_amount = (
+            pl.col("drawn_amount") + pl.col("interest").fill_null(0.0) + pl.col("nominal_amount")
+        )
+
         if fx_rates is None or not config.apply_fx_conversion:
             # No FX rates or conversion disabled - add null audit columns
             return exposures.with_columns([
                 pl.col("currency").alias("original_currency"),
-                (pl.col("drawn_amount") + pl.col("interest").fill_null(0.0) + pl.col("nominal_amount")).alias("original_amount"),
+                original_amount.alias("original_amount"),
                 pl.lit(None).cast(pl.Float64).alias("fx_rate_applied"),
             ])
 
-        target_currency = config.base_currency
-
-        # Filter FX rates to only those targeting our base currency
-        rates_to_target = fx_rates.filter(
-            pl.col("currency_to") == target_currency
-        ).select([
-            pl.col("currency_from"),
-            pl.col("rate"),
-        ])
-
-        # Join exposures with FX rates on currency
-        converted = exposures.join(
-            rates_to_target,
-            left_on="currency",
-            right_on="currency_from",
-            how="left",
-        )
+        vector = self.resolve_rates(fx_rates, config)
 
-        # Apply conversion with audit trail
-        converted = converted.with_columns([
-            # Preserve original currency
+        # Audit trail: original currency and total amount (including accrued interest),
+        # and the rate applied (null if same currency or no rate)
+        converted = exposures.with_columns([
             pl.col("currency").alias("original_currency"),
-            # Preserve original total amount (including accrued interest)
-            (pl.col("drawn_amount") + pl.col("interest").fill_null(0.0) + pl.col("nominal_amount")).alias("original_amount"),
-            # Track rate applied (null if same currency or no rate)
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.lit(None).cast(pl.Float64))
-            .otherwise(pl.col("rate"))
-            .alias("fx_rate_applied"),
-        ])
-
-        # Convert amounts where rate is available
-        # If currency matches target or no rate found, keep original amounts
-        converted = converted.with_columns([
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("drawn_amount"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("drawn_amount") * pl.col("rate"))
-            .otherwise(pl.col("drawn_amount"))
-            .alias("drawn_amount"),
-
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("undrawn_amount"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("undrawn_amount") * pl.col("rate"))
-            .otherwise(pl.col("undrawn_amount"))
-            .alias("undrawn_amount"),
-
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("nominal_amount"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("nominal_amount") * pl.col("rate"))
-            .otherwise(pl.col("nominal_amount"))
-            .alias("nominal_amount"),
-
-            # Convert interest (nullable - preserve nulls through conversion)
-            pl.when(pl.col("interest").is_null())
-            .then(pl.lit(None).cast(pl.Float64))
-            .when(pl.col("currency") == target_currency)
-            .then(pl.col("interest"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("interest") * pl.col("rate"))
-            .otherwise(pl.col("interest"))
-            .alias("interest"),
-
-            # Update currency to target where conversion applied
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("currency"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.lit(target_currency))
-            .otherwise(pl.col("currency"))
-            .alias("currency"),
-        ])
-
-        # Drop the temporary rate column from join
-        converted = converted.drop("rate")
+            original_amount.alias("original_amount"),
+            vector.rate_expr().alias(_RATE_COLUMN),
+        ]).with_columns(
+            pl.col(_RATE_COLUMN).alias("fx_rate_applied"),
+        )
 
-        return converted
+        return self._apply_rate(
+            converted,
+            ["drawn_amount", "undrawn_amount", "nominal_amount", "interest"],
+            vector,
+        )
 
     def convert_collateral(
         self,
@@ -171,54 +238,13 @@ class FXConverter:
         if fx_rates is None or not config.apply_fx_conversion:
             return collateral
 
-        target_currency = config.base_currency
-
-        # Filter FX rates to only those targeting our base currency
-        rates_to_target = fx_rates.filter(
-            pl.col("currency_to") == target_currency
-        ).select([
-            pl.col("currency_from"),
-            pl.col("rate"),
-        ])
-
-        # Join collateral with FX rates on currency
-        converted = collateral.join(
-            rates_to_target,
-            left_on="currency",
-            right_on="currency_from",
-            how="left",
+        vector = self.resolve_rates(fx_rates, config)
+        return self._apply_rate(
+            collateral.with_columns(vector.rate_expr().alias(_RATE_COLUMN)),
+            ["market_value", "nominal_value"],
+            vector,
         )
 
-        # Convert amounts where rate is available
-        converted = converted.with_columns([
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("market_value"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("market_value") * pl.col("rate"))
-            .otherwise(pl.col("market_value"))
-            .alias("market_value"),
-
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("nominal_value"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("nominal_value") * pl.col("rate"))
-            .otherwise(pl.col("nominal_value"))
-            .alias("nominal_value"),
-
-            # Update currency to target where conversion applied
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("currency"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.lit(target_currency))
-            .otherwise(pl.col("currency"))
-            .alias("currency"),
-        ])
-
-        # Drop the temporary rate column from join
-        converted = converted.drop("rate")
-
-        return converted
-
     def convert_guarantees(
         self,
         guarantees: pl.LazyFrame,
@@ -239,47 +265,13 @@ class FXConverter:
         if fx_rates is None or not config.apply_fx_conversion:
             return guarantees
 
-        target_currency = config.base_currency
-
-        # Filter FX rates to only those targeting our base currency
-        rates_to_target = fx_rates.filter(
-            pl.col("currency_to") == target_currency
-        ).select([
-            pl.col("currency_from"),
-            pl.col("rate"),
-        ])
-
-        # Join guarantees with FX rates on currency
-        converted = guarantees.join(
-            rates_to_target,
-            left_on="currency",
-            right_on="currency_from",
-            how="left",
+        vector = self.resolve_rates(fx_rates, config)
+        return self._apply_rate(
+            guarantees.with_columns(vector.rate_expr().alias(_RATE_COLUMN)),
+            ["amount_covered"],
+            vector,
         )
 
-        # Convert amounts where rate is available
-        converted = converted.with_columns([
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("amount_covered"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("amount_covered") * pl.col("rate"))
-            .otherwise(pl.col("amount_covered"))
-            .alias("amount_covered"),
-
-            # Update currency to target where conversion applied
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("currency"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.lit(target_currency))
-            .otherwise(pl.col("currency"))
-            .alias("currency"),
-        ])
-
-        # Drop the temporary rate column from join
-        converted = converted.drop("rate")
-
-        return converted
-
     def convert_provisions(
         self,
         provisions: pl.LazyFrame,
@@ -300,48 +292,13 @@ class FXConverter:
         if fx_rates is None or not config.apply_fx_conversion:
             return provisions
 
-        target_currency = config.base_currency
-
-        # Filter FX rates to only those targeting our base currency
-        rates_to_target = fx_rates.filter(
-            pl.col("currency_to") == target_currency
-        ).select([
-            pl.col("currency_from"),
-            pl.col("rate"),
-        ])
-
-        # Join provisions with FX rates on currency
-        converted = provisions.join(
-            rates_to_target,
-            left_on="currency",
-            right_on="currency_from",
-            how="left",
+        vector = self.resolve_rates(fx_rates, config)
+        return self._apply_rate(
+            provisions.with_columns(vector.rate_expr().alias(_RATE_COLUMN)),
+            ["amount"],
+            vector,
         )
 
-        # Convert amounts where rate is available
-        converted = converted.with_columns([
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("amount"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("amount") * pl.col("rate"))
-            .otherwise(pl.col("amount"))
-            .alias("amount"),
-
-            # Update currency to target where conversion applied
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("currency"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.lit(target_currency))
-            .otherwise(pl.col("currency"))
-            .alias("currency"),
-        ])
-
-        # Drop the temporary rate column from join
-        converted = converted.drop("rate")
-
-        return converted
-
-
     def convert_equity_exposures(
         self,
         equity_exposures: pl.LazyFrame,
@@ -362,53 +319,144 @@ class FXConverter:
         if fx_rates is None or not config.apply_fx_conversion:
             return equity_exposures
 
-        target_currency = config.base_currency
-
-        # Filter FX rates to only those targeting our base currency
-        rates_to_target = fx_rates.filter(
-            pl.col("currency_to") == target_currency
-        ).select([
-            pl.col("currency_from"),
-            pl.col("rate"),
-        ])
-
-        # Join equity exposures with FX rates on currency
-        converted = equity_exposures.join(
-            rates_to_target,
-            left_on="currency",
-            right_on="currency_from",
-            how="left",
+        vector = self.resolve_rates(fx_rates, config)
+        return self._apply_rate(
+            equity_exposures.with_columns(vector.rate_expr().alias(_RATE_COLUMN)),
+            ["carrying_value", "fair_value"],
+            vector,
         )
 
-        # Convert amounts where rate is available
-        converted = converted.with_columns([
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("carrying_value"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("carrying_value") * pl.col("rate"))
-            .otherwise(pl.col("carrying_value"))
-            .alias("carrying_value"),
-
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("fair_value"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.col("fair_value") * pl.col("rate"))
-            .otherwise(pl.col("fair_value"))
-            .alias("fair_value"),
-
-            # Update currency to target where conversion applied
-            pl.when(pl.col("currency") == target_currency)
-            .then(pl.col("currency"))
-            .when(pl.col("rate").is_not_null())
-            .then(pl.lit(target_currency))
-            .otherwise(pl.col("currency"))
-            .alias("currency"),
-        ])
+    # =========================================================================
+    # Private Methods - Rate Resolution
+    # =========================================================================
+
+    def _build_vector(
+        self,
+        fx_rates: pl.LazyFrame,
+        base_currency: str,
+        reporting_date: date,
+    ) -> FXRateVector:
+        """Collect the quotes and resolve each currency into base_currency."""
+        quotes, quote_dates = self._latest_quotes(fx_rates, reporting_date)
+
+        rates: dict[str, float] = {}
+        sources: dict[str, str] = {}
+        pairs: dict[str, list[tuple[str, str]]] = {}
+
+        def to_currency(currency: str, target: str) -> tuple[float, str, tuple[str, str]] | None:
+            """Rate from currency into target, from a direct or inverse quote."""
+            direct = quotes.get((currency, target))
+            if direct is not None:
+                return direct, "direct", (currency, target)
+            inverse = quotes.get((target, currency))
+            if inverse:
+                return 1.0 / inverse, "inverse", (target, currency)
+            return None
+
+        currencies = {c for pair in quotes for c in pair} - {base_currency}
+        pivot = self.pivot_currency
+
+        for currency in sorted(currencies):
+            leg = to_currency(currency, base_currency)
+            if leg is not None:
+                rates[currency], sources[currency], pair = leg
+                pairs[currency] = [pair]
+                continue
+
+            if currency == pivot:
+                continue
+            first = to_currency(currency, pivot)
+            second = to_currency(pivot, base_currency)
+            if first is not None and second is not None:
+                rates[currency] = first[0] * second[0]
+                sources[currency] = "triangulated"
+                pairs[currency] = [first[2], second[2]]
+
+        unresolved = sorted(currencies - set(rates))
+        if unresolved:
+            logger.warning(
+                "No FX rate into %s for %s; amounts in these currencies are not converted",
+                base_currency,
+                ", ".join(unresolved),
+            )
+
+        stale: list[str] = []
+        if quote_dates:
+            for currency, used in pairs.items():
+                oldest = min(quote_dates[pair] for pair in used)
+                if (reporting_date - oldest).days > self.max_rate_age_days:
+                    stale.append(currency)
+            if stale:
+                logger.warning(
+                    "FX rates older than %d days for %s",
+                    self.max_rate_age_days,
+                    ", ".join(stale),
+                )
+
+        return FXRateVector(
+            base_currency=base_currency,
+            rates=rates,
+            sources=sources,
+            stale=tuple(stale),
+            unresolved=tuple(unresolved),
+        )
 
-        # Drop the temporary rate column from join
-        converted = converted.drop("rate")
+    @staticmethod
+    def _latest_quotes(
+        fx_rates: pl.LazyFrame,
+        reporting_date: date,
+    ) -> tuple[dict[tuple[str, str], float], dict[tuple[str, str], date]]:
+        """Latest quote per (currency_from, currency_to), with its date if dated."""
+        dated = "rate_date" in fx_rates.collect_schema().names()
 
-        return converted
+        quotes_lf = fx_rates.filter(
+            pl.col("rate").is_not_null() & (pl.col("currency_from") != pl.col("currency_to"))
+        )
+        if dated:
+            quotes_lf = quotes_lf.filter(
+                pl.col("rate_date") <= reporting_date
+            ).sort("rate_date").group_by(["currency_from", "currency_to"]).agg(
+                pl.col("rate").last(),
+                pl.col("rate_date").last(),
+            )
+        else:
+            quotes_lf = quotes_lf.group_by(
+                ["currency_from", "currency_to"], maintain_order=True
+            ).agg(pl.col("rate").first())
+
+        quotes: dict[tuple[str, str], float] = {}
+        quote_dates: dict[tuple[str, str], date] = {}
+        for row in quotes_lf.collect().iter_rows(named=True):
+            pair = (row["currency_from"], row["currency_to"])
+            quotes[pair] = row["rate"]
+            if dated:
+                quote_dates[pair] = row["rate_date"]
+        return quotes, quote_dates
+
+    # =========================================================================
+    # Private Methods - Conversion
+    # =========================================================================
+
+    @staticmethod
+    def _apply_rate(
+        frame: pl.LazyFrame,
+        amount_columns: list[str],
+        vector: FXRateVector,
+    ) -> pl.LazyFrame:
+        """
+        Multiply amounts by the resolved rate and relabel converted rows.
+
+        Rows in the base currency or without a rate keep their amounts and
+        currency. Null amounts stay null.
+        """
+        rate = pl.col(_RATE_COLUMN)
+        return frame.with_columns([
+            *[(pl.col(c) * rate.fill_null(1.0)).alias(c) for c in amount_columns],
+            pl.when(rate.is_not_null())
+            .then(pl.lit(vector.base_currency))
+            .otherwise(pl.col("currency"))
+            .alias("currency"),
+        ]).drop(_RATE_COLUMN)
 
 
 def create_fx_converter() -> FXConverter:
@@ -24,7 +24,9 @@ Usage:
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import polars as pl
@@ -35,6 +37,15 @@ from rwa_calc.contracts.bundles import (
     ResolvedHierarchyBundle,
 )
 from rwa_calc.engine.fx_converter import FXConverter
+from rwa_calc.engine.hierarchy_index import HierarchyIndex
+from rwa_calc.engine.key_aggregates import (
+    COUNTERPARTY_KEY,
+    FACILITY_KEY,
+    LENDING_GROUP_KEY,
+    KeyAggregates,
+)
+from rwa_calc.engine.key_encoding import key_dtype, undrawn_reference
+from rwa_calc.engine.ratings import RatingSelector
 
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
@@ -61,8 +72,22 @@ class HierarchyResolver:
     - Aggregating lending group exposures for retail threshold
 
     All operations use Polars LazyFrames for deferred execution.
+
+    With an index directory, ultimate parents and facility roots come from
+    a persisted HierarchyIndex that is updated incrementally each run.
     """
 
+    def __init__(self, index_dir: str | Path | None = None) -> None:
+        """
+        Initialize HierarchyResolver.
+
+        Args:
+            index_dir: Directory of the persisted hierarchy index (optional).
+                Without one, hierarchies are resolved from scratch each run.
+        """
+        self.index_dir = Path(index_dir) if index_dir is not None else None
+        self._index_lock = threading.Lock()
+
     def _is_valid_optional_data(
         self,
         data: pl.LazyFrame | None,
@@ -116,11 +141,18 @@ class HierarchyResolver:
         """
         errors: list[HierarchyError] = []
 
+        # Step 0: Bring the persisted hierarchy index up to date (if configured)
+        hierarchy_index = self._refresh_hierarchy_index(data)
+
         # Step 1: Build counterparty hierarchy lookup
         counterparty_lookup, cp_errors = self._build_counterparty_lookup(
             data.counterparties,
             data.org_mappings,
             data.ratings,
+            config,
+            ultimate_parents=(
+                hierarchy_index.ultimate_parent_lookup() if hierarchy_index else None
+            ),
         )
         errors.extend(cp_errors)
 
@@ -131,6 +163,9 @@ class HierarchyResolver:
             data.facilities,
             data.facility_mappings,
             counterparty_lookup,
+            facility_root_lookup=(
+                hierarchy_index.facility_root_lookup() if hierarchy_index else None
+            ),
         )
         errors.extend(exp_errors)
 
@@ -143,6 +178,26 @@ class HierarchyResolver:
         equity_exposures = data.equity_exposures
 
         if config.apply_fx_conversion and data.fx_rates is not None:
+            # Rates are resolved once and shared by every conversion below
+            fx_vector = fx_converter.resolve_rates(data.fx_rates, config)
+            if fx_vector.stale:
+                errors.append(HierarchyError(
+                    error_type="stale_fx_rate",
+                    message=(
+                        f"FX rates older than {fx_converter.max_rate_age_days} days "
+                        f"used for: {', '.join(fx_vector.stale)}"
+                    ),
+                    context={"currencies": list(fx_vector.stale)},
+                ))
+            if fx_vector.unresolved:
+                errors.append(HierarchyError(
+                    error_type="missing_fx_rate",
+                    message=(
+                        f"No FX rate into {config.base_currency} for: "
+                        f"{', '.join(fx_vector.unresolved)}; amounts are not converted"
+                    ),
+                    context={"currencies": list(fx_vector.unresolved)},
+                ))
             exposures = fx_converter.convert_exposures(exposures, data.fx_rates, config)
             if collateral is not None:
                 collateral = fx_converter.convert_collateral(collateral, data.fx_rates, config)
@@ -203,10 +258,21 @@ class HierarchyResolver:
         counterparties: pl.LazyFrame,
         org_mappings: pl.LazyFrame | None,
         ratings: pl.LazyFrame | None,
+        config: CalculationConfig | None = None,
+        ultimate_parents: pl.LazyFrame | None = None,
     ) -> tuple[CounterpartyLookup, list[HierarchyError]]:
         """
         Build counterparty hierarchy lookup using pure LazyFrame operations.
 
+        Args:
+            counterparties: Counterparty data
+            org_mappings: Parent-child counterparty mappings (optional)
+            ratings: Ratings history (optional)
+            config: Calculation configuration, used for point-in-time
+                rating selection (optional)
+            ultimate_parents: Precomputed ultimate parent mapping, e.g. from a
+                HierarchyIndex (default: resolved from org_mappings)
+
         Returns:
             Tuple of (CounterpartyLookup, list of errors)
         """
@@ -215,17 +281,18 @@ class HierarchyResolver:
         # If org_mappings is None, create empty LazyFrame with expected schema
         if org_mappings is None:
             org_mappings = pl.LazyFrame(schema={
-                "parent_counterparty_reference": pl.String,
-                "child_counterparty_reference": pl.String,
+                "parent_counterparty_reference": key_dtype(),
+                "child_counterparty_reference": key_dtype(),
             })
 
         # Build ultimate parent mapping (LazyFrame)
-        ultimate_parents = self._build_ultimate_parent_lazy(org_mappings)
+        if ultimate_parents is None:
+            ultimate_parents = self._build_ultimate_parent_lazy(org_mappings)
 
         # If ratings is None, create empty LazyFrame with expected schema
         if ratings is None:
             ratings = pl.LazyFrame(schema={
-                "counterparty_reference": pl.String,
+                "counterparty_reference": key_dtype(),
                 "rating_reference": pl.String,
                 "rating_type": pl.String,
                 "rating_agency": pl.String,
@@ -237,7 +304,7 @@ class HierarchyResolver:
 
         # Build rating inheritance (LazyFrame)
         rating_info = self._build_rating_inheritance_lazy(
-            counterparties, ratings, ultimate_parents
+            counterparties, ratings, ultimate_parents, config
         )
 
         # Enrich counterparties with hierarchy info
@@ -259,6 +326,31 @@ class HierarchyResolver:
             rating_inheritance=rating_info,
         ), errors
 
+    def _refresh_hierarchy_index(self, data: RawDataBundle) -> HierarchyIndex | None:
+        """
+        Load, update and persist the hierarchy index.
+
+        The index stores string references, so runs on dictionary-encoded
+        keys (whose codes differ between runs) resolve from scratch.
+
+        Returns:
+            Up-to-date HierarchyIndex, or None when no index is configured
+        """
+        if self.index_dir is None or key_dtype() != pl.String:
+            return None
+
+        # Concurrent runs on this resolver read and write the index one at a time
+        with self._index_lock:
+            previous = HierarchyIndex.load(self.index_dir)
+            if previous is None:
+                index = HierarchyIndex.build(data.org_mappings, data.facility_mappings)
+            else:
+                index = previous.update(data.org_mappings, data.facility_mappings)
+
+            if index is not previous:
+                index.save(self.index_dir)
+        return index
+
     def _build_ultimate_parent_lazy(
         self,
         org_mappings: pl.LazyFrame,
@@ -335,10 +427,14 @@ class HierarchyResolver:
         counterparties: pl.LazyFrame,
         ratings: pl.LazyFrame,
         ultimate_parents: pl.LazyFrame,
+        config: CalculationConfig | None = None,
     ) -> pl.LazyFrame:
         """
         Build rating lookup with inheritance via LazyFrame joins.
 
+        Each counterparty's own rating is chosen by RatingSelector according
+        to config.rating_selection (latest rating as of the reporting date).
+
         Returns LazyFrame with columns:
         - counterparty_reference: The entity
         - cqs, pd, rating_value, rating_agency, rating_type, rating_date: Rating info
@@ -346,12 +442,10 @@ class HierarchyResolver:
         - source_counterparty: Where the rating came from
         - inheritance_reason: own_rating, parent_rating, or unrated
         """
-        # Get most recent rating per counterparty (sort by date then reference for consistency)
+        # Select the applicable rating per counterparty (point-in-time, top-1 per group)
         first_ratings = (
-            ratings
-            .sort(["rating_date", "rating_reference"], descending=[True, True])
-            .group_by("counterparty_reference")
-            .first()
+            RatingSelector()
+            .select(ratings, config)
             .select([
                 pl.col("counterparty_reference").alias("rated_cp"),
                 pl.col("rating_type"),
@@ -421,7 +515,7 @@ class HierarchyResolver:
 
             pl.when(has_own_rating).then(pl.col("counterparty_reference"))
             .when(has_parent_rating).then(pl.col("ultimate_parent_reference"))
-            .otherwise(pl.lit(None).cast(pl.String)).alias("source_counterparty"),
+            .otherwise(pl.lit(None).cast(key_dtype())).alias("source_counterparty"),
 
             pl.when(has_own_rating).then(pl.lit("own_rating"))
             .when(has_parent_rating).then(pl.lit("parent_rating"))
@@ -457,8 +551,8 @@ class HierarchyResolver:
             - facility_hierarchy_depth: Number of levels traversed
         """
         empty_result = pl.LazyFrame(schema={
-            "child_facility_reference": pl.String,
-            "root_facility_reference": pl.String,
+            "child_facility_reference": key_dtype(),
+            "root_facility_reference": key_dtype(),
             "facility_hierarchy_depth": pl.Int32,
         })
 
@@ -646,11 +740,11 @@ class HierarchyResolver:
         if not self._is_valid_optional_data(facilities, required_cols):
             # No valid facilities, return empty LazyFrame with expected schema
             return pl.LazyFrame(schema={
-                "exposure_reference": pl.String,
+                "exposure_reference": key_dtype(),
                 "exposure_type": pl.String,
                 "product_type": pl.String,
                 "book_code": pl.String,
-                "counterparty_reference": pl.String,
+                "counterparty_reference": key_dtype(),
                 "value_date": pl.Date,
                 "maturity_date": pl.Date,
                 "currency": pl.String,
@@ -671,8 +765,8 @@ class HierarchyResolver:
         mapping_required_cols = {"parent_facility_reference", "child_reference"}
         if not self._is_valid_optional_data(facility_mappings, mapping_required_cols):
             facility_mappings = pl.LazyFrame(schema={
-                "parent_facility_reference": pl.String,
-                "child_reference": pl.String,
+                "parent_facility_reference": key_dtype(),
+                "child_reference": key_dtype(),
                 "child_type": pl.String,
             })
 
@@ -693,7 +787,7 @@ class HierarchyResolver:
         if loan_ref_col is None:
             # No valid loans, all facilities are 100% undrawn
             loan_drawn_totals = pl.LazyFrame(schema={
-                "aggregation_facility": pl.String,
+                "aggregation_facility": key_dtype(),
                 "total_drawn": pl.Float64,
             })
         else:
@@ -750,7 +844,7 @@ class HierarchyResolver:
 
         if contingent_ref_col is None:
             contingent_totals = pl.LazyFrame(schema={
-                "aggregation_facility": pl.String,
+                "aggregation_facility": key_dtype(),
                 "total_contingent": pl.Float64,
             })
         else:
@@ -804,7 +898,7 @@ class HierarchyResolver:
                 pl.col("child_facility_reference").alias("_sub_ref"),
             )
         else:
-            sub_facility_refs = pl.LazyFrame(schema={"_sub_ref": pl.String})
+            sub_facility_refs = pl.LazyFrame(schema={"_sub_ref": key_dtype()})
 
         # Join with facilities to calculate undrawn
         # Combine loan drawn + contingent utilisation
@@ -847,11 +941,13 @@ class HierarchyResolver:
         # Note: parent_facility_reference is set to the source facility to enable
         # facility-level collateral allocation to undrawn amounts
         select_exprs = [
-            (pl.col("facility_reference") + "_UNDRAWN").alias("exposure_reference"),
+            undrawn_reference(
+                "facility_reference", facility_schema["facility_reference"]
+            ).alias("exposure_reference"),
             pl.lit("facility_undrawn").alias("exposure_type"),
             pl.col("product_type") if "product_type" in facility_cols else pl.lit(None).cast(pl.String).alias("product_type"),
             pl.col("book_code").cast(pl.String, strict=False) if "book_code" in facility_cols else pl.lit(None).cast(pl.String).alias("book_code"),
-            pl.col("counterparty_reference") if "counterparty_reference" in facility_cols else pl.lit(None).cast(pl.String).alias("counterparty_reference"),
+            pl.col("counterparty_reference") if "counterparty_reference" in facility_cols else pl.lit(None).cast(key_dtype()).alias("counterparty_reference"),
             pl.col("value_date") if "value_date" in facility_cols else pl.lit(None).cast(pl.Date).alias("value_date"),
             pl.col("maturity_date") if "maturity_date" in facility_cols else pl.lit(None).cast(pl.Date).alias("maturity_date"),
             pl.col("currency") if "currency" in facility_cols else pl.lit(None).cast(pl.String).alias("currency"),
@@ -887,6 +983,7 @@ class HierarchyResolver:
         facilities: pl.LazyFrame | None,
         facility_mappings: pl.LazyFrame,
         counterparty_lookup: CounterpartyLookup,
+        facility_root_lookup: pl.LazyFrame | None = None,
     ) -> tuple[pl.LazyFrame, list[HierarchyError]]:
         """
         Unify loans, contingents, and facility undrawn into a single exposures LazyFrame.
@@ -896,6 +993,9 @@ class HierarchyResolver:
         - contingent: Off-balance sheet items (guarantees, LCs, etc.)
         - facility_undrawn: Undrawn facility headroom (limit - drawn loans)
 
+        facility_root_lookup may be supplied precomputed (e.g. from a
+        HierarchyIndex); by default it is resolved from facility_mappings.
+
         Returns:
             Tuple of (unified exposures LazyFrame, list of errors)
         """
@@ -979,7 +1079,8 @@ class HierarchyResolver:
             exposure_frames.append(contingents_unified)
 
         # Build facility root lookup for multi-level hierarchies
-        facility_root_lookup = self._build_facility_root_lookup(facility_mappings)
+        if facility_root_lookup is None:
+            facility_root_lookup = self._build_facility_root_lookup(facility_mappings)
 
         # Calculate and add facility undrawn exposures
         # This creates separate exposure records for undrawn facility headroom
@@ -1065,7 +1166,7 @@ class HierarchyResolver:
                 .then(pl.col("_frl_root"))
                 .when(pl.col("parent_facility_reference").is_not_null())
                 .then(pl.col("parent_facility_reference"))
-                .otherwise(pl.lit(None).cast(pl.String))
+                .otherwise(pl.lit(None).cast(key_dtype()))
                 .alias("root_facility_reference"),
                 # Multi-level: lookup depth + 1; single-level: 1; no parent: 0
                 pl.when(pl.col("_frl_depth").is_not_null())
@@ -1079,7 +1180,7 @@ class HierarchyResolver:
             exposures = exposures.with_columns([
                 pl.when(pl.col("parent_facility_reference").is_not_null())
                 .then(pl.col("parent_facility_reference"))
-                .otherwise(pl.lit(None).cast(pl.String))
+                .otherwise(pl.lit(None).cast(key_dtype()))
                 .alias("root_facility_reference"),
                 pl.when(pl.col("parent_facility_reference").is_not_null())
                 .then(pl.lit(1).cast(pl.Int8))
@@ -1177,16 +1278,18 @@ class HierarchyResolver:
         # Calculate totals per lending group
         # - total_exposure: Raw sum (for reference/audit)
         # - adjusted_exposure: Sum excluding residential property (for retail threshold)
-        lending_group_totals = exposures_with_group.filter(
-            pl.col("lending_group_reference").is_not_null()
-        ).group_by("lending_group_reference").agg([
-            pl.col("drawn_amount").clip(lower_bound=0.0).sum().alias("total_drawn"),
-            pl.col("nominal_amount").sum().alias("total_nominal"),
-            (pl.col("drawn_amount").clip(lower_bound=0.0) + pl.col("nominal_amount")).sum().alias("total_exposure"),
-            pl.col("exposure_for_retail_threshold").sum().alias("adjusted_exposure"),
-            pl.col("residential_collateral_value").sum().alias("total_residential_coverage"),
-            pl.len().alias("exposure_count"),
-        ])
+        floored_drawn = pl.col("drawn_amount").clip(lower_bound=0.0)
+        lending_group_totals = KeyAggregates(
+            exposures_with_group,
+            {
+                "total_drawn": floored_drawn,
+                "total_nominal": pl.col("nominal_amount"),
+                "total_exposure": floored_drawn + pl.col("nominal_amount"),
+                "adjusted_exposure": pl.col("exposure_for_retail_threshold"),
+                "total_residential_coverage": pl.col("residential_collateral_value"),
+            },
+            keys=(LENDING_GROUP_KEY,),
+        ).table(LENDING_GROUP_KEY)
 
         return lending_group_totals, errors
 
@@ -1492,17 +1595,17 @@ class HierarchyResolver:
         prop_facility = aggregate_by_level(all_property_collateral, "facility", "prop_facility")
         prop_counterparty = aggregate_by_level(all_property_collateral, "counterparty", "prop_cp")
 
-        # Calculate allocation weights for facility-level collateral
-        # (exposure's share of total exposure under that facility)
-        facility_totals = exposure_amounts.group_by("parent_facility_reference").agg([
-            pl.col("total_exposure_amount").sum().alias("facility_total"),
-        ])
-
-        # Calculate allocation weights for counterparty-level collateral
-        # (exposure's share of total exposure for that counterparty)
-        counterparty_totals = exposure_amounts.group_by("counterparty_reference").agg([
-            pl.col("total_exposure_amount").sum().alias("cp_total"),
-        ])
+        # Totals for the allocation weights of facility- and counterparty-level
+        # collateral (exposure's share of total exposure under that key)
+        amount_totals = KeyAggregates(
+            exposure_amounts, {"total_exposure_amount": pl.col("total_exposure_amount")}
+        )
+        facility_totals = amount_totals.totals(
+            FACILITY_KEY, {"total_exposure_amount": "facility_total"}
+        )
+        counterparty_totals = amount_totals.totals(
+            COUNTERPARTY_KEY, {"total_exposure_amount": "cp_total"}
+        )
 
         # Join all levels of collateral to exposures
         result = exposure_amounts.join(
@@ -1692,11 +1795,14 @@ class HierarchyResolver:
         return exposures
 
 
-def create_hierarchy_resolver() -> HierarchyResolver:
+def create_hierarchy_resolver(index_dir: str | Path | None = None) -> HierarchyResolver:
     """
     Create a hierarchy resolver instance.
 
+    Args:
+        index_dir: Directory of the persisted hierarchy index (optional)
+
     Returns:
         HierarchyResolver ready for use
     """
-    return HierarchyResolver()
+    return HierarchyResolver(index_dir=index_dir)
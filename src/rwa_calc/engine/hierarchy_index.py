@@ -0,0 +1,367 @@
+"""
+Persisted hierarchy index for the RWA calculator pipeline.
+
+The org hierarchy and facility tree change by a fraction of a percent
+between daily runs, yet resolving them from scratch walks every edge up
+to the root each run. HierarchyIndex stores the resolved roots with the
+edges they were built from. A run loads the previous index, diffs its
+edges against the current mapping tables and re-walks only the children
+whose edge changed plus their descendants (which may have been
+re-rooted). Everything else is reused as-is.
+
+The index holds two root tables, each with one row per child:
+- ultimate parents: counterparty -> ultimate parent (org_mappings)
+- facility roots: sub-facility -> root facility (facility_mappings rows
+  whose child is a facility)
+
+Walks follow HierarchyResolver: at most MAX_DEPTH hops from a child, so
+indexed and freshly resolved roots agree.
+
+Every save stamps one version id into the Parquet metadata of all four
+files. Files are replaced one at a time, so a reader in another process
+or resolver can meet files from two saves; load() then finds differing
+version ids and returns None, and the resolver rebuilds the index.
+
+Classes:
+    HierarchyIndex: Resolved hierarchy roots and the edges behind them
+
+Usage:
+    from rwa_calc.engine.hierarchy import HierarchyResolver
+
+    resolver = HierarchyResolver(index_dir="/data/.rwa_hierarchy")
+    resolved = resolver.resolve(data, config)  # loads, updates and saves the index
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from pathlib import Path
+
+import polars as pl
+
+# Hops walked from a child towards its root (direct parent + 10 levels)
+MAX_DEPTH = 11
+
+# Files written to the index directory
+_FILES = ("org_edges", "facility_edges", "ultimate_parents", "facility_roots")
+
+# Parquet metadata key holding the id of the save that wrote a file
+VERSION_KEY = "rwa_hierarchy_index_version"
+
+
+class HierarchyIndex:
+    """
+    Resolved hierarchy roots and the edges they were built from.
+
+    Edge tables have columns child and parent; root tables have child,
+    root and depth (Int32).
+
+    Attributes:
+        org_edges: Counterparty edges (child -> parent)
+        facility_edges: Facility-to-facility edges (child -> parent)
+        ultimate_parents: Root per counterparty child
+        facility_roots: Root per sub-facility
+        recomputed: Children re-walked when this index was produced
+    """
+
+    def __init__(
+        self,
+        org_edges: pl.DataFrame,
+        facility_edges: pl.DataFrame,
+        ultimate_parents: pl.DataFrame,
+        facility_roots: pl.DataFrame,
+        recomputed: int = 0,
+    ) -> None:
+        """
+        Initialize HierarchyIndex.
+
+        Args:
+            org_edges: Counterparty edges (child -> parent)
+            facility_edges: Facility-to-facility edges (child -> parent)
+            ultimate_parents: Root per counterparty child
+            facility_roots: Root per sub-facility
+            recomputed: Children re-walked when this index was produced
+        """
+        self.org_edges = org_edges
+        self.facility_edges = facility_edges
+        self.ultimate_parents = ultimate_parents
+        self.facility_roots = facility_roots
+        self.recomputed = recomputed
+
+    @classmethod
+    def build(
+        cls,
+        org_mappings: pl.LazyFrame | None,
+        facility_mappings: pl.LazyFrame | None,
+    ) -> HierarchyIndex:
+        """
+        Build an index from scratch.
+
+        Args:
+            org_mappings: Parent-child counterparty mappings (optional)
+            facility_mappings: Facility mappings (optional)
+
+        Returns:
+            HierarchyIndex with every child walked
+        """
+        org = org_edges(org_mappings)
+        facility = facility_edges(facility_mappings)
+        return cls(
+            org_edges=org,
+            facility_edges=facility,
+            ultimate_parents=_walk_to_root(org, org.select("child")),
+            facility_roots=_walk_to_root(facility, facility.select("child")),
+            recomputed=org.height + facility.height,
+        )
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    def update(
+        self,
+        org_mappings: pl.LazyFrame | None,
+        facility_mappings: pl.LazyFrame | None,
+    ) -> HierarchyIndex:
+        """
+        Bring the index up to date with the current mapping tables.
+
+        Children whose edge was added, removed or re-parented are
+        re-walked together with their descendants; all other roots are
+        reused.
+
+        Args:
+            org_mappings: Current parent-child counterparty mappings
+            facility_mappings: Current facility mappings
+
+        Returns:
+            This index if no edge changed, else an updated HierarchyIndex
+        """
+        org = org_edges(org_mappings)
+        facility = facility_edges(facility_mappings)
+        if org.schema != self.org_edges.schema or facility.schema != self.facility_edges.schema:
+            return HierarchyIndex.build(org_mappings, facility_mappings)
+
+        ultimate, org_count = _refresh_roots(self.org_edges, org, self.ultimate_parents)
+        roots, facility_count = _refresh_roots(self.facility_edges, facility, self.facility_roots)
+        if org_count + facility_count == 0:
+            return self
+
+        return HierarchyIndex(
+            org_edges=org,
+            facility_edges=facility,
+            ultimate_parents=ultimate,
+            facility_roots=roots,
+            recomputed=org_count + facility_count,
+        )
+
+    def ultimate_parent_lookup(self) -> pl.LazyFrame:
+        """
+        Ultimate parents in HierarchyResolver's lookup format.
+
+        Returns:
+            LazyFrame with counterparty_reference, ultimate_parent_reference
+            and hierarchy_depth
+        """
+        return self.ultimate_parents.lazy().select([
+            pl.col("child").alias("counterparty_reference"),
+            pl.col("root").alias("ultimate_parent_reference"),
+            pl.col("depth").alias("hierarchy_depth"),
+        ])
+
+    def facility_root_lookup(self) -> pl.LazyFrame:
+        """
+        Facility roots in HierarchyResolver's lookup format.
+
+        Returns:
+            LazyFrame with child_facility_reference, root_facility_reference
+            and facility_hierarchy_depth
+        """
+        return self.facility_roots.lazy().select([
+            pl.col("child").alias("child_facility_reference"),
+            pl.col("root").alias("root_facility_reference"),
+            pl.col("depth").alias("facility_hierarchy_depth"),
+        ])
+
+    def save(self, directory: str | Path) -> None:
+        """
+        Write the index as Parquet files.
+
+        Each file is written to a temporary name and moved into place, and
+        carries the same new version id in its metadata.
+
+        Args:
+            directory: Index directory (created if missing)
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        version = uuid.uuid4().hex
+        for name in _FILES:
+            target = directory / f"{name}.parquet"
+            tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            getattr(self, name).write_parquet(tmp, metadata={VERSION_KEY: version})
+            os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, directory: str | Path) -> HierarchyIndex | None:
+        """
+        Read an index written by save().
+
+        Each file's data and version id are read through one open handle,
+        so a concurrent replace cannot split them.
+
+        Args:
+            directory: Index directory
+
+        Returns:
+            HierarchyIndex, or None if the directory holds no complete index
+            or its files come from different saves
+        """
+        frames: list[pl.DataFrame] = []
+        versions: set[str | None] = set()
+        for name in _FILES:
+            try:
+                with open(Path(directory) / f"{name}.parquet", "rb") as f:
+                    versions.add(pl.read_parquet_metadata(f).get(VERSION_KEY))
+                    f.seek(0)
+                    frames.append(pl.read_parquet(f))
+            except FileNotFoundError:
+                return None
+
+        if len(versions) != 1 or None in versions:
+            return None
+        return cls(*frames)
+
+
+# =============================================================================
+# Edge Extraction
+# =============================================================================
+
+
+def org_edges(org_mappings: pl.LazyFrame | None) -> pl.DataFrame:
+    """
+    Counterparty edges from org mappings.
+
+    Args:
+        org_mappings: Parent-child counterparty mappings (optional)
+
+    Returns:
+        DataFrame with unique child and parent columns
+    """
+    if org_mappings is None:
+        return pl.DataFrame(schema={"child": pl.String, "parent": pl.String})
+    return _unique_edges(org_mappings.select([
+        pl.col("child_counterparty_reference").alias("child"),
+        pl.col("parent_counterparty_reference").alias("parent"),
+    ]))
+
+
+def facility_edges(facility_mappings: pl.LazyFrame | None) -> pl.DataFrame:
+    """
+    Facility-to-facility edges from facility mappings.
+
+    Only rows whose child_type (or node_type) is "facility" are edges;
+    without a type column there are none.
+
+    Args:
+        facility_mappings: Facility mappings (optional)
+
+    Returns:
+        DataFrame with unique child and parent columns
+    """
+    empty = pl.DataFrame(schema={"child": pl.String, "parent": pl.String})
+    if facility_mappings is None:
+        return empty
+
+    names = facility_mappings.collect_schema().names()
+    if "child_type" in names:
+        type_col = "child_type"
+    elif "node_type" in names:
+        type_col = "node_type"
+    else:
+        return empty
+
+    return _unique_edges(facility_mappings.filter(
+        pl.col(type_col).fill_null("").str.to_lowercase() == "facility"
+    ).select([
+        pl.col("child_reference").alias("child"),
+        pl.col("parent_facility_reference").alias("parent"),
+    ]))
+
+
+def _unique_edges(edges: pl.LazyFrame) -> pl.DataFrame:
+    """Distinct non-null edges, sorted for stable diffs."""
+    return edges.drop_nulls().unique().sort(["child", "parent"]).collect()
+
+
+# =============================================================================
+# Root Resolution
+# =============================================================================
+
+
+def _walk_to_root(edges: pl.DataFrame, children: pl.DataFrame) -> pl.DataFrame:
+    """Walk each child up to MAX_DEPTH hops towards its root."""
+    parent_map = edges.lazy().select([
+        pl.col("child").alias("_lookup_child"),
+        pl.col("parent").alias("_lookup_parent"),
+    ])
+
+    result = edges.lazy().join(children.lazy(), on="child", how="semi").select([
+        pl.col("child"),
+        pl.col("parent").alias("root"),
+        pl.lit(1).cast(pl.Int32).alias("depth"),
+    ])
+
+    for _ in range(MAX_DEPTH - 1):
+        result = result.join(
+            parent_map,
+            left_on="root",
+            right_on="_lookup_child",
+            how="left",
+        ).with_columns([
+            pl.coalesce(pl.col("_lookup_parent"), pl.col("root")).alias("root"),
+            pl.when(pl.col("_lookup_parent").is_not_null())
+            .then(pl.col("depth") + 1)
+            .otherwise(pl.col("depth"))
+            .alias("depth"),
+        ]).select(["child", "root", "depth"])
+
+    return result.collect()
+
+
+def _with_descendants(edges: pl.DataFrame, nodes: pl.DataFrame) -> pl.DataFrame:
+    """Nodes plus every child within MAX_DEPTH levels below them."""
+    affected = nodes.unique()
+    frontier = affected
+    for _ in range(MAX_DEPTH):
+        below = edges.join(
+            frontier.rename({"child": "parent"}), on="parent", how="semi",
+        ).join(
+            affected, on="child", how="anti",
+        ).select("child").unique()
+        if below.is_empty():
+            break
+        affected = pl.concat([affected, below])
+        frontier = below
+    return affected
+
+
+def _refresh_roots(
+    old_edges: pl.DataFrame,
+    new_edges: pl.DataFrame,
+    old_roots: pl.DataFrame,
+) -> tuple[pl.DataFrame, int]:
+    """Re-walk children affected by edge changes; keep every other root."""
+    changed = pl.concat([
+        old_edges.join(new_edges, on=["child", "parent"], how="anti"),
+        new_edges.join(old_edges, on=["child", "parent"], how="anti"),
+    ]).select("child").unique()
+    if changed.is_empty():
+        return old_roots, 0
+
+    affected = _with_descendants(new_edges, changed)
+    kept = old_roots.join(affected, on="child", how="anti")
+    recomputed = _walk_to_root(new_edges, affected)
+    return pl.concat([kept, recomputed]), affected.height
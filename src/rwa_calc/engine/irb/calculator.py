@@ -157,7 +157,10 @@ class IRBCalculator:
         return IRBResultBundle(
             results=exposures,
             expected_loss=exposures.irb.select_expected_loss(),
-            calculation_audit=exposures.irb.build_audit(),
+            calculation_audit=(
+                exposures.irb.build_audit(include_strings=config.audit_strings)
+                if config.audit_trail else None
+            ),
             errors=errors,
         )
 
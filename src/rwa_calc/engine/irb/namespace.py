@@ -803,13 +803,16 @@ class IRBLazyFrame:
             pl.col("expected_loss"),
         ])
 
-    def build_audit(self) -> pl.LazyFrame:
+    def build_audit(self, include_strings: bool = True) -> pl.LazyFrame:
         """
         Build IRB calculation audit trail.
 
         Selects key calculation columns and creates a human-readable
         calculation string.
 
+        Args:
+            include_strings: Whether to add the irb_calculation string
+
         Returns:
             LazyFrame with audit columns including irb_calculation string
         """
@@ -842,6 +845,8 @@ class IRBLazyFrame:
                 select_cols.append(col)
 
         audit = self._lf.select(select_cols)
+        if not include_strings:
+            return audit
 
         # Build audit string with defaulted treatment indicator
         has_is_defaulted = "is_defaulted" in available_cols
@@ -0,0 +1,181 @@
+"""
+Shared per-key aggregates for the RWA calculator pipeline.
+
+Several hierarchy and CRM steps pro-rate amounts (collateral, provisions)
+across the exposures of a facility, counterparty or lending group, or look
+up a per-key attribute. Each used to compute its own totals with a
+group_by over the full exposure frame and join them back. KeyAggregates
+computes every registered measure per key in one group_by pass, and each
+step joins the resulting small table.
+
+Tables describe one version of the exposure frame. A step that changes
+the frame calls with_exposures() with the changed columns; tables whose
+key or measure inputs changed are rebuilt from the new frame, the rest are
+kept. Tables are lazy and shared, so Polars' common-subplan elimination
+evaluates each once per query.
+
+Classes:
+    KeyAggregates: Per-key sums over an exposure frame
+
+Usage:
+    from rwa_calc.engine.key_aggregates import COUNTERPARTY_KEY, KeyAggregates
+
+    aggregates = KeyAggregates(exposures, {"ead_gross": pl.col("ead_gross")})
+    exposures = aggregates.attach(exposures, COUNTERPARTY_KEY, {"ead_gross": "cp_ead_total"})
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Literal
+
+import polars as pl
+
+from rwa_calc.engine.key_encoding import key_dtype
+
+# Keys totals are computed for
+FACILITY_KEY = "parent_facility_reference"
+COUNTERPARTY_KEY = "counterparty_reference"
+LENDING_GROUP_KEY = "lending_group_reference"
+AGGREGATE_KEYS: tuple[str, ...] = (FACILITY_KEY, COUNTERPARTY_KEY, LENDING_GROUP_KEY)
+
+Aggregation = Literal["sum", "first"]
+
+
+class KeyAggregates:
+    """
+    Per-key aggregates of named measures over an exposure frame.
+
+    Each key's table holds one row per non-null key value, with one
+    column per measure and an exposure_count.
+
+    Attributes:
+        measures: Measure names and the expressions aggregated for them
+        keys: Key columns tables can be built for
+        aggregation: How measures are aggregated per key ("sum" or "first")
+    """
+
+    def __init__(
+        self,
+        exposures: pl.LazyFrame,
+        measures: dict[str, pl.Expr],
+        keys: Sequence[str] = AGGREGATE_KEYS,
+        aggregation: Aggregation = "sum",
+    ) -> None:
+        """
+        Initialize KeyAggregates.
+
+        Args:
+            exposures: Exposure frame the totals are computed over
+            measures: Measure name -> expression aggregated per key
+            keys: Key columns tables can be built for
+            aggregation: "sum" for totals, "first" for per-key attributes
+        """
+        self.measures = dict(measures)
+        self.keys = tuple(keys)
+        self.aggregation = aggregation
+        self._exposures = exposures
+        self._tables: dict[str, pl.LazyFrame] = {}
+
+    def table(self, key: str) -> pl.LazyFrame:
+        """
+        Totals of every measure per key value, built on first use.
+
+        Args:
+            key: Key column (one of keys)
+
+        Returns:
+            LazyFrame with the key, one column per measure and exposure_count.
+            Empty when the exposure frame has no such column.
+        """
+        if key not in self.keys:
+            raise ValueError(f"Unknown aggregate key {key!r}; expected one of {self.keys}")
+
+        if key not in self._tables:
+            aggregates = [
+                getattr(expr, self.aggregation)().alias(name)
+                for name, expr in self.measures.items()
+            ]
+            if key in self._exposures.collect_schema().names():
+                self._tables[key] = self._exposures.filter(
+                    pl.col(key).is_not_null()
+                ).group_by(key).agg([*aggregates, pl.len().alias("exposure_count")])
+            else:
+                self._tables[key] = pl.LazyFrame(schema={
+                    key: key_dtype(),
+                    **self._exposures.select(aggregates).collect_schema(),
+                    "exposure_count": pl.UInt32,
+                })
+        return self._tables[key]
+
+    def totals(self, key: str, columns: dict[str, str]) -> pl.LazyFrame:
+        """
+        Key column plus selected measures, renamed for the caller.
+
+        Args:
+            key: Key column
+            columns: Measure name -> output column name (may be the same name)
+
+        Returns:
+            LazyFrame with the key and the renamed measures
+        """
+        return self.table(key).select([
+            pl.col(key),
+            *(pl.col(measure).alias(alias) for measure, alias in columns.items()),
+        ])
+
+    def attach(
+        self,
+        exposures: pl.LazyFrame,
+        key: str,
+        columns: dict[str, str],
+    ) -> pl.LazyFrame:
+        """
+        Left-join selected measures onto an exposure frame by key.
+
+        Args:
+            exposures: Frame to add totals to
+            key: Key column
+            columns: Measure name -> output column name
+
+        Returns:
+            Exposures with the totals (null where the key has none)
+        """
+        if key not in exposures.collect_schema().names():
+            return exposures.with_columns([
+                pl.lit(None).cast(pl.Float64).alias(alias) for alias in columns.values()
+            ])
+        return exposures.join(self.totals(key, columns), on=key, how="left")
+
+    def with_exposures(
+        self,
+        exposures: pl.LazyFrame,
+        changed: Iterable[str],
+    ) -> KeyAggregates:
+        """
+        Aggregates for a new version of the exposure frame.
+
+        Tables built so far are kept unless the changed columns include
+        their key or an input of any measure; those, and tables not yet
+        built, are computed from the new frame. Steps that add or drop
+        exposure rows must list the key columns as changed.
+
+        Args:
+            exposures: Updated exposure frame
+            changed: Columns the caller modified since these aggregates were built
+
+        Returns:
+            KeyAggregates over the new frame, sharing the unaffected tables
+        """
+        changed = set(changed)
+        inputs = {
+            name
+            for expr in self.measures.values()
+            for name in expr.meta.root_names()
+        }
+        refreshed = KeyAggregates(exposures, self.measures, self.keys, self.aggregation)
+        if inputs.isdisjoint(changed):
+            refreshed._tables = {
+                key: table for key, table in self._tables.items() if key not in changed
+            }
+        return refreshed
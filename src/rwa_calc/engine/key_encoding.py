@@ -0,0 +1,277 @@
+"""
+Dictionary-encoded reference keys for the RWA calculator pipeline.
+
+Hierarchy resolution, classification, CRM, the calculators and the
+aggregator join and group almost exclusively on string references
+(counterparty, exposure, facility, beneficiary, guarantor, lending
+group). At scale, hashing and comparing those strings dominates the
+joins. KeyDictionary encodes every reference column as a Categorical
+backed by one per-run category mapping, so joins and group_bys compare
+UInt32 codes, and the output is cast back to strings.
+
+Encoding and decoding are plain casts: no lookup table is joined into
+the plans, and the mapping is freed by Polars once no frame of the run
+uses it. Categoricals compare, sort and pattern-match like the strings
+they hold, so stages need no encoding-specific logic apart from three
+helpers that fall through to plain string behaviour when no dictionary
+is active:
+- key_dtype(): dtype for empty or null reference columns
+- undrawn_reference(): a facility's undrawn exposure reference
+- with_key_text(): the string form of a reference, for pattern matching
+
+Classes:
+    KeyDictionary: Per-run reference encoding
+
+Functions:
+    key_dtype: Reference column dtype in the active encoding
+    is_encoded: Whether a dtype is an encoded reference dtype
+    undrawn_reference: Undrawn exposure reference for a facility column
+    with_key_text: Add the string form of a reference column
+    is_key_column: Whether a column name denotes a reference key
+
+Usage:
+    from rwa_calc.engine.pipeline import PipelineOrchestrator
+
+    pipeline = PipelineOrchestrator(encode_keys=True)
+    result = pipeline.run_with_data(data, config)  # results use string references
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import fields, is_dataclass, replace
+from typing import TYPE_CHECKING, TypeVar
+
+import polars as pl
+
+if TYPE_CHECKING:
+    from rwa_calc.contracts.bundles import RawDataBundle
+
+
+# Namespace of the per-run category mappings
+KEY_NAMESPACE = "rwa_calc.keys"
+
+# Suffix of facility undrawn exposure references
+UNDRAWN_SUFFIX = "_UNDRAWN"
+
+# Column name endings that identify reference keys in stage outputs
+KEY_COLUMN_SUFFIXES: tuple[str, ...] = (
+    "_reference",
+    "guarantor",
+    "counterparty",
+    "counterparty_guaranteed",
+)
+
+# Reference columns encoded in each RawDataBundle frame
+ENCODED_COLUMNS: dict[str, tuple[str, ...]] = {
+    "facilities": ("facility_reference", "counterparty_reference"),
+    "loans": ("loan_reference", "counterparty_reference"),
+    "contingents": ("contingent_reference", "counterparty_reference"),
+    "counterparties": ("counterparty_reference",),
+    "collateral": ("beneficiary_reference",),
+    "guarantees": ("guarantor", "beneficiary_reference"),
+    "provisions": ("beneficiary_reference",),
+    "ratings": ("counterparty_reference",),
+    "facility_mappings": ("parent_facility_reference", "child_reference"),
+    "org_mappings": ("parent_counterparty_reference", "child_counterparty_reference"),
+    "lending_mappings": ("parent_counterparty_reference", "child_counterparty_reference"),
+    "specialised_lending": ("exposure_reference",),
+    "equity_exposures": ("exposure_reference", "counterparty_reference"),
+}
+
+_active_dictionary: ContextVar[KeyDictionary | None] = ContextVar(
+    "rwa_active_key_dictionary", default=None
+)
+
+_BundleT = TypeVar("_BundleT")
+
+
+def key_dtype() -> pl.DataType:
+    """
+    Reference column dtype in the active encoding.
+
+    Returns:
+        The active dictionary's Categorical dtype, else pl.String
+    """
+    dictionary = _active_dictionary.get()
+    return dictionary.dtype if dictionary is not None else pl.String
+
+
+def is_encoded(dtype: pl.DataType) -> bool:
+    """Whether a dtype is an encoded reference dtype."""
+    return isinstance(dtype, pl.Categorical)
+
+
+def undrawn_reference(column: str, dtype: pl.DataType) -> pl.Expr:
+    """
+    Undrawn exposure reference derived from a facility reference column.
+
+    Args:
+        column: Facility reference column
+        dtype: The column's dtype (string or encoded)
+
+    Returns:
+        "<facility>_UNDRAWN", in the column's dtype
+    """
+    if is_encoded(dtype):
+        return (pl.col(column).cast(pl.String) + UNDRAWN_SUFFIX).cast(dtype)
+    return pl.col(column) + UNDRAWN_SUFFIX
+
+
+def with_key_text(lf: pl.LazyFrame, column: str, alias: str) -> pl.LazyFrame:
+    """
+    Add the string form of a reference column.
+
+    Args:
+        lf: Frame holding the reference column
+        column: Reference column (string or encoded)
+        alias: Name of the added string column
+
+    Returns:
+        The frame with alias added
+    """
+    return lf.with_columns(pl.col(column).cast(pl.String).alias(alias))
+
+
+def is_key_column(name: str) -> bool:
+    """Whether a column name denotes a reference key."""
+    return name.endswith(KEY_COLUMN_SUFFIXES)
+
+
+class KeyDictionary:
+    """
+    Per-run encoding of reference columns as Categoricals.
+
+    Every dictionary owns its own category mapping, so concurrent runs
+    never share codes and a run's mapping is released with its frames.
+
+    Attributes:
+        dtype: Categorical dtype of encoded references in this run
+    """
+
+    def __init__(self) -> None:
+        """Initialize KeyDictionary with a fresh category mapping."""
+        if hasattr(pl, "Categories"):
+            categories = pl.Categories(uuid.uuid4().hex, namespace=KEY_NAMESPACE)
+            self.dtype: pl.DataType = pl.Categorical(categories)
+        else:
+            # Older Polars: one process-wide category mapping
+            self.dtype = pl.Categorical()
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    @contextmanager
+    def activate(self) -> Iterator[KeyDictionary]:
+        """
+        Make this dictionary active while stage plans are built.
+
+        Yields:
+            This dictionary
+        """
+        token = _active_dictionary.set(self)
+        try:
+            yield self
+        finally:
+            _active_dictionary.reset(token)
+
+    def encode(self, lf: pl.LazyFrame, columns: Sequence[str]) -> pl.LazyFrame:
+        """
+        Encode string reference columns.
+
+        Args:
+            lf: Frame holding the columns
+            columns: Reference columns to encode
+
+        Returns:
+            The frame with the columns in this dictionary's dtype
+        """
+        return lf.with_columns(
+            pl.col(column).cast(pl.String).cast(self.dtype) for column in columns
+        ).cache()
+
+    def decode(
+        self,
+        lf: pl.LazyFrame,
+        columns: Sequence[str] | None = None,
+    ) -> pl.LazyFrame:
+        """
+        Cast encoded reference columns back to strings.
+
+        Args:
+            lf: Frame holding encoded columns
+            columns: Columns to decode (default: every encoded key column)
+
+        Returns:
+            The frame with the columns as String
+        """
+        if columns is None:
+            columns = [
+                name
+                for name, dtype in lf.collect_schema().items()
+                if is_encoded(dtype) and is_key_column(name)
+            ]
+        if not columns:
+            return lf
+        return lf.with_columns(pl.col(column).cast(pl.String) for column in columns)
+
+    def encode_bundle(self, data: RawDataBundle) -> RawDataBundle:
+        """
+        Encode every reference column of a raw data bundle.
+
+        Args:
+            data: Raw input data with string references
+
+        Returns:
+            RawDataBundle with encoded references
+        """
+        updates = {
+            name: self.encode(frame, columns)
+            for name, frame, columns in _encoded_fields(data)
+        }
+        return replace(data, **updates)
+
+    def decode_bundle(self, bundle: _BundleT) -> _BundleT:
+        """
+        Decode every reference column of a bundle's LazyFrames.
+
+        Nested bundles (e.g. AggregatedResultBundle.perimeter_results)
+        are decoded too.
+
+        Args:
+            bundle: Frozen dataclass bundle (e.g. AggregatedResultBundle)
+
+        Returns:
+            The same bundle type with string references
+        """
+        updates = {}
+        for f in fields(bundle):
+            value = getattr(bundle, f.name)
+            if isinstance(value, pl.LazyFrame):
+                updates[f.name] = self.decode(value)
+            elif is_dataclass(value) and not isinstance(value, type):
+                updates[f.name] = self.decode_bundle(value)
+        return replace(bundle, **updates)
+
+
+# =============================================================================
+# Private Helpers
+# =============================================================================
+
+
+def _encoded_fields(
+    data: RawDataBundle,
+) -> Iterator[tuple[str, pl.LazyFrame, tuple[str, ...]]]:
+    """Bundle fields with the reference columns present in each."""
+    for name, columns in ENCODED_COLUMNS.items():
+        frame = getattr(data, name)
+        if frame is None:
+            continue
+        present = set(frame.collect_schema().names())
+        columns = tuple(c for c in columns if c in present)
+        if columns:
+            yield name, frame, columns
@@ -7,6 +7,8 @@ exposure data from various sources (Parquet, CSV, databases).
 Classes:
     ParquetLoader: Load data from Parquet files
     CSVLoader: Load data from CSV files
+    ExcelLoader: Load data from the sheets of an Excel workbook
+    CSVCache: Typed Parquet cache of parsed CSV files
 
 Usage:
     from rwa_calc.engine.loader import ParquetLoader
@@ -20,6 +22,11 @@ for the calculation pipeline.
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -38,6 +45,7 @@ from rwa_calc.data.schemas import (
     LENDING_MAPPING_SCHEMA,
     LOAN_SCHEMA,
     ORG_MAPPING_SCHEMA,
+    PERIMETER_SCHEMA,
     PROVISION_SCHEMA,
     RATINGS_SCHEMA,
     SPECIALISED_LENDING_SCHEMA,
@@ -142,6 +150,7 @@ class DataSourceConfig:
         specialised_lending_file: Optional path to specialised lending data
         equity_exposures_file: Optional path to equity exposure data
         fx_rates_file: Optional path to FX rates data for currency conversion
+        perimeters_file: Optional path to perimeter membership (perimeter_id, book_code)
     """
 
     counterparty_files: list[str] = field(default_factory=lambda: [
@@ -163,6 +172,7 @@ class DataSourceConfig:
     specialised_lending_file: str | None = "counterparty/specialised_lending.parquet"
     equity_exposures_file: str | None = None
     fx_rates_file: str | None = "fx_rates/fx_rates.parquet"
+    perimeters_file: str | None = None
 
 
 class DataLoadError(Exception):
@@ -212,6 +222,7 @@ class ParquetLoader:
         "specialised_lending_file": SPECIALISED_LENDING_SCHEMA,
         "equity_exposures_file": EQUITY_EXPOSURE_SCHEMA,
         "fx_rates_file": FX_RATES_SCHEMA,
+        "perimeters_file": PERIMETER_SCHEMA,
     }
 
     def __init__(
@@ -424,9 +435,163 @@ class ParquetLoader:
             fx_rates=self._load_parquet_optional(
                 self.config.fx_rates_file, FX_RATES_SCHEMA
             ),
+            perimeters=self._load_parquet_optional(
+                self.config.perimeters_file, PERIMETER_SCHEMA
+            ),
         )
 
 
+# Bump when the cached representation changes, to invalidate old entries
+CSV_CACHE_VERSION = 1
+
+# Default cache directory, created under the CSV base path
+CSV_CACHE_DIR = ".rwa_cache"
+
+# Read size for content hashing
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+class CSVCache:
+    """
+    Typed Parquet cache of parsed CSV files.
+
+    Each CSV is stored as a Parquet file holding the normalize_columns and
+    enforce_schema result, with a JSON manifest recording the source's
+    size, mtime and content hash plus a fingerprint of the schema used.
+    An entry is valid when size and mtime match; if only the mtime
+    differs, the content hash decides (and the manifest is refreshed).
+
+    Attributes:
+        cache_dir: Directory holding cached Parquet files and manifests
+    """
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        """
+        Initialize CSVCache.
+
+        Args:
+            cache_dir: Directory holding cached Parquet files and manifests
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, relative_path: str) -> Path:
+        """Cached Parquet path for a CSV path relative to the base path."""
+        return (self.cache_dir / relative_path).with_suffix(".parquet")
+
+    def lookup(
+        self,
+        source: Path,
+        relative_path: str,
+        schema: dict[str, pl.DataType] | None,
+    ) -> Path | None:
+        """
+        Return the cached Parquet file for a CSV, if it is still valid.
+
+        Args:
+            source: CSV file path
+            relative_path: CSV path relative to the base path
+            schema: Schema enforced on the cached data (None if not enforced)
+
+        Returns:
+            Path to the cached Parquet file, or None if missing or stale
+        """
+        target = self.path_for(relative_path)
+        manifest_path = self._manifest_path(target)
+        if not target.exists() or not manifest_path.exists():
+            return None
+
+        try:
+            manifest = json.loads(manifest_path.read_text())
+            stat = source.stat()
+        except (OSError, ValueError):
+            return None
+
+        if (
+            manifest.get("version") != CSV_CACHE_VERSION
+            or manifest.get("schema") != self._schema_fingerprint(schema)
+            or manifest.get("size") != stat.st_size
+        ):
+            return None
+
+        if manifest.get("mtime_ns") == stat.st_mtime_ns:
+            return target
+
+        # Touched but possibly unchanged: compare content
+        if manifest.get("hash") != self._content_hash(source):
+            return None
+        manifest["mtime_ns"] = stat.st_mtime_ns
+        manifest_path.write_text(json.dumps(manifest))
+        return target
+
+    def store(
+        self,
+        source: Path,
+        relative_path: str,
+        schema: dict[str, pl.DataType] | None,
+        lf: pl.LazyFrame,
+    ) -> Path:
+        """
+        Stream a parsed CSV into the cache.
+
+        The source is fingerprinted before conversion, so a file modified
+        during conversion is re-converted on the next run.
+
+        Args:
+            source: CSV file path
+            relative_path: CSV path relative to the base path
+            schema: Schema enforced on lf (None if not enforced)
+            lf: Normalised, schema-enforced scan of the CSV
+
+        Returns:
+            Path to the cached Parquet file
+        """
+        stat = source.stat()
+        manifest = {
+            "version": CSV_CACHE_VERSION,
+            "schema": self._schema_fingerprint(schema),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": self._content_hash(source),
+        }
+
+        target = self.path_for(relative_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            lf.sink_parquet(tmp)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            raise
+        os.replace(tmp, target)
+
+        manifest_tmp = self._manifest_path(tmp)
+        manifest_tmp.write_text(json.dumps(manifest))
+        os.replace(manifest_tmp, self._manifest_path(target))
+        return target
+
+    @staticmethod
+    def _manifest_path(target: Path) -> Path:
+        """Manifest path for a cached Parquet file."""
+        return target.with_name(f"{target.name}.json")
+
+    @staticmethod
+    def _schema_fingerprint(schema: dict[str, pl.DataType] | None) -> str | None:
+        """Stable fingerprint of a schema."""
+        if schema is None:
+            return None
+        text = ";".join(f"{name}:{dtype}" for name, dtype in sorted(schema.items()))
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _content_hash(source: Path) -> str:
+        """Hash of a file's contents."""
+        digest = hashlib.blake2b(digest_size=16)
+        with source.open("rb") as f:
+            while chunk := f.read(_HASH_CHUNK_BYTES):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
 class CSVLoader:
     """
     Load data from CSV files.
@@ -440,17 +605,29 @@ class CSVLoader:
     have the expected data types, preventing type mismatch errors in
     downstream calculations.
 
+    With caching enabled, each CSV is parsed once into a typed Parquet
+    file (see CSVCache) and later loads scan the Parquet file until the
+    CSV changes. Stale tables are converted in parallel at the start of
+    load().
+
     Attributes:
         base_path: Base directory containing data files
         config: Data source configuration (paths should end in .csv)
         enforce_schemas: Whether to cast columns to expected types (default True)
+        cache: Parquet cache of parsed CSVs, or None if caching is disabled
     """
 
+    # Same file-to-schema mapping as the Parquet loader
+    _SCHEMA_MAP = ParquetLoader._SCHEMA_MAP
+
     def __init__(
         self,
         base_path: str | Path,
         config: DataSourceConfig | None = None,
         enforce_schemas: bool = True,
+        cache: bool = False,
+        cache_dir: str | Path | None = None,
+        max_workers: int | None = None,
     ) -> None:
         """
         Initialize CSVLoader.
@@ -460,14 +637,23 @@ class CSVLoader:
             config: Optional data source configuration
             enforce_schemas: Whether to enforce type casting based on schemas.
                            Set to False to load raw types from files.
+            cache: Whether to cache parsed CSVs as typed Parquet files
+            cache_dir: Cache directory (default: base_path / ".rwa_cache").
+                       Setting it enables caching.
+            max_workers: Maximum parallel CSV conversions (default: one per table)
         """
         self.base_path = Path(base_path)
         self.config = config or self._get_csv_config()
         self.enforce_schemas = enforce_schemas
+        self.max_workers = max_workers
 
         if not self.base_path.exists():
             raise DataLoadError(f"Base path does not exist: {self.base_path}")
 
+        self.cache: CSVCache | None = None
+        if cache or cache_dir is not None:
+            self.cache = CSVCache(cache_dir or self.base_path / CSV_CACHE_DIR)
+
     @staticmethod
     def _get_csv_config() -> DataSourceConfig:
         """Get config with CSV file extensions."""
@@ -516,13 +702,7 @@ class CSVLoader:
             raise DataLoadError(f"File not found: {full_path}", source=relative_path)
 
         try:
-            lf = normalize_columns(pl.scan_csv(full_path, try_parse_dates=True))
-
-            # Apply schema enforcement if enabled and schema provided
-            if self.enforce_schemas and schema is not None:
-                lf = enforce_schema(lf, schema, strict=False)
-
-            return lf
+            return self._scan(relative_path, schema)
         except Exception as e:
             raise DataLoadError(f"Failed to load CSV: {e}", source=relative_path) from e
 
@@ -558,19 +738,95 @@ class CSVLoader:
             return None
 
         try:
-            lf = normalize_columns(pl.scan_csv(full_path, try_parse_dates=True))
+            lf = self._scan(relative_path, schema)
             # Check if file has any rows - return None for empty files
             if not self._has_rows(lf):
                 return None
-
-            # Apply schema enforcement if enabled and schema provided
-            if self.enforce_schemas and schema is not None:
-                lf = enforce_schema(lf, schema, strict=False)
-
             return lf
         except Exception:
             return None
 
+    def _scan(
+        self,
+        relative_path: str,
+        schema: dict[str, pl.DataType] | None,
+    ) -> pl.LazyFrame:
+        """
+        Scan one CSV, normalised and schema-enforced, from the cache when valid.
+
+        Args:
+            relative_path: Path relative to base_path
+            schema: Schema to enforce (ignored when enforce_schemas is False)
+
+        Returns:
+            LazyFrame over the cached Parquet file or the CSV itself
+        """
+        schema = schema if self.enforce_schemas else None
+        full_path = self.base_path / relative_path
+
+        if self.cache is not None:
+            cached = self.cache.lookup(full_path, relative_path, schema)
+            if cached is not None:
+                return pl.scan_parquet(cached)
+
+        return self._parse(full_path, schema)
+
+    @staticmethod
+    def _parse(
+        full_path: Path,
+        schema: dict[str, pl.DataType] | None,
+    ) -> pl.LazyFrame:
+        """Lazily parse a CSV with normalised headers and optional schema."""
+        lf = normalize_columns(pl.scan_csv(full_path, try_parse_dates=True))
+        if schema is not None:
+            lf = enforce_schema(lf, schema, strict=False)
+        return lf
+
+    def _sources(self) -> list[tuple[str, dict[str, pl.DataType]]]:
+        """Every configured CSV that exists, with its schema."""
+        sources = [(path, COUNTERPARTY_SCHEMA) for path in self.config.counterparty_files]
+        for attr, schema in self._SCHEMA_MAP.items():
+            path = getattr(self.config, attr)
+            if path is not None:
+                sources.append((path, schema))
+        return [(path, schema) for path, schema in sources if (self.base_path / path).exists()]
+
+    def warm_cache(self) -> list[str]:
+        """
+        Convert every stale or uncached CSV into the cache, in parallel.
+
+        Each conversion streams the CSV through normalize_columns and
+        enforce_schema into Parquet. Files that fail to convert are left
+        uncached, so load() reports them the same way it does without a
+        cache.
+
+        Returns:
+            Relative paths of the CSVs converted in this call
+        """
+        if self.cache is None:
+            return []
+
+        stale = []
+        for path, schema in self._sources():
+            schema = schema if self.enforce_schemas else None
+            if self.cache.lookup(self.base_path / path, path, schema) is None:
+                stale.append((path, schema))
+        if not stale:
+            return []
+
+        def convert(path: str, schema: dict[str, pl.DataType] | None) -> str | None:
+            full_path = self.base_path / path
+            try:
+                self.cache.store(full_path, path, schema, self._parse(full_path, schema))
+            except Exception:
+                return None
+            return path
+
+        workers = self.max_workers or len(stale)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            converted = pool.map(lambda item: convert(*item), stale)
+            return [path for path in converted if path is not None]
+
     def _has_rows(self, lf: pl.LazyFrame) -> bool:
         """
         Check if a LazyFrame has any rows.
@@ -601,13 +857,7 @@ class CSVLoader:
             full_path = self.base_path / file_path
             if full_path.exists():
                 try:
-                    lf = normalize_columns(pl.scan_csv(full_path, try_parse_dates=True))
-
-                    # Apply schema enforcement if enabled
-                    if self.enforce_schemas:
-                        lf = enforce_schema(lf, COUNTERPARTY_SCHEMA, strict=False)
-
-                    frames.append(lf)
+                    frames.append(self._scan(file_path, COUNTERPARTY_SCHEMA))
                 except Exception as e:
                     raise DataLoadError(
                         f"Failed to load counterparty file: {e}",
@@ -632,6 +882,8 @@ class CSVLoader:
         Raises:
             DataLoadError: If required data cannot be loaded
         """
+        self.warm_cache()
+
         contingents = self._load_csv_optional(
             self.config.contingents_file, CONTINGENTS_SCHEMA
         )
@@ -677,6 +929,286 @@ class CSVLoader:
             fx_rates=self._load_csv_optional(
                 self.config.fx_rates_file, FX_RATES_SCHEMA
             ),
+            perimeters=self._load_csv_optional(
+                self.config.perimeters_file, PERIMETER_SCHEMA
+            ),
+        )
+
+
+# Polars dtype -> fastexcel dtype used when reading a sheet
+_EXCEL_DTYPES: dict[type[pl.DataType], str] = {
+    pl.Float32: "float",
+    pl.Float64: "float",
+    pl.Decimal: "float",
+    pl.Int8: "int",
+    pl.Int16: "int",
+    pl.Int32: "int",
+    pl.Int64: "int",
+    pl.UInt8: "int",
+    pl.UInt16: "int",
+    pl.UInt32: "int",
+    pl.UInt64: "int",
+    pl.String: "string",
+    pl.Categorical: "string",
+    pl.Enum: "string",
+    pl.Boolean: "boolean",
+    pl.Date: "date",
+    pl.Datetime: "datetime",
+    pl.Duration: "duration",
+}
+
+
+def excel_dtypes(
+    columns: list[str],
+    schema: dict[str, pl.DataType],
+) -> dict[str, str]:
+    """
+    Map sheet header names to fastexcel dtypes from an expected schema.
+
+    Headers are matched after normalize_columns-style normalisation, so
+    "Drawn Amount" picks up the dtype of drawn_amount.
+
+    Args:
+        columns: Header names as they appear in the sheet
+        schema: Expected schema keyed by normalised column name
+
+    Returns:
+        Dictionary of sheet header name to fastexcel dtype
+    """
+    dtypes = {}
+    for column in columns:
+        expected = schema.get(column.lower().replace(" ", "_"))
+        if expected is None:
+            continue
+        dtype = _EXCEL_DTYPES.get(expected.base_type())
+        if dtype is not None:
+            dtypes[column] = dtype
+    return dtypes
+
+
+class ExcelLoader:
+    """
+    Load data from the sheets of an Excel workbook.
+
+    Implements LoaderProtocol for a single workbook with one sheet per
+    input table. The DataSourceConfig entries are sheet names (see
+    _get_excel_config for the defaults). Sheets are read in parallel
+    through fastexcel's Arrow path, with dtypes from data/schemas.py
+    applied at read time and enforce_schema narrowing them afterwards.
+
+    With caching enabled, each typed sheet is stored as Parquet (see
+    CSVCache) and reused until the workbook changes.
+
+    Attributes:
+        workbook_path: Path to the .xlsx/.xlsm/.xls/.ods workbook
+        config: Data source configuration (entries are sheet names)
+        enforce_schemas: Whether to cast columns to expected types (default True)
+        cache: Parquet cache of typed sheets, or None if caching is disabled
+    """
+
+    _SCHEMA_MAP = ParquetLoader._SCHEMA_MAP
+
+    def __init__(
+        self,
+        workbook_path: str | Path,
+        config: DataSourceConfig | None = None,
+        enforce_schemas: bool = True,
+        cache: bool = False,
+        cache_dir: str | Path | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        """
+        Initialize ExcelLoader.
+
+        Args:
+            workbook_path: Path to the workbook
+            config: Optional data source configuration of sheet names
+            enforce_schemas: Whether to enforce type casting based on schemas.
+                           Set to False to load inferred types from the sheets.
+            cache: Whether to cache typed sheets as Parquet files
+            cache_dir: Cache directory (default: ".rwa_cache" next to the
+                       workbook). Setting it enables caching.
+            max_workers: Maximum parallel sheet reads (default: one per sheet)
+        """
+        self.workbook_path = Path(workbook_path)
+        self.config = config or self._get_excel_config()
+        self.enforce_schemas = enforce_schemas
+        self.max_workers = max_workers
+
+        if not self.workbook_path.is_file():
+            raise DataLoadError(f"Workbook does not exist: {self.workbook_path}")
+
+        self.cache: CSVCache | None = None
+        if cache or cache_dir is not None:
+            self.cache = CSVCache(cache_dir or self.workbook_path.parent / CSV_CACHE_DIR)
+
+    @staticmethod
+    def _get_excel_config() -> DataSourceConfig:
+        """Get config with default sheet names."""
+        return DataSourceConfig(
+            counterparty_files=["sovereign", "institution", "corporate", "retail"],
+            facilities_file="facilities",
+            loans_file="loans",
+            contingents_file="contingents",
+            collateral_file="collateral",
+            guarantees_file="guarantee",
+            provisions_file="provision",
+            ratings_file="ratings",
+            facility_mappings_file="facility_mapping",
+            org_mappings_file="org_mapping",
+            lending_mappings_file="lending_mapping",
+            specialised_lending_file="specialised_lending",
+            equity_exposures_file=None,
+            fx_rates_file="fx_rates",
+        )
+
+    def _read_sheets(
+        self,
+        requested: list[tuple[str, dict[str, pl.DataType]]],
+    ) -> dict[str, pl.LazyFrame]:
+        """
+        Read the requested sheets that exist in the workbook.
+
+        Cached sheets are scanned from Parquet; the rest are read in
+        parallel, one fastexcel reader per thread over the same bytes.
+
+        Args:
+            requested: (sheet name, schema) pairs
+
+        Returns:
+            Dictionary of configured sheet name to typed LazyFrame
+
+        Raises:
+            DataLoadError: If the workbook or a sheet cannot be read
+        """
+        import fastexcel
+
+        try:
+            workbook = self.workbook_path.read_bytes()
+            available = fastexcel.read_excel(workbook).sheet_names
+        except Exception as e:
+            raise DataLoadError(
+                f"Failed to open workbook: {e}", source=str(self.workbook_path)
+            ) from e
+
+        by_lower = {name.lower(): name for name in available}
+        frames: dict[str, pl.LazyFrame] = {}
+        to_read = []
+        for name, schema in requested:
+            sheet = name if name in available else by_lower.get(name.lower())
+            if sheet is None or name in frames:
+                continue
+            schema = schema if self.enforce_schemas else None
+            if self.cache is not None:
+                cached = self.cache.lookup(self.workbook_path, self._cache_key(sheet), schema)
+                if cached is not None:
+                    frames[name] = pl.scan_parquet(cached)
+                    continue
+            to_read.append((name, sheet, schema))
+
+        def read(name: str, sheet: str, schema: dict[str, pl.DataType] | None) -> pl.LazyFrame:
+            reader = fastexcel.read_excel(workbook)
+            dtypes = None
+            if schema is not None:
+                header = reader.load_sheet(sheet, n_rows=0).to_arrow().schema.names
+                dtypes = excel_dtypes(header, schema) or None
+            try:
+                table = reader.load_sheet(sheet, dtypes=dtypes).to_arrow()
+            except Exception as e:
+                raise DataLoadError(f"Failed to read sheet: {e}", source=sheet) from e
+
+            lf = normalize_columns(pl.from_arrow(table).lazy())
+            if schema is not None:
+                lf = enforce_schema(lf, schema, strict=False)
+            if self.cache is None:
+                return lf
+            try:
+                cached = self.cache.store(self.workbook_path, self._cache_key(sheet), schema, lf)
+            except OSError:
+                return lf
+            return pl.scan_parquet(cached)
+
+        if to_read:
+            workers = self.max_workers or len(to_read)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(lambda item: read(*item), to_read)
+                for (name, _, _), lf in zip(to_read, results, strict=True):
+                    frames[name] = lf
+
+        return frames
+
+    def _cache_key(self, sheet: str) -> str:
+        """Cache path for a sheet, relative to the cache directory."""
+        return f"{self.workbook_path.name}/{sheet}.sheet"
+
+    def _sheet(
+        self,
+        frames: dict[str, pl.LazyFrame],
+        name: str,
+    ) -> pl.LazyFrame:
+        """A required sheet."""
+        if name not in frames:
+            raise DataLoadError(f"Sheet not found: {name}", source=str(self.workbook_path))
+        return frames[name]
+
+    def _sheet_optional(
+        self,
+        frames: dict[str, pl.LazyFrame],
+        name: str | None,
+    ) -> pl.LazyFrame | None:
+        """An optional sheet, or None if missing or empty."""
+        if name is None or name not in frames:
+            return None
+        lf = frames[name]
+        if lf.head(1).collect().height == 0:
+            return None
+        return lf
+
+    def load(self) -> RawDataBundle:
+        """
+        Load all required data and return as a RawDataBundle.
+
+        Returns:
+            RawDataBundle containing all input LazyFrames
+
+        Raises:
+            DataLoadError: If required data cannot be loaded
+        """
+        requested = [(name, COUNTERPARTY_SCHEMA) for name in self.config.counterparty_files]
+        for attr, schema in self._SCHEMA_MAP.items():
+            name = getattr(self.config, attr)
+            if name is not None:
+                requested.append((name, schema))
+        frames = self._read_sheets(requested)
+
+        counterparties = [
+            frames[name] for name in self.config.counterparty_files if name in frames
+        ]
+        if not counterparties:
+            raise DataLoadError("No counterparty sheets found", source=str(self.workbook_path))
+
+        contingents = self._sheet_optional(frames, self.config.contingents_file)
+        if contingents is not None:
+            contingents = _default_bs_type(contingents)
+
+        return RawDataBundle(
+            facilities=self._sheet(frames, self.config.facilities_file),
+            loans=self._sheet(frames, self.config.loans_file),
+            counterparties=pl.concat(counterparties, how="diagonal_relaxed"),
+            facility_mappings=self._sheet(frames, self.config.facility_mappings_file),
+            org_mappings=self._sheet_optional(frames, self.config.org_mappings_file),
+            lending_mappings=self._sheet(frames, self.config.lending_mappings_file),
+            contingents=contingents,
+            collateral=self._sheet_optional(frames, self.config.collateral_file),
+            guarantees=self._sheet_optional(frames, self.config.guarantees_file),
+            provisions=self._sheet_optional(frames, self.config.provisions_file),
+            ratings=self._sheet_optional(frames, self.config.ratings_file),
+            specialised_lending=self._sheet_optional(
+                frames, self.config.specialised_lending_file
+            ),
+            equity_exposures=self._sheet_optional(frames, self.config.equity_exposures_file),
+            fx_rates=self._sheet_optional(frames, self.config.fx_rates_file),
+            perimeters=self._sheet_optional(frames, self.config.perimeters_file),
         )
 
 
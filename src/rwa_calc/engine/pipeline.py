@@ -11,7 +11,7 @@ Pipeline position:
 Key responsibilities:
 - Wire all pipeline components in correct order
 - Handle component dependencies and data flow
-- Accumulate errors from all stages
+- Accumulate errors from all stages (per run, so concurrent runs stay separate)
 - Support both full pipeline (with loader) and pre-loaded data execution
 
 Usage:
@@ -26,7 +26,9 @@ Usage:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -54,6 +56,8 @@ from rwa_calc.contracts.protocols import (
     EquityCalculatorProtocol,
     OutputAggregatorProtocol,
 )
+from rwa_calc.engine.key_encoding import KeyDictionary, key_dtype
+from rwa_calc.engine.resources import ResourceGovernor
 
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
@@ -74,6 +78,21 @@ class PipelineError:
     context: dict = field(default_factory=dict)
 
 
+@dataclass
+class RunContext:
+    """
+    Mutable state of a single pipeline run.
+
+    Created by each run and passed through every stage, so concurrent
+    runs on one orchestrator never share state.
+
+    Attributes:
+        errors: Errors accumulated by this run's stages
+    """
+
+    errors: list[PipelineError] = field(default_factory=list)
+
+
 # =============================================================================
 # Pipeline Orchestrator Implementation
 # =============================================================================
@@ -99,6 +118,12 @@ class PipelineOrchestrator:
     7. SlottingCalculator: Calculate Slotting RWA
     8. OutputAggregator: Combine results, apply floor, generate summaries
 
+    Thread safety:
+        run() and run_with_data() are reentrant. Per-run state lives in a
+        RunContext passed through the stages, so one orchestrator and its
+        components can serve concurrent runs from several threads. A
+        ResourceGovernor bounds how many of them run at once.
+
     Usage:
         orchestrator = PipelineOrchestrator(
             loader=ParquetLoader(base_path),
@@ -124,6 +149,8 @@ class PipelineOrchestrator:
         slotting_calculator: SlottingCalculatorProtocol | None = None,
         equity_calculator: EquityCalculatorProtocol | None = None,
         aggregator: OutputAggregatorProtocol | None = None,
+        encode_keys: bool = False,
+        governor: ResourceGovernor | None = None,
     ) -> None:
         """
         Initialize pipeline with components.
@@ -141,6 +168,9 @@ class PipelineOrchestrator:
             slotting_calculator: Slotting calculator
             equity_calculator: Equity calculator
             aggregator: Output aggregator
+            encode_keys: Run every stage on dictionary-encoded references,
+                decoded back to strings at the output (default False)
+            governor: Memory and concurrency limits for runs (optional)
         """
         self._loader = loader
         self._hierarchy_resolver = hierarchy_resolver
@@ -151,7 +181,9 @@ class PipelineOrchestrator:
         self._slotting_calculator = slotting_calculator
         self._equity_calculator = equity_calculator
         self._aggregator = aggregator
-        self._errors: list[PipelineError] = []
+        self._encode_keys = encode_keys
+        self._governor = governor
+        self._init_lock = threading.Lock()
 
     # =========================================================================
     # Public API
@@ -177,19 +209,17 @@ class PipelineOrchestrator:
                 "No loader configured. Use run_with_data() or provide a loader."
             )
 
-        # Reset errors for new run
-        self._errors = []
-
         # Stage 1: Load data
         try:
             raw_data = self._loader.load()
         except Exception as e:
-            self._errors.append(PipelineError(
+            run = RunContext()
+            run.errors.append(PipelineError(
                 stage="loader",
                 error_type="load_error",
                 message=str(e),
             ))
-            return self._create_error_result()
+            return self._create_error_result(run)
 
         return self.run_with_data(raw_data, config)
 
@@ -204,6 +234,10 @@ class PipelineOrchestrator:
         Bypasses the loader stage, useful for testing or
         when data is already available.
 
+        With a governor, the run waits for a concurrency slot and switches
+        its materialisation points to streaming if its estimated working
+        set exceeds the memory budget.
+
         Args:
             data: Pre-loaded raw data bundle
             config: Calculation configuration
@@ -211,71 +245,138 @@ class PipelineOrchestrator:
         Returns:
             AggregatedResultBundle with all results and audit trail
         """
-        # Reset errors for new run
-        self._errors = []
+        if self._governor is None:
+            return self._run_stages(data, config)
+
+        with self._governor.admit(data, config) as plan:
+            return self._run_stages(data, plan.config)
+
+    def with_loader(self, loader: LoaderProtocol) -> PipelineOrchestrator:
+        """
+        Orchestrator for another data source sharing this one's components.
+
+        The components and governor are shared, not copied, so
+        warm state is reused and runs count against the same limits.
+
+        Args:
+            loader: Data loader for the new orchestrator
+
+        Returns:
+            PipelineOrchestrator with the given loader
+        """
+        self._ensure_components_initialized()
+        return PipelineOrchestrator(
+            loader=loader,
+            hierarchy_resolver=self._hierarchy_resolver,
+            classifier=self._classifier,
+            crm_processor=self._crm_processor,
+            sa_calculator=self._sa_calculator,
+            irb_calculator=self._irb_calculator,
+            slotting_calculator=self._slotting_calculator,
+            equity_calculator=self._equity_calculator,
+            aggregator=self._aggregator,
+            encode_keys=self._encode_keys,
+            governor=self._governor,
+        )
+
+    # =========================================================================
+    # Private Methods - Stage Sequencing
+    # =========================================================================
+
+    def _run_stages(
+        self,
+        data: RawDataBundle,
+        config: CalculationConfig,
+    ) -> AggregatedResultBundle:
+        """Run every stage from hierarchy resolution to aggregation."""
+        # Per-run state; nothing run-specific is stored on the orchestrator
+        run = RunContext()
 
         # Ensure components are initialized
         self._ensure_components_initialized()
 
         # Validate input data values
-        self._validate_input_data(data)
+        self._validate_input_data(data, run)
+
+        # Every stage joins on references: optionally run them on encoded keys,
+        # decoding back to strings only at the output
+        key_dictionary = self._build_key_dictionary()
+        if key_dictionary is not None:
+            data = key_dictionary.encode_bundle(data)
+
+        with key_dictionary.activate() if key_dictionary is not None else nullcontext():
+            result = self._run_keyed_stages(data, config, run)
+        if result is None:
+            return self._create_error_result(run)
+
+        if key_dictionary is not None:
+            result = key_dictionary.decode_bundle(result)
+
+        # Add pipeline errors to result
+        if run.errors:
+            all_errors = list(result.errors) + [
+                self._convert_pipeline_error(e) for e in run.errors
+            ]
+            result = replace(result, errors=all_errors)
+
+        return result
 
+    def _run_keyed_stages(
+        self,
+        data: RawDataBundle,
+        config: CalculationConfig,
+        run: RunContext,
+    ) -> AggregatedResultBundle | None:
+        """Run every stage from hierarchy resolution to aggregation."""
         # Stage 2: Resolve hierarchies
-        resolved = self._run_hierarchy_resolver(data, config)
+        resolved = self._run_hierarchy_resolver(data, config, run)
         if resolved is None:
-            return self._create_error_result()
+            return None
 
         # Stage 3: Classify exposures
-        classified = self._run_classifier(resolved, config)
+        classified = self._run_classifier(resolved, config, run)
         if classified is None:
-            return self._create_error_result()
+            return None
 
         # Stage 4: Apply CRM
-        crm_adjusted = self._run_crm_processor(classified, config)
+        crm_adjusted = self._run_crm_processor(classified, config, run)
         if crm_adjusted is None:
-            return self._create_error_result()
+            return None
 
         # Stage 5-8: Run calculators in parallel (conceptually)
-        sa_bundle = self._run_sa_calculator(crm_adjusted, config)
-        irb_bundle = self._run_irb_calculator(crm_adjusted, config)
-        slotting_bundle = self._run_slotting_calculator(crm_adjusted, config)
-        equity_bundle = self._run_equity_calculator(crm_adjusted, config)
+        sa_bundle = self._run_sa_calculator(crm_adjusted, config, run)
+        irb_bundle = self._run_irb_calculator(crm_adjusted, config, run)
+        slotting_bundle = self._run_slotting_calculator(crm_adjusted, config, run)
+        equity_bundle = self._run_equity_calculator(crm_adjusted, config, run)
 
         # Stage 9: Aggregate results
-        result = self._run_aggregator(
+        return self._run_aggregator(
             sa_bundle,
             irb_bundle,
             slotting_bundle,
             equity_bundle,
             config,
+            run,
+            perimeters=data.perimeters,
         )
 
-        # Add pipeline errors to result
-        if self._errors:
-            all_errors = list(result.errors) + [
-                self._convert_pipeline_error(e) for e in self._errors
-            ]
-            result = AggregatedResultBundle(
-                results=result.results,
-                sa_results=result.sa_results,
-                irb_results=result.irb_results,
-                slotting_results=result.slotting_results,
-                equity_results=result.equity_results,
-                floor_impact=result.floor_impact,
-                supporting_factor_impact=result.supporting_factor_impact,
-                summary_by_class=result.summary_by_class,
-                summary_by_approach=result.summary_by_approach,
-                errors=all_errors,
-            )
-
-        return result
+    def _build_key_dictionary(self) -> KeyDictionary | None:
+        """Key dictionary for the run, or None to keep string references."""
+        if not self._encode_keys:
+            return None
+        return KeyDictionary()
 
     # =========================================================================
     # Private Methods - Component Initialization
     # =========================================================================
 
     def _ensure_components_initialized(self) -> None:
-        """Ensure all required components are initialized."""
+        """
+        Ensure all required components are initialized.
+
+        Defaults are created once, under a lock, and then shared by every
+        run; components hold no per-run state.
+        """
         from rwa_calc.engine.hierarchy import HierarchyResolver
         from rwa_calc.engine.classifier import ExposureClassifier
         from rwa_calc.engine.crm.processor import CRMProcessor
@@ -285,41 +386,42 @@ class PipelineOrchestrator:
         from rwa_calc.engine.equity.calculator import EquityCalculator
         from rwa_calc.engine.aggregator import OutputAggregator
 
-        if self._hierarchy_resolver is None:
-            self._hierarchy_resolver = HierarchyResolver()
-        if self._classifier is None:
-            self._classifier = ExposureClassifier()
-        if self._crm_processor is None:
-            self._crm_processor = CRMProcessor()
-        if self._sa_calculator is None:
-            self._sa_calculator = SACalculator()
-        if self._irb_calculator is None:
-            self._irb_calculator = IRBCalculator()
-        if self._slotting_calculator is None:
-            self._slotting_calculator = SlottingCalculator()
-        if self._equity_calculator is None:
-            self._equity_calculator = EquityCalculator()
-        if self._aggregator is None:
-            self._aggregator = OutputAggregator()
+        with self._init_lock:
+            if self._hierarchy_resolver is None:
+                self._hierarchy_resolver = HierarchyResolver()
+            if self._classifier is None:
+                self._classifier = ExposureClassifier()
+            if self._crm_processor is None:
+                self._crm_processor = CRMProcessor()
+            if self._sa_calculator is None:
+                self._sa_calculator = SACalculator()
+            if self._irb_calculator is None:
+                self._irb_calculator = IRBCalculator()
+            if self._slotting_calculator is None:
+                self._slotting_calculator = SlottingCalculator()
+            if self._equity_calculator is None:
+                self._equity_calculator = EquityCalculator()
+            if self._aggregator is None:
+                self._aggregator = OutputAggregator()
 
     # =========================================================================
     # Private Methods - Stage Execution
     # =========================================================================
 
-    def _validate_input_data(self, data: RawDataBundle) -> None:
+    def _validate_input_data(self, data: RawDataBundle, run: RunContext) -> None:
         """Validate input data values against column constraints."""
         try:
             from rwa_calc.contracts.validation import validate_bundle_values
 
             validation_errors = validate_bundle_values(data)
             for error in validation_errors:
-                self._errors.append(PipelineError(
+                run.errors.append(PipelineError(
                     stage="input_validation",
                     error_type="invalid_value",
                     message=error.message,
                 ))
         except Exception as e:
-            self._errors.append(PipelineError(
+            run.errors.append(PipelineError(
                 stage="input_validation",
                 error_type="validation_error",
                 message=f"Value validation failed: {e}",
@@ -329,6 +431,7 @@ class PipelineOrchestrator:
         self,
         data: RawDataBundle,
         config: CalculationConfig,
+        run: RunContext,
     ) -> ResolvedHierarchyBundle | None:
         """Run hierarchy resolution stage."""
         try:
@@ -336,7 +439,7 @@ class PipelineOrchestrator:
             # Accumulate hierarchy errors
             if result.hierarchy_errors:
                 for error in result.hierarchy_errors:
-                    self._errors.append(PipelineError(
+                    run.errors.append(PipelineError(
                         stage="hierarchy_resolver",
                         error_type=getattr(error, "error_type", "unknown"),
                         message=getattr(error, "message", str(error)),
@@ -344,7 +447,7 @@ class PipelineOrchestrator:
                     ))
             return result
         except Exception as e:
-            self._errors.append(PipelineError(
+            run.errors.append(PipelineError(
                 stage="hierarchy_resolver",
                 error_type="resolution_error",
                 message=str(e),
@@ -355,6 +458,7 @@ class PipelineOrchestrator:
         self,
         data: ResolvedHierarchyBundle,
         config: CalculationConfig,
+        run: RunContext,
     ) -> ClassifiedExposuresBundle | None:
         """Run classification stage."""
         try:
@@ -362,7 +466,7 @@ class PipelineOrchestrator:
             # Accumulate classification errors
             if result.classification_errors:
                 for error in result.classification_errors:
-                    self._errors.append(PipelineError(
+                    run.errors.append(PipelineError(
                         stage="classifier",
                         error_type=getattr(error, "error_type", "unknown"),
                         message=getattr(error, "message", str(error)),
@@ -370,7 +474,7 @@ class PipelineOrchestrator:
                     ))
             return result
         except Exception as e:
-            self._errors.append(PipelineError(
+            run.errors.append(PipelineError(
                 stage="classifier",
                 error_type="classification_error",
                 message=str(e),
@@ -381,6 +485,7 @@ class PipelineOrchestrator:
         self,
         data: ClassifiedExposuresBundle,
         config: CalculationConfig,
+        run: RunContext,
     ) -> CRMAdjustedBundle | None:
         """Run CRM processing stage."""
         try:
@@ -388,7 +493,7 @@ class PipelineOrchestrator:
             # Accumulate CRM errors
             if result.crm_errors:
                 for error in result.crm_errors:
-                    self._errors.append(PipelineError(
+                    run.errors.append(PipelineError(
                         stage="crm_processor",
                         error_type=getattr(error, "error_type", "unknown"),
                         message=getattr(error, "message", str(error)),
@@ -396,7 +501,7 @@ class PipelineOrchestrator:
                     ))
             return result
         except Exception as e:
-            self._errors.append(PipelineError(
+            run.errors.append(PipelineError(
                 stage="crm_processor",
                 error_type="crm_error",
                 message=str(e),
@@ -407,6 +512,7 @@ class PipelineOrchestrator:
         self,
         data: CRMAdjustedBundle,
         config: CalculationConfig,
+        run: RunContext,
     ) -> SAResultBundle | None:
         """Run SA calculation stage."""
         try:
@@ -422,14 +528,14 @@ class PipelineOrchestrator:
             # Accumulate SA errors
             if result.errors:
                 for error in result.errors:
-                    self._errors.append(PipelineError(
+                    run.errors.append(PipelineError(
                         stage="sa_calculator",
                         error_type=getattr(error, "error_type", "unknown"),
                         message=getattr(error, "message", str(error)),
                     ))
             return result
         except Exception as e:
-            self._errors.append(PipelineError(
+            run.errors.append(PipelineError(
                 stage="sa_calculator",
                 error_type="sa_calculation_error",
                 message=str(e),
@@ -444,6 +550,7 @@ class PipelineOrchestrator:
         self,
         data: CRMAdjustedBundle,
         config: CalculationConfig,
+        run: RunContext,
     ) -> IRBResultBundle | None:
         """Run IRB calculation stage."""
         try:
@@ -460,14 +567,14 @@ class PipelineOrchestrator:
             # Accumulate IRB errors
             if result.errors:
                 for error in result.errors:
-                    self._errors.append(PipelineError(
+                    run.errors.append(PipelineError(
                         stage="irb_calculator",
                         error_type=getattr(error, "error_type", "unknown"),
                         message=getattr(error, "message", str(error)),
                     ))
             return result
         except Exception as e:
-            self._errors.append(PipelineError(
+            run.errors.append(PipelineError(
                 stage="irb_calculator",
                 error_type="irb_calculation_error",
                 message=str(e),
@@ -483,6 +590,7 @@ class PipelineOrchestrator:
         self,
         data: CRMAdjustedBundle,
         config: CalculationConfig,
+        run: RunContext,
     ) -> SlottingResultBundle | None:
         """Run Slotting calculation stage."""
         try:
@@ -498,14 +606,14 @@ class PipelineOrchestrator:
             # Accumulate Slotting errors
             if result.errors:
                 for error in result.errors:
-                    self._errors.append(PipelineError(
+                    run.errors.append(PipelineError(
                         stage="slotting_calculator",
                         error_type=getattr(error, "error_type", "unknown"),
                         message=getattr(error, "message", str(error)),
                     ))
             return result
         except Exception as e:
-            self._errors.append(PipelineError(
+            run.errors.append(PipelineError(
                 stage="slotting_calculator",
                 error_type="slotting_calculation_error",
                 message=str(e),
@@ -520,6 +628,7 @@ class PipelineOrchestrator:
         self,
         data: CRMAdjustedBundle,
         config: CalculationConfig,
+        run: RunContext,
     ) -> EquityResultBundle | None:
         """Run Equity calculation stage."""
         try:
@@ -536,14 +645,14 @@ class PipelineOrchestrator:
             # Accumulate Equity errors
             if result.errors:
                 for error in result.errors:
-                    self._errors.append(PipelineError(
+                    run.errors.append(PipelineError(
                         stage="equity_calculator",
                         error_type=getattr(error, "error_type", "unknown"),
                         message=getattr(error, "message", str(error)),
                     ))
             return result
         except Exception as e:
-            self._errors.append(PipelineError(
+            run.errors.append(PipelineError(
                 stage="equity_calculator",
                 error_type="equity_calculation_error",
                 message=str(e),
@@ -562,6 +671,8 @@ class PipelineOrchestrator:
         slotting_bundle: SlottingResultBundle | None,
         equity_bundle: EquityResultBundle | None,
         config: CalculationConfig,
+        run: RunContext,
+        perimeters: pl.LazyFrame | None = None,
     ) -> AggregatedResultBundle:
         """Run output aggregation stage."""
         try:
@@ -571,26 +682,27 @@ class PipelineOrchestrator:
                 slotting_bundle=slotting_bundle,
                 config=config,
                 equity_bundle=equity_bundle,
+                perimeters=perimeters,
             )
             # Accumulate aggregation errors
             if result.errors:
                 for error in result.errors:
                     if isinstance(error, PipelineError):
-                        self._errors.append(error)
+                        run.errors.append(error)
                     else:
-                        self._errors.append(PipelineError(
+                        run.errors.append(PipelineError(
                             stage="aggregator",
                             error_type=getattr(error, "error_type", "unknown"),
                             message=getattr(error, "message", str(error)),
                         ))
             return result
         except Exception as e:
-            self._errors.append(PipelineError(
+            run.errors.append(PipelineError(
                 stage="aggregator",
                 error_type="aggregation_error",
                 message=str(e),
             ))
-            return self._create_error_result()
+            return self._create_error_result(run)
 
     # =========================================================================
     # Private Methods - Utilities
@@ -606,24 +718,24 @@ class PipelineOrchestrator:
         except Exception:
             return False
 
-    def _create_error_result(self) -> AggregatedResultBundle:
+    def _create_error_result(self, run: RunContext) -> AggregatedResultBundle:
         """Create error result when pipeline fails."""
         return AggregatedResultBundle(
             results=pl.LazyFrame({
-                "exposure_reference": pl.Series([], dtype=pl.String),
+                "exposure_reference": pl.Series([], dtype=key_dtype()),
                 "approach_applied": pl.Series([], dtype=pl.String),
                 "exposure_class": pl.Series([], dtype=pl.String),
                 "ead_final": pl.Series([], dtype=pl.Float64),
                 "risk_weight": pl.Series([], dtype=pl.Float64),
                 "rwa_final": pl.Series([], dtype=pl.Float64),
             }),
-            errors=[self._convert_pipeline_error(e) for e in self._errors],
+            errors=[self._convert_pipeline_error(e) for e in run.errors],
         )
 
     def _create_empty_sa_frame(self) -> pl.LazyFrame:
         """Create empty SA results frame."""
         return pl.LazyFrame({
-            "exposure_reference": pl.Series([], dtype=pl.String),
+            "exposure_reference": pl.Series([], dtype=key_dtype()),
             "exposure_class": pl.Series([], dtype=pl.String),
             "ead_final": pl.Series([], dtype=pl.Float64),
             "risk_weight": pl.Series([], dtype=pl.Float64),
@@ -635,7 +747,7 @@ class PipelineOrchestrator:
     def _create_empty_irb_frame(self) -> pl.LazyFrame:
         """Create empty IRB results frame."""
         return pl.LazyFrame({
-            "exposure_reference": pl.Series([], dtype=pl.String),
+            "exposure_reference": pl.Series([], dtype=key_dtype()),
             "exposure_class": pl.Series([], dtype=pl.String),
             "ead_final": pl.Series([], dtype=pl.Float64),
             "pd_floored": pl.Series([], dtype=pl.Float64),
@@ -648,7 +760,7 @@ class PipelineOrchestrator:
     def _create_empty_slotting_frame(self) -> pl.LazyFrame:
         """Create empty Slotting results frame."""
         return pl.LazyFrame({
-            "exposure_reference": pl.Series([], dtype=pl.String),
+            "exposure_reference": pl.Series([], dtype=key_dtype()),
             "slotting_category": pl.Series([], dtype=pl.String),
             "is_hvcre": pl.Series([], dtype=pl.Boolean),
             "ead_final": pl.Series([], dtype=pl.Float64),
@@ -659,7 +771,7 @@ class PipelineOrchestrator:
     def _create_empty_equity_frame(self) -> pl.LazyFrame:
         """Create empty Equity results frame."""
         return pl.LazyFrame({
-            "exposure_reference": pl.Series([], dtype=pl.String),
+            "exposure_reference": pl.Series([], dtype=key_dtype()),
             "equity_type": pl.Series([], dtype=pl.String),
             "ead_final": pl.Series([], dtype=pl.Float64),
             "risk_weight": pl.Series([], dtype=pl.Float64),
@@ -686,6 +798,8 @@ class PipelineOrchestrator:
 def create_pipeline(
     data_path: str | Path | None = None,
     loader: LoaderProtocol | None = None,
+    encode_keys: bool = False,
+    governor: ResourceGovernor | None = None,
 ) -> PipelineOrchestrator:
     """
     Create a pipeline orchestrator with default components.
@@ -693,6 +807,8 @@ def create_pipeline(
     Args:
         data_path: Path to data directory (creates ParquetLoader)
         loader: Pre-configured loader (overrides data_path)
+        encode_keys: Join on dictionary-encoded references (default False)
+        governor: Memory and concurrency limits (optional)
 
     Returns:
         PipelineOrchestrator ready for use
@@ -712,7 +828,11 @@ def create_pipeline(
     if loader is None and data_path is not None:
         loader = ParquetLoader(base_path=data_path)
 
-    return PipelineOrchestrator(loader=loader)
+    return PipelineOrchestrator(
+        loader=loader,
+        encode_keys=encode_keys,
+        governor=governor,
+    )
 
 
 def create_test_pipeline() -> PipelineOrchestrator:
@@ -0,0 +1,394 @@
+"""
+Resource governor for the RWA calculator pipeline.
+
+Polars runs every query on a process-wide thread pool sized to the
+machine, and the classifier and CRM stages materialise the full exposure
+frame in memory. When interactive and batch runs share a host they
+compete for both. ResourceGovernor bounds a run's footprint:
+
+- memory_budget_bytes: soft budget for a run's working set. The working
+  set is estimated from input row counts x schema row widths; runs over
+  budget stream the classifier and CRM outputs to Arrow IPC spill files
+  and scan them back, instead of collecting them in memory.
+- max_concurrent_runs: runs admitted at once per governor. Further runs
+  wait for a slot.
+- expected_threads: a check, not a limit. The Polars thread pool is a
+  startup-time setting: Polars sizes it once per process from
+  POLARS_MAX_THREADS, before this module can run, so set that variable in
+  the process environment. The governor logs a warning when the pool
+  differs from expected_threads.
+
+Spill files stay on disk while a run's lazy results may still read them.
+They live in one directory per governor, removed by close() or when the
+governor is garbage collected.
+
+Classes:
+    ResourceLimits: Memory and concurrency budgets
+    ResourcePlan: Estimated footprint and effective config for one run
+    ResourceGovernor: Admits runs within the limits
+
+Functions:
+    check_thread_pool: Check the Polars thread pool against an expected size
+    materialise: Collect a stage output in memory or through a spill file
+    row_width: Estimated bytes per row of a schema
+    estimate_bytes: Estimated in-memory size of a raw data bundle
+
+Usage:
+    from rwa_calc.engine.pipeline import PipelineOrchestrator
+    from rwa_calc.engine.resources import ResourceGovernor, ResourceLimits
+
+    governor = ResourceGovernor(ResourceLimits(
+        expected_threads=8,
+        memory_budget_bytes=4 * 1024**3,
+        max_concurrent_runs=2,
+    ))
+    pipeline = PipelineOrchestrator(governor=governor)
+    result = pipeline.run_with_data(data, config)
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+if TYPE_CHECKING:
+    from rwa_calc.contracts.bundles import RawDataBundle
+    from rwa_calc.contracts.config import CalculationConfig
+
+logger = logging.getLogger(__name__)
+
+# Intermediate columns widen the exposure frame to roughly this multiple
+# of the input size while the classifier and CRM stages run
+DEFAULT_WORKING_SET_FACTOR = 3.0
+
+# Prefix of a governor's spill directory
+SPILL_PREFIX = "rwa_spill_"
+
+# Bytes per value for variable-width types (references, codes)
+STRING_WIDTH = 24
+
+# Bytes per value for fixed-width types
+_DTYPE_WIDTHS: dict[type[pl.DataType], int] = {
+    pl.Boolean: 1,
+    pl.Int8: 1,
+    pl.UInt8: 1,
+    pl.Int16: 2,
+    pl.UInt16: 2,
+    pl.Int32: 4,
+    pl.UInt32: 4,
+    pl.Float32: 4,
+    pl.Date: 4,
+    pl.Int64: 8,
+    pl.UInt64: 8,
+    pl.Float64: 8,
+    pl.Datetime: 8,
+    pl.Duration: 8,
+    pl.Decimal: 16,
+    pl.Categorical: 4,
+    pl.Enum: 4,
+}
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """
+    Memory and concurrency budgets for pipeline runs.
+
+    Every limit is optional; None leaves that resource unbounded.
+
+    Attributes:
+        memory_budget_bytes: Soft budget for a run's estimated working set
+        max_concurrent_runs: Runs admitted at once
+        expected_threads: Polars thread pool size to check for (logged, not
+            enforced; set POLARS_MAX_THREADS at process startup)
+        working_set_factor: Working set as a multiple of the input size
+        spill_dir: Parent directory for spill files of over-budget runs
+            (default: the system temporary directory)
+    """
+
+    memory_budget_bytes: int | None = None
+    max_concurrent_runs: int | None = None
+    expected_threads: int | None = None
+    working_set_factor: float = DEFAULT_WORKING_SET_FACTOR
+    spill_dir: Path | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("expected_threads", "memory_budget_bytes", "max_concurrent_runs"):
+            value = getattr(self, name)
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be at least 1, got {value}")
+
+
+@dataclass(frozen=True)
+class ResourcePlan:
+    """
+    Estimated footprint and effective configuration for one run.
+
+    Attributes:
+        config: Configuration the run uses (spilled stages if over budget)
+        estimated_bytes: Estimated working set of the run
+        streaming: Whether stages stream to spill files instead of memory
+        threads: Effective Polars thread pool size
+    """
+
+    config: CalculationConfig
+    estimated_bytes: int
+    streaming: bool
+    threads: int
+
+
+class ResourceGovernor:
+    """
+    Admit pipeline runs within memory and concurrency limits.
+
+    One governor is shared by every orchestrator that should count
+    against the same concurrency limit.
+
+    Usage:
+        governor = ResourceGovernor(ResourceLimits(max_concurrent_runs=2))
+        with governor.admit(data, config) as plan:
+            result = run(data, plan.config)
+    """
+
+    def __init__(self, limits: ResourceLimits | None = None) -> None:
+        """
+        Initialize ResourceGovernor.
+
+        Checks the Polars thread pool against expected_threads if it is set.
+
+        Args:
+            limits: Resource budgets (default: unbounded)
+        """
+        self.limits = limits or ResourceLimits()
+        self._slots = (
+            threading.BoundedSemaphore(self.limits.max_concurrent_runs)
+            if self.limits.max_concurrent_runs is not None
+            else None
+        )
+        self.threads = check_thread_pool(self.limits.expected_threads)
+        self._spill_dir: Path | None = None
+        self._spill_lock = threading.Lock()
+        self._finalizer: weakref.finalize | None = None
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    def plan(self, data: RawDataBundle, config: CalculationConfig) -> ResourcePlan:
+        """
+        Estimate a run's working set and decide whether its stages spill.
+
+        Runs over budget get a config with a spill directory and the
+        streaming engine, so the classifier and CRM outputs are sunk to
+        Arrow IPC files and scanned back instead of collected in memory.
+
+        Args:
+            data: Raw data bundle the run will process
+            config: Requested calculation configuration
+
+        Returns:
+            ResourcePlan with the config the run should use
+        """
+        budget = self.limits.memory_budget_bytes
+        if budget is None:
+            return ResourcePlan(
+                config=config, estimated_bytes=0, streaming=False, threads=self.threads,
+            )
+
+        estimated = int(estimate_bytes(data) * self.limits.working_set_factor)
+        streaming = estimated > budget and config.spill_dir is None
+        if streaming:
+            config = replace(
+                config,
+                materialise_engine="streaming",
+                spill_dir=self.spill_dir(),
+            )
+
+        return ResourcePlan(
+            config=config,
+            estimated_bytes=estimated,
+            streaming=streaming,
+            threads=self.threads,
+        )
+
+    @contextmanager
+    def admit(
+        self,
+        data: RawDataBundle,
+        config: CalculationConfig,
+    ) -> Iterator[ResourcePlan]:
+        """
+        Hold a run slot for the duration of a run.
+
+        Blocks while max_concurrent_runs runs are in progress.
+
+        Args:
+            data: Raw data bundle the run will process
+            config: Requested calculation configuration
+
+        Yields:
+            ResourcePlan for the admitted run
+        """
+        with self._slots if self._slots is not None else nullcontext():
+            yield self.plan(data, config)
+
+    def spill_dir(self) -> Path:
+        """
+        The governor's spill directory, created on first use.
+
+        Returns:
+            Directory over-budget runs sink their stage outputs to
+        """
+        with self._spill_lock:
+            if self._spill_dir is None:
+                self._spill_dir = Path(
+                    tempfile.mkdtemp(prefix=SPILL_PREFIX, dir=self.limits.spill_dir)
+                )
+                self._finalizer = weakref.finalize(
+                    self, shutil.rmtree, self._spill_dir, ignore_errors=True
+                )
+            return self._spill_dir
+
+    def close(self) -> None:
+        """
+        Remove the spill directory.
+
+        Lazy results of over-budget runs read their spill files, so collect
+        or write them out before closing.
+        """
+        with self._spill_lock:
+            if self._finalizer is not None:
+                self._finalizer()
+            self._spill_dir = None
+            self._finalizer = None
+
+
+# =============================================================================
+# Materialisation
+# =============================================================================
+
+
+def materialise(
+    lf: pl.LazyFrame,
+    config: CalculationConfig,
+    stage: str,
+) -> pl.LazyFrame:
+    """
+    Collect a stage output in memory or through a spill file.
+
+    Without a spill directory the frame is collected with the configured
+    materialise_engine. With one, it is streamed to an Arrow IPC file
+    there and scanned back, so the output never has to fit in memory.
+
+    Args:
+        lf: Stage output to materialise
+        config: Calculation configuration (materialise_engine, spill_dir)
+        stage: Stage name, used in the spill file name
+
+    Returns:
+        LazyFrame over the materialised output
+    """
+    if config.spill_dir is None:
+        return lf.collect(engine=config.materialise_engine).lazy()
+
+    path = Path(config.spill_dir) / f"{stage}-{uuid.uuid4().hex}.arrow"
+    lf.sink_ipc(path)
+    return pl.scan_ipc(path)
+
+
+# =============================================================================
+# Threads
+# =============================================================================
+
+
+def check_thread_pool(expected_threads: int | None) -> int:
+    """
+    Check the Polars thread pool against an expected size.
+
+    Polars sizes its pool from POLARS_MAX_THREADS when it is first
+    imported, and the pool cannot be resized afterwards, so the pool size
+    is a startup-time setting of the process environment. This function
+    cannot change it; it logs a warning when the pool differs from the
+    expected size.
+
+    Args:
+        expected_threads: Expected pool size (None skips the check)
+
+    Returns:
+        Effective pool size
+    """
+    threads = pl.thread_pool_size()
+    if expected_threads is not None and threads != expected_threads:
+        logger.warning(
+            "Polars thread pool has %d threads, not the expected %d; set "
+            "POLARS_MAX_THREADS=%d in the environment before the process starts",
+            threads,
+            expected_threads,
+            expected_threads,
+        )
+    return threads
+
+
+# =============================================================================
+# Size Estimation
+# =============================================================================
+
+
+def row_width(schema: pl.Schema) -> int:
+    """
+    Estimated bytes per row of a schema.
+
+    Args:
+        schema: Frame schema
+
+    Returns:
+        Sum of per-column value widths (STRING_WIDTH for strings, 8 for
+        nested and unknown types)
+    """
+    return sum(_dtype_width(dtype) for dtype in schema.dtypes())
+
+
+def estimate_bytes(data: RawDataBundle) -> int:
+    """
+    Estimated in-memory size of a raw data bundle.
+
+    Row counts of every table are collected in one pass; Parquet scans
+    answer them from file metadata.
+
+    Args:
+        data: Raw data bundle
+
+    Returns:
+        Sum over tables of row count x row width
+    """
+    frames = [
+        frame
+        for f in fields(data)
+        if isinstance(frame := getattr(data, f.name), pl.LazyFrame)
+    ]
+    if not frames:
+        return 0
+
+    counts = pl.collect_all([frame.select(pl.len()) for frame in frames])
+    return sum(
+        count.item() * row_width(frame.collect_schema())
+        for frame, count in zip(frames, counts, strict=True)
+    )
+
+
+def _dtype_width(dtype: pl.DataType) -> int:
+    """Bytes per value of a dtype."""
+    if dtype == pl.String or dtype == pl.Binary:
+        return STRING_WIDTH
+    return _DTYPE_WIDTHS.get(dtype.base_type(), 8)
@@ -142,7 +142,10 @@ class SACalculator:
         exposures = self._apply_supporting_factors(exposures, config)
 
         # Step 5: Build audit trail
-        audit = self._build_audit(exposures)
+        audit = (
+            self._build_audit(exposures, include_strings=config.audit_strings)
+            if config.audit_trail else None
+        )
 
         return SAResultBundle(
             results=exposures,
@@ -484,12 +487,14 @@ class SACalculator:
     def _build_audit(
         self,
         exposures: pl.LazyFrame,
+        include_strings: bool = True,
     ) -> pl.LazyFrame:
         """
         Build SA calculation audit trail.
 
         Args:
             exposures: Calculated exposures
+            include_strings: Whether to add the sa_calculation string
 
         Returns:
             Audit trail LazyFrame
@@ -517,6 +522,8 @@ class SACalculator:
                 select_cols.append(col)
 
         audit = exposures.select(select_cols)
+        if not include_strings:
+            return audit
 
         # Add calculation string
         audit = audit.with_columns([
@@ -50,6 +50,7 @@ from rwa_calc.data.tables.crr_slotting import (
     SLOTTING_RISK_WEIGHTS_HVCRE,
 )
 from rwa_calc.domain.enums import SlottingCategory
+from rwa_calc.engine.key_encoding import key_dtype
 
 if TYPE_CHECKING:
     from rwa_calc.contracts.config import CalculationConfig
@@ -146,7 +147,7 @@ class SlottingCalculator:
         # Handle case where there are no slotting exposures
         if exposures is None:
             empty_frame = pl.LazyFrame({
-                "exposure_reference": pl.Series([], dtype=pl.String),
+                "exposure_reference": pl.Series([], dtype=key_dtype()),
                 "slotting_category": pl.Series([], dtype=pl.String),
                 "is_hvcre": pl.Series([], dtype=pl.Boolean),
                 "ead_final": pl.Series([], dtype=pl.Float64),
@@ -169,7 +170,10 @@ class SlottingCalculator:
         exposures = self._calculate_rwa(exposures)
 
         # Step 4: Build audit trail
-        audit = self._build_audit(exposures)
+        audit = (
+            self._build_audit(exposures, include_strings=config.audit_strings)
+            if config.audit_trail else None
+        )
 
         return SlottingResultBundle(
             results=exposures,
@@ -376,6 +380,7 @@ class SlottingCalculator:
     def _build_audit(
         self,
         exposures: pl.LazyFrame,
+        include_strings: bool = True,
     ) -> pl.LazyFrame:
         """Build slotting calculation audit trail."""
         schema = exposures.collect_schema()
@@ -399,6 +404,8 @@ class SlottingCalculator:
                 select_cols.append(col)
 
         audit = exposures.select(select_cols)
+        if not include_strings:
+            return audit
 
         # Add calculation string
         audit = audit.with_columns([
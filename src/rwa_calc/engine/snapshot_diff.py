@@ -0,0 +1,401 @@
+"""
+Row-level change sets between two input snapshots.
+
+Compares two loader outputs (RawDataBundles, e.g. yesterday's and
+today's) table by table and classifies every row as inserted, updated,
+deleted or unchanged. Rows are matched on each table's reference key;
+a matched row is updated when its content hash differs. The hash covers
+the table's schema columns from data/schemas.py (excluding the key) that
+are present in both snapshots, so extra source columns do not register
+as changes.
+
+Only the keys of changed rows are materialised. All tables are hashed,
+joined and counted together in one pl.collect_all call on the streaming
+engine, which runs the tables concurrently and keeps memory bounded by
+the key and hash columns. The insert/update/delete frames are lazy semi
+joins of those keys against the snapshots.
+
+Keys are expected to be unique per snapshot (DataQualityChecker reports
+duplicates). Rows with a null key cannot be matched and are left out.
+
+Classes:
+    SnapshotTable: Key and schema used to diff one table
+    TableChanges: Insert/update/delete frames for one table
+    SnapshotDiff: Change sets and statistics for every table
+    SnapshotDiffer: Compare two RawDataBundles
+
+Usage:
+    from rwa_calc.engine.snapshot_diff import create_snapshot_differ
+
+    diff = create_snapshot_differ().diff(yesterday, today)
+    diff.statistics                       # one row per table
+    diff.changes["loans"].updates.collect()
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from rwa_calc.data.schemas import (
+    COLLATERAL_SCHEMA,
+    CONTINGENTS_SCHEMA,
+    COUNTERPARTY_SCHEMA,
+    EQUITY_EXPOSURE_SCHEMA,
+    FACILITY_MAPPING_SCHEMA,
+    FACILITY_SCHEMA,
+    FX_RATES_SCHEMA,
+    GUARANTEE_SCHEMA,
+    LENDING_MAPPING_SCHEMA,
+    LOAN_SCHEMA,
+    ORG_MAPPING_SCHEMA,
+    PERIMETER_SCHEMA,
+    PROVISION_SCHEMA,
+    RATINGS_SCHEMA,
+    SPECIALISED_LENDING_SCHEMA,
+)
+
+if TYPE_CHECKING:
+    from rwa_calc.contracts.bundles import RawDataBundle
+    from rwa_calc.contracts.config import PolarsEngine
+
+
+# =============================================================================
+# Table Specifications
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class SnapshotTable:
+    """
+    How one input table is diffed.
+
+    Attributes:
+        key: Reference columns identifying a row (columns absent from both
+            snapshots are skipped, so optional key columns are allowed)
+        schema: Expected schema; its non-key columns form the content hash
+    """
+
+    key: tuple[str, ...]
+    schema: dict[str, pl.DataType]
+
+
+# RawDataBundle field -> diff specification
+SNAPSHOT_TABLES: dict[str, SnapshotTable] = {
+    "facilities": SnapshotTable(("facility_reference",), FACILITY_SCHEMA),
+    "loans": SnapshotTable(("loan_reference",), LOAN_SCHEMA),
+    "contingents": SnapshotTable(("contingent_reference",), CONTINGENTS_SCHEMA),
+    "counterparties": SnapshotTable(("counterparty_reference",), COUNTERPARTY_SCHEMA),
+    "collateral": SnapshotTable(("collateral_reference",), COLLATERAL_SCHEMA),
+    "guarantees": SnapshotTable(("guarantee_reference",), GUARANTEE_SCHEMA),
+    "provisions": SnapshotTable(("provision_reference",), PROVISION_SCHEMA),
+    "ratings": SnapshotTable(("rating_reference",), RATINGS_SCHEMA),
+    "specialised_lending": SnapshotTable(("exposure_reference",), SPECIALISED_LENDING_SCHEMA),
+    "equity_exposures": SnapshotTable(("exposure_reference",), EQUITY_EXPOSURE_SCHEMA),
+    "facility_mappings": SnapshotTable(("child_reference",), FACILITY_MAPPING_SCHEMA),
+    "org_mappings": SnapshotTable(("child_counterparty_reference",), ORG_MAPPING_SCHEMA),
+    "lending_mappings": SnapshotTable(("child_counterparty_reference",), LENDING_MAPPING_SCHEMA),
+    "fx_rates": SnapshotTable(("currency_from", "currency_to", "rate_date"), FX_RATES_SCHEMA),
+    "perimeters": SnapshotTable(("perimeter_id", "book_code"), PERIMETER_SCHEMA),
+}
+
+# Values of the change_type column
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+STATISTICS_SCHEMA: dict[str, pl.DataType] = {
+    "table": pl.String,
+    "previous_rows": pl.Int64,
+    "current_rows": pl.Int64,
+    "inserts": pl.Int64,
+    "updates": pl.Int64,
+    "deletes": pl.Int64,
+    "unchanged": pl.Int64,
+    "change_rate": pl.Float64,
+}
+
+_HASH_PREVIOUS = "_hash_previous"
+_HASH_CURRENT = "_hash_current"
+
+
+# =============================================================================
+# Results
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class TableChanges:
+    """
+    Row-level changes of one table.
+
+    Attributes:
+        table: RawDataBundle field name
+        key: Key columns rows were matched on
+        changed_keys: Key columns plus change_type for every changed row
+        inserts: Current-snapshot rows whose key is new
+        updates: Current-snapshot rows whose content changed
+        deletes: Previous-snapshot rows whose key disappeared
+    """
+
+    table: str
+    key: tuple[str, ...]
+    changed_keys: pl.DataFrame
+    inserts: pl.LazyFrame
+    updates: pl.LazyFrame
+    deletes: pl.LazyFrame
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    """
+    Result of comparing two snapshots.
+
+    Attributes:
+        changes: Table name -> TableChanges
+        statistics: One row per table (see STATISTICS_SCHEMA)
+    """
+
+    changes: dict[str, TableChanges]
+    statistics: pl.DataFrame
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any table has an inserted, updated or deleted row."""
+        return any(changes.changed_keys.height for changes in self.changes.values())
+
+
+# =============================================================================
+# Snapshot Differ
+# =============================================================================
+
+
+class SnapshotDiffer:
+    """
+    Compare two RawDataBundles table by table.
+
+    Attributes:
+        tables: Table name -> SnapshotTable for the tables that are diffed
+    """
+
+    def __init__(self, tables: dict[str, SnapshotTable] | None = None) -> None:
+        """
+        Initialize SnapshotDiffer.
+
+        Args:
+            tables: Tables to diff; defaults to SNAPSHOT_TABLES
+        """
+        self.tables = SNAPSHOT_TABLES if tables is None else tables
+
+    def diff(
+        self,
+        previous: RawDataBundle,
+        current: RawDataBundle,
+        engine: PolarsEngine = "streaming",
+    ) -> SnapshotDiff:
+        """
+        Compute row-level change sets between two snapshots.
+
+        A table missing from one snapshot counts as empty there; tables
+        missing from both are skipped.
+
+        Args:
+            previous: Earlier snapshot
+            current: Later snapshot
+            engine: Polars engine for the combined collect
+
+        Returns:
+            SnapshotDiff with per-table changes and statistics
+
+        Raises:
+            ValueError: If a table has none of its key columns in both snapshots
+        """
+        plans: list[tuple[str, tuple[str, ...], pl.LazyFrame, pl.LazyFrame]] = []
+        queries: list[pl.LazyFrame] = []
+        for name, spec in self.tables.items():
+            before = getattr(previous, name, None)
+            after = getattr(current, name, None)
+            if before is None and after is None:
+                continue
+            before, after = _align(before, after)
+            key = self._key(name, spec, before, after)
+            # Join keys must share a dtype; the current snapshot's types win
+            after_schema = after.collect_schema()
+            before = before.with_columns([pl.col(c).cast(after_schema[c]) for c in key])
+            joined = _hash_join(before, after, key, spec.schema)
+            queries.extend([_changed_keys(joined, key), _counts(joined)])
+            plans.append((name, key, before, after))
+
+        frames = pl.collect_all(queries, engine=engine) if queries else []
+
+        changes: dict[str, TableChanges] = {}
+        rows: list[tuple] = []
+        for i, (name, key, before, after) in enumerate(plans):
+            changed, counts = frames[2 * i], frames[2 * i + 1]
+            changes[name] = _table_changes(name, key, changed, before, after)
+            rows.append(_statistics_row(name, changed, counts))
+
+        statistics = pl.DataFrame(rows, schema=STATISTICS_SCHEMA, orient="row")
+        return SnapshotDiff(changes=changes, statistics=statistics)
+
+    # =========================================================================
+    # Private Methods
+    # =========================================================================
+
+    def _key(
+        self,
+        name: str,
+        spec: SnapshotTable,
+        before: pl.LazyFrame,
+        after: pl.LazyFrame,
+    ) -> tuple[str, ...]:
+        """Key columns present in both snapshots."""
+        before_names = set(before.collect_schema().names())
+        after_names = set(after.collect_schema().names())
+        key = tuple(c for c in spec.key if c in before_names and c in after_names)
+        if not key:
+            raise ValueError(
+                f"[{name}] None of the key columns {spec.key} are present in both snapshots"
+            )
+        return key
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _align(
+    before: pl.LazyFrame | None,
+    after: pl.LazyFrame | None,
+) -> tuple[pl.LazyFrame, pl.LazyFrame]:
+    """Replace a missing snapshot table with an empty frame of the other's schema."""
+    if before is None:
+        return pl.LazyFrame(schema=after.collect_schema()), after
+    if after is None:
+        return before, pl.LazyFrame(schema=before.collect_schema())
+    return before, after
+
+
+def _row_hash(
+    lf: pl.LazyFrame,
+    key: tuple[str, ...],
+    content: list[str],
+    schema: dict[str, pl.DataType],
+    alias: str,
+) -> pl.LazyFrame:
+    """Key columns plus a hash of the content columns, cast to their schema types."""
+    if content:
+        row_hash = pl.struct([
+            pl.col(c).cast(schema[c], strict=False) for c in content
+        ]).hash(seed=0)
+    else:
+        row_hash = pl.lit(0, dtype=pl.UInt64)
+    return lf.select([*key, row_hash.alias(alias)]).drop_nulls(list(key))
+
+
+def _hash_join(
+    before: pl.LazyFrame,
+    after: pl.LazyFrame,
+    key: tuple[str, ...],
+    schema: dict[str, pl.DataType],
+) -> pl.LazyFrame:
+    """Full join of both snapshots' key and hash projections."""
+    before_names = set(before.collect_schema().names())
+    after_names = set(after.collect_schema().names())
+    content = [
+        c for c in schema
+        if c not in key and c in before_names and c in after_names
+    ]
+    return _row_hash(before, key, content, schema, _HASH_PREVIOUS).join(
+        _row_hash(after, key, content, schema, _HASH_CURRENT),
+        on=list(key),
+        how="full",
+        coalesce=True,
+    )
+
+
+def _change_type() -> pl.Expr:
+    """Classify a joined row as insert, update or delete (null if unchanged)."""
+    return (
+        pl.when(pl.col(_HASH_PREVIOUS).is_null()).then(pl.lit(INSERT))
+        .when(pl.col(_HASH_CURRENT).is_null()).then(pl.lit(DELETE))
+        .when(pl.col(_HASH_PREVIOUS) != pl.col(_HASH_CURRENT)).then(pl.lit(UPDATE))
+        .otherwise(pl.lit(None, dtype=pl.String))
+        .alias("change_type")
+    )
+
+
+def _changed_keys(joined: pl.LazyFrame, key: tuple[str, ...]) -> pl.LazyFrame:
+    """Keys of changed rows with their change_type."""
+    return joined.select([*key, _change_type()]).drop_nulls("change_type")
+
+
+def _counts(joined: pl.LazyFrame) -> pl.LazyFrame:
+    """Row counts per snapshot and unchanged rows, in one aggregation."""
+    return joined.select([
+        pl.col(_HASH_PREVIOUS).is_not_null().sum().cast(pl.Int64).alias("previous_rows"),
+        pl.col(_HASH_CURRENT).is_not_null().sum().cast(pl.Int64).alias("current_rows"),
+        (pl.col(_HASH_PREVIOUS) == pl.col(_HASH_CURRENT)).sum().cast(pl.Int64).alias("unchanged"),
+    ])
+
+
+def _table_changes(
+    name: str,
+    key: tuple[str, ...],
+    changed: pl.DataFrame,
+    before: pl.LazyFrame,
+    after: pl.LazyFrame,
+) -> TableChanges:
+    """Lazy insert/update/delete frames for one table."""
+
+    def rows(source: pl.LazyFrame, change_type: str) -> pl.LazyFrame:
+        keys = changed.lazy().filter(pl.col("change_type") == change_type).select(key)
+        return source.join(keys, on=list(key), how="semi")
+
+    return TableChanges(
+        table=name,
+        key=key,
+        changed_keys=changed,
+        inserts=rows(after, INSERT),
+        updates=rows(after, UPDATE),
+        deletes=rows(before, DELETE),
+    )
+
+
+def _statistics_row(name: str, changed: pl.DataFrame, counts: pl.DataFrame) -> tuple:
+    """Build one statistics row (STATISTICS_SCHEMA order)."""
+    by_type = dict(changed.get_column("change_type").value_counts().iter_rows())
+    inserts = by_type.get(INSERT, 0)
+    updates = by_type.get(UPDATE, 0)
+    deletes = by_type.get(DELETE, 0)
+    count = counts.row(0, named=True)
+    unchanged = count["unchanged"] or 0
+    total = inserts + updates + deletes + unchanged
+    return (
+        name,
+        count["previous_rows"] or 0,
+        count["current_rows"] or 0,
+        inserts,
+        updates,
+        deletes,
+        unchanged,
+        (inserts + updates + deletes) / total if total else 0.0,
+    )
+
+
+# =============================================================================
+# Factory Function
+# =============================================================================
+
+
+def create_snapshot_differ() -> SnapshotDiffer:
+    """
+    Create a SnapshotDiffer instance.
+
+    Returns:
+        SnapshotDiffer ready for use
+    """
+    return SnapshotDiffer()
@@ -11,9 +11,14 @@ Features:
     - Load cached results from calculator
     - Filter by exposure class, approach, risk weight range
     - Aggregation by different dimensions
-    - Drill-down into individual exposures
+    - Drill-down into individual exposures (paged)
     - Charts and visualizations
     - Export filtered results
+
+Results are never loaded in full. Filter options, totals and summaries
+come from the aggregate sidecar written by the calculator (see
+rwa_calc.api.results_cache); pages, risk weight range filters and
+exports scan the cached Arrow IPC file with filters pushed down.
 """
 
 import marimo
@@ -25,13 +30,13 @@ app = marimo.App(width="full")
 @app.cell
 def _():
     import marimo as mo
-    import polars as pl
-    import json
     from pathlib import Path
 
+    from rwa_calc.api import ResultsCache, ResultsFilter
+
     cache_dir = Path(__file__).parent / ".cache"
 
-    return Path, cache_dir, json, mo, pl
+    return Path, ResultsCache, ResultsFilter, cache_dir, mo
 
 
 @app.cell
@@ -70,14 +75,13 @@ Analyze and drill down into your RWA calculation results. Use the filters below
 
 
 @app.cell
-def _(cache_dir, json, mo, pl):
-    results_file = cache_dir / "last_results.parquet"
-    meta_file = cache_dir / "last_results_meta.json"
+def _(ResultsCache, cache_dir, mo):
+    cache = ResultsCache(cache_dir)
+    has_results = cache.exists()
 
-    if results_file.exists():
-        results_df = pl.read_parquet(results_file)
-        metadata = json.loads(meta_file.read_text()) if meta_file.exists() else {}
-        has_results = True
+    if has_results:
+        metadata = cache.metadata()
+        overall = cache.totals()
 
         mo.output.replace(
             mo.callout(
@@ -85,16 +89,14 @@ def _(cache_dir, json, mo, pl):
 **Loaded Results**
 - Framework: {metadata.get('framework', 'Unknown')}
 - Reporting Date: {metadata.get('reporting_date', 'Unknown')}
-- Total Exposures: {results_df.height:,}
-- Total RWA: {metadata.get('total_rwa', 0):,.0f}
+- Total Exposures: {overall['exposure_count']:,}
+- Total RWA: {metadata.get('total_rwa', overall['total_rwa']):,.0f}
                 """),
                 kind="success",
             )
         )
     else:
-        results_df = pl.DataFrame()
         metadata = {}
-        has_results = False
 
         mo.output.replace(
             mo.callout(
@@ -103,30 +105,21 @@ def _(cache_dir, json, mo, pl):
             )
         )
 
-    return has_results, metadata, results_df
+    return cache, has_results, metadata
 
 
 @app.cell
-def _(has_results, mo, results_df):
-    if has_results and results_df.height > 0:
-        # Get unique values for filters
-        exposure_classes = ["All"] + sorted(
-            results_df.select("exposure_class").unique().to_series().to_list()
-        ) if "exposure_class" in results_df.columns else ["All"]
-
-        approaches = ["All"] + sorted(
-            results_df.select("approach_applied").unique().to_series().to_list()
-        ) if "approach_applied" in results_df.columns else ["All"]
-
-        # Create filter widgets
+def _(cache, has_results, mo):
+    if has_results:
+        # Filter options come from the aggregate sidecar, not the results
         class_filter = mo.ui.dropdown(
-            options=exposure_classes,
+            options=["All"] + cache.filter_options("exposure_class"),
             value="All",
             label="Exposure Class",
         )
 
         approach_filter = mo.ui.dropdown(
-            options=approaches,
+            options=["All"] + cache.filter_options("approach_applied"),
             value="All",
             label="Approach",
         )
@@ -168,64 +161,47 @@ def _(has_results, mo, results_df):
 
 
 @app.cell
-def _(approach_filter, class_filter, has_results, mo, pl, results_df, rw_max, rw_min):
-    if has_results and results_df.height > 0 and class_filter is not None:
-        # Apply filters
-        filtered_df = results_df
-
-        if class_filter.value != "All" and "exposure_class" in filtered_df.columns:
-            filtered_df = filtered_df.filter(pl.col("exposure_class") == class_filter.value)
-
-        if approach_filter.value != "All" and "approach_applied" in filtered_df.columns:
-            filtered_df = filtered_df.filter(pl.col("approach_applied") == approach_filter.value)
-
-        if "risk_weight" in filtered_df.columns:
-            filtered_df = filtered_df.filter(
-                (pl.col("risk_weight") >= rw_min.value) &
-                (pl.col("risk_weight") <= rw_max.value)
-            )
-
-        # Compute filtered statistics
-        if "ead_final" in filtered_df.columns and "rwa_final" in filtered_df.columns:
-            total_ead = filtered_df.select(pl.col("ead_final").sum()).item()
-            total_rwa = filtered_df.select(pl.col("rwa_final").sum()).item()
-            avg_rw = total_rwa / total_ead if total_ead > 0 else 0
-        else:
-            total_ead = 0
-            total_rwa = 0
-            avg_rw = 0
+def _(ResultsFilter, approach_filter, cache, class_filter, has_results, mo, rw_max, rw_min):
+    if has_results and class_filter is not None:
+        # Risk weight bounds at their defaults are left unset so the cube can answer
+        results_filter = ResultsFilter(
+            exposure_class=None if class_filter.value == "All" else class_filter.value,
+            approach=None if approach_filter.value == "All" else approach_filter.value,
+            rw_min=rw_min.value if rw_min.value > 0.0 else None,
+            rw_max=rw_max.value if rw_max.value < 5.0 else None,
+        )
+        filtered_totals = cache.totals(results_filter)
 
         mo.output.replace(
             mo.hstack([
                 mo.stat(
-                    value=f"{filtered_df.height:,}",
+                    value=f"{filtered_totals['exposure_count']:,}",
                     label="Exposures",
                 ),
                 mo.stat(
-                    value=f"{total_ead:,.0f}",
+                    value=f"{filtered_totals['total_ead']:,.0f}",
                     label="Total EAD",
                 ),
                 mo.stat(
-                    value=f"{total_rwa:,.0f}",
+                    value=f"{filtered_totals['total_rwa']:,.0f}",
                     label="Total RWA",
                 ),
                 mo.stat(
-                    value=f"{avg_rw:.2%}",
+                    value=f"{filtered_totals['avg_risk_weight']:.2%}",
                     label="Avg Risk Weight",
                 ),
             ], justify="space-around")
         )
     else:
-        filtered_df = pl.DataFrame()
-        total_ead = 0
-        total_rwa = 0
+        results_filter = None
+        filtered_totals = {"exposure_count": 0, "total_ead": 0.0, "total_rwa": 0.0}
 
-    return avg_rw, filtered_df, total_ead, total_rwa
+    return filtered_totals, results_filter
 
 
 @app.cell
-def _(filtered_df, has_results, mo):
-    if has_results and filtered_df.height > 0:
+def _(filtered_totals, has_results, mo):
+    if has_results and filtered_totals["exposure_count"] > 0:
         # Aggregation selector
         agg_options = ["None", "By Exposure Class", "By Approach", "By Risk Weight Band"]
         agg_selector = mo.ui.dropdown(
@@ -247,64 +223,25 @@ def _(filtered_df, has_results, mo):
 
 
 @app.cell
-def _(agg_selector, filtered_df, has_results, mo, pl):
-    if has_results and filtered_df.height > 0 and agg_selector is not None:
-        if agg_selector.value == "By Exposure Class" and "exposure_class" in filtered_df.columns:
-            agg_df = filtered_df.group_by("exposure_class").agg([
-                pl.col("ead_final").sum().alias("total_ead"),
-                pl.col("rwa_final").sum().alias("total_rwa"),
-                pl.len().alias("count"),
-            ]).with_columns(
-                (pl.col("total_rwa") / pl.col("total_ead")).alias("avg_risk_weight")
-            ).sort("total_rwa", descending=True)
+def _(agg_selector, cache, has_results, mo, results_filter):
+    agg_dimensions = {
+        "By Exposure Class": ("exposure_class", "Summary by Exposure Class"),
+        "By Approach": ("approach_applied", "Summary by Approach"),
+        "By Risk Weight Band": ("rw_band", "Summary by Risk Weight Band"),
+    }
 
-            mo.output.replace(
-                mo.vstack([
-                    mo.md("#### Summary by Exposure Class"),
-                    mo.ui.table(agg_df, selection=None),
-                ])
-            )
-
-        elif agg_selector.value == "By Approach" and "approach_applied" in filtered_df.columns:
-            agg_df = filtered_df.group_by("approach_applied").agg([
-                pl.col("ead_final").sum().alias("total_ead"),
-                pl.col("rwa_final").sum().alias("total_rwa"),
-                pl.len().alias("count"),
-            ]).with_columns(
-                (pl.col("total_rwa") / pl.col("total_ead")).alias("avg_risk_weight")
-            ).sort("total_rwa", descending=True)
-
-            mo.output.replace(
-                mo.vstack([
-                    mo.md("#### Summary by Approach"),
-                    mo.ui.table(agg_df, selection=None),
-                ])
-            )
+    if has_results and agg_selector is not None and agg_selector.value in agg_dimensions:
+        agg_dimension, agg_title = agg_dimensions[agg_selector.value]
 
-        elif agg_selector.value == "By Risk Weight Band" and "risk_weight" in filtered_df.columns:
-            agg_df = filtered_df.with_columns(
-                pl.when(pl.col("risk_weight") <= 0.20).then(pl.lit("0-20%"))
-                .when(pl.col("risk_weight") <= 0.50).then(pl.lit("20-50%"))
-                .when(pl.col("risk_weight") <= 0.75).then(pl.lit("50-75%"))
-                .when(pl.col("risk_weight") <= 1.00).then(pl.lit("75-100%"))
-                .when(pl.col("risk_weight") <= 1.50).then(pl.lit("100-150%"))
-                .otherwise(pl.lit("150%+"))
-                .alias("rw_band")
-            ).group_by("rw_band").agg([
-                pl.col("ead_final").sum().alias("total_ead"),
-                pl.col("rwa_final").sum().alias("total_rwa"),
-                pl.len().alias("count"),
-            ]).with_columns(
-                (pl.col("total_rwa") / pl.col("total_ead")).alias("avg_risk_weight")
-            ).sort("rw_band")
+        if agg_dimension in cache.cube().columns:
+            agg_df = cache.summary(agg_dimension, results_filter)
 
             mo.output.replace(
                 mo.vstack([
-                    mo.md("#### Summary by Risk Weight Band"),
+                    mo.md(f"#### {agg_title}"),
                     mo.ui.table(agg_df, selection=None),
                 ])
             )
-
         else:
             agg_df = None
     else:
@@ -314,10 +251,12 @@ def _(agg_selector, filtered_df, has_results, mo, pl):
 
 
 @app.cell
-def _(filtered_df, has_results, mo):
-    if has_results and filtered_df.height > 0:
-        # Column selector for detailed view
-        available_cols = filtered_df.columns
+def _(cache, filtered_totals, has_results, mo):
+    page_size = 500
+
+    if has_results and filtered_totals["exposure_count"] > 0:
+        # Column names come from the file schema; no data is read
+        available_cols = cache.columns
 
         # Default columns to show
         default_cols = [
@@ -338,60 +277,70 @@ def _(filtered_df, has_results, mo):
             label="Columns to Display",
         )
 
+        page_count = max((filtered_totals["exposure_count"] - 1) // page_size + 1, 1)
+        page_selector = mo.ui.number(
+            value=1,
+            start=1,
+            stop=page_count,
+            step=1,
+            label=f"Page (of {page_count:,})",
+        )
+
         mo.output.replace(
             mo.vstack([
                 mo.md("### Detailed Results"),
-                column_selector,
+                mo.hstack([column_selector, page_selector], justify="start", gap=2),
             ])
         )
     else:
         column_selector = None
+        page_selector = None
 
-    return (column_selector,)
+    return column_selector, page_selector, page_size
 
 
 @app.cell
-def _(column_selector, filtered_df, has_results, mo):
-    if has_results and filtered_df.height > 0 and column_selector is not None and column_selector.value:
-        display_cols = [c for c in column_selector.value if c in filtered_df.columns]
+def _(cache, column_selector, filtered_totals, has_results, mo, page_selector, page_size, results_filter):
+    if has_results and column_selector is not None and column_selector.value:
+        display_cols = list(column_selector.value)
+        offset = (int(page_selector.value) - 1) * page_size
 
-        if display_cols:
-            display_df = filtered_df.select(display_cols)
+        # Only the selected columns and this page are read from the cache file
+        display_df = cache.page(results_filter, display_cols, offset=offset, limit=page_size)
+
+        mo.output.replace(
+            mo.vstack([
+                mo.md(
+                    f"*Showing rows {offset + 1:,}-{offset + display_df.height:,} "
+                    f"of {filtered_totals['exposure_count']:,}*"
+                ),
+                mo.ui.table(display_df, selection=None),
+            ])
+        )
+    else:
+        display_cols = []
 
-            mo.output.replace(
-                mo.vstack([
-                    mo.md(f"*Showing {min(display_df.height, 500):,} of {display_df.height:,} rows*"),
-                    mo.ui.table(display_df.head(500), selection=None),
-                ])
-            )
     return (display_cols,)
 
 
 @app.cell
-def _(filtered_df, has_results, mo):
-    import io
-
-    if has_results and filtered_df.height > 0:
-        # Export options
-        csv_data = filtered_df.write_csv()
-
-        # Write parquet to bytes buffer
-        parquet_buffer = io.BytesIO()
-        filtered_df.write_parquet(parquet_buffer)
-        parquet_bytes = parquet_buffer.getvalue()
-
+def _(cache, filtered_totals, has_results, mo, results_filter):
+    if has_results and filtered_totals["exposure_count"] > 0:
+        # Exports are generated when the button is clicked, not on every run
         mo.output.replace(
             mo.vstack([
                 mo.md("### Export Filtered Results"),
                 mo.hstack([
                     mo.download(
-                        data=csv_data.encode("utf-8"),
+                        data=lambda: cache.to_bytes(results_filter, format="csv"),
                         filename="filtered_rwa_results.csv",
+                        mimetype="text/csv",
                         label="Download CSV",
                     ),
                     mo.download(
-                        data=parquet_bytes,
+                        data=lambda: cache.to_bytes(results_filter, format="parquet"),
                         filename="filtered_rwa_results.parquet",
+                        mimetype="application/octet-stream",
                         label="Download Parquet",
                     ),
                 ], gap=2),
@@ -401,21 +350,18 @@ def _(filtered_df, has_results, mo):
 
 
 @app.cell
-def _(cache_dir, has_results, mo, pl):
-    # Load summary tables if available
-    class_summary_file = cache_dir / "last_summary_by_class.parquet"
-    approach_summary_file = cache_dir / "last_summary_by_approach.parquet"
-
+def _(cache, has_results, mo):
+    # Summary tables written by the calculator
     if has_results:
         output_parts = []
 
-        if class_summary_file.exists():
-            class_summary_df = pl.read_parquet(class_summary_file)
+        class_summary_df = cache.summary_table("class")
+        if class_summary_df is not None:
             output_parts.append(mo.md("### Original Summary by Exposure Class"))
             output_parts.append(mo.ui.table(class_summary_df, selection=None))
 
-        if approach_summary_file.exists():
-            approach_summary_df = pl.read_parquet(approach_summary_file)
+        approach_summary_df = cache.summary_table("approach")
+        if approach_summary_df is not None:
             output_parts.append(mo.md("### Original Summary by Approach"))
             output_parts.append(mo.ui.table(approach_summary_df, selection=None))
 
@@ -215,9 +215,8 @@ def _(
     reporting_date_input,
     run_button,
 ):
-    from rwa_calc.api import RWAService, CalculationRequest
+    from rwa_calc.api import RWAService, CalculationRequest, ResultsCache
     from datetime import date as date_type
-    import json
 
     calculation_response = None
     calculation_error = None
@@ -240,25 +239,10 @@ def _(
 
             calculation_response = service.calculate(request)
 
-            # Cache results for the results explorer and CSV download
+            # Cache results (Arrow IPC + aggregate sidecars) for the results explorer.
+            # CSV is generated on demand when Download is clicked.
             if calculation_response and calculation_response.success:
-                calculation_response.results.write_parquet(cache_dir / "last_results.parquet")
-                calculation_response.results.write_csv(cache_dir / "last_results.csv")
-
-                # Save metadata
-                metadata = {
-                    "framework": calculation_response.framework,
-                    "reporting_date": str(calculation_response.reporting_date),
-                    "total_ead": float(calculation_response.summary.total_ead),
-                    "total_rwa": float(calculation_response.summary.total_rwa),
-                    "exposure_count": calculation_response.summary.exposure_count,
-                }
-                (cache_dir / "last_results_meta.json").write_text(json.dumps(metadata, indent=2))
-
-                if calculation_response.summary_by_class is not None:
-                    calculation_response.summary_by_class.write_parquet(cache_dir / "last_summary_by_class.parquet")
-                if calculation_response.summary_by_approach is not None:
-                    calculation_response.summary_by_approach.write_parquet(cache_dir / "last_summary_by_approach.parquet")
+                ResultsCache(cache_dir).write(calculation_response)
 
         except Exception as e:
             calculation_error = str(e)
@@ -398,19 +382,18 @@ def _(calculation_response, mo):
 
 @app.cell
 def _(cache_dir, calculation_response, mo):
+    from rwa_calc.api import ResultsCache as _ResultsCache
+
     if calculation_response and calculation_response.success and calculation_response.results.height > 0:
-        csv_path = cache_dir / "last_results.csv"
-        if csv_path.exists():
-            csv_data = csv_path.read_bytes()
-        else:
-            csv_data = calculation_response.results.write_csv().encode("utf-8")
+        _cache = _ResultsCache(cache_dir)
 
         mo.output.replace(
             mo.vstack([
                 mo.md("### Export Results"),
                 mo.download(
-                    data=csv_data,
+                    data=lambda: _cache.to_bytes(format="csv"),
                     filename="rwa_results.csv",
+                    mimetype="text/csv",
                     label="Download CSV",
                 ),
             ])
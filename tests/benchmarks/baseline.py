@@ -0,0 +1,306 @@
+"""
+Checked-in benchmark baselines and regression comparison.
+
+Reads pytest-benchmark JSON reports (--benchmark-json) and compares the
+median time of each benchmark, and the per-stage memory of subprocess
+memory benchmarks, against the baseline stored in tests/benchmarks/baselines/. Benchmarks are keyed by
+"<file>::<class>::<test>[<scale>]".
+
+Usage:
+    # Produce a report
+    uv run pytest tests/benchmarks/test_stage_benchmark.py --benchmark-only \\
+        -m "not slow" --benchmark-json=stage_benchmarks.json
+
+    # Flag regressions (exit code 1 if any)
+    uv run python -m tests.benchmarks.baseline compare stage_benchmarks.json
+
+    # Custom tolerances (fractional increase allowed)
+    uv run python -m tests.benchmarks.baseline compare stage_benchmarks.json \\
+        --time-tolerance 0.30 --memory-tolerance 0.20
+
+    # Record / refresh baseline entries from a report (merges by key)
+    uv run python -m tests.benchmarks.baseline update stage_benchmarks.json
+
+    # Memory benchmarks use their own baseline file
+    uv run python -m tests.benchmarks.baseline update memory_benchmarks.json \\
+        --baseline tests/benchmarks/baselines/memory_benchmarks.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_BASELINE = BASELINE_DIR / "stage_benchmarks.json"
+MEMORY_BASELINE = BASELINE_DIR / "memory_benchmarks.json"
+
+# Fractional increase over baseline tolerated before flagging a regression
+DEFAULT_TIME_TOLERANCE = 0.25
+DEFAULT_MEMORY_TOLERANCE = 0.25
+
+# Absolute floors below which changes are treated as noise
+MIN_TIME_S = 0.005
+MIN_MEMORY_MB = 16.0
+
+
+# =============================================================================
+# DATA TYPES
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Summary of one benchmark run."""
+
+    median_s: float
+    stage_rss_mb: float | None = None
+    peak_rss_mb: float | None = None
+    rows: int | None = None
+    stage_bytes_per_row: float | None = None
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A metric that exceeded its baseline by more than the tolerance."""
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Fractional change relative to the baseline."""
+        return (self.current - self.baseline) / self.baseline if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.metric} {self.baseline:.4g} -> {self.current:.4g} "
+            f"({self.change:+.1%})"
+        )
+
+
+# =============================================================================
+# LOADING AND SAVING
+# =============================================================================
+
+
+def benchmark_key(fullname: str) -> str:
+    """Strip the directory from a pytest node id so keys are path-independent."""
+    return fullname.rsplit("/", 1)[-1]
+
+
+def load_report(path: str | Path) -> dict[str, Measurement]:
+    """
+    Load a pytest-benchmark JSON report.
+
+    Args:
+        path: Path to a --benchmark-json output file
+
+    Returns:
+        Mapping of benchmark key to Measurement
+    """
+    data = json.loads(Path(path).read_text())
+    measurements: dict[str, Measurement] = {}
+    for bench in data.get("benchmarks", []):
+        extra = bench.get("extra_info", {})
+        measurements[benchmark_key(bench["fullname"])] = Measurement(
+            # Subprocess benchmarks report the stage's own time separately
+            median_s=extra.get("stage_seconds", bench["stats"]["median"]),
+            stage_rss_mb=extra.get("stage_rss_mb"),
+            peak_rss_mb=extra.get("peak_rss_mb"),
+            rows=extra.get("rows"),
+            stage_bytes_per_row=extra.get("stage_bytes_per_row"),
+        )
+    return measurements
+
+
+def load_baseline(path: str | Path = DEFAULT_BASELINE) -> dict[str, Measurement]:
+    """
+    Load a checked-in baseline file.
+
+    Args:
+        path: Baseline JSON path
+
+    Returns:
+        Mapping of benchmark key to Measurement (empty if the file is missing)
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text())
+    return {name: Measurement(**values) for name, values in data.get("benchmarks", {}).items()}
+
+
+def write_baseline(
+    measurements: dict[str, Measurement],
+    path: str | Path = DEFAULT_BASELINE,
+) -> Path:
+    """
+    Merge measurements into a baseline file.
+
+    Existing entries not present in ``measurements`` are kept, so scales can
+    be recorded in separate runs.
+
+    Args:
+        measurements: New measurements keyed by benchmark
+        path: Baseline JSON path
+
+    Returns:
+        Path of the written baseline
+    """
+    path = Path(path)
+    merged = load_baseline(path)
+    merged.update(measurements)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "machine": _machine_info(),
+        "benchmarks": {name: asdict(merged[name]) for name in sorted(merged)},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+    return path
+
+
+def _machine_info() -> dict[str, str]:
+    """Describe the host the baseline was recorded on."""
+    import polars as pl
+
+    return {
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+# =============================================================================
+# COMPARISON
+# =============================================================================
+
+
+def compare(
+    current: dict[str, Measurement],
+    baseline: dict[str, Measurement],
+    time_tolerance: float = DEFAULT_TIME_TOLERANCE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE,
+) -> list[Regression]:
+    """
+    Compare a report against a baseline.
+
+    A metric regresses when it exceeds the baseline by more than the
+    tolerance and by more than the absolute noise floor. Benchmarks missing
+    from either side are ignored, as is per-stage RSS where either side has
+    none (the in-process stage benchmarks do not record it).
+
+    Args:
+        current: Measurements from the current run
+        baseline: Baseline measurements
+        time_tolerance: Allowed fractional increase in median time
+        memory_tolerance: Allowed fractional increase in per-stage RSS
+
+    Returns:
+        List of regressions (empty if none)
+    """
+    regressions: list[Regression] = []
+    for name in sorted(current.keys() & baseline.keys()):
+        now, base = current[name], baseline[name]
+
+        if (
+            now.median_s > base.median_s * (1 + time_tolerance)
+            and now.median_s - base.median_s > MIN_TIME_S
+        ):
+            regressions.append(Regression(name, "median_s", base.median_s, now.median_s))
+
+        if (
+            now.stage_rss_mb is not None
+            and base.stage_rss_mb is not None
+            and now.stage_rss_mb > base.stage_rss_mb * (1 + memory_tolerance)
+            and now.stage_rss_mb - base.stage_rss_mb > MIN_MEMORY_MB
+        ):
+            regressions.append(Regression(name, "stage_rss_mb", base.stage_rss_mb, now.stage_rss_mb))
+
+    return regressions
+
+
+def compare_memory(
+    name: str,
+    measurement: Measurement,
+    baseline_path: str | Path = MEMORY_BASELINE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE,
+) -> list[Regression]:
+    """
+    Compare a single measurement's per-stage RSS against a baseline file.
+
+    Used by the memory benchmarks to gate regressions inside the suite.
+    Time is not compared, since subprocess wall time includes setup.
+
+    Args:
+        name: Benchmark key (see benchmark_key)
+        measurement: Current measurement
+        baseline_path: Baseline JSON path
+        memory_tolerance: Allowed fractional increase in per-stage RSS
+
+    Returns:
+        List of regressions (empty if none or no baseline entry)
+    """
+    return compare(
+        {name: measurement},
+        load_baseline(baseline_path),
+        time_tolerance=float("inf"),
+        memory_tolerance=memory_tolerance,
+    )
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m tests.benchmarks.baseline``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks.baseline",
+        description="Compare pytest-benchmark reports against checked-in baselines.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compare_parser = subparsers.add_parser("compare", help="Flag regressions against the baseline")
+    compare_parser.add_argument("report", type=Path, help="pytest-benchmark JSON report")
+    compare_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE)
+    compare_parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE)
+
+    update_parser = subparsers.add_parser("update", help="Record report results as the baseline")
+    update_parser.add_argument("report", type=Path, help="pytest-benchmark JSON report")
+    update_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+
+    args = parser.parse_args(argv)
+    current = load_report(args.report)
+
+    if args.command == "update":
+        path = write_baseline(current, args.baseline)
+        print(f"Recorded {len(current)} benchmark(s) in {path}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    regressions = compare(current, baseline, args.time_tolerance, args.memory_tolerance)
+
+    unmatched = sorted(current.keys() - baseline.keys())
+    print(f"Compared {len(current.keys() & baseline.keys())} benchmark(s) against {args.baseline}")
+    if unmatched:
+        print(f"No baseline for {len(unmatched)} benchmark(s): {', '.join(unmatched)}")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -344,6 +344,36 @@ def memory_tracker():
     return MemoryTracker()
 
 
+@pytest.fixture
+def stage_benchmark(benchmark):
+    """
+    Benchmark a pipeline stage and record peak memory alongside timings.
+
+    Times the stage with pytest-benchmark, then runs it once more to record
+    the process peak RSS (including Polars/Arrow allocations) in extra_info.
+    The peak includes the materialized inputs of every stage and whatever
+    earlier tests left behind, so it is informational only: the baseline
+    gates time here, and per-stage memory is gated by the subprocess
+    benchmarks in test_memory_benchmark.py.
+
+    Usage:
+        def test_stage(stage_benchmark):
+            result = stage_benchmark(lambda: stage.run(data), rows=n_exposures)
+    """
+    from tests.benchmarks.memory import measure_peak_rss
+
+    def run(fn, *, rows: int | None = None, rounds: int = 3):
+        result = benchmark.pedantic(fn, rounds=rounds, iterations=1, warmup_rounds=1)
+
+        _, peak = measure_peak_rss(fn)
+        benchmark.extra_info["peak_rss_mb"] = round(peak / (1024 * 1024), 2)
+        if rows:
+            benchmark.extra_info["rows"] = rows
+        return result
+
+    return run
+
+
 # =============================================================================
 # PYTEST CONFIGURATION
 # =============================================================================
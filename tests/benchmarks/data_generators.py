@@ -6,7 +6,9 @@ Generates large-scale test data with:
 - Facility/exposure hierarchies with depth >= 2
 - At least half of entity types covered
 
-Uses numpy vectorized operations for efficient generation at scale.
+Uses numpy vectorized operations for efficient generation at scale;
+references and dates are formatted in Polars/numpy rather than Python loops
+(see format_references and offset_dates).
 
 Entity Type Coverage (minimum 50%):
 - Counterparty: corporate, retail, institution, sovereign, specialised_lending
@@ -27,31 +29,35 @@ Parquet Caching:
 """
 
 import logging
-from dataclasses import dataclass
-from datetime import date, timedelta
+from dataclasses import dataclass, fields, is_dataclass, replace
+from datetime import date
 from pathlib import Path
 
 import numpy as np
 import polars as pl
 
-
-# Configure logger for benchmark data generation
-logger = logging.getLogger("rwa_calc.benchmarks")
-
-# Default directory for cached benchmark data
-BENCHMARK_DATA_DIR = Path(__file__).parent / "data"
-
+from rwa_calc.contracts.bundles import RawDataBundle
 from rwa_calc.data.schemas import (
     COLLATERAL_SCHEMA,
     CONTINGENTS_SCHEMA,
     COUNTERPARTY_SCHEMA,
     FACILITY_MAPPING_SCHEMA,
     FACILITY_SCHEMA,
+    FX_RATES_SCHEMA,
+    GUARANTEE_SCHEMA,
+    LENDING_MAPPING_SCHEMA,
     LOAN_SCHEMA,
     ORG_MAPPING_SCHEMA,
+    PROVISION_SCHEMA,
     RATINGS_SCHEMA,
 )
 
+# Configure logger for benchmark data generation
+logger = logging.getLogger("rwa_calc.benchmarks")
+
+# Default directory for cached benchmark data
+BENCHMARK_DATA_DIR = Path(__file__).parent / "data"
+
 
 @dataclass(frozen=True)
 class BenchmarkDataConfig:
@@ -91,6 +97,54 @@ class BenchmarkDataConfig:
     slotting_default_pct: float = 0.05
 
 
+# =============================================================================
+# VECTORISED FORMATTING HELPERS
+# =============================================================================
+
+
+def format_references(
+    prefix: str | np.ndarray,
+    indices: np.ndarray,
+    width: int = 8,
+) -> pl.Series:
+    """
+    Build references as prefix + zero-padded index without a Python loop.
+
+    Equivalent to [f"{prefix}{i:0{width}d}" for i in indices].
+
+    Args:
+        prefix: Prefix for every reference, or one prefix per index
+        indices: Non-negative integer indices
+        width: Minimum number of digits
+
+    Returns:
+        String Series of references
+    """
+    frame = pl.DataFrame({"index": indices})
+    if isinstance(prefix, np.ndarray):
+        frame = frame.with_columns(pl.Series("prefix", prefix, dtype=pl.String))
+        head = pl.col("prefix")
+    else:
+        head = pl.lit(prefix)
+    return frame.select(
+        (head + pl.col("index").cast(pl.String).str.zfill(width)).alias("reference")
+    ).to_series()
+
+
+def offset_dates(base: date, days: np.ndarray) -> np.ndarray:
+    """
+    Dates a number of days after (or, if negative, before) a base date.
+
+    Args:
+        base: Base date
+        days: Integer day offsets
+
+    Returns:
+        numpy datetime64[D] array (read by Polars as Date)
+    """
+    return np.datetime64(base, "D") + np.asarray(days).astype("timedelta64[D]")
+
+
 def generate_counterparties(config: BenchmarkDataConfig) -> pl.LazyFrame:
     """
     Generate synthetic counterparty data with specified entity type distribution.
@@ -169,8 +223,8 @@ def generate_counterparties(config: BenchmarkDataConfig) -> pl.LazyFrame:
 
     # Build DataFrame using Polars native operations
     return pl.DataFrame({
-        "counterparty_reference": pl.Series([f"CP_{i:08d}" for i in range(n)]),
-        "counterparty_name": pl.Series([f"Entity_{i}" for i in range(n)]),
+        "counterparty_reference": format_references("CP_", np.arange(n)),
+        "counterparty_name": format_references("Entity_", np.arange(n), width=1),
         "entity_type": pl.Series(entities),
         "country_code": pl.Series(countries),
         "annual_revenue": pl.Series(revenues),
@@ -226,8 +280,7 @@ def generate_org_mappings(
     n_depth_3 = int(n_in_hierarchy * config.depth_3_pct)
 
     # Counterparties not in hierarchy are potential roots
-    hierarchy_set = set(hierarchy_indices)
-    root_indices = np.array([i for i in range(n) if i not in hierarchy_set])
+    root_indices = np.setdiff1d(np.arange(n), hierarchy_indices)
 
     # Depth level children
     depth_2_children = hierarchy_indices[:n_depth_2]
@@ -310,7 +363,7 @@ def generate_facilities(
     # VECTORIZED: Generate maturity dates
     base_date = date(2026, 1, 1)
     maturity_days = rng.integers(365, 365 * 10, size=n_facilities)
-    maturity_dates = [base_date + timedelta(days=int(d)) for d in maturity_days]
+    maturity_dates = offset_dates(base_date, maturity_days)
 
     # VECTORIZED: Currency
     currencies = rng.choice(
@@ -353,11 +406,11 @@ def generate_facilities(
 
     # Build DataFrame using numpy arrays
     return pl.DataFrame({
-        "facility_reference": [f"FAC_{i:08d}" for i in range(n_facilities)],
+        "facility_reference": format_references("FAC_", np.arange(n_facilities)),
         "product_type": product_types,
         "book_code": book_codes,
         "counterparty_reference": cp_refs_arr[cp_assignments],
-        "value_date": [base_date] * n_facilities,
+        "value_date": offset_dates(base_date, np.zeros(n_facilities, dtype=np.int64)),
         "maturity_date": maturity_dates,
         "currency": currencies,
         "limit": limits,
@@ -369,6 +422,7 @@ def generate_facilities(
         "risk_type": risk_types,
         "ccf_modelled": np.full(n_facilities, None),  # No modelled CCF for benchmarks
         "is_short_term_trade_lc": np.full(n_facilities, None),  # N/A for facilities
+        "is_buy_to_let": (product_types == "MORTGAGE_FACILITY") & (rng.random(n_facilities) < 0.20),
     }).cast(FACILITY_SCHEMA).lazy()
 
 
@@ -519,31 +573,27 @@ def generate_loans(
 
     # Generate loan references - include slotting category for SL loans
     # Format: SL_STRONG_00000001 for specialised lending, LOAN_00000001 for others
-    loan_refs = []
-    for i in range(n_loans):
-        if sl_mask[i] and slotting_categories[i]:
-            loan_refs.append(f"SL_{slotting_categories[i]}_{i:08d}")
-        else:
-            loan_refs.append(f"LOAN_{i:08d}")
-
-    # Build DataFrame - use polars for date arithmetic
+    loan_prefixes = np.where(
+        sl_mask & (slotting_categories != ""),
+        np.char.add(np.char.add("SL_", slotting_categories.astype(str)), "_"),
+        "LOAN_",
+    )
+    loan_refs = format_references(loan_prefixes, np.arange(n_loans))
+
     df = pl.DataFrame({
         "loan_reference": loan_refs,
         "product_type": product_types,
         "book_code": book_codes,
         "counterparty_reference": cp_refs_arr[cp_assignments],
-        "value_date": pl.Series([base_date] * n_loans),
-        "maturity_date": pl.Series([base_date] * n_loans).dt.offset_by(
-            pl.Series([f"{d}d" for d in maturity_days])
-        ) if False else [base_date + timedelta(days=int(d)) for d in maturity_days],
+        "value_date": offset_dates(base_date, np.zeros(n_loans, dtype=np.int64)),
+        "maturity_date": offset_dates(base_date, maturity_days),
         "currency": currencies,
         "drawn_amount": drawn_amounts,
+        "interest": np.zeros(n_loans),
         "lgd": lgd,
         "beel": np.zeros(n_loans),
         "seniority": seniority,
-        "risk_type": np.full(n_loans, "FR"),  # Loans are already drawn, full risk
-        "ccf_modelled": np.full(n_loans, None),  # No modelled CCF for loans
-        "is_short_term_trade_lc": np.full(n_loans, None),  # N/A for loans
+        "is_buy_to_let": (product_types == "RESIDENTIAL_MORTGAGE") & (rng.random(n_loans) < 0.20),
     }).cast(LOAN_SCHEMA)
 
     return df.lazy()
@@ -584,8 +634,7 @@ def generate_facility_mappings(
     # Determine which facilities are sub-facilities (have parents)
     n_sub_facilities = int(n_fac * config.sub_facility_pct)
     sub_fac_indices = rng.permutation(n_fac)[:n_sub_facilities]
-    sub_fac_set = set(sub_fac_indices)
-    root_fac_indices = np.array([i for i in range(n_fac) if i not in sub_fac_set])
+    root_fac_indices = np.setdiff1d(np.arange(n_fac), sub_fac_indices)
 
     # VECTORIZED: Create facility -> sub-facility mappings (depth 2)
     if len(root_fac_indices) > 0 and len(sub_fac_indices) > 0:
@@ -752,11 +801,11 @@ def generate_ratings(
     # VECTORIZED: Rating dates - within last year
     base_date = date(2026, 1, 1)
     days_ago = rng.integers(0, 365, size=n_rated)
-    rating_dates = [base_date - timedelta(days=int(d)) for d in days_ago]
+    rating_dates = offset_dates(base_date, -days_ago)
 
     # Build DataFrame
     return pl.DataFrame({
-        "rating_reference": [f"RAT_{i:08d}" for i in range(n_rated)],
+        "rating_reference": format_references("RAT_", np.arange(n_rated)),
         "counterparty_reference": rated_refs,
         "rating_type": np.where(is_external, "external", "internal"),
         "rating_agency": agencies,
@@ -811,7 +860,7 @@ def generate_contingents(
     # VECTORIZED: Maturity dates
     base_date = date(2026, 1, 1)
     maturity_days = rng.integers(90, 365 * 3, size=n_contingents)
-    maturity_dates = [base_date + timedelta(days=int(d)) for d in maturity_days]
+    maturity_dates = offset_dates(base_date, maturity_days)
 
     # VECTORIZED: Currencies
     currencies = rng.choice(["GBP", "USD", "EUR"], size=n_contingents, p=[0.70, 0.20, 0.10])
@@ -838,11 +887,11 @@ def generate_contingents(
 
     # Build DataFrame using numpy arrays
     return pl.DataFrame({
-        "contingent_reference": [f"CONT_{i:08d}" for i in range(n_contingents)],
+        "contingent_reference": format_references("CONT_", np.arange(n_contingents)),
         "product_type": product_types,
         "book_code": np.full(n_contingents, "CONTINGENT"),
         "counterparty_reference": cp_refs_arr[cp_assignments],
-        "value_date": [base_date] * n_contingents,
+        "value_date": offset_dates(base_date, np.zeros(n_contingents, dtype=np.int64)),
         "maturity_date": maturity_dates,
         "currency": currencies,
         "nominal_amount": nominal_amounts,
@@ -852,6 +901,7 @@ def generate_contingents(
         "risk_type": risk_types,
         "ccf_modelled": np.full(n_contingents, None),  # No modelled CCF for benchmarks
         "is_short_term_trade_lc": is_short_term_trade_lc,  # True for LCs
+        "bs_type": np.full(n_contingents, "OFB"),  # All contingents are off-balance sheet
     }).cast(CONTINGENTS_SCHEMA).lazy()
 
 
@@ -902,7 +952,7 @@ def generate_collateral(
     # VECTORIZED: Maturity dates
     base_date = date(2026, 1, 1)
     maturity_days = rng.integers(365, 365 * 10, size=n_collateral)
-    maturity_dates = [base_date + timedelta(days=int(d)) for d in maturity_days]
+    maturity_dates = offset_dates(base_date, maturity_days)
 
     # VECTORIZED: Market values (50-150% of loan amount)
     assigned_loan_amounts = loan_amounts_arr[loan_assignments]
@@ -943,7 +993,7 @@ def generate_collateral(
 
     # VECTORIZED: Valuation dates
     val_days_ago = rng.integers(0, 90, size=n_collateral)
-    valuation_dates = [base_date - timedelta(days=int(d)) for d in val_days_ago]
+    valuation_dates = offset_dates(base_date, -val_days_ago)
 
     # VECTORIZED: Valuation types
     valuation_types = np.where(real_estate_mask, "independent", "market")
@@ -974,12 +1024,13 @@ def generate_collateral(
 
     # Build DataFrame with proper null handling for nullable columns
     df = pl.DataFrame({
-        "collateral_reference": [f"COLL_{i:08d}" for i in range(n_collateral)],
+        "collateral_reference": format_references("COLL_", np.arange(n_collateral)),
         "collateral_type": coll_types,
         "currency": currencies,
         "maturity_date": maturity_dates,
         "market_value": market_values,
         "nominal_value": nominal_values,
+        "pledge_percentage": pl.repeat(None, n_collateral, dtype=pl.Float64, eager=True),  # Market value always provided
         "beneficiary_type": np.full(n_collateral, "loan"),
         "beneficiary_reference": beneficiary_refs,
         "issuer_cqs": issuer_cqs,
@@ -1011,6 +1062,128 @@ def generate_collateral(
     ]).cast(COLLATERAL_SCHEMA).lazy()
 
 
+def generate_guarantees(
+    counterparties: pl.LazyFrame,
+    loans: pl.LazyFrame,
+    config: BenchmarkDataConfig,
+) -> pl.LazyFrame:
+    """
+    Generate guarantee data for benchmark testing.
+
+    Creates guarantees on ~10% of loans, provided by institution and
+    sovereign counterparties, covering 50-100% of the loan.
+
+    Args:
+        counterparties: LazyFrame of counterparties
+        loans: LazyFrame of loans
+        config: Benchmark data configuration
+
+    Returns:
+        LazyFrame of guarantees matching GUARANTEE_SCHEMA
+    """
+    rng = np.random.default_rng(config.seed + 8)
+
+    guarantor_refs = (
+        counterparties.filter(pl.col("entity_type").is_in(["institution", "sovereign"]))
+        .select("counterparty_reference")
+        .collect()["counterparty_reference"]
+        .to_numpy()
+    )
+    loan_data = loans.select("loan_reference", "currency", "maturity_date", "drawn_amount").collect()
+    n_loans = loan_data.height
+
+    # ~10% of loans are guaranteed
+    n_guarantees = int(n_loans * 0.10)
+    if n_guarantees == 0 or len(guarantor_refs) == 0:
+        return pl.LazyFrame(schema=GUARANTEE_SCHEMA)
+
+    # VECTORIZED: Pick guaranteed loans and guarantors
+    loan_idx = rng.choice(n_loans, size=n_guarantees, replace=False)
+    guaranteed = loan_data[loan_idx]
+    percentage_covered = rng.choice([0.5, 0.8, 1.0], size=n_guarantees, p=[0.30, 0.30, 0.40])
+
+    return pl.DataFrame({
+        "guarantee_reference": format_references("GUAR_", np.arange(n_guarantees)),
+        "guarantee_type": rng.choice(
+            ["bank_guarantee", "sovereign_guarantee"], size=n_guarantees, p=[0.70, 0.30]
+        ),
+        "guarantor": guarantor_refs[rng.choice(len(guarantor_refs), size=n_guarantees)],
+        "currency": guaranteed["currency"],
+        "maturity_date": guaranteed["maturity_date"],
+        "amount_covered": guaranteed["drawn_amount"].to_numpy() * percentage_covered,
+        "percentage_covered": percentage_covered,
+        "beneficiary_type": np.full(n_guarantees, "loan"),
+        "beneficiary_reference": guaranteed["loan_reference"],
+    }).cast(GUARANTEE_SCHEMA).lazy()
+
+
+def generate_provisions(
+    loans: pl.LazyFrame,
+    config: BenchmarkDataConfig,
+) -> pl.LazyFrame:
+    """
+    Generate IFRS 9 provision data for benchmark testing.
+
+    Creates provisions on ~15% of loans with a stage 1/2/3 mix and
+    provision amounts of 0.5-2%, 2-10% and 20-60% of the drawn balance.
+
+    Args:
+        loans: LazyFrame of loans
+        config: Benchmark data configuration
+
+    Returns:
+        LazyFrame of provisions matching PROVISION_SCHEMA
+    """
+    rng = np.random.default_rng(config.seed + 9)
+
+    loan_data = loans.select("loan_reference", "currency", "drawn_amount").collect()
+    n_loans = loan_data.height
+
+    # ~15% of loans carry a provision
+    n_provisions = int(n_loans * 0.15)
+    if n_provisions == 0:
+        return pl.LazyFrame(schema=PROVISION_SCHEMA)
+
+    loan_idx = rng.choice(n_loans, size=n_provisions, replace=False)
+    provisioned = loan_data[loan_idx]
+
+    # VECTORIZED: IFRS 9 stage drives provision coverage
+    stages = rng.choice([1, 2, 3], size=n_provisions, p=[0.70, 0.22, 0.08])
+    coverage = np.select(
+        [stages == 1, stages == 2],
+        [
+            rng.uniform(0.005, 0.02, size=n_provisions),
+            rng.uniform(0.02, 0.10, size=n_provisions),
+        ],
+        default=rng.uniform(0.20, 0.60, size=n_provisions),
+    )
+
+    return pl.DataFrame({
+        "provision_reference": format_references("PROV_", np.arange(n_provisions)),
+        "provision_type": np.where(stages == 3, "SCRA", rng.choice(["SCRA", "GCRA"], size=n_provisions)),
+        "ifrs9_stage": stages,
+        "currency": provisioned["currency"],
+        "amount": provisioned["drawn_amount"].to_numpy() * coverage,
+        "as_of_date": offset_dates(date(2026, 1, 1), np.zeros(n_provisions, dtype=np.int64)),
+        "beneficiary_type": np.full(n_provisions, "loan"),
+        "beneficiary_reference": provisioned["loan_reference"],
+    }).cast(PROVISION_SCHEMA).lazy()
+
+
+def generate_fx_rates() -> pl.LazyFrame:
+    """
+    Generate FX rates for the currencies used by the benchmark generators.
+
+    Returns:
+        LazyFrame of FX rates matching FX_RATES_SCHEMA
+    """
+    return pl.DataFrame({
+        "currency_from": ["GBP", "USD", "EUR"],
+        "currency_to": ["GBP", "GBP", "GBP"],
+        "rate": [1.0, 0.79, 0.88],
+    }).cast(FX_RATES_SCHEMA).lazy()
+
+
 def generate_benchmark_dataset(
     n_counterparties: int,
     hierarchy_depth: int = 3,
@@ -1048,6 +1221,9 @@ def generate_benchmark_dataset(
     ratings = generate_ratings(counterparties, config)
     contingents = generate_contingents(counterparties, config)
     collateral = generate_collateral(counterparties, loans, config)
+    guarantees = generate_guarantees(counterparties, loans, config)
+    provisions = generate_provisions(loans, config)
+    fx_rates = generate_fx_rates()
 
     return {
         "counterparties": counterparties,
@@ -1058,6 +1234,9 @@ def generate_benchmark_dataset(
         "ratings": ratings,
         "contingents": contingents,
         "collateral": collateral,
+        "guarantees": guarantees,
+        "provisions": provisions,
+        "fx_rates": fx_rates,
     }
 
 
@@ -1087,6 +1266,7 @@ def get_dataset_statistics(dataset: dict[str, pl.LazyFrame]) -> dict:
         zip(
             entity_counts["entity_type"].to_list(),
             entity_counts["len"].to_list(),
+            strict=True,
         )
     )
 
@@ -1110,6 +1290,7 @@ def get_dataset_statistics(dataset: dict[str, pl.LazyFrame]) -> dict:
                 zip(
                     child_type_counts["child_type"].to_list(),
                     child_type_counts["len"].to_list(),
+                    strict=True,
                 )
             ),
         }
@@ -1194,6 +1375,9 @@ def load_benchmark_dataset(
         "ratings",
         "contingents",
         "collateral",
+        "guarantees",
+        "provisions",
+        "fx_rates",
     ]
 
     # Check all files exist
@@ -1273,3 +1457,67 @@ def clear_cached_datasets(data_dir: Path | None = None) -> None:
         logger.info(f"Cleared cached datasets from {base_dir}")
     else:
         logger.debug(f"No cached datasets found at {base_dir}")
+
+
+# =============================================================================
+# SCALES AND BUNDLE HELPERS
+# =============================================================================
+
+# Dataset configuration per benchmark scale (mirrors the conftest fixtures)
+SCALE_CONFIGS: dict[str, BenchmarkDataConfig] = {
+    "10k": BenchmarkDataConfig(n_counterparties=10_000, hierarchy_depth=3),
+    "100k": BenchmarkDataConfig(n_counterparties=100_000, hierarchy_depth=3),
+    "1m": BenchmarkDataConfig(n_counterparties=1_000_000, hierarchy_depth=4),
+    "10m": BenchmarkDataConfig(n_counterparties=10_000_000, hierarchy_depth=4),
+}
+
+
+def get_or_create_scale_dataset(scale: str) -> dict[str, pl.LazyFrame]:
+    """
+    Load or generate the dataset for a named scale.
+
+    Args:
+        scale: One of the SCALE_CONFIGS keys
+
+    Returns:
+        Dictionary of LazyFrames
+    """
+    config = SCALE_CONFIGS[scale]
+    return get_or_create_dataset(
+        scale=scale,
+        n_counterparties=config.n_counterparties,
+        hierarchy_depth=config.hierarchy_depth,
+        seed=config.seed,
+    )
+
+
+def create_raw_data_bundle(dataset: dict[str, pl.LazyFrame]) -> RawDataBundle:
+    """Create a RawDataBundle including guarantees, provisions and FX rates."""
+    return RawDataBundle(
+        counterparties=dataset["counterparties"],
+        facilities=dataset["facilities"],
+        loans=dataset["loans"],
+        contingents=dataset["contingents"],
+        collateral=dataset["collateral"],
+        guarantees=dataset["guarantees"],
+        provisions=dataset["provisions"],
+        ratings=dataset["ratings"],
+        facility_mappings=dataset["facility_mappings"],
+        org_mappings=dataset["org_mappings"],
+        lending_mappings=pl.LazyFrame(schema=LENDING_MAPPING_SCHEMA),
+        fx_rates=dataset["fx_rates"],
+    )
+
+
+def materialize(obj):
+    """Collect every LazyFrame in a (possibly nested) bundle dataclass."""
+    if isinstance(obj, pl.LazyFrame):
+        return obj.collect().lazy()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        updates = {
+            f.name: materialize(getattr(obj, f.name))
+            for f in fields(obj)
+            if isinstance(getattr(obj, f.name), pl.LazyFrame) or is_dataclass(getattr(obj, f.name))
+        }
+        return replace(obj, **updates)
+    return obj
@@ -0,0 +1,356 @@
+"""
+Process memory measurement helpers for benchmark tests.
+
+tracemalloc only sees Python allocations, so it misses the Arrow buffers
+Polars allocates in Rust. These helpers measure resident set size (RSS)
+instead:
+
+- On Linux the peak RSS high-water mark (VmHWM) is reset by writing "5"
+  to /proc/self/clear_refs, giving an exact per-operation peak.
+- Elsewhere the process-lifetime ru_maxrss is used, which is an upper
+  bound rather than a per-operation figure.
+
+Only RSS is sampled: Polars exposes no allocator statistics, so there is
+no high-water mark of Polars' own allocations. RSS also counts Python and
+numpy memory and pages the allocator has freed but kept, so stage figures
+are upper bounds on the Polars working set.
+
+Pipeline stages can also be measured in a fresh subprocess, so the figure
+is not distorted by allocator caches or data left over from earlier
+tests. The worker builds and materializes the inputs of the stage, then
+records the RSS before the stage, the peak while it runs, and the Arrow
+size of its output.
+
+Usage:
+    from tests.benchmarks.memory import measure_peak_rss, run_stage_in_subprocess
+
+    result, peak_bytes = measure_peak_rss(lambda: lf.collect())
+    stage = run_stage_in_subprocess("crm", "100k")
+    print(stage.bytes_per_exposure)
+
+    # Bytes per exposure for every stage at one scale
+    uv run python -m tests.benchmarks.memory report 100k
+
+    # Measure one stage in this process (used by the subprocess harness)
+    uv run python -m tests.benchmarks.memory run crm 100k
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import resource
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, fields, is_dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+_CLEAR_REFS = Path("/proc/self/clear_refs")
+_STATUS = Path("/proc/self/status")
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+_MB = 1024 * 1024
+
+# Reporting date used by the stage worker (matches the stage benchmarks)
+REPORTING_DATE = date(2026, 1, 1)
+
+
+def can_reset_peak_rss() -> bool:
+    """Whether the per-process RSS high-water mark can be reset."""
+    return _CLEAR_REFS.exists() and _STATUS.exists()
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the RSS high-water mark to the current RSS.
+
+    Returns:
+        True if the reset succeeded
+    """
+    if not can_reset_peak_rss():
+        return False
+    try:
+        _CLEAR_REFS.write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss_bytes() -> int:
+    """
+    Peak resident set size of this process, in bytes.
+
+    Returns VmHWM on Linux (resettable via reset_peak_rss) and the
+    process-lifetime ru_maxrss elsewhere.
+    """
+    if _STATUS.exists():
+        for line in _STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux/BSD
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def current_rss_bytes() -> int:
+    """Current resident set size of this process, in bytes (0 if unknown)."""
+    if _STATUS.exists():
+        for line in _STATUS.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def measure_peak_rss[T](fn: Callable[[], T]) -> tuple[T, int]:
+    """
+    Run fn and report the peak RSS reached while it ran.
+
+    Args:
+        fn: Zero-argument callable to measure
+
+    Returns:
+        Tuple of (fn result, peak RSS in bytes)
+    """
+    reset_peak_rss()
+    result = fn()
+    return result, peak_rss_bytes()
+
+
+# =============================================================================
+# STAGE MEASUREMENT
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class StageMemory:
+    """Memory footprint of one pipeline stage at one scale."""
+
+    stage: str
+    scale: str
+    n_exposures: int  # loans + contingents in the source data
+    rss_before_bytes: int
+    peak_rss_bytes: int
+    output_bytes: int
+    seconds: float
+
+    @property
+    def stage_rss_bytes(self) -> int:
+        """Growth of the RSS high-water mark over the pre-stage RSS."""
+        return max(self.peak_rss_bytes - self.rss_before_bytes, 0)
+
+    @property
+    def bytes_per_exposure(self) -> float:
+        """Stage working memory per exposure."""
+        return self.stage_rss_bytes / self.n_exposures if self.n_exposures else 0.0
+
+    @property
+    def peak_bytes_per_exposure(self) -> float:
+        """Whole-process peak RSS per exposure, including stage inputs."""
+        return self.peak_rss_bytes / self.n_exposures if self.n_exposures else 0.0
+
+    def extra_info(self) -> dict[str, float | int]:
+        """Values for pytest-benchmark extra_info / baseline files."""
+        return {
+            "peak_rss_mb": round(self.peak_rss_bytes / _MB, 2),
+            "stage_rss_mb": round(self.stage_rss_bytes / _MB, 2),
+            "output_mb": round(self.output_bytes / _MB, 2),
+            "rows": self.n_exposures,
+            "stage_bytes_per_row": round(self.bytes_per_exposure, 1),
+            "peak_bytes_per_row": round(self.peak_bytes_per_exposure, 1),
+            "stage_seconds": round(self.seconds, 3),
+        }
+
+
+def _frames(obj: Any) -> list:
+    """Every DataFrame/LazyFrame in a (possibly nested) result object."""
+    if isinstance(obj, (pl.DataFrame, pl.LazyFrame)):
+        return [obj]
+    if isinstance(obj, dict):
+        return [frame for value in obj.values() for frame in _frames(value)]
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return [frame for f in fields(obj) for frame in _frames(getattr(obj, f.name))]
+    return []
+
+
+def _stage_runners() -> dict[str, Callable[[dict[str, Any]], Any]]:
+    """
+    Pipeline stages in execution order.
+
+    Each runner takes the state built by the previous stages and returns
+    its own output, fully materialized.
+    """
+    from tests.benchmarks.data_generators import create_raw_data_bundle, materialize
+
+    from rwa_calc.api.formatters import materialize_bundle
+    from rwa_calc.engine.aggregator import OutputAggregator
+    from rwa_calc.engine.classifier import ExposureClassifier
+    from rwa_calc.engine.crm.processor import CRMProcessor
+    from rwa_calc.engine.hierarchy import HierarchyResolver
+    from rwa_calc.engine.irb.calculator import IRBCalculator
+    from rwa_calc.engine.sa.calculator import SACalculator
+    from rwa_calc.engine.slotting.calculator import SlottingCalculator
+
+    return {
+        "load": lambda s: materialize(create_raw_data_bundle(s["dataset"])),
+        "hierarchy": lambda s: materialize(HierarchyResolver().resolve(s["load"], s["config"])),
+        "classifier": lambda s: materialize(
+            ExposureClassifier().classify(s["hierarchy"], s["config"])
+        ),
+        "crm": lambda s: materialize(
+            CRMProcessor().get_crm_adjusted_bundle(s["classifier"], s["config"])
+        ),
+        "sa": lambda s: materialize(SACalculator().get_sa_result_bundle(s["crm"], s["config"])),
+        "irb": lambda s: materialize(IRBCalculator().get_irb_result_bundle(s["crm"], s["config"])),
+        "slotting": lambda s: materialize(
+            SlottingCalculator().get_slotting_result_bundle(s["crm"], s["config"])
+        ),
+        "aggregator": lambda s: materialize_bundle(
+            OutputAggregator().aggregate_with_audit(
+                s["sa"], s["irb"], s["slotting"], s["config"]
+            )
+        ),
+    }
+
+
+STAGES: tuple[str, ...] = (
+    "load", "hierarchy", "classifier", "crm", "sa", "irb", "slotting", "aggregator",
+)
+
+
+def measure_stage(stage: str, scale: str) -> StageMemory:
+    """
+    Measure one stage in the current process.
+
+    Runs and materializes every earlier stage, then resets the RSS
+    high-water mark and runs the requested stage. Intended to be run in a
+    fresh process; see run_stage_in_subprocess.
+
+    Args:
+        stage: One of STAGES
+        scale: Dataset scale (e.g. "100k")
+
+    Returns:
+        StageMemory for the stage
+    """
+    from tests.benchmarks.data_generators import get_or_create_scale_dataset
+
+    from rwa_calc.contracts.config import CalculationConfig, IRBPermissions
+
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage {stage!r}; expected one of {', '.join(STAGES)}")
+
+    runners = _stage_runners()
+    state: dict[str, Any] = {
+        "dataset": get_or_create_scale_dataset(scale),
+        "config": CalculationConfig.crr(
+            reporting_date=REPORTING_DATE,
+            irb_permissions=IRBPermissions.full_irb(),
+        ),
+    }
+    for name in STAGES[: STAGES.index(stage)]:
+        state[name] = runners[name](state)
+
+    n_exposures = state["dataset"]["loans"].select("loan_reference").collect().height
+    n_exposures += state["dataset"]["contingents"].select("contingent_reference").collect().height
+
+    gc.collect()
+    rss_before = current_rss_bytes()
+    reset_peak_rss()
+    start = time.perf_counter()
+    output = runners[stage](state)
+    seconds = time.perf_counter() - start
+    peak = peak_rss_bytes()
+
+    output_bytes = sum(
+        (frame.collect() if isinstance(frame, pl.LazyFrame) else frame).estimated_size()
+        for frame in _frames(output)
+    )
+    return StageMemory(
+        stage=stage,
+        scale=scale,
+        n_exposures=n_exposures,
+        rss_before_bytes=rss_before,
+        peak_rss_bytes=peak,
+        output_bytes=output_bytes,
+        seconds=seconds,
+    )
+
+
+def run_stage_in_subprocess(stage: str, scale: str, timeout: float | None = None) -> StageMemory:
+    """
+    Measure one stage in a fresh Python process.
+
+    Args:
+        stage: One of STAGES
+        scale: Dataset scale (e.g. "100k")
+        timeout: Optional timeout in seconds
+
+    Returns:
+        StageMemory reported by the worker
+
+    Raises:
+        RuntimeError: If the worker fails
+    """
+    completed = subprocess.run(
+        [sys.executable, "-m", "tests.benchmarks.memory", "run", stage, scale],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Memory worker for stage {stage!r} at {scale} failed:\n{completed.stderr[-2000:]}"
+        )
+    return StageMemory(**json.loads(completed.stdout.strip().splitlines()[-1]))
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m tests.benchmarks.memory``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks.memory",
+        description="Measure per-stage peak RSS of the RWA pipeline.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Measure one stage in this process (JSON)")
+    run_parser.add_argument("stage", choices=STAGES)
+    run_parser.add_argument("scale")
+
+    report_parser = subparsers.add_parser("report", help="Measure every stage in subprocesses")
+    report_parser.add_argument("scale")
+    report_parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        print(json.dumps(asdict(measure_stage(args.stage, args.scale))))
+        return 0
+
+    print(f"{'stage':<12}{'exposures':>12}{'peak MB':>10}{'stage MB':>10}{'B/exposure':>12}")
+    for stage in args.stages:
+        result = run_stage_in_subprocess(stage, args.scale)
+        print(
+            f"{stage:<12}{result.n_exposures:>12,}{result.peak_rss_bytes / _MB:>10.1f}"
+            f"{result.stage_rss_bytes / _MB:>10.1f}{result.bytes_per_exposure:>12.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,832 @@
+"""
+Chunked, parallel synthetic portfolio generator for 100M-row benchmarks.
+
+data_generators.py builds each table for the whole dataset in memory,
+which caps practical scale at ~10M counterparties. This generator splits
+the counterparty range into fixed-size chunks and generates each chunk
+independently in a worker process, writing it straight to hive-partitioned
+Parquet:
+
+    <root>/<table>/chunk=00042/data.parquet
+    <root>/fx_rates/data.parquet
+    <root>/manifest.json
+
+Each chunk draws from its own random stream, SeedSequence(seed,
+spawn_key=(chunk,)), so a dataset is identical whatever the worker count
+or completion order. Everything a chunk references (group parents,
+facilities, loans, guarantors) lies in the same chunk, so any prefix of
+chunks is a self-consistent smaller portfolio. load_portfolio(chunks=n)
+uses this to read scaling series from one generated dataset.
+
+Distributions are skewed like a real book:
+- Group sizes are heavy-tailed (Pareto): most counterparties stand alone,
+  a few groups have thousands of members
+- Groups are chains or b-ary trees up to max_depth levels deep, and
+  sub-facilities follow the group tree, giving deep facility hierarchies
+- Loans per counterparty are heavy-tailed around the configured mean
+- Internal ratings sit on a fixed PD master scale, so PDs repeat
+
+References are built with vectorised string formatting
+(data_generators.format_references), never Python loops.
+
+Usage:
+    from tests.benchmarks.portfolio_generator import (
+        PortfolioConfig, generate_portfolio, load_portfolio,
+    )
+
+    generate_portfolio(PortfolioConfig(n_counterparties=34_000_000), path, workers=16)
+    dataset = load_portfolio(path)             # every chunk
+    subset = load_portfolio(path, chunks=4)    # first 4 chunks only
+
+    # From the command line (~100M loans)
+    uv run python -m tests.benchmarks.portfolio_generator generate 100m --workers 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+from tests.benchmarks.data_generators import (
+    BENCHMARK_DATA_DIR,
+    format_references,
+    generate_fx_rates,
+    offset_dates,
+)
+
+from rwa_calc.data.schemas import (
+    COLLATERAL_SCHEMA,
+    CONTINGENTS_SCHEMA,
+    COUNTERPARTY_SCHEMA,
+    FACILITY_MAPPING_SCHEMA,
+    FACILITY_SCHEMA,
+    GUARANTEE_SCHEMA,
+    LOAN_SCHEMA,
+    ORG_MAPPING_SCHEMA,
+    PROVISION_SCHEMA,
+    RATINGS_SCHEMA,
+)
+
+# Tables written once per chunk (fx_rates is written once per dataset)
+CHUNKED_TABLES = (
+    "counterparties",
+    "org_mappings",
+    "facilities",
+    "loans",
+    "facility_mappings",
+    "ratings",
+    "contingents",
+    "collateral",
+    "guarantees",
+    "provisions",
+)
+
+MANIFEST_FILE = "manifest.json"
+
+# Digits in counterparty-derived references (up to 10bn counterparties)
+REFERENCE_WIDTH = 10
+
+BASE_DATE = date(2026, 1, 1)
+
+# Internal PD master scale; every internal rating takes one of these PDs
+PD_GRADES = np.array([
+    0.0003, 0.0005, 0.0008, 0.0012, 0.0020, 0.0032, 0.0050, 0.0080,
+    0.0130, 0.0210, 0.0340, 0.0550, 0.0900, 0.1500, 0.2500,
+])
+
+# Branching factors for tree-shaped groups and their weights
+_BRANCHING = np.array([2, 3, 5, 10, 50])
+_BRANCHING_P = [0.25, 0.25, 0.20, 0.20, 0.10]
+
+_ENTITY_TYPES = np.array(
+    ["corporate", "individual", "institution", "sovereign", "specialised_lending"]
+)
+_SLOTTING_CATEGORIES = np.array(["STRONG", "GOOD", "SATISFACTORY", "WEAK", "DEFAULT"])
+
+# Loan products per entity type (values) with their probabilities
+_LOAN_PRODUCTS: dict[str, tuple[list[str], list[float]]] = {
+    "corporate": (["TERM_LOAN", "RCF_DRAWING", "TRADE_LOAN"], [0.50, 0.35, 0.15]),
+    "individual": (
+        ["PERSONAL_LOAN", "RESIDENTIAL_MORTGAGE", "CREDIT_CARD"], [0.30, 0.50, 0.20],
+    ),
+    "institution": (["INTERBANK_LOAN", "TERM_LOAN"], [0.70, 0.30]),
+    "sovereign": (["SOVEREIGN_LOAN"], [1.0]),
+    "specialised_lending": (
+        ["PROJECT_FINANCE", "OBJECT_FINANCE", "COMMODITIES_FINANCE", "IPRE", "HVCRE"],
+        [0.30, 0.20, 0.15, 0.25, 0.10],
+    ),
+}
+
+_BOOK_CODES = {
+    "TERM_LOAN": "CORP_LENDING",
+    "RCF_DRAWING": "CORP_LENDING",
+    "TRADE_LOAN": "TRADE_FINANCE",
+    "INTERBANK_LOAN": "FI_LENDING",
+    "SOVEREIGN_LOAN": "SOVEREIGN",
+    "PERSONAL_LOAN": "RETAIL_UNSECURED",
+    "RESIDENTIAL_MORTGAGE": "RETAIL_MORTGAGES",
+    "CREDIT_CARD": "RETAIL_CARDS",
+    "PROJECT_FINANCE": "SPECIALISED_LENDING",
+    "OBJECT_FINANCE": "SPECIALISED_LENDING",
+    "COMMODITIES_FINANCE": "SPECIALISED_LENDING",
+    "IPRE": "SPECIALISED_LENDING",
+    "HVCRE": "SPECIALISED_LENDING",
+}
+
+
+@dataclass(frozen=True)
+class PortfolioConfig:
+    """Configuration for chunked portfolio generation."""
+
+    n_counterparties: int
+    chunk_size: int = 1_000_000  # Counterparties per chunk (bounds worker memory)
+    seed: int = 42
+
+    # Entity type distribution: corporate, individual, institution,
+    # sovereign, specialised_lending (must sum to 1.0)
+    entity_weights: tuple[float, ...] = (0.35, 0.30, 0.15, 0.10, 0.10)
+
+    # Groups: Pareto tail index of group sizes (lower = heavier tail)
+    group_tail_alpha: float = 1.3
+    max_group_size: int = 20_000
+    max_depth: int = 10  # Levels below the group root (resolver walks 11 hops)
+    chain_pct: float = 0.30  # Groups of <= max_depth + 1 members built as chains
+
+    # Loans per counterparty: heavy-tailed with approximately this mean
+    loans_per_counterparty: float = 3.0
+    loan_tail_alpha: float = 1.8
+    max_loans_per_counterparty: int = 1_000
+
+    # Facility hierarchy
+    facility_hierarchy_pct: float = 0.40  # Loans mapped under their facility
+    sub_facility_pct: float = 0.25  # Group members whose facility nests in the parent's
+
+    # Ratings
+    rated_percentage: float = 0.70
+    external_rating_pct: float = 0.40
+
+    # Coverage of the CRM and off-balance sheet tables
+    contingent_pct: float = 0.20  # Of counterparties
+    collateral_pct: float = 0.30  # Of loans
+    guarantee_pct: float = 0.10  # Of loans
+    provision_pct: float = 0.15  # Of loans
+
+    @property
+    def n_chunks(self) -> int:
+        """Number of chunks the counterparty range is split into."""
+        return -(-self.n_counterparties // self.chunk_size)
+
+    def chunk_bounds(self, chunk: int) -> tuple[int, int]:
+        """First and one-past-last counterparty index of a chunk."""
+        start = chunk * self.chunk_size
+        return start, min(start + self.chunk_size, self.n_counterparties)
+
+
+# Portfolio scales, named by approximate loan count
+PORTFOLIO_SCALES: dict[str, PortfolioConfig] = {
+    "1m": PortfolioConfig(n_counterparties=340_000, chunk_size=100_000),
+    "10m": PortfolioConfig(n_counterparties=3_400_000),
+    "100m": PortfolioConfig(n_counterparties=34_000_000),
+}
+
+
+# =============================================================================
+# CHUNK GENERATION
+# =============================================================================
+
+
+def generate_chunk(config: PortfolioConfig, chunk: int) -> dict[str, pl.DataFrame]:
+    """
+    Generate every table for one chunk of counterparties.
+
+    Args:
+        config: Portfolio configuration
+        chunk: Chunk number (0-based)
+
+    Returns:
+        DataFrames keyed by table name (CHUNKED_TABLES)
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(config.seed, spawn_key=(chunk,)))
+    start, end = config.chunk_bounds(chunk)
+    cp_index = np.arange(start, end)
+
+    counterparties, cp_refs, entities, revenues = _counterparties(rng, config, cp_index)
+    org_children, org_parents = _group_edges(rng, config, len(cp_index))
+    loans, loan_cp = _loans(rng, config, chunk, cp_refs, entities, revenues)
+    fac_refs = format_references("FAC_", cp_index, REFERENCE_WIDTH)
+
+    return {
+        "counterparties": counterparties,
+        "org_mappings": pl.DataFrame({
+            "parent_counterparty_reference": cp_refs.gather(org_parents),
+            "child_counterparty_reference": cp_refs.gather(org_children),
+        }).cast(ORG_MAPPING_SCHEMA),
+        "facilities": _facilities(rng, fac_refs, cp_refs, revenues),
+        "loans": loans,
+        "facility_mappings": _facility_mappings(
+            rng, config, fac_refs, org_children, org_parents, loans, loan_cp,
+        ),
+        "ratings": _ratings(rng, config, chunk, cp_refs),
+        "contingents": _contingents(rng, config, chunk, cp_refs, revenues),
+        "collateral": _collateral(rng, config, chunk, loans),
+        "guarantees": _guarantees(rng, config, chunk, loans, cp_refs, entities),
+        "provisions": _provisions(rng, config, chunk, loans),
+    }
+
+
+def _counterparties(
+    rng: np.random.Generator,
+    config: PortfolioConfig,
+    cp_index: np.ndarray,
+) -> tuple[pl.DataFrame, pl.Series, np.ndarray, np.ndarray]:
+    """Counterparties plus their references, entity types and revenues."""
+    n = len(cp_index)
+    entities = _ENTITY_TYPES[rng.choice(len(_ENTITY_TYPES), size=n, p=config.entity_weights)]
+
+    revenue_ranges = {
+        "corporate": (1e6, 5e8),
+        "individual": (0.0, 2e6),
+        "institution": (1e9, 1e11),
+        "sovereign": (1e10, 1e12),
+        "specialised_lending": (1e7, 1e9),
+    }
+    revenues = np.zeros(n)
+    for entity, (low, high) in revenue_ranges.items():
+        mask = entities == entity
+        revenues[mask] = rng.uniform(low, high, size=mask.sum())
+
+    # Slotting category is read from the reference of specialised lenders
+    sl_mask = entities == "specialised_lending"
+    categories = _SLOTTING_CATEGORIES[
+        rng.choice(len(_SLOTTING_CATEGORIES), size=n, p=[0.20, 0.35, 0.30, 0.10, 0.05])
+    ]
+    prefixes = np.where(sl_mask, np.char.add(np.char.add("SL_", categories), "_"), "CP_")
+    cp_refs = format_references(prefixes, cp_index, REFERENCE_WIDTH)
+
+    inst_mask = entities == "institution"
+    sov_mask = entities == "sovereign"
+    frame = pl.DataFrame({
+        "counterparty_reference": cp_refs,
+        "counterparty_name": format_references("Entity_", cp_index, width=1),
+        "entity_type": entities,
+        "country_code": rng.choice(
+            ["GB", "US", "DE", "FR", "JP", "XX"], size=n, p=[0.60, 0.15, 0.10, 0.08, 0.05, 0.02],
+        ),
+        "annual_revenue": revenues,
+        "total_assets": revenues * rng.uniform(1.2, 2.0, size=n),
+        "default_status": rng.random(n) < 0.02,
+        "sector_code": rng.choice(["64.19", "64.20", "47.11", "25.11", "42.21", "70.22"], size=n),
+        "is_financial_institution": inst_mask,
+        "is_regulated": inst_mask | sov_mask,
+        "is_pse": sov_mask & (rng.random(n) < 0.3),
+        "is_mdb": np.zeros(n, dtype=bool),
+        "is_international_org": np.zeros(n, dtype=bool),
+        "is_central_counterparty": inst_mask & (rng.random(n) < 0.05),
+        "is_regional_govt_local_auth": sov_mask & (rng.random(n) < 0.2),
+        "is_managed_as_retail": np.zeros(n, dtype=bool),
+    }).cast(COUNTERPARTY_SCHEMA)
+    return frame, cp_refs, entities, revenues
+
+
+def _group_sizes(rng: np.random.Generator, config: PortfolioConfig, n: int) -> np.ndarray:
+    """Heavy-tailed group sizes summing to n."""
+    draws = []
+    total = 0
+    while total < n:
+        batch = 1 + np.floor(rng.pareto(config.group_tail_alpha, size=max(1024, n // 2)))
+        batch = np.minimum(batch, config.max_group_size).astype(np.int64)
+        draws.append(batch)
+        total += int(batch.sum())
+    sizes = np.concatenate(draws)
+    last = int(np.searchsorted(np.cumsum(sizes), n))
+    sizes = sizes[: last + 1]
+    sizes[-1] -= int(sizes.sum()) - n
+    return sizes
+
+
+def _group_edges(
+    rng: np.random.Generator,
+    config: PortfolioConfig,
+    n: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Child and parent positions (chunk-local) of the org hierarchy.
+
+    Groups occupy consecutive positions; the first member is the root.
+    Member k of a group hangs under member (k - 1) // b, which makes a
+    chain for b = 1 and a b-ary tree otherwise. b is at least
+    ceil(size ** (1 / max_depth)), so no member is deeper than max_depth.
+    """
+    sizes = _group_sizes(rng, config, n)
+    starts = np.cumsum(sizes) - sizes
+
+    branching = _BRANCHING[rng.choice(len(_BRANCHING), size=len(sizes), p=_BRANCHING_P)]
+    min_branching = np.ceil(sizes.astype(float) ** (1.0 / config.max_depth)).astype(np.int64)
+    branching = np.maximum(branching, min_branching)
+    chains = (sizes <= config.max_depth + 1) & (rng.random(len(sizes)) < config.chain_pct)
+    branching = np.where(chains, 1, branching)
+
+    member_start = np.repeat(starts, sizes)
+    position = np.arange(n) - member_start
+    children = np.flatnonzero(position > 0)
+    parent_position = (position[children] - 1) // np.repeat(branching, sizes)[children]
+    return children, member_start[children] + parent_position
+
+
+def _loans(
+    rng: np.random.Generator,
+    config: PortfolioConfig,
+    chunk: int,
+    cp_refs: pl.Series,
+    entities: np.ndarray,
+    revenues: np.ndarray,
+) -> tuple[pl.DataFrame, np.ndarray]:
+    """Loans and the chunk-local counterparty position of each."""
+    n_cp = len(entities)
+    alpha = config.loan_tail_alpha
+    scale = max(config.loans_per_counterparty - 0.5, 0.0) * (alpha - 1)
+    counts = 1 + np.floor(rng.pareto(alpha, size=n_cp) * scale)
+    counts = np.minimum(counts, config.max_loans_per_counterparty).astype(np.int64)
+
+    loan_cp = np.repeat(np.arange(n_cp), counts)
+    n_loans = len(loan_cp)
+    loan_entities = entities[loan_cp]
+
+    products = np.empty(n_loans, dtype=object)
+    for entity, (choices, p) in _LOAN_PRODUCTS.items():
+        mask = loan_entities == entity
+        products[mask] = rng.choice(choices, size=mask.sum(), p=p)
+
+    lgd = np.full(n_loans, 0.45)
+    lgd[products == "RESIDENTIAL_MORTGAGE"] = 0.10
+    lgd[products == "CREDIT_CARD"] = 0.85
+
+    frame = pl.DataFrame({
+        "loan_reference": format_references(f"LN_{chunk:05d}_", np.arange(n_loans), 9),
+        "product_type": products.astype(str),
+        "counterparty_reference": cp_refs.gather(loan_cp),
+        "value_date": offset_dates(BASE_DATE, -rng.integers(0, 365 * 3, size=n_loans)),
+        "maturity_date": offset_dates(BASE_DATE, rng.integers(365, 365 * 7, size=n_loans)),
+        "currency": rng.choice(["GBP", "USD", "EUR"], size=n_loans, p=[0.70, 0.20, 0.10]),
+        "drawn_amount": np.maximum(
+            revenues[loan_cp] * rng.uniform(0.001, 0.05, size=n_loans), 10_000,
+        ),
+        "interest": np.zeros(n_loans),
+        "lgd": lgd,
+        "beel": np.zeros(n_loans),
+        "seniority": rng.choice(["senior", "subordinated"], size=n_loans, p=[0.92, 0.08]),
+        "is_buy_to_let": (products == "RESIDENTIAL_MORTGAGE") & (rng.random(n_loans) < 0.20),
+    }).with_columns(
+        pl.col("product_type").replace_strict(_BOOK_CODES).alias("book_code"),
+    ).select(list(LOAN_SCHEMA)).cast(LOAN_SCHEMA)
+    return frame, loan_cp
+
+
+def _facilities(
+    rng: np.random.Generator,
+    fac_refs: pl.Series,
+    cp_refs: pl.Series,
+    revenues: np.ndarray,
+) -> pl.DataFrame:
+    """One facility per counterparty."""
+    n = len(fac_refs)
+    products = rng.choice(
+        ["RCF", "TERM_FACILITY", "MORTGAGE_FACILITY", "TRADE_FACILITY"],
+        size=n, p=[0.35, 0.35, 0.20, 0.10],
+    )
+    uncommitted = rng.random(n) < 0.30
+    risk_types = np.where(
+        uncommitted,
+        "LR",
+        np.where(products == "RCF", "MR", rng.choice(["MR", "MLR"], size=n, p=[0.70, 0.30])),
+    )
+    return pl.DataFrame({
+        "facility_reference": fac_refs,
+        "product_type": products,
+        "book_code": rng.choice(
+            ["CORP_LENDING", "RETAIL_LENDING", "FI_LENDING", "TRADE_FINANCE"],
+            size=n, p=[0.45, 0.35, 0.15, 0.05],
+        ),
+        "counterparty_reference": cp_refs,
+        "value_date": offset_dates(BASE_DATE, np.zeros(n, dtype=np.int64)),
+        "maturity_date": offset_dates(BASE_DATE, rng.integers(365, 365 * 10, size=n)),
+        "currency": rng.choice(["GBP", "USD", "EUR"], size=n, p=[0.70, 0.20, 0.10]),
+        "limit": np.maximum(revenues * rng.uniform(0.01, 0.10, size=n), 100_000),
+        "committed": ~uncommitted,
+        "lgd": np.full(n, 0.45),
+        "beel": np.zeros(n),
+        "is_revolving": products == "RCF",
+        "seniority": rng.choice(["senior", "subordinated"], size=n, p=[0.90, 0.10]),
+        "risk_type": risk_types,
+        "ccf_modelled": pl.repeat(None, n, dtype=pl.Float64, eager=True),
+        "is_short_term_trade_lc": pl.repeat(None, n, dtype=pl.Boolean, eager=True),
+        "is_buy_to_let": (products == "MORTGAGE_FACILITY") & (rng.random(n) < 0.20),
+    }).cast(FACILITY_SCHEMA)
+
+
+def _facility_mappings(
+    rng: np.random.Generator,
+    config: PortfolioConfig,
+    fac_refs: pl.Series,
+    org_children: np.ndarray,
+    org_parents: np.ndarray,
+    loans: pl.DataFrame,
+    loan_cp: np.ndarray,
+) -> pl.DataFrame:
+    """Loans under their counterparty's facility; sub-facilities along the group tree."""
+    nested = rng.random(len(org_children)) < config.sub_facility_pct
+    mapped = np.flatnonzero(rng.random(len(loan_cp)) < config.facility_hierarchy_pct)
+
+    return pl.concat([
+        pl.DataFrame({
+            "parent_facility_reference": fac_refs.gather(org_parents[nested]),
+            "child_reference": fac_refs.gather(org_children[nested]),
+            "child_type": np.full(nested.sum(), "facility"),
+        }),
+        pl.DataFrame({
+            "parent_facility_reference": fac_refs.gather(loan_cp[mapped]),
+            "child_reference": loans["loan_reference"].gather(mapped),
+            "child_type": np.full(len(mapped), "loan"),
+        }),
+    ]).cast(FACILITY_MAPPING_SCHEMA)
+
+
+def _ratings(
+    rng: np.random.Generator,
+    config: PortfolioConfig,
+    chunk: int,
+    cp_refs: pl.Series,
+) -> pl.DataFrame:
+    """One rating per rated counterparty; internal PDs from the master scale."""
+    rated = np.flatnonzero(rng.random(len(cp_refs)) < config.rated_percentage)
+    n = len(rated)
+    external = rng.random(n) < config.external_rating_pct
+
+    # Internal grades cluster mid-scale, so a few PDs cover most ratings
+    grades = rng.binomial(len(PD_GRADES) - 1, 0.4, size=n)
+    internal_pd = PD_GRADES[grades]
+    internal_cqs = np.digitize(internal_pd, [0.001, 0.005, 0.02, 0.05, 0.15]) + 1
+
+    external_cqs = rng.choice([1, 2, 3, 4, 5, 6], size=n, p=[0.05, 0.20, 0.35, 0.25, 0.10, 0.05])
+    external_values = np.array(["", "AAA", "AA", "A", "BBB", "BB", "B"])[external_cqs]
+    external_pd = np.array([0.0, 0.0003, 0.001, 0.005, 0.02, 0.05, 0.15])[external_cqs]
+
+    return pl.DataFrame({
+        "rating_reference": format_references(f"RAT_{chunk:05d}_", np.arange(n), 9),
+        "counterparty_reference": cp_refs.gather(rated),
+        "rating_type": np.where(external, "external", "internal"),
+        "rating_agency": np.where(
+            external, rng.choice(["S&P", "Moodys", "Fitch"], size=n), "internal",
+        ),
+        "rating_value": np.where(
+            external, external_values, np.char.add("INT_", (grades + 1).astype(str)),
+        ),
+        "cqs": np.where(external, external_cqs, internal_cqs),
+        "pd": np.where(external, external_pd, internal_pd),
+        "rating_date": offset_dates(BASE_DATE, -rng.integers(0, 365, size=n)),
+        "is_solicited": external,
+    }).cast(RATINGS_SCHEMA)
+
+
+def _contingents(
+    rng: np.random.Generator,
+    config: PortfolioConfig,
+    chunk: int,
+    cp_refs: pl.Series,
+    revenues: np.ndarray,
+) -> pl.DataFrame:
+    """Off-balance sheet items for a share of counterparties."""
+    holders = np.flatnonzero(rng.random(len(cp_refs)) < config.contingent_pct)
+    n = len(holders)
+    products = rng.choice(
+        ["TRADE_LC", "FINANCIAL_GUARANTEE", "UNDRAWN_COMMITMENT"], size=n, p=[0.30, 0.30, 0.40],
+    )
+    return pl.DataFrame({
+        "contingent_reference": format_references(f"CT_{chunk:05d}_", np.arange(n), 9),
+        "product_type": products,
+        "book_code": np.full(n, "CONTINGENT"),
+        "counterparty_reference": cp_refs.gather(holders),
+        "value_date": offset_dates(BASE_DATE, np.zeros(n, dtype=np.int64)),
+        "maturity_date": offset_dates(BASE_DATE, rng.integers(90, 365 * 3, size=n)),
+        "currency": rng.choice(["GBP", "USD", "EUR"], size=n, p=[0.70, 0.20, 0.10]),
+        "nominal_amount": np.maximum(revenues[holders] * rng.uniform(0.005, 0.02, size=n), 50_000),
+        "lgd": np.full(n, 0.45),
+        "beel": np.zeros(n),
+        "seniority": np.full(n, "senior"),
+        "risk_type": np.select(
+            [products == "TRADE_LC", products == "FINANCIAL_GUARANTEE"], ["MLR", "FR"], "MR",
+        ),
+        "ccf_modelled": pl.repeat(None, n, dtype=pl.Float64, eager=True),
+        "is_short_term_trade_lc": products == "TRADE_LC",
+        "bs_type": np.full(n, "OFB"),
+    }).cast(CONTINGENTS_SCHEMA)
+
+
+def _collateral(
+    rng: np.random.Generator,
+    config: PortfolioConfig,
+    chunk: int,
+    loans: pl.DataFrame,
+) -> pl.DataFrame:
+    """Collateral on a share of loans; type-specific columns null elsewhere."""
+    secured = np.flatnonzero(rng.random(loans.height) < config.collateral_pct)
+    n = len(secured)
+    types = rng.choice(
+        ["cash", "real_estate", "bond", "equity"], size=n, p=[0.20, 0.40, 0.25, 0.15],
+    )
+    bond = types == "bond"
+    real_estate = types == "real_estate"
+    adc = real_estate & (rng.random(n) < 0.1)
+    market_values = loans["drawn_amount"].to_numpy()[secured] * rng.uniform(0.50, 1.50, size=n)
+
+    return pl.DataFrame({
+        "collateral_reference": format_references(f"COL_{chunk:05d}_", np.arange(n), 9),
+        "collateral_type": types,
+        "currency": rng.choice(["GBP", "USD", "EUR"], size=n, p=[0.75, 0.15, 0.10]),
+        "maturity_date": offset_dates(BASE_DATE, rng.integers(365, 365 * 10, size=n)),
+        "market_value": market_values,
+        "nominal_value": market_values * rng.uniform(0.95, 1.05, size=n),
+        "pledge_percentage": pl.repeat(None, n, dtype=pl.Float64, eager=True),
+        "beneficiary_type": np.full(n, "loan"),
+        "beneficiary_reference": loans["loan_reference"].gather(secured),
+        "issuer_cqs": np.where(bond, rng.choice([1, 2, 3, 4], size=n, p=[0.3, 0.4, 0.2, 0.1]), 0),
+        "issuer_type": np.where(
+            bond, rng.choice(["sovereign", "corporate"], size=n, p=[0.60, 0.40]),
+            np.where(types == "equity", "corporate", ""),
+        ),
+        "residual_maturity_years": np.where(bond, rng.uniform(1, 10, size=n), np.nan),
+        "is_eligible_financial_collateral": ~real_estate,
+        "is_eligible_irb_collateral": np.ones(n, dtype=bool),
+        "valuation_date": offset_dates(BASE_DATE, -rng.integers(0, 90, size=n)),
+        "valuation_type": np.where(real_estate, "independent", "market"),
+        "property_type": np.where(
+            real_estate, np.where(rng.random(n) < 0.6, "residential", "commercial"), "",
+        ),
+        "property_ltv": np.where(real_estate, rng.uniform(0.3, 0.9, size=n), np.nan),
+        "is_income_producing": real_estate & (rng.random(n) < 0.3),
+        "is_adc": adc,
+        "is_presold": adc & (rng.random(n) < 0.5),
+    }).with_columns(
+        pl.when(pl.col("issuer_cqs") > 0).then(pl.col("issuer_cqs")),
+        pl.when(pl.col("issuer_type") != "").then(pl.col("issuer_type")),
+        pl.when(pl.col("property_type") != "").then(pl.col("property_type")),
+        pl.col("residual_maturity_years", "property_ltv").fill_nan(None),
+    ).cast(COLLATERAL_SCHEMA)
+
+
+def _guarantees(
+    rng: np.random.Generator,
+    config: PortfolioConfig,
+    chunk: int,
+    loans: pl.DataFrame,
+    cp_refs: pl.Series,
+    entities: np.ndarray,
+) -> pl.DataFrame:
+    """Guarantees on a share of loans from institutions and sovereigns in the chunk."""
+    guarantors = np.flatnonzero((entities == "institution") | (entities == "sovereign"))
+    guaranteed = np.flatnonzero(rng.random(loans.height) < config.guarantee_pct)
+    n = len(guaranteed)
+    if n == 0 or len(guarantors) == 0:
+        return pl.DataFrame(schema=GUARANTEE_SCHEMA)
+
+    covered = rng.choice([0.5, 0.8, 1.0], size=n, p=[0.30, 0.30, 0.40])
+    rows = loans[guaranteed]
+    return pl.DataFrame({
+        "guarantee_reference": format_references(f"GU_{chunk:05d}_", np.arange(n), 9),
+        "guarantee_type": rng.choice(
+            ["bank_guarantee", "sovereign_guarantee"], size=n, p=[0.70, 0.30],
+        ),
+        "guarantor": cp_refs.gather(rng.choice(guarantors, size=n)),
+        "currency": rows["currency"],
+        "maturity_date": rows["maturity_date"],
+        "amount_covered": rows["drawn_amount"].to_numpy() * covered,
+        "percentage_covered": covered,
+        "beneficiary_type": np.full(n, "loan"),
+        "beneficiary_reference": rows["loan_reference"],
+    }).cast(GUARANTEE_SCHEMA)
+
+
+def _provisions(
+    rng: np.random.Generator,
+    config: PortfolioConfig,
+    chunk: int,
+    loans: pl.DataFrame,
+) -> pl.DataFrame:
+    """IFRS 9 provisions on a share of loans."""
+    provisioned = np.flatnonzero(rng.random(loans.height) < config.provision_pct)
+    n = len(provisioned)
+    stages = rng.choice([1, 2, 3], size=n, p=[0.70, 0.22, 0.08])
+    coverage = np.select(
+        [stages == 1, stages == 2],
+        [rng.uniform(0.005, 0.02, size=n), rng.uniform(0.02, 0.10, size=n)],
+        rng.uniform(0.20, 0.60, size=n),
+    )
+    rows = loans[provisioned]
+    return pl.DataFrame({
+        "provision_reference": format_references(f"PR_{chunk:05d}_", np.arange(n), 9),
+        "provision_type": np.where(stages == 3, "SCRA", rng.choice(["SCRA", "GCRA"], size=n)),
+        "ifrs9_stage": stages,
+        "currency": rows["currency"],
+        "amount": rows["drawn_amount"].to_numpy() * coverage,
+        "as_of_date": offset_dates(BASE_DATE, np.zeros(n, dtype=np.int64)),
+        "beneficiary_type": np.full(n, "loan"),
+        "beneficiary_reference": rows["loan_reference"],
+    }).cast(PROVISION_SCHEMA)
+
+
+# =============================================================================
+# WRITING AND LOADING
+# =============================================================================
+
+
+def chunk_path(root: Path, table: str, chunk: int) -> Path:
+    """Hive-partitioned file for one table chunk."""
+    return root / table / f"chunk={chunk:05d}" / "data.parquet"
+
+
+def write_chunk(config: PortfolioConfig, root: Path, chunk: int) -> dict[str, int]:
+    """
+    Generate one chunk and write each table to its partition.
+
+    Files are written under a temporary name and moved into place, so an
+    interrupted run never leaves a truncated partition.
+
+    Args:
+        config: Portfolio configuration
+        root: Dataset directory
+        chunk: Chunk number
+
+    Returns:
+        Row count per table
+    """
+    counts = {}
+    for table, frame in generate_chunk(config, chunk).items():
+        target = chunk_path(root, table, chunk)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        frame.write_parquet(tmp)
+        os.replace(tmp, target)
+        counts[table] = frame.height
+    return counts
+
+
+def generate_portfolio(
+    config: PortfolioConfig,
+    root: Path,
+    workers: int | None = None,
+) -> dict:
+    """
+    Generate a portfolio chunk by chunk, in parallel worker processes.
+
+    Workers are spawned (not forked) so Polars' thread pool is not
+    inherited. Regenerating into an existing directory first deletes the
+    manifest and any chunk partitions beyond n_chunks left by a larger
+    dataset. The manifest is written last, so load_portfolio ignores the
+    directory until every chunk is in place.
+
+    Args:
+        config: Portfolio configuration
+        root: Dataset directory
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        Manifest with the config, row counts per table and elapsed seconds
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    (root / MANIFEST_FILE).unlink(missing_ok=True)
+    _remove_stale_chunks(root, config.n_chunks)
+    chunks = range(config.n_chunks)
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [write_chunk(config, root, chunk) for chunk in chunks]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(write_chunk, repeat(config), repeat(root), chunks))
+
+    fx_path = root / "fx_rates" / "data.parquet"
+    fx_path.parent.mkdir(parents=True, exist_ok=True)
+    generate_fx_rates().collect().write_parquet(fx_path)
+
+    manifest = {
+        "config": asdict(config),
+        "rows": {table: sum(counts[table] for counts in results) for table in CHUNKED_TABLES},
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    (root / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _remove_stale_chunks(root: Path, n_chunks: int) -> None:
+    """Delete chunk partitions numbered n_chunks or above from every table."""
+    for table in CHUNKED_TABLES:
+        for partition in (root / table).glob("chunk=*"):
+            if int(partition.name.removeprefix("chunk=")) >= n_chunks:
+                shutil.rmtree(partition)
+
+
+def load_portfolio(root: Path, chunks: int | None = None) -> dict[str, pl.LazyFrame] | None:
+    """
+    Scan a generated portfolio.
+
+    Args:
+        root: Dataset directory
+        chunks: Read only the first n chunks (default: all)
+
+    Returns:
+        LazyFrames keyed by table name (as from generate_benchmark_dataset),
+        or None if the directory holds no complete portfolio
+    """
+    root = Path(root)
+    if not (root / MANIFEST_FILE).exists():
+        return None
+
+    dataset = {}
+    for table in CHUNKED_TABLES:
+        lf = pl.scan_parquet(
+            root / table,
+            hive_partitioning=True,
+            hive_schema={"chunk": pl.Int32},
+        )
+        if chunks is not None:
+            lf = lf.filter(pl.col("chunk") < chunks)
+        dataset[table] = lf.drop("chunk")
+    dataset["fx_rates"] = pl.scan_parquet(root / "fx_rates" / "data.parquet")
+    return dataset
+
+
+def get_portfolio_path(scale: str, data_dir: Path | None = None) -> Path:
+    """Directory of a generated portfolio scale."""
+    return (data_dir or BENCHMARK_DATA_DIR) / f"portfolio_{scale}"
+
+
+def get_or_create_portfolio(
+    scale: str,
+    data_dir: Path | None = None,
+    workers: int | None = None,
+) -> dict[str, pl.LazyFrame]:
+    """
+    Load a portfolio scale, generating it first if it is not on disk.
+
+    Args:
+        scale: One of the PORTFOLIO_SCALES keys
+        data_dir: Optional custom data directory
+        workers: Worker processes used if generating
+
+    Returns:
+        LazyFrames keyed by table name
+    """
+    path = get_portfolio_path(scale, data_dir)
+    dataset = load_portfolio(path)
+    if dataset is None:
+        generate_portfolio(PORTFOLIO_SCALES[scale], path, workers=workers)
+        dataset = load_portfolio(path)
+    return dataset
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for ``python -m tests.benchmarks.portfolio_generator``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks.portfolio_generator",
+        description="Generate chunked synthetic portfolios as hive-partitioned Parquet.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="Generate a portfolio scale")
+    generate_parser.add_argument("scale", choices=list(PORTFOLIO_SCALES))
+    generate_parser.add_argument("--workers", type=int, default=None)
+    generate_parser.add_argument("--data-dir", type=Path, default=None)
+
+    args = parser.parse_args(argv)
+
+    path = get_portfolio_path(args.scale, args.data_dir)
+    manifest = generate_portfolio(PORTFOLIO_SCALES[args.scale], path, workers=args.workers)
+
+    print(f"{'table':<20}{'rows':>16}")
+    for table, rows in manifest["rows"].items():
+        print(f"{table:<20}{rows:>16,}")
+    print(f"Generated {path} in {manifest['seconds']:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
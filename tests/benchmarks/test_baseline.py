@@ -0,0 +1,118 @@
+"""
+Tests for the benchmark baseline comparison and memory helpers.
+
+These are plain unit tests (no benchmark fixture) so they run in the
+default suite.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from tests.benchmarks.baseline import (
+    Measurement,
+    compare,
+    compare_memory,
+    load_baseline,
+    load_report,
+    main,
+    write_baseline,
+)
+from tests.benchmarks.memory import StageMemory
+
+
+def _write_report(path: Path, median_s: float, stage_rss_mb: float) -> Path:
+    path.write_text(json.dumps({
+        "benchmarks": [{
+            "fullname": "tests/benchmarks/test_stage_benchmark.py::TestCRM::test_full_crm[10k]",
+            "stats": {"median": median_s},
+            "extra_info": {"stage_rss_mb": stage_rss_mb, "peak_rss_mb": 500.0, "rows": 10_000},
+        }],
+    }))
+    return path
+
+
+class TestBaselineCompare:
+    """Tests for compare / load / write."""
+
+    def test_load_report_keys_without_directory(self, tmp_path: Path) -> None:
+        report = load_report(_write_report(tmp_path / "r.json", 1.0, 100.0))
+
+        assert list(report) == ["test_stage_benchmark.py::TestCRM::test_full_crm[10k]"]
+        assert report["test_stage_benchmark.py::TestCRM::test_full_crm[10k]"].rows == 10_000
+
+    def test_within_tolerance_is_not_a_regression(self) -> None:
+        base = {"b": Measurement(median_s=1.0, stage_rss_mb=100.0)}
+        now = {"b": Measurement(median_s=1.2, stage_rss_mb=120.0)}
+
+        assert compare(now, base, time_tolerance=0.25, memory_tolerance=0.25) == []
+
+    def test_time_and_memory_regressions_flagged(self) -> None:
+        base = {"b": Measurement(median_s=1.0, stage_rss_mb=100.0)}
+        now = {"b": Measurement(median_s=1.5, stage_rss_mb=200.0)}
+
+        regressions = compare(now, base, time_tolerance=0.25, memory_tolerance=0.25)
+
+        assert [r.metric for r in regressions] == ["median_s", "stage_rss_mb"]
+        assert regressions[0].change == 0.5
+
+    def test_noise_floor_ignores_tiny_absolute_changes(self) -> None:
+        base = {"b": Measurement(median_s=0.001, stage_rss_mb=1.0)}
+        now = {"b": Measurement(median_s=0.003, stage_rss_mb=5.0)}
+
+        assert compare(now, base) == []
+
+    def test_compare_memory_ignores_time(self, tmp_path: Path) -> None:
+        path = tmp_path / "memory.json"
+        write_baseline({"b": Measurement(median_s=1.0, stage_rss_mb=100.0)}, path)
+
+        slow = Measurement(median_s=10.0, stage_rss_mb=100.0)
+        bloated = Measurement(median_s=1.0, stage_rss_mb=300.0)
+
+        assert compare_memory("b", slow, path) == []
+        assert [r.metric for r in compare_memory("b", bloated, path)] == ["stage_rss_mb"]
+        assert compare_memory("unknown", bloated, path) == []
+
+    def test_write_baseline_merges_entries(self, tmp_path: Path) -> None:
+        path = tmp_path / "baseline.json"
+        write_baseline({"a": Measurement(median_s=1.0)}, path)
+        write_baseline({"b": Measurement(median_s=2.0)}, path)
+
+        assert set(load_baseline(path)) == {"a", "b"}
+
+    def test_main_exit_codes(self, tmp_path: Path) -> None:
+        baseline = tmp_path / "baseline.json"
+        main(["update", str(_write_report(tmp_path / "base.json", 1.0, 100.0)),
+              "--baseline", str(baseline)])
+
+        ok = _write_report(tmp_path / "ok.json", 1.1, 100.0)
+        slow = _write_report(tmp_path / "slow.json", 3.0, 100.0)
+
+        assert main(["compare", str(ok), "--baseline", str(baseline)]) == 0
+        assert main(["compare", str(slow), "--baseline", str(baseline)]) == 1
+
+
+class TestStageMemory:
+    """Tests for the StageMemory summary."""
+
+    def test_bytes_per_exposure(self) -> None:
+        result = StageMemory(
+            stage="crm", scale="10k", n_exposures=1_000,
+            rss_before_bytes=100 * 2**20, peak_rss_bytes=110 * 2**20,
+            output_bytes=2**20, seconds=0.5,
+        )
+
+        assert result.stage_rss_bytes == 10 * 2**20
+        assert result.bytes_per_exposure == 10 * 2**20 / 1_000
+        assert result.extra_info()["stage_rss_mb"] == 10.0
+        assert result.extra_info()["output_mb"] == 1.0
+
+    def test_stage_rss_never_negative(self) -> None:
+        result = StageMemory(
+            stage="sa", scale="10k", n_exposures=0,
+            rss_before_bytes=200, peak_rss_bytes=100, output_bytes=0, seconds=0.0,
+        )
+
+        assert result.stage_rss_bytes == 0
+        assert result.bytes_per_exposure == 0.0
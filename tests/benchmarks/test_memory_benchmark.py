@@ -0,0 +1,68 @@
+"""
+Memory-footprint benchmarks for the RWA calculation pipeline.
+
+Runs each pipeline stage in a fresh subprocess at 100K / 1M / 10M scale
+and records peak RSS, stage working memory, output size and bytes per
+exposure in extra_info. RSS covers Polars/Arrow allocations made in Rust,
+which tracemalloc does not see.
+
+Each measurement is checked against tests/benchmarks/baselines/
+memory_benchmarks.json; a stage whose working memory exceeds its baseline
+by more than the tolerance fails.
+
+Usage:
+    # Run at 100K, writing a JSON report
+    uv run pytest tests/benchmarks/test_memory_benchmark.py --benchmark-only \\
+        -m "not slow" --benchmark-json=memory_benchmarks.json
+
+    # Record the report as the new baseline after an intentional change
+    uv run python -m tests.benchmarks.baseline update memory_benchmarks.json \\
+        --baseline tests/benchmarks/baselines/memory_benchmarks.json
+
+    # Bytes per exposure for every stage, without pytest
+    uv run python -m tests.benchmarks.memory report 100k
+"""
+
+from __future__ import annotations
+
+import pytest
+from tests.benchmarks.baseline import Measurement, benchmark_key, compare_memory
+from tests.benchmarks.memory import STAGES, can_reset_peak_rss, run_stage_in_subprocess
+
+MEMORY_SCALES = [
+    pytest.param("100k", marks=pytest.mark.scale_100k, id="100k"),
+    pytest.param("1m", marks=[pytest.mark.scale_1m, pytest.mark.slow], id="1m"),
+    pytest.param("10m", marks=[pytest.mark.scale_10m, pytest.mark.slow], id="10m"),
+]
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not can_reset_peak_rss(), reason="Per-stage peak RSS requires Linux /proc")
+class TestStageMemory:
+    """Per-stage peak RSS and bytes per exposure, measured in subprocesses."""
+
+    @pytest.mark.parametrize("scale", MEMORY_SCALES)
+    @pytest.mark.parametrize("stage", STAGES)
+    def test_stage_memory(self, benchmark, request, stage: str, scale: str):
+        # Generate and cache the dataset in this process so the worker only loads it
+        request.getfixturevalue(f"dataset_{scale}")
+
+        result = benchmark.pedantic(
+            run_stage_in_subprocess, args=(stage, scale), rounds=1, iterations=1,
+        )
+        benchmark.extra_info.update(result.extra_info())
+
+        print(
+            f"\n{stage} @ {scale}: peak {result.peak_rss_bytes / 2**20:.1f} MB, "
+            f"stage {result.stage_rss_bytes / 2**20:.1f} MB, "
+            f"{result.bytes_per_exposure:.0f} B/exposure"
+        )
+
+        current = Measurement(
+            median_s=result.seconds,
+            stage_rss_mb=result.stage_rss_bytes / 2**20,
+            peak_rss_mb=result.peak_rss_bytes / 2**20,
+            rows=result.n_exposures,
+        )
+        regressions = compare_memory(benchmark_key(request.node.nodeid), current)
+        assert not regressions, "\n".join(str(r) for r in regressions)
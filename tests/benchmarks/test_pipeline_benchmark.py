@@ -516,6 +516,38 @@ class TestApproachBenchmarks100K:
         irb_count = result.irb_results.collect(engine=BENCHMARK_ENGINE).height if result.irb_results is not None else 0
         print(f"\nSA exposures: {sa_count:,}, IRB exposures: {irb_count:,}")
 
+    def test_full_irb_encoded_keys_100k(
+        self,
+        benchmark,
+        dataset_100k: dict[str, pl.LazyFrame],
+    ):
+        """
+        Benchmark full IRB calculation at 100K scale on encoded reference keys.
+
+        Pairs with test_full_irb_100k: same data and outputs, but every
+        stage joins on dictionary-encoded references.
+        """
+        raw_data = create_raw_data_bundle(dataset_100k)
+        config = CalculationConfig.crr(
+            BENCHMARK_REPORTING_DATE,
+            irb_permissions=IRBPermissions.full_irb(),
+        )
+
+        pipeline = PipelineOrchestrator(loader=InMemoryLoader(raw_data), encode_keys=True)
+
+        def run_pipeline():
+            result = pipeline.run(config)
+            if result.sa_results is not None:
+                _ = result.sa_results.collect(engine=BENCHMARK_ENGINE)
+            if result.irb_results is not None:
+                _ = result.irb_results.collect(engine=BENCHMARK_ENGINE)
+            return result
+
+        result = benchmark(run_pipeline)
+
+        assert result is not None
+        assert result.irb_results.collect_schema()["exposure_reference"] == pl.String
+
     def test_irb_with_slotting_100k(
         self,
         benchmark,
@@ -0,0 +1,203 @@
+"""
+Tests for the chunked portfolio generator and vectorised formatting helpers.
+
+These are plain unit tests on a small portfolio (no benchmark fixture),
+so they run in the default suite.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import polars as pl
+import pytest
+import tests.benchmarks.data_generators as data_generators
+import tests.benchmarks.portfolio_generator as portfolio_generator
+from tests.benchmarks.data_generators import format_references, offset_dates
+from tests.benchmarks.portfolio_generator import (
+    CHUNKED_TABLES,
+    MANIFEST_FILE,
+    PD_GRADES,
+    PortfolioConfig,
+    chunk_path,
+    generate_chunk,
+    generate_portfolio,
+    load_portfolio,
+)
+
+CONFIG = PortfolioConfig(n_counterparties=5_000, chunk_size=2_000, max_group_size=500)
+
+
+@pytest.fixture(scope="module")
+def portfolio(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Small portfolio generated in-process."""
+    root = tmp_path_factory.mktemp("portfolio")
+    generate_portfolio(CONFIG, root, workers=1)
+    return root
+
+
+def _roots(mappings: pl.DataFrame) -> pl.DataFrame:
+    """Root and depth of every child, walking the parent edges."""
+    parents = dict(zip(
+        mappings["child_counterparty_reference"], mappings["parent_counterparty_reference"],
+        strict=True,
+    ))
+    rows = []
+    for child in parents:
+        depth, node = 0, child
+        while node in parents:
+            node = parents[node]
+            depth += 1
+        rows.append((child, node, depth))
+    return pl.DataFrame(rows, schema=["child", "root", "depth"], orient="row")
+
+
+class TestFormattingHelpers:
+    """Tests for format_references and offset_dates."""
+
+    def test_references_match_fstrings(self) -> None:
+        indices = np.array([0, 7, 123_456_789])
+
+        assert format_references("CP_", indices).to_list() == [f"CP_{i:08d}" for i in indices]
+
+    def test_per_row_prefixes(self) -> None:
+        prefixes = np.array(["SL_GOOD_", "LOAN_"])
+
+        assert format_references(prefixes, np.array([1, 2])).to_list() == [
+            "SL_GOOD_00000001", "LOAN_00000002",
+        ]
+
+    def test_offset_dates(self) -> None:
+        base = date(2026, 1, 1)
+        dates = pl.Series(offset_dates(base, np.array([0, 31, -1])))
+
+        assert dates.to_list() == [base, base + timedelta(days=31), base - timedelta(days=1)]
+
+
+def _loop_references(prefix: Any, indices: np.ndarray, width: int = 8) -> pl.Series:
+    """format_references as the f-string loop it replaced."""
+    prefixes = prefix if isinstance(prefix, np.ndarray) else [prefix] * len(indices)
+    return pl.Series(
+        [f"{p}{i:0{width}d}" for p, i in zip(prefixes, indices, strict=True)], dtype=pl.String
+    )
+
+
+def _loop_dates(base: date, days: np.ndarray) -> list[date]:
+    """offset_dates as the timedelta loop it replaced."""
+    return [base + timedelta(days=int(d)) for d in days]
+
+
+def _loop_setdiff(values: np.ndarray, excluded: np.ndarray) -> np.ndarray:
+    """np.setdiff1d as the set-membership scan it replaced."""
+    excluded_set = set(excluded.tolist())
+    return np.array([i for i in values.tolist() if i not in excluded_set])
+
+
+class TestVectorisedGenerators:
+    """The vectorised data_generators output matches the loop-based version."""
+
+    def test_dataset_unchanged(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        vectorised = data_generators.generate_benchmark_dataset(500, seed=7)
+
+        monkeypatch.setattr(data_generators, "format_references", _loop_references)
+        monkeypatch.setattr(data_generators, "offset_dates", _loop_dates)
+        monkeypatch.setattr(data_generators.np, "setdiff1d", _loop_setdiff)
+        looped = data_generators.generate_benchmark_dataset(500, seed=7)
+
+        for name, lf in vectorised.items():
+            assert lf.collect().equals(looped[name].collect()), name
+
+
+class TestPortfolioGenerator:
+    """Tests for chunked generation, layout and distributions."""
+
+    def test_hive_layout_and_manifest(self, portfolio: Path) -> None:
+        for table in CHUNKED_TABLES:
+            for chunk in range(CONFIG.n_chunks):
+                assert chunk_path(portfolio, table, chunk).exists()
+        assert CONFIG.n_chunks == 3
+
+        manifest = json.loads((portfolio / MANIFEST_FILE).read_text())
+        assert manifest["rows"]["counterparties"] == CONFIG.n_counterparties
+
+    def test_chunks_are_deterministic(self, portfolio: Path) -> None:
+        """A chunk regenerated on its own matches the written partition."""
+        regenerated = generate_chunk(CONFIG, 1)["loans"]
+        written = pl.read_parquet(chunk_path(portfolio, "loans", 1))
+
+        assert regenerated.equals(written)
+
+    def test_references_unique_and_resolved(self, portfolio: Path) -> None:
+        dataset = {name: lf.collect() for name, lf in load_portfolio(portfolio).items()}
+        counterparties = dataset["counterparties"]["counterparty_reference"]
+        loans = dataset["loans"]
+
+        assert counterparties.is_unique().all()
+        assert counterparties.len() == CONFIG.n_counterparties
+        assert loans["loan_reference"].is_unique().all()
+        assert loans["counterparty_reference"].is_in(counterparties).all()
+        assert dataset["org_mappings"]["parent_counterparty_reference"].is_in(counterparties).all()
+        assert dataset["collateral"]["beneficiary_reference"].is_in(loans["loan_reference"]).all()
+
+    def test_group_skew_and_depth(self, portfolio: Path) -> None:
+        mappings = load_portfolio(portfolio)["org_mappings"].collect()
+        roots = _roots(mappings)
+        group_sizes = roots.group_by("root").len()["len"] + 1
+
+        assert group_sizes.max() > 20 * group_sizes.median()
+        assert roots["depth"].max() <= CONFIG.max_depth
+        assert roots["depth"].max() >= 3
+
+    def test_pd_grades_repeat(self, portfolio: Path) -> None:
+        internal = load_portfolio(portfolio)["ratings"].filter(
+            pl.col("rating_type") == "internal"
+        ).collect()
+
+        assert internal["pd"].is_in(PD_GRADES.tolist()).all()
+        assert internal["pd"].n_unique() <= len(PD_GRADES)
+
+    def test_load_chunk_prefix(self, portfolio: Path) -> None:
+        subset = load_portfolio(portfolio, chunks=1)
+        counterparties = subset["counterparties"].collect()
+
+        assert counterparties.height == CONFIG.chunk_size
+        assert "chunk" not in counterparties.columns
+        assert subset["loans"].collect()["counterparty_reference"].is_in(
+            counterparties["counterparty_reference"]
+        ).all()
+
+    def test_missing_manifest(self, tmp_path: Path) -> None:
+        assert load_portfolio(tmp_path) is None
+
+    def test_regenerate_smaller(self, tmp_path: Path) -> None:
+        """Regenerating with fewer chunks drops the old partitions beyond them."""
+        generate_portfolio(CONFIG, tmp_path, workers=1)
+        smaller = PortfolioConfig(n_counterparties=2_000, chunk_size=2_000, max_group_size=500)
+
+        generate_portfolio(smaller, tmp_path, workers=1)
+
+        for table in CHUNKED_TABLES:
+            assert not chunk_path(tmp_path, table, 1).parent.exists()
+        counterparties = load_portfolio(tmp_path)["counterparties"].collect()
+        assert counterparties.height == smaller.n_counterparties
+
+    def test_manifest_removed_while_generating(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """An interrupted regeneration leaves no manifest, so the directory is not loaded."""
+        generate_portfolio(CONFIG, tmp_path, workers=1)
+
+        def fail(*args: Any) -> dict[str, int]:
+            raise RuntimeError("interrupted")
+
+        monkeypatch.setattr(portfolio_generator, "write_chunk", fail)
+        with pytest.raises(RuntimeError):
+            generate_portfolio(CONFIG, tmp_path, workers=1)
+
+        assert load_portfolio(tmp_path) is None
@@ -0,0 +1,389 @@
+"""
+Stage-level benchmark tests for the RWA calculation pipeline.
+
+Benchmarks each pipeline stage in isolation at 10K / 100K / 1M scale:
+- ParquetLoader / CSVLoader (load + materialize)
+- validate_bundle_values
+- FXConverter (exposures and collateral)
+- HaircutCalculator
+- CRMProcessor (provisions, collateral, guarantees, full CRM)
+- OutputAggregator
+- ResultFormatter
+
+All upstream inputs are materialized once per scale, so each benchmark
+measures only its own stage. Every benchmark records wall time (via
+pytest-benchmark) plus the process peak RSS and row count in extra_info.
+The baseline gates time only; per-stage memory is measured in
+subprocesses by test_memory_benchmark.py.
+
+Usage:
+    # Run all stage benchmarks at 10K and 100K, writing a JSON report
+    uv run pytest tests/benchmarks/test_stage_benchmark.py --benchmark-only \\
+        -m "not slow" --benchmark-json=stage_benchmarks.json
+
+    # Compare against the checked-in baseline (exit code 1 on regression)
+    uv run python -m tests.benchmarks.baseline compare stage_benchmarks.json
+
+    # Update the checked-in baseline after an intentional change
+    uv run python -m tests.benchmarks.baseline update stage_benchmarks.json
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from pathlib import Path
+from typing import Literal
+
+import polars as pl
+import pytest
+from tests.benchmarks.data_generators import create_raw_data_bundle, materialize
+
+from rwa_calc.contracts.bundles import (
+    AggregatedResultBundle,
+    ClassifiedExposuresBundle,
+    CRMAdjustedBundle,
+    EquityResultBundle,
+    IRBResultBundle,
+    RawDataBundle,
+    ResolvedHierarchyBundle,
+    SAResultBundle,
+    SlottingResultBundle,
+)
+from rwa_calc.contracts.config import CalculationConfig, IRBPermissions
+from rwa_calc.data.schemas import LENDING_MAPPING_SCHEMA
+from rwa_calc.engine.loader import CSVLoader, DataSourceConfig, ParquetLoader
+
+# Default reporting date for benchmarks
+BENCHMARK_REPORTING_DATE = date(2026, 1, 1)
+
+# Default engine for benchmarks - streaming for memory efficiency
+BENCHMARK_ENGINE: Literal["cpu", "gpu", "streaming"] = "streaming"
+
+# Scale -> dataset fixture name
+SCALES = [
+    pytest.param("10k", marks=pytest.mark.scale_10k, id="10k"),
+    pytest.param("100k", marks=pytest.mark.scale_100k, id="100k"),
+    pytest.param("1m", marks=[pytest.mark.scale_1m, pytest.mark.slow], id="1m"),
+]
+
+
+# =============================================================================
+# STAGE INPUTS
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class StageInputs:
+    """Materialized inputs for every stage at one scale."""
+
+    config: CalculationConfig
+    raw: RawDataBundle
+    resolved: ResolvedHierarchyBundle
+    classified: ClassifiedExposuresBundle
+    pre_collateral: pl.LazyFrame
+    post_collateral: pl.LazyFrame
+    crm_adjusted: CRMAdjustedBundle
+    sa_bundle: SAResultBundle
+    irb_bundle: IRBResultBundle
+    slotting_bundle: SlottingResultBundle | None
+    equity_bundle: EquityResultBundle | None
+    aggregated: AggregatedResultBundle
+    source_dir: Path
+
+    @property
+    def n_exposures(self) -> int:
+        return self.resolved.exposures.select(pl.len()).collect().item()
+
+
+def _source_config(ext: str) -> DataSourceConfig:
+    """DataSourceConfig for the flat benchmark file layout."""
+    return DataSourceConfig(
+        counterparty_files=[f"counterparties.{ext}"],
+        facilities_file=f"facilities.{ext}",
+        loans_file=f"loans.{ext}",
+        contingents_file=f"contingents.{ext}",
+        collateral_file=f"collateral.{ext}",
+        guarantees_file=f"guarantees.{ext}",
+        provisions_file=f"provisions.{ext}",
+        ratings_file=f"ratings.{ext}",
+        facility_mappings_file=f"facility_mappings.{ext}",
+        org_mappings_file=f"org_mappings.{ext}",
+        lending_mappings_file=f"lending_mappings.{ext}",
+        specialised_lending_file=None,
+        fx_rates_file=f"fx_rates.{ext}",
+    )
+
+
+def _write_sources(dataset: dict[str, pl.LazyFrame], target: Path) -> Path:
+    """Write the dataset as Parquet and CSV files for loader benchmarks."""
+    target.mkdir(parents=True, exist_ok=True)
+    frames = dict(dataset)
+    frames["lending_mappings"] = pl.LazyFrame(schema=LENDING_MAPPING_SCHEMA)
+    for name, lf in frames.items():
+        df = lf.collect()
+        df.write_parquet(target / f"{name}.parquet")
+        df.write_csv(target / f"{name}.csv")
+    return target
+
+
+def build_stage_inputs(dataset: dict[str, pl.LazyFrame], source_dir: Path) -> StageInputs:
+    """Run the pipeline once, materializing the input of every stage."""
+    from rwa_calc.engine.aggregator import OutputAggregator
+    from rwa_calc.engine.classifier import ExposureClassifier
+    from rwa_calc.engine.crm.processor import CRMProcessor
+    from rwa_calc.engine.equity.calculator import EquityCalculator
+    from rwa_calc.engine.hierarchy import HierarchyResolver
+    from rwa_calc.engine.irb.calculator import IRBCalculator
+    from rwa_calc.engine.sa.calculator import SACalculator
+    from rwa_calc.engine.slotting.calculator import SlottingCalculator
+
+    config = CalculationConfig.crr(
+        BENCHMARK_REPORTING_DATE,
+        irb_permissions=IRBPermissions.full_irb(),
+    )
+    raw = materialize(create_raw_data_bundle(dataset))
+    resolved = materialize(HierarchyResolver().resolve(raw, config))
+    classified = materialize(ExposureClassifier().classify(resolved, config))
+
+    crm = CRMProcessor()
+    exposures = crm.resolve_provisions(classified.all_exposures, classified.provisions, config)
+    pre_collateral = materialize(crm._initialize_ead(crm._apply_ccf(exposures, config)))
+    post_collateral = materialize(crm.apply_collateral(pre_collateral, classified.collateral, config))
+    crm_adjusted = materialize(crm.get_crm_adjusted_bundle(classified, config))
+
+    sa_bundle = materialize(SACalculator().get_sa_result_bundle(crm_adjusted, config))
+    irb_bundle = materialize(IRBCalculator().get_irb_result_bundle(crm_adjusted, config))
+    slotting_bundle = materialize(SlottingCalculator().get_slotting_result_bundle(crm_adjusted, config))
+    equity_bundle = materialize(EquityCalculator().get_equity_result_bundle(crm_adjusted, config))
+    aggregated = materialize(OutputAggregator().aggregate_with_audit(
+        sa_bundle, irb_bundle, slotting_bundle, config, equity_bundle=equity_bundle,
+    ))
+
+    return StageInputs(
+        config=config,
+        raw=raw,
+        resolved=resolved,
+        classified=classified,
+        pre_collateral=pre_collateral,
+        post_collateral=post_collateral,
+        crm_adjusted=crm_adjusted,
+        sa_bundle=sa_bundle,
+        irb_bundle=irb_bundle,
+        slotting_bundle=slotting_bundle,
+        equity_bundle=equity_bundle,
+        aggregated=aggregated,
+        source_dir=_write_sources(dataset, source_dir),
+    )
+
+
+@pytest.fixture(scope="session", params=SCALES)
+def stage_inputs(request, tmp_path_factory) -> StageInputs:
+    """Materialized stage inputs, parametrized over benchmark scales."""
+    scale = request.param
+    dataset = request.getfixturevalue(f"dataset_{scale}")
+    return build_stage_inputs(dataset, tmp_path_factory.mktemp(f"stage_sources_{scale}"))
+
+
+# =============================================================================
+# LOADER AND VALIDATION BENCHMARKS
+# =============================================================================
+
+
+@pytest.mark.benchmark
+class TestLoaderBenchmarks:
+    """Loader benchmarks: scan, schema enforcement and materialization."""
+
+    def test_parquet_loader(self, stage_benchmark, stage_inputs: StageInputs):
+        loader = ParquetLoader(stage_inputs.source_dir, config=_source_config("parquet"))
+
+        def load():
+            return _collect_raw_bundle(loader.load())
+
+        frames = stage_benchmark(load, rows=stage_inputs.n_exposures)
+        assert all(df.height >= 0 for df in frames)
+
+    def test_csv_loader(self, stage_benchmark, stage_inputs: StageInputs):
+        loader = CSVLoader(stage_inputs.source_dir, config=_source_config("csv"))
+
+        def load():
+            return _collect_raw_bundle(loader.load())
+
+        frames = stage_benchmark(load, rows=stage_inputs.n_exposures)
+        assert all(df.height >= 0 for df in frames)
+
+    def test_validate_bundle_values(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.contracts.validation import validate_bundle_values
+
+        errors = stage_benchmark(
+            lambda: validate_bundle_values(stage_inputs.raw),
+            rows=stage_inputs.n_exposures,
+        )
+        assert isinstance(errors, list)
+
+
+def _collect_raw_bundle(bundle: RawDataBundle) -> list[pl.DataFrame]:
+    """Materialize every frame of a RawDataBundle in one pass."""
+    frames = [
+        getattr(bundle, f.name)
+        for f in fields(bundle)
+        if isinstance(getattr(bundle, f.name), pl.LazyFrame)
+    ]
+    return pl.collect_all(frames, engine=BENCHMARK_ENGINE)
+
+
+# =============================================================================
+# FX AND CRM BENCHMARKS
+# =============================================================================
+
+
+@pytest.mark.benchmark
+class TestFXConverterBenchmarks:
+    """FXConverter benchmarks."""
+
+    def test_convert_exposures(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.engine.fx_converter import FXConverter
+
+        converter = FXConverter()
+
+        def convert():
+            return converter.convert_exposures(
+                stage_inputs.resolved.exposures, stage_inputs.raw.fx_rates, stage_inputs.config,
+            ).collect(engine=BENCHMARK_ENGINE)
+
+        result = stage_benchmark(convert, rows=stage_inputs.n_exposures)
+        assert "fx_rate_applied" in result.columns
+
+    def test_convert_collateral(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.engine.fx_converter import FXConverter
+
+        converter = FXConverter()
+
+        def convert():
+            return converter.convert_collateral(
+                stage_inputs.raw.collateral, stage_inputs.raw.fx_rates, stage_inputs.config,
+            ).collect(engine=BENCHMARK_ENGINE)
+
+        result = stage_benchmark(convert, rows=stage_inputs.n_exposures)
+        assert result.height > 0
+
+
+@pytest.mark.benchmark
+class TestCRMBenchmarks:
+    """CRMProcessor and HaircutCalculator benchmarks."""
+
+    def test_haircuts(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.engine.crm.haircuts import HaircutCalculator
+
+        calculator = HaircutCalculator()
+
+        def apply():
+            return calculator.apply_haircuts(
+                stage_inputs.classified.collateral, stage_inputs.pre_collateral, stage_inputs.config,
+            ).collect(engine=BENCHMARK_ENGINE)
+
+        result = stage_benchmark(apply, rows=stage_inputs.n_exposures)
+        assert result.height > 0
+
+    def test_provisions(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.engine.crm.processor import CRMProcessor
+
+        crm = CRMProcessor()
+
+        def apply():
+            return crm.resolve_provisions(
+                stage_inputs.classified.all_exposures,
+                stage_inputs.classified.provisions,
+                stage_inputs.config,
+            ).collect(engine=BENCHMARK_ENGINE)
+
+        result = stage_benchmark(apply, rows=stage_inputs.n_exposures)
+        assert result.height == stage_inputs.n_exposures
+
+    def test_collateral(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.engine.crm.processor import CRMProcessor
+
+        crm = CRMProcessor()
+
+        def apply():
+            return crm.apply_collateral(
+                stage_inputs.pre_collateral, stage_inputs.classified.collateral, stage_inputs.config,
+            ).collect(engine=BENCHMARK_ENGINE)
+
+        result = stage_benchmark(apply, rows=stage_inputs.n_exposures)
+        assert result.height == stage_inputs.n_exposures
+
+    def test_guarantees(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.engine.crm.processor import CRMProcessor
+
+        crm = CRMProcessor()
+        lookup = stage_inputs.classified.counterparty_lookup
+
+        def apply():
+            return crm.apply_guarantees(
+                stage_inputs.post_collateral,
+                stage_inputs.classified.guarantees,
+                lookup.counterparties,
+                stage_inputs.config,
+                lookup.rating_inheritance,
+            ).collect(engine=BENCHMARK_ENGINE)
+
+        result = stage_benchmark(apply, rows=stage_inputs.n_exposures)
+        assert result.height >= stage_inputs.n_exposures
+
+    def test_full_crm(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.engine.crm.processor import CRMProcessor
+
+        crm = CRMProcessor()
+
+        def apply():
+            bundle = crm.get_crm_adjusted_bundle(stage_inputs.classified, stage_inputs.config)
+            return bundle.exposures.collect(engine=BENCHMARK_ENGINE)
+
+        result = stage_benchmark(apply, rows=stage_inputs.n_exposures)
+        assert result.height >= stage_inputs.n_exposures
+
+
+# =============================================================================
+# AGGREGATION AND OUTPUT BENCHMARKS
+# =============================================================================
+
+
+@pytest.mark.benchmark
+class TestOutputBenchmarks:
+    """OutputAggregator and ResultFormatter benchmarks."""
+
+    def test_aggregator(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.api.formatters import materialize_bundle
+        from rwa_calc.engine.aggregator import OutputAggregator
+
+        aggregator = OutputAggregator()
+
+        def aggregate():
+            bundle = aggregator.aggregate_with_audit(
+                stage_inputs.sa_bundle,
+                stage_inputs.irb_bundle,
+                stage_inputs.slotting_bundle,
+                stage_inputs.config,
+                equity_bundle=stage_inputs.equity_bundle,
+            )
+            return materialize_bundle(bundle)
+
+        outputs = stage_benchmark(aggregate, rows=stage_inputs.n_exposures)
+        assert outputs["results"].height > 0
+
+    def test_result_formatter(self, stage_benchmark, stage_inputs: StageInputs):
+        from rwa_calc.api.formatters import ResultFormatter
+
+        formatter = ResultFormatter()
+
+        def format_response():
+            return formatter.format_response(
+                bundle=stage_inputs.aggregated,
+                framework="CRR",
+                reporting_date=BENCHMARK_REPORTING_DATE,
+                started_at=datetime.now(),
+            )
+
+        response = stage_benchmark(format_response, rows=stage_inputs.n_exposures)
+        assert response.success
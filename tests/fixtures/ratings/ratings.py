@@ -63,7 +63,7 @@ class Rating:
         }
 
 
-RATING_DATE = date(2026, 1, 1)
+RATING_DATE = date(2024, 1, 1)
 
 
 def create_ratings() -> pl.DataFrame:
@@ -251,7 +251,7 @@ def _firb_scenario_internal_ratings() -> list[Rating]:
         CRR-B7: Long maturity (0.80%)
     """
     # Use a date one day after standard rating date so FIRB ratings take precedence
-    firb_rating_date = date(2026, 1, 2)
+    firb_rating_date = date(2024, 1, 2)
 
     return [
         # CRR-B1: Corporate F-IRB - Low PD (0.10%)
@@ -312,7 +312,7 @@ def _airb_scenario_internal_ratings() -> list[Rating]:
         CRR-C3: Specialised Lending A-IRB - PD 1.50%
     """
     # Use same date as FIRB ratings for consistency
-    airb_rating_date = date(2026, 1, 2)
+    airb_rating_date = date(2024, 1, 2)
 
     return [
         # CRR-C1: Corporate A-IRB - PD 1.00%
@@ -349,7 +349,7 @@ def _provision_scenario_internal_ratings() -> list[Rating]:
         CRR-G3: EL Excess - PD 0.50% (provisions > EL)
     """
     # Use same date as FIRB ratings for consistency
-    provision_rating_date = date(2026, 1, 2)
+    provision_rating_date = date(2024, 1, 2)
 
     return [
         # CRR-G2: IRB EL Shortfall - PD 2.00%
@@ -15,12 +15,14 @@ import polars as pl
 import pytest
 
 from rwa_calc.api.formatters import (
+    BUNDLE_OUTPUTS,
     ResultFormatter,
+    collect_named,
     compute_summary,
     materialize_bundle,
 )
 from rwa_calc.api.models import CalculationResponse, SummaryStatistics
-from rwa_calc.contracts.bundles import AggregatedResultBundle
+from rwa_calc.contracts.bundles import AggregatedResultBundle, PerimeterResultBundle
 from rwa_calc.contracts.errors import CalculationError
 from rwa_calc.domain.enums import ErrorCategory, ErrorSeverity
 
@@ -30,6 +32,27 @@ from rwa_calc.domain.enums import ErrorCategory, ErrorSeverity
 # =============================================================================
 
 
+def _perimeter_results() -> PerimeterResultBundle:
+    """Per-perimeter summaries for a solo and a consolidated perimeter."""
+    return PerimeterResultBundle(
+        summary_by_class=pl.LazyFrame({
+            "perimeter_id": ["SOLO_A", "GROUP"],
+            "exposure_class": ["corporate", "corporate"],
+            "total_rwa": [100.0, 150.0],
+        }),
+        summary_by_approach=pl.LazyFrame({
+            "perimeter_id": ["SOLO_A", "GROUP"],
+            "approach_applied": ["SA", "SA"],
+            "total_rwa": [100.0, 150.0],
+        }),
+        lending_groups=pl.LazyFrame({
+            "perimeter_id": ["GROUP"],
+            "lending_group_reference": ["LG001"],
+            "total_exposure": [50.0],
+        }),
+    )
+
+
 @pytest.fixture
 def sample_result_bundle() -> AggregatedResultBundle:
     """Create a sample AggregatedResultBundle for testing."""
@@ -193,6 +216,43 @@ class TestResultFormatterFormatResponse:
         assert response.summary_by_class is not None
         assert isinstance(response.summary_by_class, pl.DataFrame)
 
+    def test_materializes_perimeter_results(
+        self, sample_result_bundle: AggregatedResultBundle
+    ) -> None:
+        """Should materialize per-perimeter summaries when present."""
+        bundle = AggregatedResultBundle(
+            results=sample_result_bundle.results,
+            perimeter_results=_perimeter_results(),
+        )
+        formatter = ResultFormatter()
+        response = formatter.format_response(
+            bundle=bundle,
+            framework="CRR",
+            reporting_date=date(2024, 12, 31),
+            started_at=datetime.now(),
+        )
+
+        assert response.perimeter_summary_by_class is not None
+        assert response.perimeter_summary_by_class.height == 2
+        assert response.perimeter_summary_by_approach is not None
+        assert response.perimeter_lending_groups is not None
+        assert response.perimeter_floor_impact is None
+
+    def test_no_perimeter_results(
+        self, sample_result_bundle: AggregatedResultBundle
+    ) -> None:
+        """Perimeter fields should be None when no perimeters were supplied."""
+        formatter = ResultFormatter()
+        response = formatter.format_response(
+            bundle=sample_result_bundle,
+            framework="CRR",
+            reporting_date=date(2024, 12, 31),
+            started_at=datetime.now(),
+        )
+
+        assert response.perimeter_summary_by_class is None
+        assert response.perimeter_lending_groups is None
+
     def test_converts_errors(self, error_result_bundle: AggregatedResultBundle) -> None:
         """Should convert CalculationErrors to APIErrors."""
         formatter = ResultFormatter()
@@ -290,6 +350,32 @@ class TestResultFormatterComputeSummary:
         assert response.summary.total_rwa_irb == Decimal("375000")
 
 
+    def test_floor_impact_from_aggregator_columns(
+        self, sample_result_bundle: AggregatedResultBundle
+    ) -> None:
+        """Should summarise floor impact using the aggregator's column names."""
+        from dataclasses import replace
+
+        bundle = replace(
+            sample_result_bundle,
+            floor_impact=pl.LazyFrame({
+                "exposure_reference": ["EXP003"],
+                "is_floor_binding": [True],
+                "floor_impact_rwa": [25000.0],
+            }),
+        )
+
+        response = ResultFormatter().format_response(
+            bundle=bundle,
+            framework="BASEL_3_1",
+            reporting_date=date(2027, 12, 31),
+            started_at=datetime.now(),
+        )
+
+        assert response.summary.floor_applied is True
+        assert response.summary.floor_impact == Decimal("25000")
+
+
 class TestResultFormatterFindColumn:
     """Tests for ResultFormatter._find_column method."""
 
@@ -375,3 +461,103 @@ class TestMaterializeBundle:
         assert "results" in result
         # Optional frames that are None won't be in result
         assert result.get("sa_results") is None or "sa_results" not in result
+
+    def test_selected_outputs_only(
+        self, sample_result_bundle: AggregatedResultBundle
+    ) -> None:
+        """Should materialize only the requested outputs."""
+        result = materialize_bundle(sample_result_bundle, outputs=["summary_by_class"])
+
+        assert list(result) == ["summary_by_class"]
+
+    def test_unknown_output_raises(
+        self, sample_result_bundle: AggregatedResultBundle
+    ) -> None:
+        """Should reject output names that are not bundle outputs."""
+        with pytest.raises(ValueError, match="not_a_frame"):
+            materialize_bundle(sample_result_bundle, outputs=["not_a_frame"])
+
+    def test_covers_reporting_outputs(self) -> None:
+        """Should include pre/post-CRM and supporting factor outputs."""
+        frame = pl.LazyFrame({"exposure_reference": ["EXP001"]})
+        bundle = AggregatedResultBundle(
+            results=frame,
+            pre_crm_summary=frame,
+            post_crm_detailed=frame,
+            post_crm_summary=frame,
+            supporting_factor_impact=frame,
+        )
+
+        result = materialize_bundle(bundle)
+
+        for name in ("pre_crm_summary", "post_crm_detailed", "post_crm_summary",
+                     "supporting_factor_impact"):
+            assert result[name].height == 1
+        assert set(result) <= set(BUNDLE_OUTPUTS)
+
+    def test_covers_perimeter_outputs(self) -> None:
+        """Should flatten nested perimeter summaries into perimeter_* outputs."""
+        bundle = AggregatedResultBundle(
+            results=pl.LazyFrame({"exposure_reference": ["EXP001"]}),
+            perimeter_results=_perimeter_results(),
+        )
+
+        result = materialize_bundle(bundle)
+
+        assert result["perimeter_summary_by_class"].height == 2
+        assert result["perimeter_summary_by_approach"].height == 2
+        assert result["perimeter_lending_groups"].height == 1
+        assert "perimeter_floor_impact" not in result
+
+    def test_perimeter_outputs_omitted_without_perimeters(
+        self, sample_result_bundle: AggregatedResultBundle
+    ) -> None:
+        """Perimeter outputs should be skipped when the bundle has none."""
+        result = materialize_bundle(sample_result_bundle)
+
+        assert not any(name.startswith("perimeter_") for name in result)
+
+    def test_shared_plan_executed_once(self) -> None:
+        """Outputs sharing a common sub-plan should run it only once."""
+        calls = {"count": 0}
+
+        def _count(df: pl.DataFrame) -> pl.DataFrame:
+            calls["count"] += 1
+            return df
+
+        shared = pl.LazyFrame({
+            "exposure_reference": ["EXP001", "EXP002"],
+            "exposure_class": ["corporate", "retail"],
+            "rwa_final": [100.0, 50.0],
+        }).map_batches(_count)
+
+        bundle = AggregatedResultBundle(
+            results=shared,
+            summary_by_class=shared.group_by("exposure_class").agg(pl.col("rwa_final").sum()),
+            summary_by_approach=shared.select(pl.col("rwa_final").sum()),
+        )
+
+        materialize_bundle(bundle)
+
+        assert calls["count"] == 1
+
+
+class TestCollectNamed:
+    """Tests for collect_named helper."""
+
+    def test_skips_none_frames(self) -> None:
+        """None entries should stay None."""
+        result = collect_named({"a": pl.LazyFrame({"x": [1]}), "b": None})
+
+        assert result["a"].height == 1
+        assert result["b"] is None
+
+    def test_isolates_failing_frame(self) -> None:
+        """A failing frame should not lose the other outputs."""
+        good = pl.LazyFrame({"x": [1, 2]})
+        bad = pl.LazyFrame({"x": [1]}).select(pl.col("missing"))
+
+        result = collect_named({"good": good, "bad": bad})
+
+        assert result["good"].height == 2
+        assert result["bad"] is None
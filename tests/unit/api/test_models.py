@@ -61,6 +61,7 @@ class TestCalculationRequest:
         assert request.enable_irb is False
         assert request.data_format == "parquet"
         assert request.eur_gbp_rate == Decimal("0.8732")
+        assert request.materialize_results is True
 
     def test_path_property_returns_path_object(self) -> None:
         """Path property should return Path object."""
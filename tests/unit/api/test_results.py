@@ -0,0 +1,229 @@
+"""Unit tests for the API lazy results module.
+
+Tests cover:
+- LazyResults column projection and schema access
+- Paging and batch iteration
+- Streaming writes to disk
+- Projection pushdown and opt-in caching
+- CalculationResponse.scan_results for lazy and materialized responses
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from rwa_calc.api.formatters import ResultFormatter
+from rwa_calc.api.results import LazyResults
+from rwa_calc.contracts.bundles import AggregatedResultBundle
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def results_frame() -> pl.LazyFrame:
+    """Create a results LazyFrame with 25 rows."""
+    n = 25
+    return pl.LazyFrame({
+        "exposure_reference": [f"EXP{i:03d}" for i in range(n)],
+        "approach_applied": ["SA" if i % 2 == 0 else "FIRB" for i in range(n)],
+        "exposure_class": ["corporate"] * n,
+        "ead_final": [100.0] * n,
+        "risk_weight": [0.5] * n,
+        "rwa_final": [50.0] * n,
+    })
+
+
+@pytest.fixture
+def lazy_bundle(results_frame: pl.LazyFrame) -> AggregatedResultBundle:
+    """Create a bundle around the results frame."""
+    return AggregatedResultBundle(results=results_frame, errors=[])
+
+
+# =============================================================================
+# LazyResults Tests
+# =============================================================================
+
+
+class TestLazyResults:
+    """Tests for LazyResults handle."""
+
+    def test_columns_without_collect(self, results_frame: pl.LazyFrame) -> None:
+        """Should expose schema and columns."""
+        handle = LazyResults(results_frame)
+
+        assert "rwa_final" in handle.columns
+        assert handle.schema["ead_final"] == pl.Float64
+
+    def test_select_projects_columns(self, results_frame: pl.LazyFrame) -> None:
+        """Should restrict results to selected columns."""
+        handle = LazyResults(results_frame).select(["exposure_reference", "rwa_final"])
+
+        assert handle.columns == ["exposure_reference", "rwa_final"]
+        assert handle.collect().width == 2
+
+    def test_count(self, results_frame: pl.LazyFrame) -> None:
+        """Should count rows."""
+        assert LazyResults(results_frame).count() == 25
+
+    def test_page(self, results_frame: pl.LazyFrame) -> None:
+        """Should return the requested slice."""
+        page = LazyResults(results_frame).page(offset=10, limit=5)
+
+        assert page.height == 5
+        assert page["exposure_reference"].to_list() == [f"EXP{i:03d}" for i in range(10, 15)]
+
+    def test_page_past_end(self, results_frame: pl.LazyFrame) -> None:
+        """Should return a short page at the end of the results."""
+        assert LazyResults(results_frame).page(offset=20, limit=10).height == 5
+
+    def test_page_rejects_negative_offset(self, results_frame: pl.LazyFrame) -> None:
+        """Should reject negative offsets."""
+        with pytest.raises(ValueError):
+            LazyResults(results_frame).page(offset=-1, limit=5)
+
+    def test_iter_batches_covers_all_rows(self, results_frame: pl.LazyFrame) -> None:
+        """Should yield bounded batches covering every row in order."""
+        batches = list(LazyResults(results_frame).iter_batches(batch_size=10))
+
+        assert all(b.height <= 10 for b in batches)
+        combined = pl.concat(batches)
+        assert combined.height == 25
+        assert combined["exposure_reference"].to_list() == [f"EXP{i:03d}" for i in range(25)]
+
+    def test_iter_batches_rejects_zero(self, results_frame: pl.LazyFrame) -> None:
+        """Should reject non-positive batch sizes."""
+        with pytest.raises(ValueError):
+            next(LazyResults(results_frame).iter_batches(batch_size=0))
+
+    @pytest.mark.parametrize("fmt,reader", [
+        ("parquet", pl.read_parquet),
+        ("csv", pl.read_csv),
+        ("ipc", pl.read_ipc),
+    ])
+    def test_write_to(
+        self, results_frame: pl.LazyFrame, tmp_path: Path, fmt: str, reader
+    ) -> None:
+        """Should stream results to disk in the requested format."""
+        target = LazyResults(results_frame).write_to(tmp_path / f"out.{fmt}", format=fmt)
+
+        assert target.exists()
+        assert reader(target).height == 25
+
+    def test_write_to_unknown_format(self, results_frame: pl.LazyFrame, tmp_path: Path) -> None:
+        """Should reject unknown formats."""
+        with pytest.raises(ValueError):
+            LazyResults(results_frame).write_to(tmp_path / "out.json", format="json")
+
+    def test_select_pushes_projection_to_scan(
+        self, results_frame: pl.LazyFrame, tmp_path: Path
+    ) -> None:
+        """Projected pages should read only the selected columns and rows."""
+        path = tmp_path / "results.parquet"
+        results_frame.sink_parquet(path)
+
+        handle = LazyResults(pl.scan_parquet(path)).select(["exposure_reference"])
+        plan = handle.lazy().slice(5, 5).explain()
+
+        assert "PROJECT 1/6 COLUMNS" in plan
+        assert handle.page(offset=5, limit=5)["exposure_reference"].to_list() == [
+            f"EXP{i:03d}" for i in range(5, 10)
+        ]
+
+    def test_nothing_cached_by_default(self, results_frame: pl.LazyFrame) -> None:
+        """Every access should run the query unless cache() was called."""
+        runs = []
+
+        def record(df: pl.DataFrame) -> pl.DataFrame:
+            runs.append(df.height)
+            return df
+
+        handle = LazyResults(results_frame.map_batches(record), engine="cpu")
+        handle.count()
+        handle.page(offset=0, limit=5)
+
+        assert not handle.is_cached
+        assert len(runs) == 2
+
+    def test_cache_runs_query_once(self, results_frame: pl.LazyFrame, tmp_path: Path) -> None:
+        """After cache(), pages, counts, projections and writes share one collect."""
+        runs = []
+
+        def record(df: pl.DataFrame) -> pl.DataFrame:
+            runs.append(df.height)
+            return df
+
+        handle = LazyResults(results_frame.map_batches(record), engine="cpu").cache()
+
+        assert handle.is_cached
+        assert handle.page(offset=0, limit=5).height == 5
+        assert handle.count() == 25
+        assert handle.select(["exposure_reference"]).page(offset=5, limit=5).width == 1
+        list(handle.iter_batches(batch_size=10))
+        handle.write_to(tmp_path / "out.parquet")
+
+        assert len(runs) == 1
+
+
+# =============================================================================
+# Lazy Response Tests
+# =============================================================================
+
+
+class TestLazyResponse:
+    """Tests for responses built without materializing results."""
+
+    def test_lazy_response_keeps_handle(self, lazy_bundle: AggregatedResultBundle) -> None:
+        """Should keep a lazy handle and an empty, schema-only results frame."""
+        response = ResultFormatter().format_response(
+            bundle=lazy_bundle,
+            framework="CRR",
+            reporting_date=date(2024, 12, 31),
+            started_at=datetime.now(),
+            materialize_results=False,
+        )
+
+        assert response.is_lazy
+        assert response.results.height == 0
+        assert "rwa_final" in response.results.columns
+        assert response.scan_results().count() == 25
+
+    def test_lazy_summary_matches_eager(self, lazy_bundle: AggregatedResultBundle) -> None:
+        """Streaming summary should match the materialized summary."""
+        formatter = ResultFormatter()
+        kwargs = {
+            "bundle": lazy_bundle,
+            "framework": "CRR",
+            "reporting_date": date(2024, 12, 31),
+            "started_at": datetime.now(),
+        }
+
+        eager = formatter.format_response(**kwargs)
+        lazy = formatter.format_response(**kwargs, materialize_results=False)
+
+        assert lazy.success is True
+        assert lazy.summary == eager.summary
+        assert lazy.summary.total_rwa == Decimal("1250")
+        assert lazy.summary.total_rwa_sa == Decimal("650")
+        assert lazy.summary.total_rwa_irb == Decimal("600")
+        assert lazy.performance.exposure_count == 25
+
+    def test_scan_results_on_materialized_response(
+        self, lazy_bundle: AggregatedResultBundle
+    ) -> None:
+        """Materialized responses should also offer a lazy view."""
+        response = ResultFormatter().format_response(
+            bundle=lazy_bundle,
+            framework="CRR",
+            reporting_date=date(2024, 12, 31),
+            started_at=datetime.now(),
+        )
+
+        assert not response.is_lazy
+        assert response.scan_results().page(offset=0, limit=3).height == 3
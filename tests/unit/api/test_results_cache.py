@@ -0,0 +1,197 @@
+"""Unit tests for the API results cache module.
+
+Tests cover:
+- Writing results as Arrow IPC plus the aggregate cube sidecar
+- Filter options, totals and summaries served from the cube
+- Risk weight range filters falling back to a pushed-down scan
+- Paged and on-demand exports
+- Reading a legacy Parquet cache
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from rwa_calc.api.formatters import ResultFormatter
+from rwa_calc.api.models import CalculationResponse
+from rwa_calc.api.results_cache import (
+    CUBE_FILE,
+    LEGACY_CSV_FILE,
+    LEGACY_RESULTS_FILE,
+    RESULTS_FILE,
+    ResultsCache,
+    ResultsFilter,
+)
+from rwa_calc.contracts.bundles import AggregatedResultBundle
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def results_frame() -> pl.LazyFrame:
+    """Create 20 results across two classes, two approaches and two RW bands."""
+    n = 20
+    return pl.LazyFrame({
+        "exposure_reference": [f"EXP{i:03d}" for i in range(n)],
+        "exposure_class": ["corporate" if i < 12 else "institution" for i in range(n)],
+        "approach_applied": ["SA" if i % 2 == 0 else "FIRB" for i in range(n)],
+        "ead_final": [100.0] * n,
+        "risk_weight": [1.0 if i % 4 < 2 else 0.2 for i in range(n)],
+        "rwa_final": [100.0 if i % 4 < 2 else 20.0 for i in range(n)],
+    })
+
+
+@pytest.fixture
+def response(results_frame: pl.LazyFrame) -> CalculationResponse:
+    """Lazy calculation response around the results frame."""
+    return ResultFormatter().format_response(
+        bundle=AggregatedResultBundle(results=results_frame, errors=[]),
+        framework="CRR",
+        reporting_date=date(2024, 12, 31),
+        started_at=datetime.now(),
+        materialize_results=False,
+    )
+
+
+@pytest.fixture
+def cache(response: CalculationResponse, tmp_path: Path) -> ResultsCache:
+    """Cache populated from the response."""
+    cache = ResultsCache(tmp_path)
+    cache.write(response)
+    return cache
+
+
+# =============================================================================
+# Write Tests
+# =============================================================================
+
+
+class TestResultsCacheWrite:
+    """Tests for ResultsCache.write."""
+
+    def test_writes_ipc_cube_and_metadata(self, cache: ResultsCache, tmp_path: Path) -> None:
+        assert (tmp_path / RESULTS_FILE).exists()
+        assert (tmp_path / CUBE_FILE).exists()
+        assert cache.metadata()["exposure_count"] == 20
+        assert cache.scan().select(pl.len()).collect().item() == 20
+
+    def test_no_csv_written_and_stale_files_removed(
+        self, response: CalculationResponse, tmp_path: Path
+    ) -> None:
+        (tmp_path / LEGACY_CSV_FILE).write_text("stale")
+        (tmp_path / LEGACY_RESULTS_FILE).write_bytes(b"stale")
+
+        ResultsCache(tmp_path).write(response)
+
+        assert not (tmp_path / LEGACY_CSV_FILE).exists()
+        assert not (tmp_path / LEGACY_RESULTS_FILE).exists()
+
+    def test_cube_is_small(self, cache: ResultsCache) -> None:
+        # 2 classes x 2 approaches x 2 bands
+        assert cache.cube().height == 8
+        assert cache.cube()["exposure_count"].sum() == 20
+
+
+# =============================================================================
+# Read Tests
+# =============================================================================
+
+
+class TestResultsCacheRead:
+    """Tests for filter options, totals, summaries and pages."""
+
+    def test_filter_options(self, cache: ResultsCache) -> None:
+        assert cache.filter_options("exposure_class") == ["corporate", "institution"]
+        assert cache.filter_options("approach_applied") == ["FIRB", "SA"]
+        assert cache.filter_options("rw_band") == ["0-20%", "75-100%"]
+        assert cache.filter_options("missing") == []
+
+    def test_totals_from_cube_do_not_scan(
+        self, cache: ResultsCache, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cache.cube()
+
+        def fail_scan():
+            raise AssertionError("cube-answerable query scanned the results file")
+
+        monkeypatch.setattr(cache, "scan", fail_scan)
+        totals = cache.totals(ResultsFilter(exposure_class="corporate", approach="SA"))
+
+        assert totals["exposure_count"] == 6
+        assert totals["total_ead"] == pytest.approx(600.0)
+
+    def test_risk_weight_range_matches_row_level_filter(
+        self, cache: ResultsCache, results_frame: pl.LazyFrame
+    ) -> None:
+        flt = ResultsFilter(exposure_class="corporate", rw_min=0.5, rw_max=5.0)
+        expected = results_frame.filter(
+            (pl.col("exposure_class") == "corporate") & (pl.col("risk_weight") >= 0.5)
+        ).collect()
+
+        totals = cache.totals(flt)
+
+        assert totals["exposure_count"] == expected.height
+        assert totals["total_rwa"] == pytest.approx(expected["rwa_final"].sum())
+        assert totals["avg_risk_weight"] == pytest.approx(1.0)
+
+    def test_summary_by_dimension(self, cache: ResultsCache) -> None:
+        by_band = cache.summary("rw_band")
+        by_class = cache.summary("exposure_class", ResultsFilter(approach="FIRB"))
+
+        assert by_band["rw_band"].to_list() == ["0-20%", "75-100%"]
+        assert by_band["count"].to_list() == [10, 10]
+        assert by_class["count"].sum() == 10
+        assert set(by_class.columns) == {
+            "exposure_class", "total_ead", "total_rwa", "count", "avg_risk_weight",
+        }
+
+    def test_page_projects_and_filters(self, cache: ResultsCache) -> None:
+        page = cache.page(
+            ResultsFilter(exposure_class="institution"),
+            columns=["exposure_reference", "rwa_final"],
+            offset=2,
+            limit=3,
+        )
+
+        assert page.columns == ["exposure_reference", "rwa_final"]
+        assert page["exposure_reference"].to_list() == ["EXP014", "EXP015", "EXP016"]
+
+    def test_exports_on_demand(self, cache: ResultsCache, tmp_path: Path) -> None:
+        flt = ResultsFilter(approach="SA")
+
+        csv_path = cache.write_csv(tmp_path / "export" / "sa.csv", flt)
+        parquet_bytes = cache.to_bytes(flt, format="parquet")
+
+        assert pl.read_csv(csv_path).height == 10
+        assert pl.read_parquet(parquet_bytes).height == 10
+
+    def test_legacy_parquet_cache(self, results_frame: pl.LazyFrame, tmp_path: Path) -> None:
+        results_frame.collect().write_parquet(tmp_path / LEGACY_RESULTS_FILE)
+        cache = ResultsCache(tmp_path)
+
+        assert cache.exists()
+        assert cache.totals()["exposure_count"] == 20
+        assert cache.filter_options("approach_applied") == ["FIRB", "SA"]
+
+    def test_null_risk_weights_excluded(self, tmp_path: Path) -> None:
+        """Rows without a risk weight stay out of totals, summaries and pages."""
+        results = pl.DataFrame({
+            "exposure_reference": ["EXP001", "EXP002", "EXP003"],
+            "exposure_class": ["corporate"] * 3,
+            "ead_final": [100.0, 100.0, 100.0],
+            "risk_weight": [1.0, None, 0.2],
+            "rwa_final": [100.0, 0.0, 20.0],
+        })
+        results.write_parquet(tmp_path / LEGACY_RESULTS_FILE)
+        cache = ResultsCache(tmp_path)
+
+        assert cache.totals()["exposure_count"] == 2
+        assert cache.totals(ResultsFilter(rw_max=5.0))["exposure_count"] == 2
+        assert cache.summary("rw_band")["count"].sum() == 2
+        assert cache.page()["exposure_reference"].to_list() == ["EXP001", "EXP003"]
@@ -0,0 +1,189 @@
+"""Unit tests for the historical results store.
+
+Tests cover:
+- Hive-partitioned layout and the run catalogue
+- Results plan run once per write; concurrent writers keep every entry
+- Audit strings split into their own dataset
+- Run selection: framework, date range, last N dates, latest run per date
+- Exposure history and class totals across runs
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from rwa_calc.api.results_store import (
+    CATALOGUE_DIR,
+    DATA_FILE,
+    ResultsStore,
+    RunSelection,
+)
+from rwa_calc.contracts.bundles import AggregatedResultBundle
+from rwa_calc.domain.enums import RegulatoryFramework
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+MONTH_ENDS = [date(2024, 10, 31), date(2024, 11, 30), date(2024, 12, 31)]
+
+
+def _bundle(scale: float) -> AggregatedResultBundle:
+    """Two exposures with RWA scaled by ``scale``."""
+    return AggregatedResultBundle(
+        results=pl.LazyFrame({
+            "exposure_reference": ["EXP002", "EXP001"],
+            "exposure_class": ["corporate", "institution"],
+            "ead_final": [100.0, 200.0],
+            "rwa_final": [100.0 * scale, 40.0 * scale],
+            "sa_calculation": ["SA: a", "SA: b"],
+        }),
+        summary_by_class=pl.LazyFrame({
+            "exposure_class": ["corporate", "institution"],
+            "total_rwa": [100.0 * scale, 40.0 * scale],
+        }),
+    )
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> ResultsStore:
+    """Store holding three month-end CRR runs."""
+    store = ResultsStore(tmp_path, engine="cpu")
+    for i, reporting_date in enumerate(MONTH_ENDS):
+        store.write(
+            _bundle(1.0 + i),
+            framework=RegulatoryFramework.CRR,
+            reporting_date=reporting_date,
+            run_id=f"run{i}",
+        )
+    return store
+
+
+# =============================================================================
+# Writing Tests
+# =============================================================================
+
+
+class TestWrite:
+    """Tests for ResultsStore.write."""
+
+    def test_partition_layout(self, store: ResultsStore, tmp_path: Path) -> None:
+        """Each dataset is written under framework/reporting_date/run_id partitions."""
+        partition = tmp_path / "results" / "framework=CRR" / "reporting_date=2024-12-31"
+
+        assert (partition / "run_id=run2" / DATA_FILE).exists()
+        assert (tmp_path / CATALOGUE_DIR / "run2.parquet").exists()
+
+    def test_catalogue_totals(self, store: ResultsStore) -> None:
+        """The catalogue records counts and totals per run."""
+        run = store.catalogue().filter(pl.col("run_id") == "run0").row(0, named=True)
+
+        assert run["framework"] == "CRR"
+        assert run["exposure_count"] == 2
+        assert run["total_rwa"] == pytest.approx(140.0)
+        assert set(run["tables"]) == {"results", "summary_by_class", "audit"}
+
+    def test_audit_split(self, store: ResultsStore) -> None:
+        """Audit strings live in the audit dataset, not the results."""
+        selection = RunSelection(run_ids=("run0",))
+
+        assert "sa_calculation" not in store.scan("results", selection).collect_schema()
+        audit = store.scan("audit", selection).collect()
+        assert audit["sa_calculation"].to_list() == ["SA: b", "SA: a"]
+
+    def test_results_sorted(self, store: ResultsStore) -> None:
+        """Row-level files are sorted by exposure_reference."""
+        results = store.scan("results", RunSelection(run_ids=("run0",))).collect()
+
+        assert results["exposure_reference"].to_list() == ["EXP001", "EXP002"]
+
+    def test_results_collected_once(self, tmp_path: Path) -> None:
+        """Results and audit tables share one run of the results plan."""
+        runs: list[int] = []
+
+        def record(df: pl.DataFrame) -> pl.DataFrame:
+            runs.append(df.height)
+            return df
+
+        bundle = _bundle(1.0)
+        bundle = replace(bundle, results=bundle.results.map_batches(record))
+        ResultsStore(tmp_path, engine="cpu").write(
+            bundle, framework="CRR", reporting_date=MONTH_ENDS[0]
+        )
+
+        assert len(runs) == 1
+
+    def test_concurrent_writes(self, tmp_path: Path) -> None:
+        """Runs written at the same time all reach the catalogue."""
+        store = ResultsStore(tmp_path, engine="cpu")
+
+        def write(i: int) -> str:
+            return store.write(
+                _bundle(1.0), framework="CRR", reporting_date=MONTH_ENDS[0], run_id=f"run{i}"
+            )
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            run_ids = list(pool.map(write, range(8)))
+
+        assert sorted(store.catalogue()["run_id"].to_list()) == sorted(run_ids)
+
+    def test_duplicate_run_id(self, store: ResultsStore) -> None:
+        """A run_id can only be stored once."""
+        with pytest.raises(ValueError, match="run0"):
+            store.write(_bundle(1.0), framework="CRR", reporting_date=MONTH_ENDS[0], run_id="run0")
+
+    def test_bundle_requires_date(self, tmp_path: Path) -> None:
+        """Bundles carry no reporting date, so it must be given."""
+        with pytest.raises(ValueError, match="reporting_date"):
+            ResultsStore(tmp_path).write(_bundle(1.0), framework="CRR")
+
+
+# =============================================================================
+# Query Tests
+# =============================================================================
+
+
+class TestQueries:
+    """Tests for run selection and history queries."""
+
+    def test_last_n_dates(self, store: ResultsStore) -> None:
+        """last keeps the most recent reporting dates."""
+        runs = store.runs(RunSelection(last=2))
+
+        assert runs["reporting_date"].to_list() == MONTH_ENDS[1:]
+
+    def test_latest_run_per_date(self, store: ResultsStore) -> None:
+        """A re-run replaces the earlier run of the same date unless latest_only is off."""
+        store.write(_bundle(10.0), framework="CRR", reporting_date=MONTH_ENDS[2], run_id="rerun")
+
+        assert store.runs(RunSelection(start=MONTH_ENDS[2]))["run_id"].to_list() == ["rerun"]
+        assert store.runs(RunSelection(start=MONTH_ENDS[2], latest_only=False)).height == 2
+
+    def test_exposure_history(self, store: ResultsStore) -> None:
+        """One row per month-end for the requested exposure."""
+        history = store.exposure_history("EXP001", RunSelection(last=12), ["rwa_final"])
+
+        assert history["reporting_date"].to_list() == MONTH_ENDS
+        assert history["rwa_final"].to_list() == [40.0, 80.0, 120.0]
+
+    def test_class_totals(self, store: ResultsStore) -> None:
+        """Class summaries are returned per reporting date."""
+        totals = store.class_totals(RunSelection(framework="CRR")).filter(
+            pl.col("exposure_class") == "corporate"
+        )
+
+        assert totals["total_rwa"].to_list() == [100.0, 200.0, 300.0]
+
+    def test_empty_store(self, tmp_path: Path) -> None:
+        """An empty store has no runs and no history."""
+        store = ResultsStore(tmp_path)
+
+        assert store.runs().is_empty()
+        assert store.exposure_history("EXP001").is_empty()
@@ -1034,3 +1034,163 @@ class TestPostCRMDetailedReportingApproach:
         # Guaranteed portion with SA guarantor → "standardised"
         guar = df.filter(pl.col("crm_portion_type") == "guaranteed")
         assert guar["reporting_approach"][0] == "standardised"
+
+
+class TestPerimeterResults:
+    """Tests for per-perimeter (solo and consolidated) summaries."""
+
+    @pytest.fixture
+    def perimeters(self) -> pl.LazyFrame:
+        """SOLO_A holds book A; GROUP consolidates books A and B."""
+        return pl.LazyFrame({
+            "perimeter_id": ["SOLO_A", "GROUP", "GROUP"],
+            "book_code": ["A", "A", "B"],
+        })
+
+    @pytest.fixture
+    def perimeter_sa_bundle(self) -> SAResultBundle:
+        """SA results booked across two entities, with one lending group."""
+        return SAResultBundle(
+            results=pl.LazyFrame({
+                "exposure_reference": ["EXP001", "EXP002", "EXP003"],
+                "counterparty_reference": ["CP001", "CP002", "CP003"],
+                "book_code": ["A", "B", "C"],
+                "exposure_class": ["RETAIL", "RETAIL", "CORPORATE"],
+                "ead_final": [600000.0, 700000.0, 1000000.0],
+                "risk_weight": [0.75, 0.75, 1.0],
+                "rwa_post_factor": [450000.0, 525000.0, 1000000.0],
+                "lending_group_reference": ["LG001", "LG001", None],
+                "exposure_for_retail_threshold": [600000.0, 700000.0, 1000000.0],
+            }),
+            errors=[],
+        )
+
+    def test_no_perimeters_no_results(
+        self,
+        aggregator: OutputAggregator,
+        perimeter_sa_bundle: SAResultBundle,
+        crr_config: CalculationConfig,
+    ) -> None:
+        """Perimeter results are only produced when perimeters are supplied."""
+        result = aggregator.aggregate_with_audit(
+            sa_bundle=perimeter_sa_bundle,
+            irb_bundle=None,
+            slotting_bundle=None,
+            config=crr_config,
+        )
+
+        assert result.perimeter_results is None
+
+    def test_summary_by_class_per_perimeter(
+        self,
+        aggregator: OutputAggregator,
+        perimeter_sa_bundle: SAResultBundle,
+        perimeters: pl.LazyFrame,
+        crr_config: CalculationConfig,
+    ) -> None:
+        """Each perimeter sums only the books it contains; unmapped books are excluded."""
+        result = aggregator.aggregate_with_audit(
+            sa_bundle=perimeter_sa_bundle,
+            irb_bundle=None,
+            slotting_bundle=None,
+            config=crr_config,
+            perimeters=perimeters,
+        )
+
+        summary = result.perimeter_results.summary_by_class.collect()
+        totals = {
+            (row["perimeter_id"], row["exposure_class"]): row["total_ead"]
+            for row in summary.iter_rows(named=True)
+        }
+
+        assert totals == {
+            ("SOLO_A", "RETAIL"): pytest.approx(600000.0),
+            ("GROUP", "RETAIL"): pytest.approx(1300000.0),
+        }
+
+    def test_summary_by_approach_per_perimeter(
+        self,
+        aggregator: OutputAggregator,
+        perimeter_sa_bundle: SAResultBundle,
+        perimeters: pl.LazyFrame,
+        crr_config: CalculationConfig,
+    ) -> None:
+        """Approach summaries are keyed by perimeter_id."""
+        result = aggregator.aggregate_with_audit(
+            sa_bundle=perimeter_sa_bundle,
+            irb_bundle=None,
+            slotting_bundle=None,
+            config=crr_config,
+            perimeters=perimeters,
+        )
+
+        summary = result.perimeter_results.summary_by_approach.collect()
+        group = summary.filter(pl.col("perimeter_id") == "GROUP")
+
+        assert group["approach_applied"].to_list() == ["SA"]
+        assert group["exposure_count"][0] == 2
+
+    def test_lending_group_threshold_per_perimeter(
+        self,
+        aggregator: OutputAggregator,
+        perimeter_sa_bundle: SAResultBundle,
+        perimeters: pl.LazyFrame,
+        crr_config: CalculationConfig,
+    ) -> None:
+        """A lending group can be under the retail threshold solo but over it consolidated."""
+        result = aggregator.aggregate_with_audit(
+            sa_bundle=perimeter_sa_bundle,
+            irb_bundle=None,
+            slotting_bundle=None,
+            config=crr_config,
+            perimeters=perimeters,
+        )
+
+        groups = result.perimeter_results.lending_groups.collect()
+        solo = groups.filter(pl.col("perimeter_id") == "SOLO_A")
+        group = groups.filter(pl.col("perimeter_id") == "GROUP")
+
+        assert solo["lending_group_adjusted_exposure"][0] == pytest.approx(600000.0)
+        assert solo["exceeds_retail_threshold"][0] is False
+        assert group["lending_group_adjusted_exposure"][0] == pytest.approx(1300000.0)
+        assert group["exceeds_retail_threshold"][0] is True
+
+    def test_floor_impact_per_perimeter(
+        self,
+        aggregator: OutputAggregator,
+        perimeters: pl.LazyFrame,
+        basel31_config: CalculationConfig,
+    ) -> None:
+        """Floor impact is summed per perimeter from the per-exposure floor."""
+        sa_results = pl.LazyFrame({
+            "exposure_reference": ["EXP001", "EXP002"],
+            "book_code": ["A", "B"],
+            "exposure_class": ["CORPORATE", "CORPORATE"],
+            "ead_final": [1000000.0, 1000000.0],
+            "risk_weight": [1.0, 1.0],
+            "rwa_post_factor": [1000000.0, 1000000.0],
+        })
+        irb_results = pl.LazyFrame({
+            "exposure_reference": ["EXP001", "EXP002"],
+            "book_code": ["A", "B"],
+            "exposure_class": ["CORPORATE", "CORPORATE"],
+            "approach": ["FIRB", "FIRB"],
+            "ead_final": [1000000.0, 1000000.0],
+            "risk_weight": [0.5, 0.5],
+            "rwa": [500000.0, 500000.0],
+        })
+
+        result = aggregator.aggregate_with_audit(
+            sa_bundle=SAResultBundle(results=sa_results, errors=[]),
+            irb_bundle=IRBResultBundle(results=irb_results, errors=[]),
+            slotting_bundle=None,
+            config=basel31_config,
+            perimeters=perimeters,
+        )
+
+        floor = result.perimeter_results.floor_impact.collect()
+        impact = dict(zip(floor["perimeter_id"], floor["total_floor_impact"], strict=True))
+
+        # Floor RWA = 72.5% x 1m = 725k per exposure, 225k above IRB RWA
+        assert impact["SOLO_A"] == pytest.approx(225000.0)
+        assert impact["GROUP"] == pytest.approx(450000.0)
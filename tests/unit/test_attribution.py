@@ -0,0 +1,269 @@
+"""
+Unit tests for RWA movement attribution.
+
+Tests cover:
+- New business, runoff and methodology (approach change)
+- FX, volume and CRM EAD drivers
+- SA rating migration via recomputed CQS risk weights
+- IRB PD and LGD drivers via recomputed K
+- Drivers reconcile to the total movement
+- Per-class summary and Parquet inputs
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from rwa_calc.contracts.bundles import AggregatedResultBundle, RWAMovementBundle
+from rwa_calc.contracts.config import CalculationConfig
+from rwa_calc.engine.attribution import (
+    MOVEMENT_DRIVERS,
+    MovementAttributor,
+    create_movement_attributor,
+)
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def config() -> CalculationConfig:
+    """CRR config (GBP base currency)."""
+    return CalculationConfig.crr(reporting_date=date(2024, 12, 31))
+
+
+def _row(ref: str, **overrides) -> dict:
+    """SA corporate results row: EAD 100, CQS 3 (100% RW)."""
+    row = {
+        "exposure_reference": ref,
+        "approach_applied": "SA",
+        "exposure_class": "corporate",
+        "original_currency": "GBP",
+        "fx_rate_applied": None,
+        "ead_pre_crm": 100.0,
+        "ead_final": 100.0,
+        "risk_weight": 1.0,
+        "rwa_final": 100.0,
+        "is_defaulted": False,
+        "cqs": 3,
+        "pd_floored": None,
+        "lgd_floored": None,
+        "maturity": None,
+    }
+    row.update(overrides)
+    return row
+
+
+def _irb_row(ref: str, pd: float, lgd: float, config: CalculationConfig, **overrides) -> dict:
+    """A-IRB corporate results row with RWA consistent with the IRB formulas."""
+    lf = pl.LazyFrame({
+        "pd_floored": [pd],
+        "lgd_floored": [lgd],
+        "exposure_class": ["corporate"],
+        "maturity": [2.5],
+        "turnover_m": [None],
+        "requires_fi_scalar": [False],
+        "ead_final": [1000.0],
+    }, schema_overrides={"turnover_m": pl.Float64})
+    calc = (
+        lf.irb.calculate_correlation(config)
+        .irb.calculate_k(config)
+        .irb.calculate_maturity_adjustment(config)
+        .irb.calculate_rwa(config)
+        .collect()
+    )
+    return _row(
+        ref,
+        approach_applied="advanced_irb",
+        ead_pre_crm=1000.0,
+        ead_final=1000.0,
+        pd_floored=pd,
+        lgd_floored=lgd,
+        maturity=2.5,
+        risk_weight=calc["risk_weight"][0],
+        rwa_final=calc["rwa"][0],
+        **overrides,
+    )
+
+
+def _frame(rows: list[dict]) -> pl.LazyFrame:
+    return pl.LazyFrame(rows, schema_overrides={
+        "fx_rate_applied": pl.Float64,
+        "pd_floored": pl.Float64,
+        "lgd_floored": pl.Float64,
+        "maturity": pl.Float64,
+        "cqs": pl.Int8,
+    })
+
+
+def _movements(prior: list[dict], current: list[dict], config: CalculationConfig) -> dict[str, dict]:
+    bundle = MovementAttributor().attribute(_frame(prior), _frame(current), config)
+    df = bundle.exposure_movements.collect()
+    return {row["exposure_reference"]: row for row in df.iter_rows(named=True)}
+
+
+# =============================================================================
+# Movement types
+# =============================================================================
+
+
+class TestMovementTypes:
+    """Tests for exposures entering, leaving or changing approach."""
+
+    def test_factory(self) -> None:
+        assert isinstance(create_movement_attributor(), MovementAttributor)
+
+    def test_new_business_and_runoff(self, config: CalculationConfig) -> None:
+        result = _movements([_row("OLD")], [_row("NEW", rwa_final=80.0)], config)
+
+        assert result["NEW"]["movement_type"] == "new_business"
+        assert result["NEW"]["new_business"] == pytest.approx(80.0)
+        assert result["OLD"]["movement_type"] == "runoff"
+        assert result["OLD"]["runoff"] == pytest.approx(-100.0)
+        assert result["OLD"]["other"] == pytest.approx(0.0)
+
+    def test_approach_change_is_methodology(self, config: CalculationConfig) -> None:
+        current = _row("E1", approach_applied="foundation_irb", rwa_final=60.0)
+        result = _movements([_row("E1")], [current], config)
+
+        assert result["E1"]["movement_type"] == "methodology"
+        assert result["E1"]["methodology"] == pytest.approx(-40.0)
+        assert result["E1"]["rating_migration"] == 0.0
+
+    def test_unchanged_exposure_has_no_movement(self, config: CalculationConfig) -> None:
+        result = _movements([_row("E1")], [_row("E1")], config)
+        assert all(result["E1"][d] == pytest.approx(0.0) for d in MOVEMENT_DRIVERS)
+
+
+# =============================================================================
+# EAD drivers
+# =============================================================================
+
+
+class TestEADDrivers:
+    """Tests for the FX, volume and CRM steps."""
+
+    def test_fx(self, config: CalculationConfig) -> None:
+        prior = _row("E1", original_currency="EUR", fx_rate_applied=0.85, ead_pre_crm=85.0,
+                     ead_final=85.0, rwa_final=85.0)
+        current = _row("E1", original_currency="EUR", fx_rate_applied=0.90, ead_pre_crm=90.0,
+                       ead_final=90.0, rwa_final=90.0)
+        result = _movements([prior], [current], config)
+
+        assert result["E1"]["fx"] == pytest.approx(5.0)
+        assert result["E1"]["volume"] == pytest.approx(0.0)
+        assert result["E1"]["other"] == pytest.approx(0.0)
+
+    def test_volume_and_crm(self, config: CalculationConfig) -> None:
+        # Gross EAD doubles; collateral then reduces the final EAD to 150
+        current = _row("E1", ead_pre_crm=200.0, ead_final=150.0, rwa_final=150.0)
+        result = _movements([_row("E1")], [current], config)
+
+        assert result["E1"]["volume"] == pytest.approx(100.0)
+        assert result["E1"]["crm"] == pytest.approx(-50.0)
+        assert result["E1"]["other"] == pytest.approx(0.0)
+
+
+# =============================================================================
+# Risk weight drivers
+# =============================================================================
+
+
+class TestRiskWeightDrivers:
+    """Tests for recomputed SA risk weights and IRB K."""
+
+    def test_sa_rating_migration(self, config: CalculationConfig) -> None:
+        # Corporate CQS 2 (50%) -> CQS 3 (100%)
+        prior = _row("E1", cqs=2, risk_weight=0.5, rwa_final=50.0)
+        result = _movements([prior], [_row("E1")], config)
+
+        assert result["E1"]["rating_migration"] == pytest.approx(50.0)
+        assert result["E1"]["other"] == pytest.approx(0.0)
+
+    def test_irb_pd_and_lgd(self, config: CalculationConfig) -> None:
+        prior = _irb_row("E1", pd=0.01, lgd=0.45, config=config)
+        pd_moved = _irb_row("E1", pd=0.02, lgd=0.45, config=config)
+        current = _irb_row("E1", pd=0.02, lgd=0.30, config=config)
+        result = _movements([prior], [current], config)
+
+        assert result["E1"]["rating_migration"] == pytest.approx(
+            pd_moved["rwa_final"] - prior["rwa_final"]
+        )
+        assert result["E1"]["lgd"] == pytest.approx(current["rwa_final"] - pd_moved["rwa_final"])
+        assert result["E1"]["other"] == pytest.approx(0.0, abs=1e-6)
+
+    def test_default_attributed_to_rating_migration(self, config: CalculationConfig) -> None:
+        current = _row("E1", is_defaulted=True, risk_weight=1.5, rwa_final=150.0)
+        result = _movements([_row("E1")], [current], config)
+
+        assert result["E1"]["rating_migration"] == pytest.approx(50.0)
+        assert result["E1"]["other"] == pytest.approx(0.0)
+
+
+# =============================================================================
+# Reconciliation and outputs
+# =============================================================================
+
+
+class TestOutputs:
+    """Tests for reconciliation, class summary and input types."""
+
+    @pytest.fixture
+    def runs(self, config: CalculationConfig) -> tuple[list[dict], list[dict]]:
+        prior = [
+            _row("A", cqs=2, risk_weight=0.5, rwa_final=50.0),
+            _row("B", exposure_class="institution"),
+            _irb_row("C", pd=0.01, lgd=0.45, config=config),
+            _row("D"),
+        ]
+        current = [
+            _row("A", ead_pre_crm=120.0, ead_final=120.0, rwa_final=120.0),
+            _row("B", exposure_class="institution", rwa_final=70.0),
+            _irb_row("C", pd=0.03, lgd=0.40, config=config),
+            _row("E", exposure_class="institution", rwa_final=30.0),
+        ]
+        return prior, current
+
+    def test_drivers_reconcile(self, runs, config: CalculationConfig) -> None:
+        prior, current = runs
+        bundle = MovementAttributor().attribute(_frame(prior), _frame(current), config)
+        df = bundle.exposure_movements.collect()
+
+        explained = df.select(pl.sum_horizontal(list(MOVEMENT_DRIVERS))).to_series()
+        assert (explained - df["rwa_movement"]).abs().max() < 1e-6
+        assert bundle.drivers == MOVEMENT_DRIVERS
+
+    def test_class_summary(self, runs, config: CalculationConfig) -> None:
+        prior, current = runs
+        bundle = MovementAttributor().attribute(_frame(prior), _frame(current), config)
+        by_class = {
+            row["exposure_class"]: row
+            for row in bundle.class_movements.collect().iter_rows(named=True)
+        }
+
+        assert by_class["institution"]["exposure_count"] == 2
+        assert by_class["institution"]["new_business"] == pytest.approx(30.0)
+        assert by_class["corporate"]["runoff"] == pytest.approx(-100.0)
+        total = sum(row["rwa_movement"] for row in by_class.values())
+        assert total == pytest.approx(
+            sum(r["rwa_final"] for r in current) - sum(r["rwa_final"] for r in prior)
+        )
+
+    def test_bundle_and_parquet_inputs(self, runs, config: CalculationConfig, tmp_path: Path) -> None:
+        prior, current = runs
+        prior_path = tmp_path / "prior.parquet"
+        _frame(prior).collect().write_parquet(prior_path)
+
+        bundle = MovementAttributor().attribute(
+            prior_path,
+            AggregatedResultBundle(results=_frame(current)),
+            config,
+        )
+
+        assert isinstance(bundle, RWAMovementBundle)
+        assert bundle.exposure_movements.collect().height == 5
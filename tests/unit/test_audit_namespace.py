@@ -8,6 +8,8 @@ Tests cover:
 - Slotting calculation audit string
 - CRM calculation audit string
 - Haircut calculation audit string
+- Classification and CCF audit strings
+- On-demand rendering for selected exposures
 """
 
 from __future__ import annotations
@@ -339,3 +341,103 @@ class TestBuildHaircutCalculation:
         assert "Hc=" in calc_str
         assert "Hfx=" in calc_str
         assert "Adj=" in calc_str
+
+
+# =============================================================================
+# Classification / CCF Audit Tests
+# =============================================================================
+
+
+class TestBuildClassificationAndCCF:
+    """Tests for classification reason and CCF audit strings."""
+
+    def test_classification_reason(self) -> None:
+        """Should list entity type, classes and flags."""
+        data = pl.LazyFrame({
+            "cp_entity_type": ["corporate"],
+            "exposure_class_sa": ["corporate"],
+            "exposure_class_irb": [None],
+            "is_sme": [True],
+            "is_mortgage": [False],
+            "is_defaulted": [False],
+            "is_infrastructure": [False],
+            "requires_fi_scalar": [False],
+            "qualifies_as_retail": [True],
+            "reclassified_to_retail": [False],
+        }, schema_overrides={"exposure_class_irb": pl.String})
+
+        reason = data.audit.build_classification_reason().collect()["classification_reason"][0]
+
+        assert reason.startswith("entity_type=corporate; exp_class_sa=corporate")
+        assert "exp_class_irb=unknown" in reason
+        assert reason.endswith("reclassified_to_retail=false")
+
+    def test_ccf_calculation_optional_parts(self) -> None:
+        """Should include risk_type and interest only when present."""
+        data = pl.LazyFrame({
+            "ccf": [0.5],
+            "nominal_amount": [1000.0],
+            "ead_from_ccf": [500.0],
+        })
+
+        bare = data.audit.build_ccf_calculation().collect()["ccf_calculation"][0]
+        full = (
+            data.with_columns(
+                pl.lit("MR").alias("risk_type"),
+                pl.lit(200.0).alias("drawn_amount"),
+                pl.lit(None, dtype=pl.Float64).alias("interest"),
+            )
+            .audit.build_ccf_calculation()
+            .collect()["ccf_calculation"][0]
+        )
+
+        assert bare == "CCF=50.0%; nominal=1000.0; ead_ccf=500.0"
+        assert full == (
+            "CCF=50.0%; risk_type=MR; drawn=200.0; interest=0.0; "
+            "nominal=1000.0; ead_ccf=500.0"
+        )
+
+
+# =============================================================================
+# Render Tests
+# =============================================================================
+
+
+class TestRender:
+    """Tests for on-demand audit rendering."""
+
+    @pytest.fixture
+    def results(self) -> pl.LazyFrame:
+        return pl.LazyFrame({
+            "exposure_reference": ["SA1", "IRB1", "SA2"],
+            "approach": ["standardised", "foundation_irb", "standardised"],
+            "ead_final": [100.0, 200.0, 300.0],
+            "risk_weight": [1.0, 0.5, 0.2],
+            "rwa_pre_factor": [100.0, 100.0, 60.0],
+            "pd_floored": [None, 0.01, None],
+            "lgd_floored": [None, 0.45, None],
+            "rwa": [100.0, 100.0, 60.0],
+        })
+
+    def test_filters_before_rendering(self, results: pl.LazyFrame) -> None:
+        """Should return only the requested exposures."""
+        rendered = results.audit.render(["SA2"]).collect()
+
+        assert rendered["exposure_reference"].to_list() == ["SA2"]
+        assert rendered["sa_calculation"][0] == "SA: EAD=300.0 x RW=20.0% -> RWA=60.0"
+
+    def test_strings_only_for_matching_approach(self, results: pl.LazyFrame) -> None:
+        """Should set SA/IRB strings only on rows of that approach."""
+        rendered = results.audit.render().collect()
+
+        assert rendered["sa_calculation"].is_null().to_list() == [False, True, False]
+        assert rendered["irb_calculation"].is_null().to_list() == [True, False, True]
+        assert "slotting_calculation" not in rendered.columns
+
+    def test_existing_strings_kept(self, results: pl.LazyFrame) -> None:
+        """Should not rebuild strings already present."""
+        data = results.with_columns(pl.lit("kept").alias("sa_calculation"))
+
+        rendered = data.audit.render(["SA1"]).collect()
+
+        assert rendered["sa_calculation"][0] == "kept"
@@ -28,7 +28,9 @@ from rwa_calc.domain.enums import ApproachType, ExposureClass
 from rwa_calc.engine.classifier import (
     ClassificationError,
     ExposureClassifier,
+    approach_table,
     create_exposure_classifier,
+    entity_type_table,
 )
 
 if TYPE_CHECKING:
@@ -1133,6 +1135,83 @@ class TestApproachAssignment:
         assert df["approach"][0] == ApproachType.AIRB.value
 
 
+# =============================================================================
+# Decision Table Tests
+# =============================================================================
+
+
+def _approach(
+    table: pl.DataFrame,
+    exposure_class: ExposureClass,
+    retail_without_lgd: bool = False,
+) -> str:
+    """Approach for one key of an approach table."""
+    row = table.filter(
+        (pl.col("exposure_class") == exposure_class.value)
+        & (pl.col("retail_without_lgd") == retail_without_lgd)
+    )
+    assert row.height == 1
+    return row["approach"][0]
+
+
+class TestDecisionTables:
+    """Tests for entity_type_table and approach_table."""
+
+    def test_entity_type_table_keys_unique(self) -> None:
+        """One row per entity type."""
+        table = entity_type_table()
+
+        assert table["cp_entity_type"].is_unique().all()
+
+    def test_entity_type_table_sa_and_irb_classes(self) -> None:
+        """MDBs are MDB under SA but sovereign under IRB."""
+        row = entity_type_table().filter(pl.col("cp_entity_type") == "mdb")
+
+        assert row["exposure_class_sa"][0] == ExposureClass.MDB.value
+        assert row["exposure_class_irb"][0] == ExposureClass.CENTRAL_GOVT_CENTRAL_BANK.value
+        assert row["is_financial_sector_entity"][0] is False
+
+    def test_approach_table_covers_every_class(self, crr_config: CalculationConfig) -> None:
+        """Two rows per exposure class (retail_without_lgd False/True)."""
+        table = approach_table(crr_config)
+
+        assert table.height == 2 * len(ExposureClass)
+
+    def test_sa_only(self, crr_config: CalculationConfig) -> None:
+        """SA-only permissions give SA everywhere."""
+        table = approach_table(crr_config)
+
+        assert (table["approach"] == ApproachType.SA.value).all()
+
+    def test_full_irb(self, crr_config_with_irb: CalculationConfig) -> None:
+        """Full IRB: AIRB for corporates and retail, slotting for SL."""
+        table = approach_table(crr_config_with_irb)
+
+        assert _approach(table, ExposureClass.CORPORATE) == ApproachType.AIRB.value
+        assert _approach(table, ExposureClass.RETAIL_OTHER) == ApproachType.AIRB.value
+        assert _approach(table, ExposureClass.SPECIALISED_LENDING) == ApproachType.SLOTTING.value
+        assert _approach(table, ExposureClass.EQUITY) == ApproachType.SA.value
+
+    def test_retail_without_lgd_forces_sa(self, crr_config_with_irb: CalculationConfig) -> None:
+        """Retail-managed exposures without internal LGD use SA."""
+        table = approach_table(crr_config_with_irb)
+
+        approach = _approach(table, ExposureClass.CORPORATE, retail_without_lgd=True)
+
+        assert approach == ApproachType.SA.value
+
+    def test_firb_only_institution(self) -> None:
+        """FIRB-only permissions give FIRB for institutions and SA for retail."""
+        config = CalculationConfig.crr(
+            reporting_date=date(2024, 12, 31),
+            irb_permissions=IRBPermissions.firb_only(),
+        )
+        table = approach_table(config)
+
+        assert _approach(table, ExposureClass.INSTITUTION) == ApproachType.FIRB.value
+        assert _approach(table, ExposureClass.RETAIL_MORTGAGE) == ApproachType.SA.value
+
+
 # =============================================================================
 # Exposure Splitting Tests
 # =============================================================================
@@ -0,0 +1,98 @@
+"""Unit tests for stage column contracts.
+
+Tests cover:
+- Keeping contract columns in their original order
+- Audit columns dropped when audit_mode is "none"
+- keep_all_columns debug mode
+- Later stage contracts extending earlier ones
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date
+
+import polars as pl
+import pytest
+
+from rwa_calc.contracts.columns import (
+    CLASSIFIED_COLUMNS,
+    CRM_ADJUSTED_COLUMNS,
+    ColumnContract,
+)
+from rwa_calc.contracts.config import CalculationConfig
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def contract() -> ColumnContract:
+    return ColumnContract(
+        stage="test",
+        required=frozenset({"exposure_reference", "ead_final"}),
+        audit=frozenset({"crm_calculation"}),
+    )
+
+
+@pytest.fixture
+def frame() -> pl.LazyFrame:
+    return pl.LazyFrame({
+        "ead_final": [1.0],
+        "_lookup_child": ["x"],
+        "crm_calculation": ["EAD: final=1"],
+        "exposure_reference": ["EXP001"],
+    })
+
+
+@pytest.fixture
+def config() -> CalculationConfig:
+    return CalculationConfig.crr(reporting_date=date(2024, 12, 31))
+
+
+# =============================================================================
+# Contract Tests
+# =============================================================================
+
+
+class TestColumnContract:
+    """Tests for ColumnContract.prune."""
+
+    def test_prunes_to_contract_in_original_order(
+        self, contract: ColumnContract, frame: pl.LazyFrame, config: CalculationConfig
+    ) -> None:
+        pruned = contract.prune(frame, config)
+
+        assert pruned.collect_schema().names() == [
+            "ead_final", "crm_calculation", "exposure_reference",
+        ]
+
+    def test_audit_columns_dropped_without_audit_trail(
+        self, contract: ColumnContract, frame: pl.LazyFrame, config: CalculationConfig
+    ) -> None:
+        pruned = contract.prune(frame, replace(config, audit_mode="none"))
+
+        assert pruned.collect_schema().names() == ["ead_final", "exposure_reference"]
+
+    def test_keep_all_columns_is_a_no_op(
+        self, contract: ColumnContract, frame: pl.LazyFrame, config: CalculationConfig
+    ) -> None:
+        pruned = contract.prune(frame, replace(config, keep_all_columns=True))
+
+        assert pruned is frame
+
+    def test_dropped_lists_unknown_columns(
+        self, contract: ColumnContract, frame: pl.LazyFrame
+    ) -> None:
+        names = frame.collect_schema().names()
+
+        assert contract.dropped(names) == ["_lookup_child"]
+        assert contract.dropped(names, include_audit=False) == [
+            "_lookup_child", "crm_calculation",
+        ]
+
+    def test_crm_contract_extends_classifier_contract(self) -> None:
+        assert CLASSIFIED_COLUMNS.required <= CRM_ADJUSTED_COLUMNS.required
+        assert CLASSIFIED_COLUMNS.audit <= CRM_ADJUSTED_COLUMNS.audit
+        assert not CRM_ADJUSTED_COLUMNS.required & CRM_ADJUSTED_COLUMNS.audit
@@ -0,0 +1,272 @@
+"""
+Unit tests for the data quality checker.
+
+Tests cover:
+- Protocol compliance
+- Value-domain, negative amount and PD/LGD range checks
+- Null and duplicate primary keys
+- Orphan counterparty and beneficiary references
+- Profile table contents
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+import polars as pl
+import pytest
+
+from rwa_calc.contracts.bundles import RawDataBundle
+from rwa_calc.contracts.config import CalculationConfig
+from rwa_calc.contracts.errors import (
+    ERROR_DUPLICATE_KEY,
+    ERROR_INVALID_COLUMN_VALUE,
+    ERROR_INVALID_VALUE,
+    ERROR_LGD_OUT_OF_RANGE,
+    ERROR_MISSING_FIELD,
+    ERROR_ORPHAN_REFERENCE,
+    ERROR_PD_OUT_OF_RANGE,
+)
+from rwa_calc.contracts.protocols import DataQualityCheckerProtocol
+from rwa_calc.domain.enums import ErrorSeverity
+from rwa_calc.engine.data_quality import (
+    PROFILE_SCHEMA,
+    DataQualityChecker,
+    create_data_quality_checker,
+)
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def config() -> CalculationConfig:
+    """CRR config with the in-memory engine."""
+    return CalculationConfig.crr(reporting_date=date(2024, 12, 31), collect_engine="cpu")
+
+
+@pytest.fixture
+def counterparties() -> pl.LazyFrame:
+    return pl.LazyFrame({
+        "counterparty_reference": ["CP1", "CP2", "CP3"],
+        "entity_type": ["corporate", "institution", "corporate"],
+        "annual_revenue": [10.0, 20.0, 30.0],
+    })
+
+
+@pytest.fixture
+def clean_bundle(counterparties: pl.LazyFrame) -> RawDataBundle:
+    """Bundle with no data quality issues."""
+    return RawDataBundle(
+        facilities=pl.LazyFrame({
+            "facility_reference": ["F1"],
+            "counterparty_reference": ["CP1"],
+            "limit": [100.0],
+            "lgd": [0.45],
+            "seniority": ["senior"],
+        }),
+        loans=pl.LazyFrame({
+            "loan_reference": ["L1", "L2"],
+            "counterparty_reference": ["CP1", "CP2"],
+            "drawn_amount": [50.0, 25.0],
+            "lgd": [0.45, None],
+            "seniority": ["senior", "subordinated"],
+        }),
+        counterparties=counterparties,
+        facility_mappings=pl.LazyFrame({
+            "parent_facility_reference": ["F1"],
+            "child_reference": ["L1"],
+            "child_type": ["loan"],
+        }),
+        lending_mappings=pl.LazyFrame(schema={
+            "parent_counterparty_reference": pl.String,
+            "child_counterparty_reference": pl.String,
+        }),
+        collateral=pl.LazyFrame({
+            "collateral_reference": ["C1", "C2"],
+            "collateral_type": ["cash", "real_estate"],
+            "market_value": [10.0, 20.0],
+            "beneficiary_type": ["loan", "Counterparty"],
+            "beneficiary_reference": ["L1", "CP2"],
+        }),
+        ratings=pl.LazyFrame({
+            "rating_reference": ["R1"],
+            "counterparty_reference": ["CP1"],
+            "rating_type": ["internal"],
+            "pd": [0.01],
+        }),
+    )
+
+
+@pytest.fixture
+def dirty_bundle(counterparties: pl.LazyFrame) -> RawDataBundle:
+    """Bundle with one of each kind of issue."""
+    return RawDataBundle(
+        facilities=pl.LazyFrame({
+            "facility_reference": ["F1", "F1"],
+            "counterparty_reference": ["CP1", "CP1"],
+            "limit": [100.0, 100.0],
+        }),
+        loans=pl.LazyFrame({
+            "loan_reference": ["L1", "L2", None],
+            "counterparty_reference": ["CP1", "CP_MISSING", "CP2"],
+            "drawn_amount": [50.0, -5.0, 10.0],
+            "lgd": [0.45, 1.5, 0.2],
+            "seniority": ["senior", "junior", "SENIOR"],
+        }),
+        counterparties=counterparties,
+        facility_mappings=pl.LazyFrame(schema={
+            "parent_facility_reference": pl.String,
+            "child_reference": pl.String,
+        }),
+        lending_mappings=pl.LazyFrame(schema={
+            "parent_counterparty_reference": pl.String,
+            "child_counterparty_reference": pl.String,
+        }),
+        collateral=pl.LazyFrame({
+            "collateral_reference": ["C1", "C2"],
+            "market_value": [10.0, 20.0],
+            "beneficiary_type": ["loan", "facility"],
+            "beneficiary_reference": ["L1", "F_MISSING"],
+        }),
+        ratings=pl.LazyFrame({
+            "rating_reference": ["R1"],
+            "counterparty_reference": ["CP1"],
+            "pd": [1.2],
+        }),
+    )
+
+
+def _codes(errors) -> list[str]:
+    return sorted(e.code for e in errors)
+
+
+# =============================================================================
+# Checker Tests
+# =============================================================================
+
+
+class TestDataQualityChecker:
+    """Tests for DataQualityChecker.check / profile."""
+
+    def test_implements_protocol(self) -> None:
+        assert isinstance(create_data_quality_checker(), DataQualityCheckerProtocol)
+
+    def test_clean_bundle_has_no_errors(
+        self, clean_bundle: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        assert DataQualityChecker().check(clean_bundle, config) == []
+
+    def test_dirty_bundle_reports_each_issue(
+        self, dirty_bundle: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        errors = DataQualityChecker().check(dirty_bundle, config)
+
+        assert _codes(errors) == sorted([
+            ERROR_DUPLICATE_KEY,          # facilities F1 twice
+            ERROR_MISSING_FIELD,          # null loan_reference
+            ERROR_INVALID_COLUMN_VALUE,   # seniority 'junior'
+            ERROR_INVALID_VALUE,          # negative drawn_amount
+            ERROR_LGD_OUT_OF_RANGE,       # lgd 1.5
+            ERROR_PD_OUT_OF_RANGE,        # pd 1.2
+            ERROR_ORPHAN_REFERENCE,       # loan -> CP_MISSING
+            ERROR_ORPHAN_REFERENCE,       # collateral -> facility F_MISSING
+        ])
+
+    def test_domain_violation_is_case_insensitive(
+        self, dirty_bundle: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        errors = DataQualityChecker().check(dirty_bundle, config)
+        domain = [e for e in errors if e.code == ERROR_INVALID_COLUMN_VALUE]
+
+        assert len(domain) == 1
+        assert domain[0].actual_value == "junior"
+        assert domain[0].severity == ErrorSeverity.WARNING
+
+    def test_orphan_references_name_the_offenders(
+        self, dirty_bundle: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        errors = DataQualityChecker().check(dirty_bundle, config)
+        orphans = {e.field_name: e for e in errors if e.code == ERROR_ORPHAN_REFERENCE}
+
+        assert orphans["counterparty_reference"].actual_value == "CP_MISSING"
+        assert orphans["counterparty_reference"].severity == ErrorSeverity.ERROR
+        assert orphans["beneficiary_reference"].actual_value == "facility:F_MISSING"
+
+    def test_single_collect_all(
+        self,
+        dirty_bundle: RawDataBundle,
+        config: CalculationConfig,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """All tables and reference checks should run in one collect_all."""
+        calls: list[int] = []
+        original = pl.collect_all
+
+        def counting_collect_all(frames, **kwargs):
+            frames = list(frames)
+            calls.append(len(frames))
+            return original(frames, **kwargs)
+
+        monkeypatch.setattr(pl, "collect_all", counting_collect_all)
+        DataQualityChecker().check(dirty_bundle, config)
+
+        assert len(calls) == 1
+
+    def test_custom_constraints(
+        self, clean_bundle: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        checker = DataQualityChecker(constraints={"loans": {"seniority": {"senior"}}})
+        errors = checker.check(clean_bundle, config)
+
+        assert _codes(errors) == [ERROR_INVALID_COLUMN_VALUE]
+
+
+# =============================================================================
+# Profile Tests
+# =============================================================================
+
+
+class TestDataQualityProfile:
+    """Tests for the profile table."""
+
+    def test_profile_schema_and_coverage(
+        self, clean_bundle: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        profile = DataQualityChecker().profile(clean_bundle, config).profile
+
+        assert profile.schema == pl.Schema(PROFILE_SCHEMA)
+        assert set(profile["table"]) == {
+            "facilities", "loans", "counterparties", "collateral",
+            "ratings", "facility_mappings", "lending_mappings",
+        }
+
+    def test_profile_statistics(
+        self, clean_bundle: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        profile = DataQualityChecker().profile(clean_bundle, config).profile
+        lgd = profile.filter(
+            (pl.col("table") == "loans") & (pl.col("column") == "lgd")
+        ).row(0, named=True)
+
+        assert lgd["row_count"] == 2
+        assert lgd["null_count"] == 1
+        assert lgd["null_rate"] == pytest.approx(0.5)
+        assert lgd["mean"] == pytest.approx(0.45)
+        assert lgd["out_of_range_count"] == 0
+
+    def test_profile_violation_counts(
+        self, dirty_bundle: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        report = DataQualityChecker().profile(dirty_bundle, config)
+        loans = report.profile.filter(pl.col("table") == "loans")
+
+        def stat(column: str, name: str):
+            return loans.filter(pl.col("column") == column)[name].item()
+
+        assert report.has_errors
+        assert stat("drawn_amount", "negative_count") == 1
+        assert stat("seniority", "domain_violations") == 1
+        assert stat("loan_reference", "duplicate_count") == 0
+        assert stat("drawn_amount", "min") == "-5.0"
@@ -0,0 +1,334 @@
+"""
+Unit tests for single-exposure drill-down.
+
+Tests cover:
+- Facility tree, counterparty and lending group closure expansion
+- CRM, guarantor and org hierarchy ancestors pulled into the closure
+- Unrelated exposures, guarantors' books and co-owners' books excluded
+- Explained results match the full run for the exposure (floats to rel 1e-9)
+- Audit strings rendered regardless of the configured audit_mode
+- Unknown exposures raise ValueError
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date
+
+import polars as pl
+import pytest
+
+from rwa_calc.contracts.bundles import RawDataBundle
+from rwa_calc.contracts.config import CalculationConfig
+from rwa_calc.engine.explain import (
+    ExposureExplainer,
+    ExposureExplanation,
+    create_exposure_explainer,
+)
+from rwa_calc.engine.pipeline import PipelineOrchestrator
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def config() -> CalculationConfig:
+    """CRR configuration for testing."""
+    return CalculationConfig.crr(reporting_date=date(2024, 12, 31))
+
+
+@pytest.fixture
+def raw_data() -> RawDataBundle:
+    """
+    Small book with three independent clusters.
+
+    - FAC001 (CP001) -> LN001, LN002; CP001 also owns LN003 outside the facility
+    - CP002 and CP003 form a lending group; LN004 (CP002), LN005 (CP003)
+    - LN006 (CP004) is unrelated to everything else
+    - CP001 is a subsidiary of CP005; LN001 is guaranteed by CP006
+    """
+    loan_refs = ["LN001", "LN002", "LN003", "LN004", "LN005", "LN006"]
+    loan_cps = ["CP001", "CP001", "CP001", "CP002", "CP003", "CP004"]
+    n = len(loan_refs)
+
+    facilities = pl.LazyFrame({
+        "facility_reference": ["FAC001"],
+        "counterparty_reference": ["CP001"],
+        "product_type": ["RCF"],
+        "book_code": ["BANK"],
+        "currency": ["GBP"],
+        "facility_limit": [2000000.0],
+        "value_date": [date(2023, 1, 1)],
+        "maturity_date": [date(2028, 1, 1)],
+        "lgd": [0.45],
+        "seniority": ["senior"],
+        "risk_type": ["MR"],
+        "ccf_modelled": [None],
+        "is_short_term_trade_lc": [False],
+    })
+
+    loans = pl.LazyFrame({
+        "loan_reference": loan_refs,
+        "counterparty_reference": loan_cps,
+        "product_type": ["TERM_LOAN"] * n,
+        "book_code": ["BANK"] * n,
+        "value_date": [date(2023, 1, 1)] * n,
+        "maturity_date": [date(2028, 1, 1)] * n,
+        "currency": ["GBP"] * n,
+        "drawn_amount": [500000.0, 250000.0, 100000.0, 40000.0, 30000.0, 80000.0],
+        "lgd": [0.45] * n,
+        "seniority": ["senior"] * n,
+        "risk_type": ["FR"] * n,
+        "ccf_modelled": [None] * n,
+        "is_short_term_trade_lc": [None] * n,
+    })
+
+    counterparties = pl.LazyFrame({
+        "counterparty_reference": ["CP001", "CP002", "CP003", "CP004", "CP005", "CP006"],
+        "counterparty_name": ["Corp", "Person A", "Person B", "Corp 4", "Parent", "Bank"],
+        "entity_type": [
+            "corporate", "individual", "individual", "corporate", "corporate", "institution",
+        ],
+        "country_code": ["GB"] * 6,
+        "annual_revenue": [30000000.0, 0.0, 0.0, 60000000.0, 90000000.0, None],
+        "total_assets": [50000000.0, None, None, 80000000.0, 100000000.0, None],
+        "default_status": [False] * 6,
+        "sector_code": ["62.01", None, None, "62.01", "62.01", "64.19"],
+        "is_regulated": [False, False, False, False, False, True],
+        "is_managed_as_retail": [False, True, True, False, False, False],
+    })
+
+    guarantees = pl.LazyFrame({
+        "guarantee_reference": ["GTE001"],
+        "guarantee_type": ["guarantee"],
+        "guarantor": ["CP006"],
+        "currency": ["GBP"],
+        "maturity_date": [date(2028, 1, 1)],
+        "amount_covered": [200000.0],
+        "percentage_covered": [None],
+        "beneficiary_type": ["loan"],
+        "beneficiary_reference": ["LN001"],
+    }, schema_overrides={"percentage_covered": pl.Float64})
+
+    provisions = pl.LazyFrame({
+        "provision_reference": ["PRV001", "PRV002"],
+        "provision_type": ["SCRA", "SCRA"],
+        "ifrs9_stage": [1, 1],
+        "currency": ["GBP", "GBP"],
+        "amount": [1000.0, 500.0],
+        "as_of_date": [date(2024, 12, 31)] * 2,
+        "beneficiary_type": ["loan", "loan"],
+        "beneficiary_reference": ["LN002", "LN006"],
+    }, schema_overrides={"ifrs9_stage": pl.Int8})
+
+    ratings = pl.LazyFrame({
+        "rating_reference": ["RTG001", "RTG005", "RTG006"],
+        "counterparty_reference": ["CP004", "CP005", "CP006"],
+        "rating_type": ["external"] * 3,
+        "rating_agency": ["S&P"] * 3,
+        "rating_value": ["BBB", "A", "AA"],
+        "cqs": [3, 2, 1],
+        "pd": [0.005, 0.001, 0.0005],
+        "rating_date": [date(2024, 1, 1)] * 3,
+        "is_solicited": [True] * 3,
+    })
+
+    facility_mappings = pl.LazyFrame({
+        "child_reference": ["LN001", "LN002"],
+        "parent_facility_reference": ["FAC001", "FAC001"],
+    })
+
+    org_mappings = pl.LazyFrame({
+        "child_counterparty_reference": ["CP001"],
+        "parent_counterparty_reference": ["CP005"],
+    })
+
+    lending_mappings = pl.LazyFrame({
+        "child_counterparty_reference": ["CP003"],
+        "parent_counterparty_reference": ["CP002"],
+    })
+
+    return RawDataBundle(
+        facilities=facilities,
+        loans=loans,
+        counterparties=counterparties,
+        guarantees=guarantees,
+        provisions=provisions,
+        ratings=ratings,
+        facility_mappings=facility_mappings,
+        org_mappings=org_mappings,
+        lending_mappings=lending_mappings,
+    )
+
+
+@pytest.fixture
+def shared_data(raw_data: RawDataBundle) -> RawDataBundle:
+    """
+    raw_data plus LN007 (CP004) under FAC001 and LN008 held by the guarantor CP006.
+    """
+    extra = raw_data.loans.filter(pl.col("loan_reference") == "LN006")
+    loans = pl.concat([
+        raw_data.loans,
+        extra.with_columns(pl.lit("LN007").alias("loan_reference")),
+        extra.with_columns(
+            pl.lit("LN008").alias("loan_reference"),
+            pl.lit("CP006").alias("counterparty_reference"),
+        ),
+    ])
+    facility_mappings = pl.concat([
+        raw_data.facility_mappings,
+        pl.LazyFrame({"child_reference": ["LN007"], "parent_facility_reference": ["FAC001"]}),
+    ])
+    return replace(raw_data, loans=loans, facility_mappings=facility_mappings)
+
+
+def _refs(frame: pl.LazyFrame | None, column: str) -> set[str]:
+    """Distinct values of a column."""
+    if frame is None:
+        return set()
+    return set(frame.select(column).collect().to_series())
+
+
+# =============================================================================
+# Closure Tests
+# =============================================================================
+
+
+class TestClosure:
+    """Tests for ExposureExplainer.closure."""
+
+    def test_facility_tree_and_counterparty(self, raw_data: RawDataBundle) -> None:
+        """A facility child pulls in its facility, siblings and the owner's other loans."""
+        subset = ExposureExplainer().closure(raw_data, "LN002")
+
+        assert _refs(subset.loans, "loan_reference") == {"LN001", "LN002", "LN003"}
+        assert _refs(subset.facilities, "facility_reference") == {"FAC001"}
+        assert _refs(subset.facility_mappings, "child_reference") == {"LN001", "LN002"}
+
+    def test_crm_guarantor_and_parent(self, raw_data: RawDataBundle) -> None:
+        """Guarantees, provisions, guarantors and org ancestors are included."""
+        subset = ExposureExplainer().closure(raw_data, "LN003")
+
+        assert _refs(subset.guarantees, "guarantee_reference") == {"GTE001"}
+        assert _refs(subset.provisions, "provision_reference") == {"PRV001"}
+        assert _refs(subset.counterparties, "counterparty_reference") == {
+            "CP001", "CP005", "CP006",
+        }
+        assert _refs(subset.ratings, "rating_reference") == {"RTG005", "RTG006"}
+        assert _refs(subset.org_mappings, "parent_counterparty_reference") == {"CP005"}
+
+    def test_lending_group_members(self, raw_data: RawDataBundle) -> None:
+        """A lending group member pulls in every member's exposures."""
+        subset = ExposureExplainer().closure(raw_data, "LN005")
+
+        assert _refs(subset.loans, "loan_reference") == {"LN004", "LN005"}
+        assert _refs(subset.lending_mappings, "child_counterparty_reference") == {"CP003"}
+        assert _refs(subset.facilities, "facility_reference") == set()
+
+    def test_unrelated_exposures_excluded(self, raw_data: RawDataBundle) -> None:
+        """An isolated exposure's closure holds only its own rows."""
+        subset = ExposureExplainer().closure(raw_data, "LN006")
+
+        assert _refs(subset.loans, "loan_reference") == {"LN006"}
+        assert _refs(subset.counterparties, "counterparty_reference") == {"CP004"}
+        assert _refs(subset.provisions, "provision_reference") == {"PRV002"}
+        assert _refs(subset.guarantees, "guarantee_reference") == set()
+
+    def test_undrawn_reference_maps_to_facility(self, raw_data: RawDataBundle) -> None:
+        """A facility undrawn reference resolves to the facility itself."""
+        subset = ExposureExplainer().closure(raw_data, "FAC001_UNDRAWN")
+
+        assert _refs(subset.facilities, "facility_reference") == {"FAC001"}
+        assert _refs(subset.loans, "loan_reference") == {"LN001", "LN002", "LN003"}
+
+    def test_co_owner_contributes_rows_only(self, shared_data: RawDataBundle) -> None:
+        """A facility child held by another counterparty does not pull in that owner's book."""
+        subset = ExposureExplainer().closure(shared_data, "LN002")
+
+        assert _refs(subset.loans, "loan_reference") == {"LN001", "LN002", "LN003", "LN007"}
+        assert "CP004" in _refs(subset.counterparties, "counterparty_reference")
+
+    def test_guarantor_book_excluded(self, shared_data: RawDataBundle) -> None:
+        """A guarantor contributes its counterparty and rating rows, not its exposures."""
+        subset = ExposureExplainer().closure(shared_data, "LN001")
+
+        assert "LN008" not in _refs(subset.loans, "loan_reference")
+        assert "CP006" in _refs(subset.counterparties, "counterparty_reference")
+        assert "RTG006" in _refs(subset.ratings, "rating_reference")
+
+    def test_unknown_exposure_raises(self, raw_data: RawDataBundle) -> None:
+        """Unknown references raise ValueError."""
+        with pytest.raises(ValueError, match="not found"):
+            ExposureExplainer().closure(raw_data, "MISSING")
+
+
+def _assert_matches_full_run(
+    data: RawDataBundle,
+    config: CalculationConfig,
+    reference: str,
+) -> None:
+    """Explained row equals the full-run row; floats to rel 1e-9 (summation order)."""
+    full = (
+        PipelineOrchestrator()
+        .run_with_data(data, config)
+        .results
+        .filter(pl.col("exposure_reference") == reference)
+        .collect()
+    )
+
+    explanation = ExposureExplainer().explain(data, reference, config)
+
+    assert isinstance(explanation, ExposureExplanation)
+    assert explanation.results.height == 1
+    explained = explanation.results.select(full.columns).row(0, named=True)
+    for column, expected in full.row(0, named=True).items():
+        if isinstance(expected, float):
+            assert explained[column] == pytest.approx(expected, rel=1e-9, nan_ok=True), column
+        else:
+            assert explained[column] == expected, column
+
+
+# =============================================================================
+# Explain Tests
+# =============================================================================
+
+
+class TestExplain:
+    """Tests for ExposureExplainer.explain."""
+
+    @pytest.mark.parametrize("reference", ["LN001", "LN003", "LN005", "LN006"])
+    def test_matches_full_run(
+        self,
+        raw_data: RawDataBundle,
+        config: CalculationConfig,
+        reference: str,
+    ) -> None:
+        """Explained rows equal the exposure's rows from a full run."""
+        _assert_matches_full_run(raw_data, config, reference)
+
+    @pytest.mark.parametrize("reference", ["LN001", "LN002", "LN007"])
+    def test_matches_full_run_with_shared_facility(
+        self,
+        shared_data: RawDataBundle,
+        config: CalculationConfig,
+        reference: str,
+    ) -> None:
+        """The bounded closure still reproduces the full run for co-owned facilities."""
+        _assert_matches_full_run(shared_data, config, reference)
+
+    def test_forces_full_audit(self, raw_data: RawDataBundle) -> None:
+        """Audit strings are rendered even when the config skips them."""
+        config = CalculationConfig.crr(
+            reporting_date=date(2024, 12, 31),
+            audit_mode="none",
+        )
+
+        explanation = ExposureExplainer().explain(raw_data, "LN006", config)
+
+        assert "classification_reason" in explanation.results.columns
+        assert explanation.results["classification_reason"][0] is not None
+
+    def test_factory(self) -> None:
+        """create_exposure_explainer returns an explainer."""
+        assert isinstance(create_exposure_explainer(), ExposureExplainer)
@@ -695,3 +695,114 @@ class TestRetailThresholdsDynamicRate:
 
         assert config.retail_thresholds.max_exposure_threshold == Decimal("1000000") * rate
         assert config.retail_thresholds.qrre_max_limit == Decimal("100000") * rate
+
+
+# =============================================================================
+# RATE RESOLUTION TESTS
+# =============================================================================
+
+
+class TestResolveRates:
+    """Tests for FXConverter.resolve_rates."""
+
+    def test_direct_quotes(
+        self,
+        fx_converter: FXConverter,
+        fx_rates: pl.LazyFrame,
+        config: CalculationConfig,
+    ) -> None:
+        """Direct quotes are used as-is; the base currency has no entry."""
+        vector = fx_converter.resolve_rates(fx_rates, config)
+
+        assert vector.rates["USD"] == pytest.approx(0.79)
+        assert vector.sources["USD"] == "direct"
+        assert "GBP" not in vector.rates
+
+    def test_inverse_quote(self, fx_converter: FXConverter, config: CalculationConfig) -> None:
+        """A quote from the base currency is inverted."""
+        rates = pl.LazyFrame({
+            "currency_from": ["GBP"],
+            "currency_to": ["SEK"],
+            "rate": [13.5],
+        })
+
+        vector = fx_converter.resolve_rates(rates, config)
+
+        assert vector.rates["SEK"] == pytest.approx(1 / 13.5)
+        assert vector.sources["SEK"] == "inverse"
+
+    def test_triangulated_through_pivot(
+        self,
+        fx_converter: FXConverter,
+        config: CalculationConfig,
+    ) -> None:
+        """Currencies quoted only against the pivot use the cross rate."""
+        rates = pl.LazyFrame({
+            "currency_from": ["USD", "USD"],
+            "currency_to": ["GBP", "ZAR"],
+            "rate": [0.79, 18.0],
+        })
+        exposures = pl.LazyFrame({
+            "exposure_reference": ["EXP_ZAR"],
+            "exposure_type": ["loan"],
+            "currency": ["ZAR"],
+            "drawn_amount": [18000.0],
+            "interest": [0.0],
+            "undrawn_amount": [0.0],
+            "nominal_amount": [0.0],
+        })
+
+        vector = fx_converter.resolve_rates(rates, config)
+        df = fx_converter.convert_exposures(exposures, rates, config).collect()
+
+        assert vector.sources["ZAR"] == "triangulated"
+        assert df["drawn_amount"][0] == pytest.approx(790.0)
+        assert df["currency"][0] == "GBP"
+
+    def test_latest_dated_rate_and_staleness(
+        self,
+        fx_converter: FXConverter,
+        config: CalculationConfig,
+    ) -> None:
+        """The latest rate on or before the reporting date is used and flagged if old."""
+        rates = pl.LazyFrame({
+            "currency_from": ["USD", "USD", "USD", "EUR"],
+            "currency_to": ["GBP"] * 4,
+            "rate": [0.75, 0.79, 0.99, 0.88],
+            "rate_date": [
+                date(2025, 12, 30), date(2025, 12, 31), date(2026, 2, 1), date(2025, 11, 1),
+            ],
+        })
+
+        vector = fx_converter.resolve_rates(rates, config)
+
+        assert vector.rates["USD"] == pytest.approx(0.79)
+        assert vector.stale == ("EUR",)
+
+    def test_unresolved_currency(
+        self,
+        fx_converter: FXConverter,
+        config: CalculationConfig,
+    ) -> None:
+        """A currency with no path into the base currency is listed as unresolved."""
+        rates = pl.LazyFrame({
+            "currency_from": ["USD", "CHF"],
+            "currency_to": ["GBP", "JPY"],
+            "rate": [0.79, 170.0],
+        })
+
+        vector = fx_converter.resolve_rates(rates, config)
+
+        assert vector.unresolved == ("CHF", "JPY")
+        assert "CHF" not in vector.rates
+
+    def test_memoised_per_rates_table(
+        self,
+        fx_converter: FXConverter,
+        fx_rates: pl.LazyFrame,
+        config: CalculationConfig,
+    ) -> None:
+        """Resolving the same table twice returns the same vector."""
+        first = fx_converter.resolve_rates(fx_rates, config)
+
+        assert fx_converter.resolve_rates(fx_rates, config) is first
@@ -10,6 +10,7 @@ Tests cover:
 
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import date
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -744,6 +745,29 @@ class TestFullResolution:
         assert result.lending_group_totals is not None
         assert isinstance(result.hierarchy_errors, list)
 
+    def test_fx_rate_errors_reported(
+        self,
+        resolver: HierarchyResolver,
+        simple_raw_data_bundle: RawDataBundle,
+        crr_config: CalculationConfig,
+    ) -> None:
+        """Stale and unresolvable FX rates are reported as hierarchy errors."""
+        fx_rates = pl.LazyFrame({
+            "currency_from": ["USD", "CHF"],
+            "currency_to": ["GBP", "JPY"],
+            "rate": [0.79, 170.0],
+            "rate_date": [crr_config.reporting_date, date(2020, 1, 1)],
+        })
+        data = replace(simple_raw_data_bundle, fx_rates=fx_rates)
+
+        errors = resolver.resolve(data, crr_config).hierarchy_errors
+
+        missing = [e for e in errors if e.error_type == "missing_fx_rate"]
+        assert len(missing) == 1
+        assert missing[0].context == {"currencies": ["CHF", "JPY"]}
+        assert "GBP" in missing[0].message
+        assert not [e for e in errors if e.error_type == "stale_fx_rate"]
+
     def test_resolve_with_real_fixtures(
         self,
         resolver: HierarchyResolver,
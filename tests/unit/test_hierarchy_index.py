@@ -0,0 +1,251 @@
+"""
+Unit tests for the persisted hierarchy index.
+
+Tests cover:
+- Built roots match HierarchyResolver's from-scratch resolution
+- Unchanged mappings reuse the index
+- Re-parenting re-roots descendants; only the affected subtree is re-walked
+- Removed edges drop their rows
+- Parquet save/load round trip
+- Files from different saves are rejected; concurrent readers never see a mix
+- HierarchyResolver with an index directory
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from rwa_calc.contracts.bundles import RawDataBundle
+from rwa_calc.contracts.config import CalculationConfig
+from rwa_calc.engine.hierarchy import HierarchyResolver
+from rwa_calc.engine.hierarchy_index import HierarchyIndex
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+def _org(edges: list[tuple[str, str]]) -> pl.LazyFrame:
+    """Org mappings from (child, parent) pairs."""
+    return pl.LazyFrame(
+        {
+            "child_counterparty_reference": [c for c, _ in edges],
+            "parent_counterparty_reference": [p for _, p in edges],
+        },
+        schema={
+            "child_counterparty_reference": pl.String,
+            "parent_counterparty_reference": pl.String,
+        },
+    )
+
+
+def _facilities(edges: list[tuple[str, str]]) -> pl.LazyFrame:
+    """Facility mappings from (sub-facility, parent) pairs plus one loan row."""
+    return pl.LazyFrame({
+        "child_reference": [c for c, _ in edges] + ["LN001"],
+        "parent_facility_reference": [p for _, p in edges] + ["FAC_A"],
+        "child_type": ["facility"] * len(edges) + ["loan"],
+    })
+
+
+@pytest.fixture
+def org_edges() -> list[tuple[str, str]]:
+    """Two trees: C -> B -> A and E -> D."""
+    return [("B", "A"), ("C", "B"), ("E", "D")]
+
+
+def _roots(frame: pl.LazyFrame | pl.DataFrame) -> dict[str, tuple[str, int]]:
+    """child -> (root, depth) from a lookup in either format."""
+    df = frame.collect() if isinstance(frame, pl.LazyFrame) else frame
+    child, root, depth = df.columns
+    return {row[child]: (row[root], row[depth]) for row in df.iter_rows(named=True)}
+
+
+# =============================================================================
+# Build and Update Tests
+# =============================================================================
+
+
+class TestHierarchyIndex:
+    """Tests for HierarchyIndex.build and update."""
+
+    def test_build_matches_resolver(self, org_edges: list[tuple[str, str]]) -> None:
+        """Indexed roots equal the resolver's iterative resolution."""
+        org = _org(org_edges)
+        facilities = _facilities([("FAC_B", "FAC_A"), ("FAC_C", "FAC_B")])
+        index = HierarchyIndex.build(org, facilities)
+        resolver = HierarchyResolver()
+
+        assert _roots(index.ultimate_parent_lookup()) == _roots(
+            resolver._build_ultimate_parent_lazy(org)
+        )
+        assert _roots(index.facility_root_lookup()) == _roots(
+            resolver._build_facility_root_lookup(facilities)
+        )
+
+    def test_unchanged_reuses_index(self, org_edges: list[tuple[str, str]]) -> None:
+        """No edge change returns the same index."""
+        index = HierarchyIndex.build(_org(org_edges), None)
+
+        assert index.update(_org(list(reversed(org_edges))), None) is index
+
+    def test_reparent_reroots_descendants(self, org_edges: list[tuple[str, str]]) -> None:
+        """Moving B under D re-roots B and C; E is untouched."""
+        index = HierarchyIndex.build(_org(org_edges), None)
+
+        updated = index.update(_org([("B", "D"), ("C", "B"), ("E", "D")]), None)
+
+        assert _roots(updated.ultimate_parents) == {
+            "B": ("D", 1),
+            "C": ("D", 2),
+            "E": ("D", 1),
+        }
+        assert updated.recomputed == 2
+
+    def test_new_parent_above_root(self, org_edges: list[tuple[str, str]]) -> None:
+        """A former root gaining a parent re-roots its whole tree."""
+        index = HierarchyIndex.build(_org(org_edges), None)
+
+        updated = index.update(_org([*org_edges, ("A", "Z")]), None)
+
+        assert _roots(updated.ultimate_parents)["C"] == ("Z", 3)
+        assert updated.recomputed == 3
+
+    def test_removed_edge_dropped(self, org_edges: list[tuple[str, str]]) -> None:
+        """A child without an edge no longer appears."""
+        index = HierarchyIndex.build(_org(org_edges), None)
+
+        updated = index.update(_org([("C", "B"), ("E", "D")]), None)
+
+        assert _roots(updated.ultimate_parents) == {"C": ("B", 1), "E": ("D", 1)}
+
+
+# =============================================================================
+# Persistence Tests
+# =============================================================================
+
+
+class TestPersistence:
+    """Tests for save/load and the resolver integration."""
+
+    def test_round_trip(self, org_edges: list[tuple[str, str]], tmp_path: Path) -> None:
+        """A saved index loads back with the same roots."""
+        index = HierarchyIndex.build(_org(org_edges), _facilities([("FAC_B", "FAC_A")]))
+        index.save(tmp_path)
+
+        loaded = HierarchyIndex.load(tmp_path)
+
+        assert loaded is not None
+        assert _roots(loaded.ultimate_parents) == _roots(index.ultimate_parents)
+        assert _roots(loaded.facility_roots) == _roots(index.facility_roots)
+
+    def test_load_missing(self, tmp_path: Path) -> None:
+        """An empty directory holds no index."""
+        assert HierarchyIndex.load(tmp_path) is None
+
+    def test_mixed_versions_rejected(
+        self,
+        org_edges: list[tuple[str, str]],
+        tmp_path: Path,
+    ) -> None:
+        """A directory holding files from two saves loads as no index."""
+        first, second = tmp_path / "first", tmp_path / "second"
+        HierarchyIndex.build(_org(org_edges[:1]), None).save(first)
+        HierarchyIndex.build(_org(org_edges), None).save(second)
+        (second / "ultimate_parents.parquet").replace(first / "ultimate_parents.parquet")
+
+        assert HierarchyIndex.load(first) is None
+
+    def test_concurrent_readers_see_whole_versions(
+        self,
+        org_edges: list[tuple[str, str]],
+        tmp_path: Path,
+    ) -> None:
+        """Readers racing separate writers load one whole save or none."""
+        small = HierarchyIndex.build(_org(org_edges[:1]), None)
+        large = HierarchyIndex.build(_org(org_edges), None)
+        small.save(tmp_path)
+        mismatches: list[int] = []
+
+        def write(index: HierarchyIndex) -> None:
+            for _ in range(20):
+                index.save(tmp_path)
+
+        def read() -> None:
+            for _ in range(40):
+                loaded = HierarchyIndex.load(tmp_path)
+                if loaded is not None and (
+                    loaded.org_edges.height != loaded.ultimate_parents.height
+                ):
+                    mismatches.append(1)
+
+        threads = [
+            threading.Thread(target=write, args=(small,)),
+            threading.Thread(target=write, args=(large,)),
+            threading.Thread(target=read),
+            threading.Thread(target=read),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not mismatches
+
+    def test_resolver_uses_index(
+        self,
+        org_edges: list[tuple[str, str]],
+        tmp_path: Path,
+    ) -> None:
+        """Resolution with an index matches resolution without and persists the index."""
+        config = CalculationConfig.crr(reporting_date=date(2024, 12, 31))
+        data = RawDataBundle(
+            facilities=pl.LazyFrame(schema={
+                "facility_reference": pl.String,
+                "counterparty_reference": pl.String,
+                "currency": pl.String,
+                "limit": pl.Float64,
+            }),
+            loans=pl.LazyFrame({
+                "loan_reference": ["LN001"],
+                "counterparty_reference": ["C"],
+                "product_type": ["TERM_LOAN"],
+                "book_code": ["BANK"],
+                "value_date": [date(2023, 1, 1)],
+                "maturity_date": [date(2028, 1, 1)],
+                "currency": ["GBP"],
+                "drawn_amount": [1000.0],
+                "lgd": [0.45],
+                "seniority": ["senior"],
+            }),
+            counterparties=pl.LazyFrame({
+                "counterparty_reference": ["A", "B", "C", "D", "E"],
+                "entity_type": ["corporate"] * 5,
+                "country_code": ["GB"] * 5,
+            }),
+            facility_mappings=pl.LazyFrame(schema={
+                "child_reference": pl.String,
+                "parent_facility_reference": pl.String,
+            }),
+            lending_mappings=pl.LazyFrame(schema={
+                "child_counterparty_reference": pl.String,
+                "parent_counterparty_reference": pl.String,
+            }),
+            org_mappings=_org(org_edges),
+        )
+
+        indexed = HierarchyResolver(index_dir=tmp_path).resolve(data, config)
+        plain = HierarchyResolver().resolve(data, config)
+
+        assert HierarchyIndex.load(tmp_path) is not None
+        assert _roots(indexed.counterparty_lookup.ultimate_parent_mappings) == _roots(
+            plain.counterparty_lookup.ultimate_parent_mappings
+        )
+        assert indexed.exposures.select("ultimate_parent_reference").collect().equals(
+            plain.exposures.select("ultimate_parent_reference").collect()
+        )
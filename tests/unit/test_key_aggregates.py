@@ -0,0 +1,200 @@
+"""
+Unit tests for shared per-key aggregates.
+
+Tests cover:
+- One table per key with every measure and an exposure count
+- Lending group totals and first-value attributes per key
+- Null keys excluded, missing key columns give empty tables
+- Totals renamed and attached by left join
+- Tables reused until their key or a measure input changes
+"""
+
+from __future__ import annotations
+
+import polars as pl
+import pytest
+
+from rwa_calc.engine.key_aggregates import (
+    COUNTERPARTY_KEY,
+    FACILITY_KEY,
+    LENDING_GROUP_KEY,
+    KeyAggregates,
+)
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def exposures() -> pl.LazyFrame:
+    """Four exposures over two counterparties in one lending group, three under one facility."""
+    return pl.LazyFrame({
+        "exposure_reference": ["E1", "E2", "E3", "E4"],
+        "counterparty_reference": ["CP1", "CP1", "CP2", "CP2"],
+        "parent_facility_reference": ["F1", "F1", "F1", None],
+        "lending_group_reference": ["LG1", "LG1", "LG1", "LG1"],
+        "currency": ["GBP", "GBP", "EUR", "USD"],
+        "ead_gross": [100.0, 200.0, 300.0, 400.0],
+        "provision": [1.0, 2.0, 3.0, 4.0],
+    })
+
+
+@pytest.fixture
+def aggregates(exposures: pl.LazyFrame) -> KeyAggregates:
+    """EAD and provision totals."""
+    return KeyAggregates(exposures, {
+        "ead_gross": pl.col("ead_gross"),
+        "provision": pl.col("provision"),
+    })
+
+
+# =============================================================================
+# Table Tests
+# =============================================================================
+
+
+class TestTable:
+    """Tests for KeyAggregates.table and totals."""
+
+    def test_counterparty_totals(self, aggregates: KeyAggregates) -> None:
+        """Every measure is summed per counterparty."""
+        df = aggregates.table(COUNTERPARTY_KEY).collect().sort(COUNTERPARTY_KEY)
+
+        assert df[COUNTERPARTY_KEY].to_list() == ["CP1", "CP2"]
+        assert df["ead_gross"].to_list() == [300.0, 700.0]
+        assert df["provision"].to_list() == [3.0, 7.0]
+        assert df["exposure_count"].to_list() == [2, 2]
+
+    def test_null_keys_excluded(self, aggregates: KeyAggregates) -> None:
+        """Exposures without a facility do not form a group."""
+        df = aggregates.table(FACILITY_KEY).collect()
+
+        assert df[FACILITY_KEY].to_list() == ["F1"]
+        assert df["ead_gross"].to_list() == [600.0]
+
+    def test_lending_group_totals(self, aggregates: KeyAggregates) -> None:
+        """Lending groups are a built-in key."""
+        df = aggregates.table(LENDING_GROUP_KEY).collect()
+
+        assert df["ead_gross"].to_list() == [1000.0]
+        assert df["exposure_count"].to_list() == [4]
+
+    def test_first_aggregation(self, exposures: pl.LazyFrame) -> None:
+        """aggregation="first" takes the first exposure's value per key."""
+        terms = KeyAggregates(exposures, {"currency": pl.col("currency")}, aggregation="first")
+        df = terms.table(COUNTERPARTY_KEY).collect().sort(COUNTERPARTY_KEY)
+
+        assert df["currency"].to_list() == ["GBP", "EUR"]
+
+    def test_first_aggregation_missing_key(self) -> None:
+        """Empty tables keep the dtype of the aggregated measure."""
+        lf = pl.LazyFrame({"counterparty_reference": ["CP1"], "currency": ["GBP"]})
+        terms = KeyAggregates(lf, {"currency": pl.col("currency")}, aggregation="first")
+
+        assert terms.table(FACILITY_KEY).collect_schema()["currency"] == pl.String
+
+    def test_table_memoised(self, aggregates: KeyAggregates) -> None:
+        """Repeated calls return the same lazy table."""
+        assert aggregates.table(FACILITY_KEY) is aggregates.table(FACILITY_KEY)
+
+    def test_missing_key_column(self) -> None:
+        """A frame without the key column gives an empty table."""
+        lf = pl.LazyFrame({"counterparty_reference": ["CP1"], "ead_gross": [1.0]})
+        df = KeyAggregates(lf, {"ead_gross": pl.col("ead_gross")}).table(FACILITY_KEY).collect()
+
+        assert df.height == 0
+        assert df.columns == [FACILITY_KEY, "ead_gross", "exposure_count"]
+
+    def test_unknown_key_raises(self, aggregates: KeyAggregates) -> None:
+        """Keys outside the configured set raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown aggregate key"):
+            aggregates.table("guarantor_reference")
+
+    def test_totals_renamed(self, aggregates: KeyAggregates) -> None:
+        """totals selects the key and the requested measures under new names."""
+        df = aggregates.totals(COUNTERPARTY_KEY, {"ead_gross": "cp_ead_total"}).collect()
+
+        assert df.columns == [COUNTERPARTY_KEY, "cp_ead_total"]
+
+
+# =============================================================================
+# Attach Tests
+# =============================================================================
+
+
+class TestAttach:
+    """Tests for KeyAggregates.attach."""
+
+    def test_left_join(self, aggregates: KeyAggregates, exposures: pl.LazyFrame) -> None:
+        """Each exposure gets its facility total; null keys get null."""
+        df = aggregates.attach(
+            exposures, FACILITY_KEY, {"ead_gross": "fac_ead_total"}
+        ).collect().sort("exposure_reference")
+
+        assert df["fac_ead_total"].to_list() == [600.0, 600.0, 600.0, None]
+
+    def test_missing_key_adds_nulls(self, aggregates: KeyAggregates) -> None:
+        """A frame without the key column gets null totals."""
+        lf = pl.LazyFrame({"exposure_reference": ["E1"]})
+        df = aggregates.attach(lf, FACILITY_KEY, {"ead_gross": "fac_ead_total"}).collect()
+
+        assert df["fac_ead_total"].to_list() == [None]
+
+
+# =============================================================================
+# Invalidation Tests
+# =============================================================================
+
+
+class TestWithExposures:
+    """Tests for KeyAggregates.with_exposures."""
+
+    def test_unrelated_change_reuses(
+        self, aggregates: KeyAggregates, exposures: pl.LazyFrame
+    ) -> None:
+        """Changing a column no measure or key reads keeps the built tables."""
+        table = aggregates.table(COUNTERPARTY_KEY)
+        updated = exposures.with_columns(pl.col("ead_gross").alias("ead_after_collateral"))
+        refreshed = aggregates.with_exposures(updated, ["ead_after_collateral"])
+
+        assert refreshed.table(COUNTERPARTY_KEY) is table
+
+    def test_measure_change_recomputes(
+        self, aggregates: KeyAggregates, exposures: pl.LazyFrame
+    ) -> None:
+        """Changing a measure input rebuilds the tables from the new frame."""
+        table = aggregates.table(COUNTERPARTY_KEY)
+        updated = exposures.with_columns(pl.col("ead_gross") * 2)
+        refreshed = aggregates.with_exposures(updated, ["ead_gross"])
+
+        df = refreshed.table(COUNTERPARTY_KEY).collect().sort(COUNTERPARTY_KEY)
+
+        assert refreshed.table(COUNTERPARTY_KEY) is not table
+        assert df["ead_gross"].to_list() == [600.0, 1400.0]
+
+    def test_key_change_recomputes_that_key(
+        self, aggregates: KeyAggregates, exposures: pl.LazyFrame
+    ) -> None:
+        """Changing a key column rebuilds only that key's table."""
+        facility = aggregates.table(FACILITY_KEY)
+        counterparty = aggregates.table(COUNTERPARTY_KEY)
+        updated = exposures.with_columns(pl.lit("CP1").alias(COUNTERPARTY_KEY))
+        refreshed = aggregates.with_exposures(updated, [COUNTERPARTY_KEY])
+
+        df = refreshed.table(COUNTERPARTY_KEY).collect()
+
+        assert refreshed.table(FACILITY_KEY) is facility
+        assert refreshed.table(COUNTERPARTY_KEY) is not counterparty
+        assert df["ead_gross"].to_list() == [1000.0]
+
+    def test_unbuilt_tables_use_new_frame(
+        self, aggregates: KeyAggregates, exposures: pl.LazyFrame
+    ) -> None:
+        """Tables first requested after the update are built from the new frame."""
+        updated = exposures.filter(pl.col("exposure_reference") != "E4")
+        refreshed = aggregates.with_exposures(updated, [COUNTERPARTY_KEY])
+
+        df = refreshed.table(COUNTERPARTY_KEY).collect().sort(COUNTERPARTY_KEY)
+
+        assert df["ead_gross"].to_list() == [300.0, 300.0]
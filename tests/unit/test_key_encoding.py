@@ -0,0 +1,274 @@
+"""
+Unit tests for dictionary-encoded reference keys.
+
+Tests cover:
+- Encode/decode round trips, including facility undrawn references
+- Each dictionary owns its own category mapping
+- Helpers fall through to string behaviour without an active dictionary
+- Pipeline runs on encoded keys match runs on string keys, decoded at output
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import polars as pl
+import pytest
+
+from rwa_calc.contracts.bundles import (
+    AggregatedResultBundle,
+    PerimeterResultBundle,
+    RawDataBundle,
+)
+from rwa_calc.contracts.config import CalculationConfig
+from rwa_calc.engine.key_encoding import (
+    KeyDictionary,
+    is_encoded,
+    is_key_column,
+    key_dtype,
+    undrawn_reference,
+    with_key_text,
+)
+from rwa_calc.engine.pipeline import PipelineOrchestrator
+from rwa_calc.engine.sa.calculator import SACalculator
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def config() -> CalculationConfig:
+    """CRR configuration for testing."""
+    return CalculationConfig.crr(reporting_date=date(2024, 12, 31))
+
+
+@pytest.fixture
+def raw_data() -> RawDataBundle:
+    """A facility with two loans, a guarantee and a provision on its undrawn amount."""
+    return RawDataBundle(
+        facilities=pl.LazyFrame({
+            "facility_reference": ["FAC001"],
+            "counterparty_reference": ["CP001"],
+            "product_type": ["RCF"],
+            "book_code": ["BANK"],
+            "currency": ["GBP"],
+            "limit": [2000000.0],
+            "value_date": [date(2023, 1, 1)],
+            "maturity_date": [date(2028, 1, 1)],
+            "lgd": [0.45],
+            "seniority": ["senior"],
+            "risk_type": ["MR"],
+        }),
+        loans=pl.LazyFrame({
+            "loan_reference": ["LN001", "LN002"],
+            "counterparty_reference": ["CP001", "CP002"],
+            "product_type": ["TERM_LOAN"] * 2,
+            "book_code": ["BANK"] * 2,
+            "value_date": [date(2023, 1, 1)] * 2,
+            "maturity_date": [date(2028, 1, 1)] * 2,
+            "currency": ["GBP"] * 2,
+            "drawn_amount": [500000.0, 80000.0],
+            "lgd": [0.45] * 2,
+            "seniority": ["senior"] * 2,
+        }),
+        counterparties=pl.LazyFrame({
+            "counterparty_reference": ["CP001", "CP002", "CP003"],
+            "counterparty_name": ["Corp", "Corp 2", "Bank"],
+            "entity_type": ["corporate", "corporate", "institution"],
+            "country_code": ["GB"] * 3,
+            "annual_revenue": [30000000.0, 60000000.0, None],
+            "total_assets": [50000000.0, 80000000.0, None],
+            "default_status": [False] * 3,
+            "sector_code": ["62.01", "62.01", "64.19"],
+            "is_regulated": [False, False, True],
+            "is_managed_as_retail": [False] * 3,
+        }),
+        guarantees=pl.LazyFrame({
+            "guarantee_reference": ["GTE001"],
+            "guarantee_type": ["guarantee"],
+            "guarantor": ["CP003"],
+            "currency": ["GBP"],
+            "maturity_date": [date(2028, 1, 1)],
+            "amount_covered": [200000.0],
+            "percentage_covered": [None],
+            "beneficiary_type": ["loan"],
+            "beneficiary_reference": ["LN001"],
+        }, schema_overrides={"percentage_covered": pl.Float64}),
+        provisions=pl.LazyFrame({
+            "provision_reference": ["PRV001"],
+            "provision_type": ["SCRA"],
+            "ifrs9_stage": [1],
+            "currency": ["GBP"],
+            "amount": [1000.0],
+            "as_of_date": [date(2024, 12, 31)],
+            "beneficiary_type": ["loan"],
+            "beneficiary_reference": ["FAC001_UNDRAWN"],
+        }, schema_overrides={"ifrs9_stage": pl.Int8}),
+        facility_mappings=pl.LazyFrame({
+            "child_reference": ["LN001"],
+            "parent_facility_reference": ["FAC001"],
+        }),
+        lending_mappings=pl.LazyFrame(schema={
+            "child_counterparty_reference": pl.String,
+            "parent_counterparty_reference": pl.String,
+        }),
+    )
+
+
+# =============================================================================
+# Dictionary Tests
+# =============================================================================
+
+
+class TestKeyDictionary:
+    """Tests for KeyDictionary encode and decode."""
+
+    def test_round_trip(self) -> None:
+        """Decoding an encoded frame restores the references."""
+        dictionary = KeyDictionary()
+        lf = pl.LazyFrame({"counterparty_reference": ["CP002", None, "CP001"]})
+
+        encoded = dictionary.encode(lf, ["counterparty_reference"])
+        decoded = dictionary.decode(encoded)
+
+        assert encoded.collect_schema()["counterparty_reference"] == dictionary.dtype
+        assert decoded.collect().equals(lf.collect())
+
+    def test_joins_on_codes(self) -> None:
+        """Frames encoded separately by one dictionary join on their codes."""
+        dictionary = KeyDictionary()
+        left = dictionary.encode(pl.LazyFrame({"ref": ["B", "A", "C"]}), ["ref"])
+        right = dictionary.encode(pl.LazyFrame({"ref": ["A", "B"], "v": [1, 2]}), ["ref"])
+
+        joined = left.join(right, on="ref", how="left", maintain_order="left").collect()
+
+        assert joined["v"].to_list() == [2, 1, None]
+        assert joined.sort("ref")["ref"].cast(pl.String).to_list() == ["A", "B", "C"]
+
+    def test_dictionaries_are_separate(self) -> None:
+        """Every run gets its own category mapping."""
+        first, second = KeyDictionary(), KeyDictionary()
+
+        assert is_encoded(first.dtype)
+        assert first.dtype != second.dtype
+
+    def test_encode_bundle(self, raw_data: RawDataBundle) -> None:
+        """Reference columns are encoded; item identifiers stay strings."""
+        dictionary = KeyDictionary()
+        schema = dictionary.encode_bundle(raw_data).guarantees.collect_schema()
+
+        assert schema["guarantor"] == dictionary.dtype
+        assert schema["beneficiary_reference"] == dictionary.dtype
+        assert schema["guarantee_reference"] == pl.String
+
+    def test_decode_nested_bundle(self) -> None:
+        """Key columns of nested bundles are decoded too."""
+        dictionary = KeyDictionary()
+        groups = dictionary.encode(
+            pl.LazyFrame({"perimeter_id": ["SOLO"], "lending_group_reference": ["LG1"]}),
+            ["lending_group_reference"],
+        )
+        bundle = AggregatedResultBundle(
+            results=dictionary.encode(pl.LazyFrame({"exposure_reference": ["E1"]}), [
+                "exposure_reference",
+            ]),
+            perimeter_results=PerimeterResultBundle(
+                summary_by_class=pl.LazyFrame({"perimeter_id": ["SOLO"]}),
+                summary_by_approach=pl.LazyFrame({"perimeter_id": ["SOLO"]}),
+                lending_groups=groups,
+            ),
+        )
+
+        decoded = dictionary.decode_bundle(bundle)
+
+        assert decoded.results.collect_schema()["exposure_reference"] == pl.String
+        lending_groups = decoded.perimeter_results.lending_groups.collect()
+        assert lending_groups["lending_group_reference"].to_list() == ["LG1"]
+
+
+# =============================================================================
+# Helper Tests
+# =============================================================================
+
+
+class TestHelpers:
+    """Tests for the encoding-agnostic helpers."""
+
+    def test_string_fallbacks(self) -> None:
+        """Without an active dictionary the helpers use strings."""
+        lf = pl.LazyFrame({"facility_reference": ["FAC001"]})
+        df = lf.select(undrawn_reference("facility_reference", pl.String)).collect()
+
+        assert key_dtype() == pl.String
+        assert df["facility_reference"].to_list() == ["FAC001_UNDRAWN"]
+        assert with_key_text(lf, "facility_reference", "text").collect()["text"][0] == "FAC001"
+
+    def test_active_dictionary(self) -> None:
+        """With an active dictionary the helpers work on encoded keys."""
+        dictionary = KeyDictionary()
+        lf = dictionary.encode(pl.LazyFrame({"facility_reference": ["FAC001"]}), [
+            "facility_reference",
+        ])
+
+        with dictionary.activate():
+            assert key_dtype() == dictionary.dtype
+            undrawn = lf.select(undrawn_reference("facility_reference", dictionary.dtype))
+            text = with_key_text(undrawn, "facility_reference", "text").collect()
+
+        assert text["facility_reference"].dtype == dictionary.dtype
+        assert text["text"].to_list() == ["FAC001_UNDRAWN"]
+
+    @pytest.mark.parametrize("name, expected", [
+        ("exposure_reference", True),
+        ("guarantor", True),
+        ("reporting_counterparty", True),
+        ("post_crm_counterparty_guaranteed", True),
+        ("exposure_class", False),
+    ])
+    def test_is_key_column(self, name: str, expected: bool) -> None:
+        """Key columns are recognised by name."""
+        assert is_key_column(name) is expected
+
+
+# =============================================================================
+# Pipeline Tests
+# =============================================================================
+
+
+class TestPipelineEncodedKeys:
+    """Tests for PipelineOrchestrator with encode_keys."""
+
+    def test_results_match_string_keys(
+        self, raw_data: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        """Encoded runs produce the same results as string runs."""
+        encoded = PipelineOrchestrator(encode_keys=True).run_with_data(raw_data, config)
+        plain = PipelineOrchestrator().run_with_data(raw_data, config)
+
+        encoded_df = encoded.results.collect().sort("exposure_reference")
+        plain_df = plain.results.collect().sort("exposure_reference")
+
+        assert encoded_df.schema == plain_df.schema
+        assert encoded_df.equals(plain_df)
+        assert "FAC001_UNDRAWN" in encoded_df["exposure_reference"].to_list()
+
+    def test_calculators_run_on_encoded_keys(
+        self, raw_data: RawDataBundle, config: CalculationConfig
+    ) -> None:
+        """Keys stay encoded through the calculators and are decoded at output."""
+        calculator = SACalculator()
+        seen: list[pl.DataType] = []
+
+        def spy(data, cfg):
+            seen.append(data.sa_exposures.collect_schema()["exposure_reference"])
+            return calculator.get_sa_result_bundle(data, cfg)
+
+        sa = MagicMock(wraps=calculator, get_sa_result_bundle=spy)
+        result = PipelineOrchestrator(sa_calculator=sa, encode_keys=True).run_with_data(
+            raw_data, config
+        )
+
+        assert seen and is_encoded(seen[0])
+        assert result.results.collect_schema()["exposure_reference"] == pl.String
@@ -5,11 +5,15 @@ Tests cover:
 - DataLoadError exception
 - ParquetLoader class
 - CSVLoader class
+- CSVCache typed Parquet cache of CSV inputs
+- ExcelLoader class and sheet dtype mapping
 - create_test_loader convenience function
 """
 
 from __future__ import annotations
 
+import os
+from dataclasses import replace
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -18,12 +22,15 @@ import pytest
 
 from rwa_calc.contracts.bundles import RawDataBundle
 from rwa_calc.engine.loader import (
+    CSVCache,
     CSVLoader,
     DataLoadError,
     DataSourceConfig,
+    ExcelLoader,
     ParquetLoader,
     create_test_loader,
     enforce_schema,
+    excel_dtypes,
     normalize_columns,
 )
 
@@ -558,6 +565,190 @@ class TestCSVLoaderLoad:
             loader.load()
 
 
+class TestCSVLoaderCache:
+    """Tests for the CSVLoader Parquet cache."""
+
+    def test_cache_disabled_by_default(self, temp_csv_dir: Path) -> None:
+        """No cache directory is written unless caching is enabled."""
+        CSVLoader(temp_csv_dir).load()
+
+        assert not (temp_csv_dir / ".rwa_cache").exists()
+
+    def test_load_writes_cache(self, temp_csv_dir: Path) -> None:
+        """First load converts every CSV to Parquet."""
+        loader = CSVLoader(temp_csv_dir, cache=True)
+        loader.load()
+
+        cached = temp_csv_dir / ".rwa_cache" / "exposures" / "loans.parquet"
+        assert cached.exists()
+        assert (temp_csv_dir / ".rwa_cache" / "counterparty" / "retail.parquet").exists()
+        assert loader.warm_cache() == []
+
+    def test_cached_load_matches_csv_load(self, temp_csv_dir: Path) -> None:
+        """Cached data equals the directly parsed, schema-enforced data."""
+        direct = CSVLoader(temp_csv_dir).load()
+        CSVLoader(temp_csv_dir, cache=True).load()
+        cached = CSVLoader(temp_csv_dir, cache=True).load()
+
+        assert cached.loans.collect().equals(direct.loans.collect())
+        assert cached.counterparties.collect().equals(direct.counterparties.collect())
+
+    def test_changed_csv_is_reconverted(self, temp_csv_dir: Path) -> None:
+        """Editing a CSV invalidates its cache entry only."""
+        loader = CSVLoader(temp_csv_dir, cache=True)
+        loader.load()
+
+        pl.DataFrame({
+            "loan_id": ["LOAN001", "LOAN002"],
+            "facility_id": ["FAC001", "FAC001"],
+            "outstanding_balance": [1000000.0, 5.0],
+        }).write_csv(temp_csv_dir / "exposures" / "loans.csv")
+
+        assert loader.warm_cache() == ["exposures/loans.csv"]
+        assert loader.load().loans.collect().height == 2
+
+    def test_touched_csv_uses_content_hash(self, temp_csv_dir: Path) -> None:
+        """A new mtime with unchanged content keeps the cache entry."""
+        loader = CSVLoader(temp_csv_dir, cache=True)
+        loader.load()
+
+        source = temp_csv_dir / "exposures" / "loans.csv"
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert loader.warm_cache() == []
+
+    def test_schema_change_invalidates(self, temp_csv_dir: Path) -> None:
+        """Entries written without schema enforcement are not reused with it."""
+        CSVLoader(temp_csv_dir, enforce_schemas=False, cache=True).load()
+
+        assert CSVLoader(temp_csv_dir, cache=True).warm_cache() != []
+
+    def test_custom_cache_dir(self, temp_csv_dir: Path, tmp_path: Path) -> None:
+        """cache_dir enables caching in the given directory."""
+        cache_dir = tmp_path / "csv_cache"
+        loader = CSVLoader(temp_csv_dir, cache_dir=cache_dir)
+        loader.load()
+
+        assert isinstance(loader.cache, CSVCache)
+        assert (cache_dir / "exposures" / "facilities.parquet").exists()
+
+    def test_missing_required_file_still_raises(self, temp_csv_dir: Path) -> None:
+        """Caching does not change missing-file errors."""
+        (temp_csv_dir / "exposures" / "facilities.csv").unlink()
+
+        with pytest.raises(DataLoadError, match="File not found"):
+            CSVLoader(temp_csv_dir, cache=True).load()
+
+
+class TestExcelDtypes:
+    """Tests for excel_dtypes header-to-dtype mapping."""
+
+    def test_maps_schema_types(self) -> None:
+        """Polars schema types map to fastexcel dtypes."""
+        schema = {
+            "loan_reference": pl.String,
+            "drawn_amount": pl.Float64,
+            "cqs": pl.Int8,
+            "is_defaulted": pl.Boolean,
+            "maturity_date": pl.Date,
+        }
+        columns = ["loan_reference", "drawn_amount", "cqs", "is_defaulted", "maturity_date"]
+
+        assert excel_dtypes(columns, schema) == {
+            "loan_reference": "string",
+            "drawn_amount": "float",
+            "cqs": "int",
+            "is_defaulted": "boolean",
+            "maturity_date": "date",
+        }
+
+    def test_matches_normalised_headers(self) -> None:
+        """Headers are matched after lowercasing and replacing spaces."""
+        dtypes = excel_dtypes(["Drawn Amount", "Notes"], {"drawn_amount": pl.Float64})
+
+        assert dtypes == {"Drawn Amount": "float"}
+
+
+class TestExcelLoader:
+    """Tests for ExcelLoader."""
+
+    @pytest.fixture
+    def workbook(self, tmp_path: Path) -> Path:
+        """Workbook with one sheet per required table."""
+        pytest.importorskip("xlsxwriter")
+        import xlsxwriter
+
+        path = tmp_path / "portfolio.xlsx"
+        sheets = {
+            "corporate": pl.DataFrame({
+                "Counterparty Reference": ["CORP001"],
+                "entity_type": ["corporate"],
+                "annual_revenue": [1000000.0],
+            }),
+            "facilities": pl.DataFrame({
+                "facility_reference": ["FAC001"],
+                "counterparty_reference": ["CORP001"],
+                "limit": [500000.0],
+            }),
+            "loans": pl.DataFrame({
+                "loan_reference": ["LOAN001", "LOAN002"],
+                "counterparty_reference": ["CORP001", "CORP001"],
+                "drawn_amount": [100000.0, 25000.0],
+            }),
+            "facility_mapping": pl.DataFrame({
+                "parent_facility_reference": ["FAC001"],
+                "child_reference": ["LOAN001"],
+            }),
+            "lending_mapping": pl.DataFrame({
+                "parent_counterparty_reference": ["CORP001"],
+                "child_counterparty_reference": ["CORP001"],
+            }),
+        }
+        with xlsxwriter.Workbook(path) as wb:
+            for name, df in sheets.items():
+                df.write_excel(wb, worksheet=name)
+        return path
+
+    def test_init_with_missing_workbook_raises_error(self, tmp_path: Path) -> None:
+        """Missing workbook should raise DataLoadError."""
+        with pytest.raises(DataLoadError, match="Workbook does not exist"):
+            ExcelLoader(tmp_path / "missing.xlsx")
+
+    def test_default_config_uses_sheet_names(self, tmp_path: Path) -> None:
+        """Default config entries are plain sheet names."""
+        config = ExcelLoader._get_excel_config()
+
+        assert config.loans_file == "loans"
+        assert "corporate" in config.counterparty_files
+
+    def test_load_returns_typed_frames(self, workbook: Path) -> None:
+        """Sheets load as LazyFrames with normalised headers and schema types."""
+        bundle = ExcelLoader(workbook).load()
+
+        loans = bundle.loans.collect()
+        assert loans.height == 2
+        assert loans.schema["drawn_amount"] == pl.Float64
+        assert "counterparty_reference" in bundle.counterparties.collect_schema().names()
+        assert bundle.collateral is None
+
+    def test_missing_required_sheet_raises_error(self, workbook: Path) -> None:
+        """A missing required sheet should raise DataLoadError."""
+        config = replace(ExcelLoader._get_excel_config(), loans_file="drawn")
+
+        with pytest.raises(DataLoadError, match="Sheet not found"):
+            ExcelLoader(workbook, config=config).load()
+
+    def test_cache_reused(self, workbook: Path) -> None:
+        """Cached sheets are scanned from Parquet on later loads."""
+        first = ExcelLoader(workbook, cache=True).load()
+        cached = workbook.parent / ".rwa_cache" / "portfolio.xlsx" / "loans.parquet"
+
+        assert cached.exists()
+        second = ExcelLoader(workbook, cache=True).load()
+        assert second.loans.collect().equals(first.loans.collect())
+
+
 # =============================================================================
 # create_test_loader Tests
 # =============================================================================
@@ -700,8 +891,6 @@ class TestHeaderNormalization:
 
     def test_normalize_columns_function(self) -> None:
         """Test the normalize_columns helper function directly."""
-        from rwa_calc.engine.loader import normalize_columns
-
         lf = pl.LazyFrame({
             "Column One": [1],
             "COLUMN_TWO": [2],
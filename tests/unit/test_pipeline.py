@@ -7,11 +7,13 @@ Tests the PipelineOrchestrator component including:
 - Pre-loaded data execution
 - Error handling and accumulation
 - Stage isolation
+- Concurrent runs sharing one orchestrator
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import date
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
@@ -37,6 +39,7 @@ from rwa_calc.domain.enums import ApproachType, ExposureClass
 from rwa_calc.engine.pipeline import (
     PipelineOrchestrator,
     PipelineError,
+    RunContext,
     create_pipeline,
     create_test_pipeline,
 )
@@ -487,7 +490,7 @@ class TestPipelineStageExecution:
         pipeline = PipelineOrchestrator()
         pipeline._ensure_components_initialized()
 
-        result = pipeline._run_hierarchy_resolver(mock_raw_data, crr_config)
+        result = pipeline._run_hierarchy_resolver(mock_raw_data, crr_config, RunContext())
 
         assert isinstance(result, ResolvedHierarchyBundle)
         assert result.exposures is not None
@@ -497,7 +500,7 @@ class TestPipelineStageExecution:
         pipeline = PipelineOrchestrator()
         pipeline._ensure_components_initialized()
 
-        result = pipeline._run_classifier(mock_resolved_bundle, crr_config)
+        result = pipeline._run_classifier(mock_resolved_bundle, crr_config, RunContext())
 
         assert isinstance(result, ClassifiedExposuresBundle)
 
@@ -506,7 +509,7 @@ class TestPipelineStageExecution:
         pipeline = PipelineOrchestrator()
         pipeline._ensure_components_initialized()
 
-        result = pipeline._run_crm_processor(mock_classified_bundle, crr_config)
+        result = pipeline._run_crm_processor(mock_classified_bundle, crr_config, RunContext())
 
         assert isinstance(result, CRMAdjustedBundle)
 
@@ -515,7 +518,7 @@ class TestPipelineStageExecution:
         pipeline = PipelineOrchestrator()
         pipeline._ensure_components_initialized()
 
-        result = pipeline._run_sa_calculator(mock_crm_bundle, crr_config)
+        result = pipeline._run_sa_calculator(mock_crm_bundle, crr_config, RunContext())
 
         assert isinstance(result, SAResultBundle)
         assert result.results is not None
@@ -526,7 +529,7 @@ class TestPipelineStageExecution:
         pipeline._ensure_components_initialized()
 
         # mock_crm_bundle has all SA exposures, no IRB
-        result = pipeline._run_irb_calculator(mock_crm_bundle, crr_config)
+        result = pipeline._run_irb_calculator(mock_crm_bundle, crr_config, RunContext())
 
         assert isinstance(result, IRBResultBundle)
         # Should return empty bundle since no IRB exposures
@@ -538,7 +541,7 @@ class TestPipelineStageExecution:
         pipeline = PipelineOrchestrator()
         pipeline._ensure_components_initialized()
 
-        result = pipeline._run_slotting_calculator(mock_crm_bundle, crr_config)
+        result = pipeline._run_slotting_calculator(mock_crm_bundle, crr_config, RunContext())
 
         assert isinstance(result, SlottingResultBundle)
         # Should return empty bundle since no slotting exposures
@@ -725,6 +728,154 @@ class TestPipelineIntegration:
             assert isinstance(approach_df, pl.DataFrame)
 
 
+class TestPipelineAuditMode:
+    """Tests for CalculationConfig.audit_mode."""
+
+    AUDIT_STRINGS = ["classification_reason", "ccf_calculation", "crm_calculation"]
+
+    def _run(self, raw_data: RawDataBundle, audit_mode: str) -> AggregatedResultBundle:
+        config = CalculationConfig.crr(reporting_date=date(2024, 12, 31), audit_mode=audit_mode)
+        return PipelineOrchestrator().run_with_data(raw_data, config)
+
+    def test_full_mode_builds_strings(self, mock_raw_data):
+        """Default mode keeps the per-row audit strings."""
+        results = self._run(mock_raw_data, "full").results.collect()
+
+        assert set(self.AUDIT_STRINGS) <= set(results.columns)
+
+    def test_numeric_mode_renders_same_strings_on_demand(self, mock_raw_data):
+        """Numeric mode drops the strings; render rebuilds them identically."""
+        full = self._run(mock_raw_data, "full").results.collect()
+        numeric = self._run(mock_raw_data, "numeric").results
+
+        assert not set(self.AUDIT_STRINGS) & set(numeric.collect_schema().names())
+
+        ref = full["exposure_reference"][0]
+        rendered = numeric.audit.render([ref]).collect()
+        expected = full.filter(pl.col("exposure_reference") == ref)
+
+        assert rendered.height == 1
+        for col in self.AUDIT_STRINGS:
+            assert rendered[col][0] == expected[col][0]
+        assert rendered["rwa_final"][0] == expected["rwa_final"][0]
+
+    def test_none_mode_skips_audit_frames(self, mock_raw_data):
+        """None mode skips stage audit frames without changing RWA."""
+        pipeline = PipelineOrchestrator()
+        pipeline._ensure_components_initialized()
+        config = CalculationConfig.crr(reporting_date=date(2024, 12, 31), audit_mode="none")
+
+        resolved = pipeline._run_hierarchy_resolver(mock_raw_data, config, RunContext())
+        classified = pipeline._run_classifier(resolved, config, RunContext())
+        crm = pipeline._run_crm_processor(classified, config, RunContext())
+        sa = pipeline._run_sa_calculator(crm, config, RunContext())
+
+        assert classified.classification_audit is None
+        assert crm.crm_audit is None
+        assert sa.calculation_audit is None
+
+        full = self._run(mock_raw_data, "full").results.collect()
+        none = self._run(mock_raw_data, "none").results.collect()
+        assert none["rwa_final"].sum() == pytest.approx(full["rwa_final"].sum())
+
+
+class TestPipelineColumnContracts:
+    """Tests for pruning intermediate columns before materialisation."""
+
+    def test_pruning_does_not_change_results(self, mock_raw_data):
+        """Pruned results equal the keep_all_columns results on shared columns."""
+        config = CalculationConfig.crr(reporting_date=date(2024, 12, 31))
+        debug = replace(config, keep_all_columns=True)
+
+        pruned = PipelineOrchestrator().run_with_data(mock_raw_data, config).results.collect()
+        full = PipelineOrchestrator().run_with_data(mock_raw_data, debug).results.collect()
+
+        assert pruned.width < full.width
+        assert "counterparty_hierarchy_depth" in full.columns
+        assert "counterparty_hierarchy_depth" not in pruned.columns
+        assert pruned.sort("exposure_reference").equals(
+            full.select(pruned.columns).sort("exposure_reference")
+        )
+
+
+class TestPipelineConcurrency:
+    """
+    Stress tests for concurrent runs on one orchestrator.
+
+    Meant to also run on the free-threaded (python3.13t) build, where the
+    runs execute truly in parallel.
+    """
+
+    RUNS = 24
+
+    def _inputs(
+        self,
+        mock_raw_data: RawDataBundle,
+    ) -> list[tuple[RawDataBundle, CalculationConfig]]:
+        """Alternate valid/invalid data and CRR/Basel 3.1 configs."""
+        invalid = replace(
+            mock_raw_data,
+            loans=mock_raw_data.loans.with_columns(pl.lit("bogus").alias("seniority")),
+        )
+        configs = [
+            CalculationConfig.crr(reporting_date=date(2024, 12, 31)),
+            CalculationConfig.basel_3_1(reporting_date=date(2027, 6, 30)),
+        ]
+        return [
+            (invalid if i % 3 == 0 else mock_raw_data, configs[i % 2])
+            for i in range(self.RUNS)
+        ]
+
+    @staticmethod
+    def _outcome(result: AggregatedResultBundle) -> tuple[float, list[str]]:
+        """Total RWA and sorted error messages of a run."""
+        rwa = result.results.select(pl.col("rwa_final").sum()).collect().item()
+        return rwa, sorted(getattr(e, "message", str(e)) for e in result.errors)
+
+    def test_concurrent_runs_match_serial_runs(self, mock_raw_data):
+        """Each concurrent run returns exactly its own results and errors."""
+        inputs = self._inputs(mock_raw_data)
+        pipeline = PipelineOrchestrator()
+
+        serial = [
+            self._outcome(pipeline.run_with_data(data, config))
+            for data, config in inputs[:6]
+        ]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            concurrent = list(pool.map(
+                lambda args: self._outcome(pipeline.run_with_data(*args)), inputs
+            ))
+
+        for i, (rwa, errors) in enumerate(concurrent):
+            expected_rwa, expected_errors = serial[i % 6]
+            assert rwa == pytest.approx(expected_rwa)
+            assert errors == expected_errors
+
+    def test_concurrent_first_runs_share_components(self, mock_raw_data):
+        """Lazily created default components are created once."""
+        pipeline = PipelineOrchestrator()
+        config = CalculationConfig.crr(reporting_date=date(2024, 12, 31))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: pipeline.run_with_data(mock_raw_data, config), range(8)))
+        resolver = pipeline._hierarchy_resolver
+        pipeline.run_with_data(mock_raw_data, config)
+
+        assert pipeline._hierarchy_resolver is resolver
+
+    def test_with_loader_shares_components(self):
+        """with_loader swaps the loader and keeps the warm components."""
+        pipeline = PipelineOrchestrator()
+        loader = MagicMock()
+
+        derived = pipeline.with_loader(loader)
+
+        assert derived._loader is loader
+        assert derived._crm_processor is pipeline._crm_processor
+        assert derived._aggregator is pipeline._aggregator
+
+
 class TestPipelineFactoryFunctions:
     """Tests for factory functions."""
 
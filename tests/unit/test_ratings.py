@@ -0,0 +1,218 @@
+"""
+Unit tests for point-in-time rating selection.
+
+Tests cover:
+- Latest rating at or before the reporting date
+- Future-dated ratings excluded (and kept when point_in_time is off)
+- Deterministic tie-breaking on rating_reference
+- Agency preference order
+- Separate internal (PD) and external (CQS) streams
+- Hierarchy resolver integration
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date
+
+import polars as pl
+import pytest
+
+from rwa_calc.contracts.config import CalculationConfig, RatingSelection
+from rwa_calc.engine.hierarchy import HierarchyResolver
+from rwa_calc.engine.ratings import RatingSelector, create_rating_selector
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def config() -> CalculationConfig:
+    """CRR config at 2024-12-31."""
+    return CalculationConfig.crr(reporting_date=date(2024, 12, 31))
+
+
+def _ratings(rows: list[tuple]) -> pl.LazyFrame:
+    """Build a ratings frame from (ref, cp, type, agency, value, cqs, pd, date) tuples."""
+    return pl.LazyFrame(
+        rows,
+        schema={
+            "rating_reference": pl.String,
+            "counterparty_reference": pl.String,
+            "rating_type": pl.String,
+            "rating_agency": pl.String,
+            "rating_value": pl.String,
+            "cqs": pl.Int8,
+            "pd": pl.Float64,
+            "rating_date": pl.Date,
+        },
+        orient="row",
+    )
+
+
+def _select(ratings: pl.LazyFrame, config: CalculationConfig | None) -> dict[str, dict]:
+    """Run the selector and key the result by counterparty."""
+    df = RatingSelector().select(ratings, config).collect()
+    return {row["counterparty_reference"]: row for row in df.iter_rows(named=True)}
+
+
+# =============================================================================
+# Point-in-time selection
+# =============================================================================
+
+
+class TestPointInTime:
+    """Tests for reporting-date filtering and recency."""
+
+    def test_factory(self) -> None:
+        assert isinstance(create_rating_selector(), RatingSelector)
+
+    def test_latest_rating_before_reporting_date_wins(self, config: CalculationConfig) -> None:
+        ratings = _ratings([
+            ("R1", "CP1", "external", "S&P", "A", 2, None, date(2023, 6, 30)),
+            ("R2", "CP1", "external", "S&P", "BBB", 3, None, date(2024, 6, 30)),
+        ])
+        result = _select(ratings, config)
+        assert result["CP1"]["cqs"] == 3
+        assert result["CP1"]["rating_date"] == date(2024, 6, 30)
+
+    def test_future_dated_rating_excluded(self, config: CalculationConfig) -> None:
+        """Point-in-time selection is on by default: future ratings are dropped."""
+        assert config.rating_selection.point_in_time
+        ratings = _ratings([
+            ("R1", "CP1", "external", "S&P", "A", 2, None, date(2024, 6, 30)),
+            ("R2", "CP1", "external", "S&P", "CCC", 6, None, date(2025, 3, 31)),
+            ("R3", "CP2", "external", "S&P", "AA", 1, None, date(2025, 1, 15)),
+        ])
+        result = _select(ratings, config)
+        assert result["CP1"]["cqs"] == 2
+        # Only a future rating: counterparty is unrated at the reporting date
+        assert "CP2" not in result
+
+    def test_rating_on_reporting_date_is_eligible(self, config: CalculationConfig) -> None:
+        ratings = _ratings([
+            ("R1", "CP1", "external", "S&P", "A", 2, None, date(2024, 1, 1)),
+            ("R2", "CP1", "external", "S&P", "AA", 1, None, date(2024, 12, 31)),
+        ])
+        assert _select(ratings, config)["CP1"]["cqs"] == 1
+
+    def test_point_in_time_disabled_keeps_future_ratings(self, config: CalculationConfig) -> None:
+        ratings = _ratings([
+            ("R1", "CP1", "external", "S&P", "A", 2, None, date(2024, 6, 30)),
+            ("R2", "CP1", "external", "S&P", "CCC", 6, None, date(2025, 3, 31)),
+        ])
+        config = replace(config, rating_selection=RatingSelection(point_in_time=False))
+        assert _select(ratings, config)["CP1"]["cqs"] == 6
+
+    def test_undated_rating_loses_to_dated(self, config: CalculationConfig) -> None:
+        ratings = _ratings([
+            ("R1", "CP1", "external", "S&P", "A", 2, None, date(2024, 6, 30)),
+            ("R2", "CP1", "external", "S&P", "CCC", 6, None, None),
+            ("R3", "CP2", "external", "S&P", "BB", 4, None, None),
+        ])
+        result = _select(ratings, config)
+        assert result["CP1"]["cqs"] == 2
+        assert result["CP2"]["cqs"] == 4
+
+    def test_same_date_tie_broken_by_reference(self, config: CalculationConfig) -> None:
+        ratings = _ratings([
+            ("R_B", "CP1", "external", "S&P", "BBB", 3, None, date(2024, 6, 30)),
+            ("R_A", "CP1", "external", "S&P", "A", 2, None, date(2024, 6, 30)),
+        ])
+        assert _select(ratings, config)["CP1"]["rating_value"] == "BBB"
+
+    def test_no_config_applies_no_date_filter(self) -> None:
+        ratings = _ratings([
+            ("R1", "CP1", "external", "S&P", "A", 2, None, date(2024, 6, 30)),
+            ("R2", "CP1", "external", "S&P", "CCC", 6, None, date(2030, 1, 1)),
+        ])
+        assert _select(ratings, None)["CP1"]["cqs"] == 6
+
+
+# =============================================================================
+# Agency preference and rating streams
+# =============================================================================
+
+
+class TestSelectionPolicy:
+    """Tests for agency preference and separate internal/external streams."""
+
+    def test_agency_preference_beats_recency(self, config: CalculationConfig) -> None:
+        ratings = _ratings([
+            ("R1", "CP1", "external", "Moodys", "A2", 2, None, date(2024, 3, 31)),
+            ("R2", "CP1", "external", "Fitch", "BBB", 3, None, date(2024, 9, 30)),
+            ("R3", "CP2", "external", "DBRS", "AA", 1, None, date(2024, 9, 30)),
+        ])
+        config = replace(
+            config,
+            rating_selection=RatingSelection(agency_preference=("S&P", "Moodys")),
+        )
+        result = _select(ratings, config)
+        assert result["CP1"]["rating_agency"] == "Moodys"
+        # Unlisted agencies are still used when nothing preferred exists
+        assert result["CP2"]["rating_agency"] == "DBRS"
+
+    def test_separate_streams(self, config: CalculationConfig) -> None:
+        ratings = _ratings([
+            ("E1", "CP1", "external", "S&P", "BBB", 3, None, date(2024, 3, 31)),
+            ("I1", "CP1", "internal", "internal", "4A", 4, 0.015, date(2024, 9, 30)),
+            ("I2", "CP2", "internal", "internal", "2A", 2, 0.002, date(2024, 9, 30)),
+            ("E2", "CP3", "external", "Fitch", "A", 2, None, date(2024, 9, 30)),
+        ])
+        config = replace(config, rating_selection=RatingSelection(separate_streams=True))
+        result = _select(ratings, config)
+
+        # CQS from the external stream, PD from the internal stream
+        assert result["CP1"]["cqs"] == 3
+        assert result["CP1"]["pd"] == pytest.approx(0.015)
+        assert result["CP1"]["rating_type"] == "external"
+        # Internal only: PD but no CQS
+        assert result["CP2"]["cqs"] is None
+        assert result["CP2"]["pd"] == pytest.approx(0.002)
+        assert result["CP2"]["rating_type"] == "internal"
+        # External only: CQS but no PD
+        assert result["CP3"]["cqs"] == 2
+        assert result["CP3"]["pd"] is None
+
+    def test_combined_stream_takes_latest_rating(self, config: CalculationConfig) -> None:
+        ratings = _ratings([
+            ("E1", "CP1", "external", "S&P", "BBB", 3, None, date(2024, 3, 31)),
+            ("I1", "CP1", "internal", "internal", "4A", 4, 0.015, date(2024, 9, 30)),
+        ])
+        result = _select(ratings, config)
+        assert result["CP1"]["rating_type"] == "internal"
+        assert result["CP1"]["cqs"] == 4
+
+
+# =============================================================================
+# Hierarchy integration
+# =============================================================================
+
+
+class TestHierarchyIntegration:
+    """Rating inheritance uses the point-in-time selection."""
+
+    def test_inheritance_ignores_future_ratings(self, config: CalculationConfig) -> None:
+        counterparties = pl.LazyFrame({"counterparty_reference": ["PARENT", "CHILD"]})
+        ultimate_parents = pl.LazyFrame({
+            "counterparty_reference": ["CHILD"],
+            "ultimate_parent_reference": ["PARENT"],
+            "hierarchy_depth": [1],
+        })
+        ratings = _ratings([
+            ("R1", "PARENT", "external", "S&P", "A", 2, None, date(2024, 6, 30)),
+            ("R2", "PARENT", "external", "S&P", "CCC", 6, None, date(2025, 6, 30)),
+            ("R3", "CHILD", "external", "S&P", "AA", 1, None, date(2025, 6, 30)),
+        ])
+
+        result = (
+            HierarchyResolver()
+            ._build_rating_inheritance_lazy(counterparties, ratings, ultimate_parents, config)
+            .collect()
+        )
+        rows = {r["counterparty_reference"]: r for r in result.iter_rows(named=True)}
+
+        assert rows["PARENT"]["cqs"] == 2
+        assert rows["CHILD"]["cqs"] == 2
+        assert rows["CHILD"]["inheritance_reason"] == "parent_rating"
@@ -0,0 +1,283 @@
+"""
+Unit tests for the pipeline resource governor.
+
+Tests cover:
+- Row widths and bundle size estimates from row counts x schema widths
+- Thread pool size checked against expected_threads without touching the environment
+- Runs over the memory budget spill stage outputs to IPC files and scan them back
+- Spill directories are removed by close()
+- The concurrency limit bounds runs in progress
+- Governed pipeline runs match ungoverned runs
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import polars as pl
+import pytest
+
+from rwa_calc.contracts.bundles import RawDataBundle
+from rwa_calc.contracts.config import CalculationConfig
+from rwa_calc.engine.pipeline import PipelineOrchestrator
+from rwa_calc.engine.resources import (
+    STRING_WIDTH,
+    ResourceGovernor,
+    ResourceLimits,
+    check_thread_pool,
+    estimate_bytes,
+    materialise,
+    row_width,
+)
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def config() -> CalculationConfig:
+    """CRR configuration for testing."""
+    return CalculationConfig.crr(reporting_date=date(2024, 12, 31))
+
+
+def _raw_data(n: int) -> RawDataBundle:
+    """One corporate counterparty with n loans."""
+    return RawDataBundle(
+        facilities=pl.LazyFrame(schema={
+            "facility_reference": pl.String,
+            "counterparty_reference": pl.String,
+            "currency": pl.String,
+            "limit": pl.Float64,
+        }),
+        loans=pl.LazyFrame({
+            "loan_reference": [f"LN{i:03d}" for i in range(n)],
+            "counterparty_reference": ["CP001"] * n,
+            "product_type": ["TERM_LOAN"] * n,
+            "book_code": ["BANK"] * n,
+            "value_date": [date(2023, 1, 1)] * n,
+            "maturity_date": [date(2028, 1, 1)] * n,
+            "currency": ["GBP"] * n,
+            "drawn_amount": [100.0 * (i + 1) for i in range(n)],
+            "lgd": [0.45] * n,
+            "seniority": ["senior"] * n,
+        }),
+        counterparties=pl.LazyFrame({
+            "counterparty_reference": ["CP001"],
+            "counterparty_name": ["Corporate Customer"],
+            "entity_type": ["corporate"],
+            "country_code": ["GB"],
+            "annual_revenue": [30000000.0],
+            "total_assets": [50000000.0],
+            "default_status": [False],
+            "sector_code": ["62.01"],
+            "is_regulated": [False],
+            "is_managed_as_retail": [False],
+        }),
+        facility_mappings=pl.LazyFrame(schema={
+            "child_reference": pl.String,
+            "parent_facility_reference": pl.String,
+        }),
+        lending_mappings=pl.LazyFrame(schema={
+            "child_counterparty_reference": pl.String,
+            "parent_counterparty_reference": pl.String,
+        }),
+    )
+
+
+# =============================================================================
+# Size Estimation Tests
+# =============================================================================
+
+
+class TestEstimateBytes:
+    """Tests for row_width and estimate_bytes."""
+
+    def test_row_width(self) -> None:
+        """Fixed-width types use their size, strings STRING_WIDTH."""
+        schema = pl.Schema({"a": pl.Float64, "b": pl.Int32, "c": pl.String, "d": pl.Boolean})
+
+        assert row_width(schema) == 8 + 4 + STRING_WIDTH + 1
+
+    def test_scales_with_rows(self) -> None:
+        """Estimate grows with row counts; empty tables add nothing."""
+        small = estimate_bytes(_raw_data(10))
+        large = estimate_bytes(_raw_data(20))
+        loan_width = row_width(_raw_data(1).loans.collect_schema())
+
+        assert large - small == 10 * loan_width
+
+
+# =============================================================================
+# Thread Pool Tests
+# =============================================================================
+
+
+class TestCheckThreadPool:
+    """Tests for check_thread_pool."""
+
+    def test_matching_pool(self, caplog: pytest.LogCaptureFixture) -> None:
+        """A request equal to the pool size is silent."""
+        with caplog.at_level(logging.WARNING, logger="rwa_calc.engine.resources"):
+            assert check_thread_pool(pl.thread_pool_size()) == pl.thread_pool_size()
+
+        assert not caplog.records
+
+    def test_mismatch_warns(self, caplog: pytest.LogCaptureFixture) -> None:
+        """A request the existing pool cannot meet is logged, not applied."""
+        requested = pl.thread_pool_size() + 1
+        env_before = os.environ.get("POLARS_MAX_THREADS")
+
+        with caplog.at_level(logging.WARNING, logger="rwa_calc.engine.resources"):
+            threads = check_thread_pool(requested)
+
+        assert threads == pl.thread_pool_size()
+        assert "POLARS_MAX_THREADS" in caplog.text
+        assert os.environ.get("POLARS_MAX_THREADS") == env_before
+
+
+# =============================================================================
+# Governor Tests
+# =============================================================================
+
+
+class TestResourceGovernor:
+    """Tests for ResourceGovernor planning and admission."""
+
+    def test_invalid_limit(self) -> None:
+        """Limits must be positive."""
+        with pytest.raises(ValueError, match="max_concurrent_runs"):
+            ResourceLimits(max_concurrent_runs=0)
+
+    def test_no_budget_keeps_config(self, config: CalculationConfig) -> None:
+        """Without a memory budget the config is unchanged."""
+        plan = ResourceGovernor().plan(_raw_data(10), config)
+
+        assert plan.config is config
+        assert not plan.streaming
+        assert plan.threads == pl.thread_pool_size()
+
+    def test_under_budget_stays_in_memory(self, config: CalculationConfig) -> None:
+        """Runs within budget keep in-memory materialisation."""
+        governor = ResourceGovernor(ResourceLimits(memory_budget_bytes=1024**3))
+        plan = governor.plan(_raw_data(10), config)
+
+        assert plan.estimated_bytes > 0
+        assert not plan.streaming
+        assert plan.config.materialise_engine == "cpu"
+
+    def test_over_budget_spills(self, config: CalculationConfig) -> None:
+        """Runs over budget spill stage outputs to the governor's directory."""
+        governor = ResourceGovernor(ResourceLimits(memory_budget_bytes=1))
+        plan = governor.plan(_raw_data(10), config)
+
+        assert plan.streaming
+        assert plan.config.materialise_engine == "streaming"
+        assert plan.config.spill_dir == governor.spill_dir()
+        assert plan.config.spill_dir.is_dir()
+        assert plan.config.collect_engine == config.collect_engine
+
+        governor.close()
+
+    def test_spill_dir_under_limit_dir(self, config: CalculationConfig, tmp_path: Path) -> None:
+        """Spill directories are created under ResourceLimits.spill_dir and removed by close."""
+        governor = ResourceGovernor(ResourceLimits(memory_budget_bytes=1, spill_dir=tmp_path))
+        spill_dir = governor.plan(_raw_data(10), config).config.spill_dir
+
+        assert spill_dir.parent == tmp_path
+
+        governor.close()
+
+        assert not spill_dir.exists()
+
+    def test_concurrency_limit(self, config: CalculationConfig) -> None:
+        """No more than max_concurrent_runs runs are admitted at once."""
+        governor = ResourceGovernor(ResourceLimits(max_concurrent_runs=2))
+        data = _raw_data(1)
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def hold() -> None:
+            nonlocal active, peak
+            with governor.admit(data, config):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda _: hold(), range(12)))
+
+        assert peak == 2
+
+
+# =============================================================================
+# Materialisation Tests
+# =============================================================================
+
+
+class TestMaterialise:
+    """Tests for materialise."""
+
+    def test_in_memory(self, config: CalculationConfig) -> None:
+        """Without a spill directory the frame is collected in memory."""
+        lf = pl.LazyFrame({"a": [1, 2, 3]})
+
+        result = materialise(lf, config, "stage")
+
+        assert result.explain().startswith("DF")
+        assert result.collect().equals(lf.collect())
+
+    def test_spills_to_ipc(self, config: CalculationConfig, tmp_path: Path) -> None:
+        """With a spill directory the frame is sunk to an IPC file and scanned back."""
+        lf = pl.LazyFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+        result = materialise(lf, replace(config, spill_dir=tmp_path), "stage")
+
+        files = list(tmp_path.glob("stage-*.arrow"))
+        assert len(files) == 1
+        assert result.collect().equals(pl.read_ipc(files[0]))
+        assert result.collect().equals(lf.collect())
+
+
+# =============================================================================
+# Pipeline Tests
+# =============================================================================
+
+
+class TestPipelineGovernor:
+    """Tests for PipelineOrchestrator with a governor."""
+
+    def test_spilled_results_match(self, config: CalculationConfig) -> None:
+        """Runs over budget spill the classifier and CRM outputs and give the same results."""
+        data = _raw_data(5)
+        governor = ResourceGovernor(ResourceLimits(memory_budget_bytes=1))
+
+        governed = PipelineOrchestrator(governor=governor).run_with_data(data, config)
+        plain = PipelineOrchestrator().run_with_data(data, config)
+
+        spilled = {path.name.split("-")[0] for path in governor.spill_dir().iterdir()}
+        assert spilled == {"classified", "crm_adjusted"}
+        assert governed.results.collect().sort("exposure_reference").equals(
+            plain.results.collect().sort("exposure_reference")
+        )
+
+        governor.close()
+
+    def test_with_loader_shares_governor(self) -> None:
+        """Derived orchestrators count against the same limits."""
+        governor = ResourceGovernor(ResourceLimits(max_concurrent_runs=1))
+        pipeline = PipelineOrchestrator(governor=governor)
+
+        assert pipeline.with_loader(MagicMock())._governor is governor
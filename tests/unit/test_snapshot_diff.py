@@ -0,0 +1,145 @@
+"""
+Unit tests for the snapshot differ.
+
+Tests cover:
+- Insert, update, delete and unchanged classification
+- Change frames hold full rows from the right snapshot
+- Columns outside the schema do not register as changes
+- Tables missing from one snapshot
+- Per-table statistics
+"""
+
+from __future__ import annotations
+
+import polars as pl
+import pytest
+
+from rwa_calc.contracts.bundles import RawDataBundle
+from rwa_calc.engine.snapshot_diff import (
+    SnapshotDiff,
+    SnapshotDiffer,
+    SnapshotTable,
+    create_snapshot_differ,
+)
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+def _bundle(
+    loans: pl.LazyFrame,
+    fx_rates: pl.LazyFrame | None = None,
+) -> RawDataBundle:
+    """Bundle with the given loans and empty required tables."""
+    return RawDataBundle(
+        facilities=pl.LazyFrame(schema={"facility_reference": pl.String}),
+        loans=loans,
+        counterparties=pl.LazyFrame(schema={"counterparty_reference": pl.String}),
+        facility_mappings=pl.LazyFrame(schema={"child_reference": pl.String}),
+        lending_mappings=pl.LazyFrame(schema={"child_counterparty_reference": pl.String}),
+        fx_rates=fx_rates,
+    )
+
+
+@pytest.fixture
+def previous() -> RawDataBundle:
+    return _bundle(pl.LazyFrame({
+        "loan_reference": ["L1", "L2", "L3"],
+        "drawn_amount": [100.0, 200.0, 300.0],
+        "currency": ["GBP", "GBP", "EUR"],
+        "source_system": ["A", "A", "A"],
+    }))
+
+
+@pytest.fixture
+def current() -> RawDataBundle:
+    return _bundle(pl.LazyFrame({
+        "loan_reference": ["L1", "L2", "L4"],
+        "drawn_amount": [100.0, 250.0, 400.0],
+        "currency": ["GBP", "GBP", "USD"],
+        "source_system": ["B", "B", "B"],
+    }))
+
+
+@pytest.fixture
+def diff(previous: RawDataBundle, current: RawDataBundle) -> SnapshotDiff:
+    return create_snapshot_differ().diff(previous, current, engine="cpu")
+
+
+# =============================================================================
+# Change Set Tests
+# =============================================================================
+
+
+class TestChangeSets:
+    """Tests for row classification and change frames."""
+
+    def test_changed_keys(self, diff: SnapshotDiff) -> None:
+        """L2 updated, L3 deleted, L4 inserted; L1 unchanged."""
+        changed = diff.changes["loans"].changed_keys.sort("loan_reference")
+
+        assert changed.rows() == [("L2", "update"), ("L3", "delete"), ("L4", "insert")]
+
+    def test_change_frames(self, diff: SnapshotDiff) -> None:
+        """Inserts and updates come from the current snapshot, deletes from the previous."""
+        loans = diff.changes["loans"]
+
+        assert loans.inserts.collect()["drawn_amount"].to_list() == [400.0]
+        assert loans.updates.collect()["drawn_amount"].to_list() == [250.0]
+        assert loans.deletes.collect()["currency"].to_list() == ["EUR"]
+
+    def test_non_schema_columns_ignored(self, diff: SnapshotDiff) -> None:
+        """source_system is not in LOAN_SCHEMA, so L1 stays unchanged."""
+        assert "L1" not in diff.changes["loans"].changed_keys["loan_reference"].to_list()
+
+    def test_identical_snapshots(self, previous: RawDataBundle) -> None:
+        """A snapshot compared with itself has no changes."""
+        result = SnapshotDiffer().diff(previous, previous, engine="cpu")
+
+        assert not result.has_changes
+
+    def test_table_missing_from_previous(self, previous: RawDataBundle) -> None:
+        """Every row of a table new to the current snapshot is an insert."""
+        fx_rates = pl.LazyFrame({
+            "currency_from": ["USD", "EUR"],
+            "currency_to": ["GBP", "GBP"],
+            "rate": [0.79, 0.86],
+        })
+        current = _bundle(previous.loans, fx_rates=fx_rates)
+
+        result = SnapshotDiffer().diff(previous, current, engine="cpu")
+
+        assert result.changes["fx_rates"].key == ("currency_from", "currency_to")
+        assert result.changes["fx_rates"].inserts.collect().height == 2
+
+    def test_missing_key_raises(self, previous: RawDataBundle) -> None:
+        """A table without its key column in both snapshots is rejected."""
+        differ = SnapshotDiffer({"loans": SnapshotTable(("exposure_id",), {})})
+
+        with pytest.raises(ValueError, match="loans"):
+            differ.diff(previous, previous, engine="cpu")
+
+
+# =============================================================================
+# Statistics Tests
+# =============================================================================
+
+
+class TestStatistics:
+    """Tests for per-table change statistics."""
+
+    def test_loan_statistics(self, diff: SnapshotDiff) -> None:
+        """Counts and change rate for the loans table."""
+        row = diff.statistics.filter(pl.col("table") == "loans").row(0, named=True)
+
+        assert row["previous_rows"] == 3
+        assert row["current_rows"] == 3
+        assert (row["inserts"], row["updates"], row["deletes"], row["unchanged"]) == (1, 1, 1, 1)
+        assert row["change_rate"] == pytest.approx(0.75)
+
+    def test_one_row_per_present_table(self, diff: SnapshotDiff) -> None:
+        """Tables absent from both snapshots are skipped."""
+        assert set(diff.statistics["table"]) == {
+            "facilities", "loans", "counterparties", "facility_mappings", "lending_mappings",
+        }